@@ -5,7 +5,9 @@ Usage (from repo root):
   export SAM_PLUGINS="examples.plugins.simple_plugin.plugin"
   uv run sam tools
 
-This registers two demo tools: `echo` and `time_now`.
+This registers two demo tools: `echo` and `time_now`. Because the module
+declares ``SAM_PLUGIN_MANIFEST``, SAM lists both tools without importing it and
+imports it on the first tool call.
 """
 
 from __future__ import annotations
@@ -16,6 +18,30 @@ from pydantic import BaseModel, Field
 
 from sam.core.tools import Tool, ToolSpec
 
+# Read from source by SAM; must be a plain literal matching the tools registered below
+SAM_PLUGIN_MANIFEST = [
+    {
+        "name": "echo",
+        "description": "Echo back a provided message",
+        "input_schema": {
+            "parameters": {
+                "type": "object",
+                "properties": {"message": {"type": "string", "description": "Text to echo back"}},
+                "required": ["message"],
+            }
+        },
+        "namespace": "examples",
+        "version": "0.1.0",
+    },
+    {
+        "name": "time_now",
+        "description": "Return the current UTC timestamp in ISO format",
+        "input_schema": {"parameters": {"type": "object", "properties": {}}},
+        "namespace": "examples",
+        "version": "0.1.0",
+    },
+]
+
 
 class EchoInput(BaseModel):
     message: str = Field(..., description="Text to echo back")
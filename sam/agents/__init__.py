@@ -2,7 +2,9 @@
 
 from .definition import AgentDefinition, LLMConfig, ToolConfig
 from .manager import (
+    AgentDefinitionIndex,
     default_agents_dir,
+    get_agent_index,
     list_agent_definitions,
     find_agent_definition,
     ensure_agents_dir,
@@ -10,9 +12,11 @@ from .manager import (
 
 __all__ = [
     "AgentDefinition",
+    "AgentDefinitionIndex",
     "LLMConfig",
     "ToolConfig",
     "default_agents_dir",
+    "get_agent_index",
     "list_agent_definitions",
     "find_agent_definition",
     "ensure_agents_dir",
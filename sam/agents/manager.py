@@ -2,50 +2,191 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import threading
+import tomllib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from .definition import AgentDefinition, default_agents_dir
 
+logger = logging.getLogger(__name__)
+
 AGENT_FILE_SUFFIXES = (".agent.toml", ".toml")
 
 __all__ = [
+    "AgentDefinitionIndex",
     "default_agents_dir",
+    "get_agent_index",
     "list_agent_definitions",
     "find_agent_definition",
     "ensure_agents_dir",
+    "reset_agent_indexes",
 ]
 
 
-def _iter_definition_paths(directory: Path) -> List[Path]:
-    if not directory.exists():
-        return []
-    paths: List[Path] = []
-    seen: set[Path] = set()
-    for suffix in AGENT_FILE_SUFFIXES:
-        for candidate in sorted(directory.glob(f"*{suffix}")):
-            resolved = candidate.resolve()
-            if resolved in seen:
-                continue
-            seen.add(resolved)
-            paths.append(resolved)
-    return paths
+@dataclass
+class _IndexedFile:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    definition: Optional[AgentDefinition]
 
 
-def list_agent_definitions(directory: Optional[Path] = None) -> List[AgentDefinition]:
-    agents_dir = directory or default_agents_dir()
-    definitions: List[AgentDefinition] = []
-    for path in _iter_definition_paths(agents_dir):
+class AgentDefinitionIndex:
+    """Parsed agent definitions of one directory, reparsed only when files change.
+
+    Every lookup re-lists the directory and stats the files, which is cheap;
+    a file is read and parsed again only when its mtime or size differs from
+    the last parse. Callers receive copies, so the indexed definitions can't
+    be mutated through them. Files that fail to parse are remembered (and
+    skipped) until they change.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._files: Dict[str, _IndexedFile] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        self._stats = {"parses": 0, "hits": 0}
+
+    def _scan(self) -> List[os.DirEntry]:
         try:
-            definitions.append(AgentDefinition.load(path))
-        except Exception:
-            continue
-    return definitions
+            with os.scandir(self.directory) as it:
+                entries = [e for e in it if e.name.endswith(AGENT_FILE_SUFFIXES)]
+        except OSError:
+            return []
+        # Same order as globbing: ``*.agent.toml`` first, then other ``*.toml``
+        primary = sorted(
+            (e for e in entries if e.name.endswith(".agent.toml")), key=lambda e: e.name
+        )
+        rest = sorted(
+            (e for e in entries if not e.name.endswith(".agent.toml")), key=lambda e: e.name
+        )
+        return primary + rest
+
+    def _parse(self, path: Path, mtime_ns: int, size: int) -> _IndexedFile:
+        self._stats["parses"] += 1
+        data = path.read_bytes()
+        definition: Optional[AgentDefinition] = None
+        try:
+            definition = AgentDefinition.from_dict(tomllib.loads(data.decode("utf-8")), path=path)
+        except Exception as exc:
+            logger.debug(f"Skipping agent definition {path}: {exc}")
+        return _IndexedFile(mtime_ns, size, hashlib.sha256(data).hexdigest(), definition)
 
+    def refresh(self) -> None:
+        """Bring the index in line with the directory."""
+        with self._lock:
+            files: Dict[str, _IndexedFile] = {}
+            order: List[str] = []
+            seen: set[Path] = set()
+            for entry in self._scan():
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    resolved = Path(entry.path).resolve()
+                except OSError:
+                    continue
+                if resolved in seen:
+                    continue
+                seen.add(resolved)
+                cached = self._files.get(entry.name)
+                if cached and (cached.mtime_ns, cached.size) == (st.st_mtime_ns, st.st_size):
+                    self._stats["hits"] += 1
+                else:
+                    try:
+                        cached = self._parse(resolved, st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+                files[entry.name] = cached
+                order.append(entry.name)
+            self._files = files
+            self._order = order
 
-def find_agent_definition(name: str, directory: Optional[Path] = None) -> Optional[AgentDefinition]:
-    agents_dir = directory or default_agents_dir()
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """Force a reparse of one file (or all) on the next lookup.
+
+        For writers: a rewrite within the filesystem's timestamp granularity
+        that keeps the size would otherwise go unnoticed.
+        """
+        with self._lock:
+            if filename is None:
+                self._files.clear()
+            else:
+                self._files.pop(filename, None)
+
+    def _lookup(self, name: str) -> Optional[_IndexedFile]:
+        for suffix in AGENT_FILE_SUFFIXES:
+            indexed = self._files.get(f"{name}{suffix}")
+            if indexed is not None:
+                return indexed
+        return None
+
+    def definitions(self) -> List[AgentDefinition]:
+        self.refresh()
+        return [
+            indexed.definition.model_copy(deep=True)
+            for indexed in (self._files[filename] for filename in self._order)
+            if indexed.definition is not None
+        ]
+
+    def get(self, name: str) -> Optional[AgentDefinition]:
+        """Definition stored as ``<name>.agent.toml`` or ``<name>.toml``."""
+        self.refresh()
+        indexed = self._lookup(name)
+        if indexed is None or indexed.definition is None:
+            return None
+        return indexed.definition.model_copy(deep=True)
 
+    def content_hash(self, name: str) -> Optional[str]:
+        """SHA-256 of the definition file; changes whenever its content does.
+
+        Suitable as (part of) a cache key for anything built from the
+        definition.
+        """
+        self.refresh()
+        indexed = self._lookup(name)
+        if indexed is None or indexed.definition is None:
+            return None
+        return indexed.content_hash
+
+    def count(self) -> int:
+        self.refresh()
+        return sum(1 for indexed in self._files.values() if indexed.definition is not None)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, "files": len(self._files)}
+
+
+_indexes: Dict[Path, AgentDefinitionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_agent_index(directory: Optional[Path] = None) -> AgentDefinitionIndex:
+    """Process-wide index for ``directory`` (defaults to the agents dir)."""
+    key = Path(os.path.abspath(directory or default_agents_dir()))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(key, AgentDefinitionIndex(key))
+    return index
+
+
+def reset_agent_indexes() -> None:
+    """Forget every index (tests, shutdown)."""
+    _indexes.clear()
+
+
+def list_agent_definitions(directory: Optional[Path] = None) -> List[AgentDefinition]:
+    return get_agent_index(directory).definitions()
+
+
+def find_agent_definition(name: str, directory: Optional[Path] = None) -> Optional[AgentDefinition]:
     # Allow explicit path (must be a file, not directory)
     candidate_path = Path(name)
     if candidate_path.is_file():
@@ -54,14 +195,7 @@ def find_agent_definition(name: str, directory: Optional[Path] = None) -> Option
         except Exception:
             return None
 
-    for suffix in AGENT_FILE_SUFFIXES:
-        path = agents_dir / f"{name}{suffix}"
-        if path.exists():
-            try:
-                return AgentDefinition.load(path)
-            except Exception:
-                return None
-    return None
+    return get_agent_index(directory).get(name)
 
 
 def ensure_agents_dir(directory: Optional[Path] = None) -> Path:
@@ -9,6 +9,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from ..config.settings import Settings
+from ..core.builder import shutdown_shared_resources
+from ..core.memory_provider import create_memory_manager
 from .middleware.csrf import CSRFMiddleware
 from .middleware.request_id import RequestIDMiddleware
 from ..web.session import close_agent
@@ -101,6 +103,9 @@ def create_app(extra_app_kwargs: dict[str, Any] | None = None) -> FastAPI:
             Settings.SAM_API_PORT,
             Settings.SAM_API_ROOT_PATH or "/",
         )
+        # Migrate before serving so requests only see an O(1) schema check
+        memory = create_memory_manager(Settings.SAM_DB_PATH)
+        await getattr(memory, "initialize")()
 
     @app.on_event("shutdown")
     async def _shutdown() -> None:  # pragma: no cover - side effect only
@@ -109,6 +114,7 @@ def create_app(extra_app_kwargs: dict[str, Any] | None = None) -> FastAPI:
             await close_agent()
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.debug("Failed to close cached agent cleanly: %s", exc)
+        await shutdown_shared_resources()
 
     return app
 
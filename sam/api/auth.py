@@ -17,7 +17,8 @@ from jose import JWTError, jwt
 from ..config.settings import Settings
 from ..utils.connection_pool import get_db_connection
 from ..core.migration_definitions import register_all_migrations
-from ..core.migrations import get_migration_manager
+from ..core.migrations import ensure_schema, get_migration_manager
+from .user_cache import get_user_cache, user_cache_key
 from ..utils.wallet_auth import (
     create_sign_message,
     derive_user_id,
@@ -61,7 +62,10 @@ class UserStore:
         self.db_path = db_path
 
     async def initialize(self) -> None:
-        """Initialize database tables and run migrations."""
+        """Initialize database tables and run migrations (once per process)."""
+        await ensure_schema(self.db_path, self._setup_schema, scope="auth")
+
+    async def _setup_schema(self) -> None:
         # Register and run migrations
         await register_all_migrations(self.db_path)
         manager = get_migration_manager(self.db_path)
@@ -225,6 +229,17 @@ class UserStore:
             created_at=created_at,
         )
 
+    async def set_admin(self, user_id: str, is_admin: bool) -> bool:
+        """Grant or revoke admin rights; cached bearer-token users are dropped."""
+        async with get_db_connection(self.db_path) as conn:
+            cursor = await conn.execute(
+                "UPDATE api_users SET is_admin = ? WHERE user_id = ?",
+                (int(is_admin), user_id),
+            )
+            await conn.commit()
+        await get_user_cache().invalidate(user_id=user_id)
+        return cursor.rowcount > 0
+
     async def get_or_create_wallet_user(self, wallet_address: str) -> User:
         """Get existing user or create new one from wallet address."""
         user = await self.get_user_by_wallet(wallet_address)
@@ -455,12 +470,16 @@ async def revoke_refresh_token(token: str) -> bool:
             UPDATE refresh_tokens
             SET revoked = 1
             WHERE token_hash = ?
+            RETURNING user_id
             """,
             (token_hash,),
         )
+        rows = await cursor.fetchall()
         await conn.commit()
 
-    return cursor.rowcount > 0
+    for (user_id,) in rows:
+        await get_user_cache().invalidate(user_id=user_id)
+    return bool(rows)
 
 
 async def revoke_all_user_refresh_tokens(user_id: str) -> int:
@@ -476,6 +495,7 @@ async def revoke_all_user_refresh_tokens(user_id: str) -> int:
         )
         await conn.commit()
 
+    await get_user_cache().invalidate(user_id=user_id)
     return cursor.rowcount or 0
 
 
@@ -490,15 +510,24 @@ async def decode_access_token(token: str) -> User:
     if not isinstance(wallet_address, str):
         raise ValueError("Token missing subject")
 
+    user_id = payload.get("uid")
+    cache = get_user_cache()
+    cache_key = user_cache_key(
+        user_id=user_id if isinstance(user_id, str) else None, wallet_address=wallet_address
+    )
+    user = await cache.get(cache_key)
+    if user is not None:
+        return user
+
     store = await get_user_store()
     user = await store.get_user_by_wallet(wallet_address)
     if not user:
         # Try by user_id for backward compatibility
-        user_id = payload.get("uid")
         if user_id:
             user = await store.get_user_by_id(user_id)
     if not user:
         raise ValueError("User not found")
+    await cache.put(cache_key, user)
     return user
 
 
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import os
 import secrets
-from typing import Callable
+from http.cookies import SimpleCookie
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # CSRF configuration
 CSRF_COOKIE_NAME = "sam_csrf_token"
@@ -47,72 +49,86 @@ def generate_csrf_token() -> str:
     return secrets.token_urlsafe(32)
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
+def _csrf_cookie_header() -> str:
+    """``Set-Cookie`` value carrying a fresh CSRF token."""
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[CSRF_COOKIE_NAME] = generate_csrf_token()
+    morsel = cookie[CSRF_COOKIE_NAME]
+    morsel["max-age"] = CSRF_COOKIE_MAX_AGE
+    morsel["path"] = "/"
+    morsel["samesite"] = CSRF_COOKIE_SAMESITE
+    # Not HttpOnly: must be readable by JavaScript
+    if CSRF_COOKIE_SECURE:
+        morsel["secure"] = True
+    return cookie.output(header="").strip()
+
+
+def _forbidden(detail: str) -> Response:
+    return Response(
+        content=f'{{"detail": "{detail}"}}',
+        status_code=403,
+        media_type="application/json",
+    )
+
+
+class CSRFMiddleware:
     """CSRF protection using double-submit cookie pattern.
 
     This middleware:
     1. Sets a CSRF token in a non-HttpOnly cookie (readable by JavaScript)
     2. Requires the token to be sent in X-CSRF-Token header for state-changing requests
     3. Verifies the cookie and header values match
+
+    Implemented as plain ASGI: the cookie is added to the response start
+    message and the body (including SSE streams) passes through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Skip CSRF check for safe methods
-        if request.method not in PROTECTED_METHODS:
-            response = await call_next(request)
-            # Ensure CSRF cookie is set for GET requests
-            self._ensure_csrf_cookie(request, response)
-            return response
-
-        # Skip CSRF check for exempt routes
-        if request.url.path in EXEMPT_ROUTES:
-            response = await call_next(request)
-            # Set CSRF cookie on login/register responses
-            self._ensure_csrf_cookie(request, response)
-            return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        # Safe methods and exempt routes (login/register) get a CSRF cookie
+        if scope["method"] not in PROTECTED_METHODS or path in EXEMPT_ROUTES:
+            if HTTPConnection(scope).cookies.get(CSRF_COOKIE_NAME):
+                await self.app(scope, receive, send)
+            else:
+                await self.app(scope, receive, self._with_csrf_cookie(send))
+            return
 
         # Skip CSRF check for exempt prefixes (dynamic routes)
-        if request.url.path.startswith(EXEMPT_PREFIXES):
-            response = await call_next(request)
-            return response
+        if path.startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
 
         # Validate CSRF token for state-changing requests
-        csrf_cookie = request.cookies.get(CSRF_COOKIE_NAME)
-        csrf_header = request.headers.get(CSRF_HEADER_NAME)
+        conn = HTTPConnection(scope)
+        csrf_cookie = conn.cookies.get(CSRF_COOKIE_NAME)
+        csrf_header = conn.headers.get(CSRF_HEADER_NAME)
 
         if not csrf_cookie or not csrf_header:
-            return Response(
-                content='{"detail": "CSRF token missing"}',
-                status_code=403,
-                media_type="application/json",
-            )
+            await _forbidden("CSRF token missing")(scope, receive, send)
+            return
 
         # Constant-time comparison to prevent timing attacks
         if not secrets.compare_digest(csrf_cookie, csrf_header):
-            return Response(
-                content='{"detail": "CSRF token invalid"}',
-                status_code=403,
-                media_type="application/json",
-            )
-
-        response = await call_next(request)
-        return response
-
-    def _ensure_csrf_cookie(self, request: Request, response: Response) -> None:
-        """Ensure CSRF cookie is set, generating a new one if needed."""
-        existing_token = request.cookies.get(CSRF_COOKIE_NAME)
-
-        if not existing_token:
-            token = generate_csrf_token()
-            response.set_cookie(
-                key=CSRF_COOKIE_NAME,
-                value=token,
-                max_age=CSRF_COOKIE_MAX_AGE,
-                httponly=False,  # Must be readable by JavaScript
-                secure=CSRF_COOKIE_SECURE,
-                samesite=CSRF_COOKIE_SAMESITE,
-                path="/",
-            )
+            await _forbidden("CSRF token invalid")(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _with_csrf_cookie(send: Send) -> Send:
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("set-cookie", _csrf_cookie_header())
+            await send(message)
+
+        return send_with_cookie
 
 
 __all__ = ["CSRFMiddleware", "CSRF_COOKIE_NAME", "CSRF_HEADER_NAME"]
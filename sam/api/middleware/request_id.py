@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import uuid
 from contextvars import ContextVar
-from typing import Callable, Optional
+from typing import Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable to store request ID for the current request
 # This allows access to the request ID from anywhere in the application
@@ -36,7 +36,7 @@ def generate_request_id() -> str:
     return str(uuid.uuid4())
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """Middleware that adds a unique request ID to each request.
 
     This middleware:
@@ -50,29 +50,37 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     - Log correlation
     - Debugging and troubleshooting
     - Audit trails
+
+    Implemented as plain ASGI so streaming responses are not buffered through
+    an extra task; the header is added to the response start message.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get existing request ID from header or generate new one
-        request_id = request.headers.get(REQUEST_ID_HEADER)
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
 
         if not request_id:
             request_id = generate_request_id()
 
+        # Store in request state for easy access (request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[RESPONSE_ID_HEADER] = request_id
+            await send(message)
+
         # Store in context for access throughout the request
         token = request_id_ctx.set(request_id)
-
         try:
-            # Store in request state for easy access
-            request.state.request_id = request_id
-
-            # Process the request
-            response = await call_next(request)
-
-            # Add request ID to response headers
-            response.headers[RESPONSE_ID_HEADER] = request_id
-
-            return response
+            await self.app(scope, receive, send_with_request_id)
         finally:
             # Reset context variable
             request_id_ctx.reset(token)
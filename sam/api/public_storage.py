@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
 import secrets
 import uuid
 from dataclasses import dataclass
@@ -26,13 +29,15 @@ class PublicAgentEntry:
     download_count: int
     created_at: datetime
     updated_at: datetime
-    # Computed fields (not stored directly)
+    # Derived from the rating_sum/rating_count aggregates maintained by add_rating
     rating: Optional[float] = None
     rating_count: int = 0
 
     @classmethod
     def from_row(cls, row: tuple) -> "PublicAgentEntry":
-        """Create entry from database row."""
+        """Create entry from database row (``_ENTRY_COLUMNS`` order)."""
+        rating_sum = row[10] if len(row) > 10 else 0
+        rating_count = row[11] if len(row) > 11 else 0
         return cls(
             id=row[0],
             public_id=row[1],
@@ -44,6 +49,8 @@ class PublicAgentEntry:
             download_count=row[7],
             created_at=datetime.fromisoformat(row[8]),
             updated_at=datetime.fromisoformat(row[9]),
+            rating=round(rating_sum / rating_count, 2) if rating_count else None,
+            rating_count=rating_count,
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -89,6 +96,36 @@ class AgentRating:
         )
 
 
+_ENTRY_COLUMNS = """
+    id, public_id, user_id, agent_name, visibility, share_token,
+    published_at, download_count, created_at, updated_at, rating_sum, rating_count
+"""
+
+# Sort key per marketplace sort order; each matches an index from migration 16.
+# Unrated agents rank as 0 so rating stays comparable for keyset pagination.
+_SORT_KEYS = {
+    "popular": "download_count",
+    "recent": "published_at",
+    "rating": "(rating_sum * 1.0 / MAX(rating_count, 1))",
+}
+
+
+def _encode_cursor(sort_key: Any, entry_id: int) -> str:
+    raw = json.dumps([sort_key, entry_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, entry_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(entry_id, int) or isinstance(sort_key, (list, dict, bool)):
+        raise ValueError("Invalid pagination cursor")
+    return sort_key, entry_id
+
+
 def _generate_public_id() -> str:
     """Generate a unique public ID for an agent."""
     return str(uuid.uuid4())[:8]
@@ -250,76 +287,40 @@ class PublicAgentStorage:
         """Get a public agent entry by its public ID."""
         async with get_db_connection(self.db_path) as conn:
             cursor = await conn.execute(
-                """
-                SELECT id, public_id, user_id, agent_name, visibility, share_token,
-                       published_at, download_count, created_at, updated_at
-                FROM public_agents
-                WHERE public_id = ?
-                """,
+                f"SELECT {_ENTRY_COLUMNS} FROM public_agents WHERE public_id = ?",
                 (public_id,),
             )
             row = await cursor.fetchone()
             if not row:
                 return None
 
-            entry = PublicAgentEntry.from_row(row)
-
-            # Get rating info
-            rating_info = await self._get_rating_info(conn, public_id)
-            entry.rating = rating_info[0]
-            entry.rating_count = rating_info[1]
-
-            return entry
+            return PublicAgentEntry.from_row(row)
 
     async def get_by_share_token(self, share_token: str) -> Optional[PublicAgentEntry]:
         """Get a public agent entry by its share token."""
         async with get_db_connection(self.db_path) as conn:
             cursor = await conn.execute(
-                """
-                SELECT id, public_id, user_id, agent_name, visibility, share_token,
-                       published_at, download_count, created_at, updated_at
-                FROM public_agents
-                WHERE share_token = ?
-                """,
+                f"SELECT {_ENTRY_COLUMNS} FROM public_agents WHERE share_token = ?",
                 (share_token,),
             )
             row = await cursor.fetchone()
             if not row:
                 return None
 
-            entry = PublicAgentEntry.from_row(row)
-
-            # Get rating info
-            rating_info = await self._get_rating_info(conn, entry.public_id)
-            entry.rating = rating_info[0]
-            entry.rating_count = rating_info[1]
-
-            return entry
+            return PublicAgentEntry.from_row(row)
 
     async def get_for_agent(self, user_id: str, agent_name: str) -> Optional[PublicAgentEntry]:
         """Get public agent entry for a specific user's agent."""
         async with get_db_connection(self.db_path) as conn:
             cursor = await conn.execute(
-                """
-                SELECT id, public_id, user_id, agent_name, visibility, share_token,
-                       published_at, download_count, created_at, updated_at
-                FROM public_agents
-                WHERE user_id = ? AND agent_name = ?
-                """,
+                f"SELECT {_ENTRY_COLUMNS} FROM public_agents WHERE user_id = ? AND agent_name = ?",
                 (user_id, agent_name),
             )
             row = await cursor.fetchone()
             if not row:
                 return None
 
-            entry = PublicAgentEntry.from_row(row)
-
-            # Get rating info
-            rating_info = await self._get_rating_info(conn, entry.public_id)
-            entry.rating = rating_info[0]
-            entry.rating_count = rating_info[1]
-
-            return entry
+            return PublicAgentEntry.from_row(row)
 
     async def list_public_agents(
         self,
@@ -329,20 +330,25 @@ class PublicAgentStorage:
         tags: Optional[List[str]] = None,
         sort: Literal["popular", "recent", "rating"] = "popular",
         exclude_user_id: Optional[str] = None,
-    ) -> Tuple[List[PublicAgentEntry], int]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[PublicAgentEntry], int, Optional[str]]:
         """
-        List public agents for the marketplace.
+        List public agents for the marketplace in a single query.
 
         Args:
             limit: Maximum number of results
-            offset: Pagination offset
+            offset: Pagination offset (prefer ``cursor`` for deep pages)
             search: Search query for agent name
             tags: Filter by tags (not implemented yet - requires agent definition lookup)
             sort: Sort order - 'popular', 'recent', or 'rating'
             exclude_user_id: Exclude agents from this user
+            cursor: Keyset cursor returned with the previous page
 
         Returns:
-            Tuple of (list of entries, total count)
+            Tuple of (list of entries, total count, cursor for the next page or None)
+
+        Raises:
+            ValueError: If ``cursor`` is malformed
         """
         # Build query
         where_clauses = ["visibility = 'public'"]
@@ -357,49 +363,47 @@ class PublicAgentStorage:
             params.append(exclude_user_id)
 
         where_sql = " AND ".join(where_clauses)
+        sort_sql = _SORT_KEYS.get(sort, _SORT_KEYS["popular"])
 
-        # Determine sort
-        if sort == "recent":
-            order_sql = "published_at DESC"
-        elif sort == "rating":
-            # Will need subquery for rating
-            order_sql = "download_count DESC"  # Fallback for now
-        else:  # popular
-            order_sql = "download_count DESC"
+        page_where = where_sql
+        page_params = list(params)
+        if cursor:
+            # Keyset pagination: continue strictly after the previous page's last row
+            page_where += f" AND ({sort_sql}, id) < (?, ?)"
+            page_params.extend(_decode_cursor(cursor))
 
         async with get_db_connection(self.db_path) as conn:
-            # Get total count
-            count_cursor = await conn.execute(
-                f"SELECT COUNT(*) FROM public_agents WHERE {where_sql}",
-                params,
-            )
-            count_row = await count_cursor.fetchone()
-            total_count = count_row[0] if count_row else 0
-
-            # Get entries
-            cursor = await conn.execute(
+            # The count rides along with the page (and still arrives for empty pages)
+            cursor_obj = await conn.execute(
                 f"""
-                SELECT id, public_id, user_id, agent_name, visibility, share_token,
-                       published_at, download_count, created_at, updated_at
-                FROM public_agents
-                WHERE {where_sql}
-                ORDER BY {order_sql}
-                LIMIT ? OFFSET ?
+                SELECT t.total, p.*
+                FROM (SELECT COUNT(*) AS total FROM public_agents WHERE {where_sql}) AS t
+                LEFT JOIN (
+                    SELECT {_ENTRY_COLUMNS}, {sort_sql} AS sort_key
+                    FROM public_agents
+                    WHERE {page_where}
+                    ORDER BY sort_key DESC, id DESC
+                    LIMIT ? OFFSET ?
+                ) AS p ON 1
+                ORDER BY p.sort_key DESC, p.id DESC
                 """,
-                params + [limit, offset],
+                params + page_params + [limit, offset],
             )
-            rows = await cursor.fetchall()
-
-            entries = []
-            for row in rows:
-                entry = PublicAgentEntry.from_row(row)
-                # Get rating info
-                rating_info = await self._get_rating_info(conn, entry.public_id)
-                entry.rating = rating_info[0]
-                entry.rating_count = rating_info[1]
-                entries.append(entry)
-
-            return entries, total_count
+            rows = await cursor_obj.fetchall()
+
+        total_count = rows[0][0] if rows else 0
+        entries: List[PublicAgentEntry] = []
+        sort_keys: List[Any] = []
+        for row in rows:
+            if row[1] is None:
+                continue
+            entries.append(PublicAgentEntry.from_row(row[1:13]))
+            sort_keys.append(row[13])
+
+        next_cursor = None
+        if entries and len(entries) == limit:
+            next_cursor = _encode_cursor(sort_keys[-1], entries[-1].id)
+        return entries, total_count, next_cursor
 
     async def increment_download_count(self, public_id: str) -> bool:
         """Increment the download count for an agent."""
@@ -441,6 +445,22 @@ class PublicAgentStorage:
         now = datetime.now(timezone.utc).isoformat()
 
         async with get_db_connection(self.db_path) as conn:
+            # Apply the change to the aggregates first: this write takes the database
+            # lock, so the old rating read here can't change before the upsert commits
+            await conn.execute(
+                """
+                UPDATE public_agents SET
+                    rating_sum = rating_sum + ? - COALESCE(
+                        (SELECT rating FROM agent_ratings WHERE public_id = ? AND user_id = ?),
+                        0
+                    ),
+                    rating_count = rating_count + NOT EXISTS(
+                        SELECT 1 FROM agent_ratings WHERE public_id = ? AND user_id = ?
+                    )
+                WHERE public_id = ?
+                """,
+                (rating, public_id, user_id, public_id, user_id, public_id),
+            )
             # Upsert rating
             await conn.execute(
                 """
@@ -513,55 +533,30 @@ class PublicAgentStorage:
 
             return ratings, total_count
 
-    async def _get_rating_info(self, conn: Any, public_id: str) -> Tuple[Optional[float], int]:
-        """Get average rating and count for an agent."""
-        cursor = await conn.execute(
-            """
-            SELECT AVG(rating), COUNT(*)
-            FROM agent_ratings
-            WHERE public_id = ?
-            """,
-            (public_id,),
-        )
-        row = await cursor.fetchone()
-        if row and row[1] > 0:
-            return (round(row[0], 2), row[1])
-        return (None, 0)
-
     async def get_marketplace_stats(self) -> "MarketplaceStats":
-        """Get overall marketplace statistics."""
+        """Get overall marketplace statistics from the maintained aggregates."""
         async with get_db_connection(self.db_path) as conn:
-            # Total public agents
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM public_agents WHERE visibility = 'public'"
-            )
-            row = await cursor.fetchone()
-            total_public = row[0] if row else 0
-
-            # Average rating across all rated agents
             cursor = await conn.execute(
                 """
-                SELECT AVG(rating), COUNT(DISTINCT public_id)
-                FROM agent_ratings
+                SELECT
+                    COALESCE(SUM(visibility = 'public'), 0),
+                    COALESCE(SUM(rating_sum), 0),
+                    COALESCE(SUM(rating_count), 0),
+                    COALESCE(SUM(rating_count > 0), 0),
+                    COALESCE(SUM(download_count), 0)
+                FROM public_agents
                 """
             )
             row = await cursor.fetchone()
-            avg_rating = round(row[0], 2) if row and row[0] else None
-            rated_agents = row[1] if row else 0
 
-            # Total downloads
-            cursor = await conn.execute(
-                "SELECT COALESCE(SUM(download_count), 0) FROM public_agents"
-            )
-            row = await cursor.fetchone()
-            total_downloads = row[0] if row else 0
-
-            return MarketplaceStats(
-                total_public_agents=total_public,
-                average_rating=avg_rating,
-                rated_agents=rated_agents,
-                total_downloads=total_downloads,
-            )
+        # Aggregates without GROUP BY always return exactly one row
+        total_public, rating_sum, rating_count, rated_agents, total_downloads = row
+        return MarketplaceStats(
+            total_public_agents=total_public,
+            average_rating=round(rating_sum / rating_count, 2) if rating_count else None,
+            rated_agents=rated_agents,
+            total_downloads=total_downloads,
+        )
 
 
 @dataclass
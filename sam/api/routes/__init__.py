@@ -2,13 +2,14 @@
 
 from fastapi import FastAPI
 
-from . import agents, auth, health, onboarding, public_agents, secrets, sessions, users
+from . import agents, auth, health, metrics, onboarding, public_agents, secrets, sessions, users
 
 
 def register_routes(app: FastAPI) -> None:
     """Attach all API routers to the provided FastAPI instance."""
 
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(auth.router)
     app.include_router(onboarding.router)
     # IMPORTANT: public_agents must come BEFORE agents to avoid /{name} matching /public
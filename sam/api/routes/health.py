@@ -9,6 +9,8 @@ from typing import Optional
 from fastapi import APIRouter
 
 from ...config.settings import Settings
+from ...integrations.solana.rpc_router import get_rpc_router_health
+from ...utils.http_client import get_http_host_stats
 from ..public_storage import get_public_storage
 
 router = APIRouter(prefix="", tags=["health"])
@@ -26,8 +28,8 @@ async def _get_marketplace_stats() -> Optional[dict[str, int]]:
     """Get marketplace statistics for health check."""
     try:
         storage = get_public_storage(Settings.SAM_DB_PATH)
-        _, total = await storage.list_public_agents(limit=0, offset=0)
-        return {"public_agents": total}
+        stats = await storage.get_marketplace_stats()
+        return {"public_agents": stats.total_public_agents}
     except Exception as e:
         logger.debug("Failed to get marketplace stats: %s", e)
         return None
@@ -41,6 +43,8 @@ async def health_status() -> dict[str, object]:
         "version": _package_version(),
         "llm_provider": Settings.LLM_PROVIDER,
         "marketplace": marketplace,
+        "solana_rpc": get_rpc_router_health(),
+        "http_hosts": get_http_host_stats(),
     }
 
 
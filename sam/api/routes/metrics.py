@@ -0,0 +1,29 @@
+"""Prometheus metrics endpoint."""
+
+from __future__ import annotations
+
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ...config.settings import Settings
+from ...utils.prometheus import CONTENT_TYPE, render_metrics
+
+router = APIRouter(prefix="", tags=["metrics"])
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics(authorization: Optional[str] = Header(default=None)) -> PlainTextResponse:
+    token = Settings.SAM_API_METRICS_TOKEN
+    if token and not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(await render_metrics(), media_type=CONTENT_TYPE)
+
+
+__all__ = ["router"]
@@ -49,6 +49,7 @@ async def list_public_agents(
     offset: int = Query(default=0, ge=0),
     search: Optional[str] = Query(default=None, max_length=100),
     sort: Literal["popular", "recent", "rating"] = Query(default="popular"),
+    cursor: Optional[str] = Query(default=None, max_length=200),
     user: Optional[APIUser] = Depends(get_current_user_optional),
 ) -> PublicAgentsListResponse:
     """
@@ -58,19 +59,24 @@ async def list_public_agents(
     - **offset**: Pagination offset
     - **search**: Search query for agent name
     - **sort**: Sort order - 'popular', 'recent', or 'rating'
+    - **cursor**: `next_cursor` from the previous page (faster than offset)
     """
     storage = _get_storage()
 
     # Optionally exclude current user's agents from results
     exclude_user = user.user_id if user else None
 
-    entries, total = await storage.list_public_agents(
-        limit=limit,
-        offset=offset,
-        search=search,
-        sort=sort,
-        exclude_user_id=exclude_user,
-    )
+    try:
+        entries, total, next_cursor = await storage.list_public_agents(
+            limit=limit,
+            offset=offset,
+            search=search,
+            sort=sort,
+            exclude_user_id=exclude_user,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     # Convert to response items with agent definitions for description/tags
     items: List[PublicAgentListItem] = []
@@ -107,6 +113,7 @@ async def list_public_agents(
         total=total,
         limit=limit,
         offset=offset,
+        next_cursor=next_cursor,
     )
 
 
@@ -383,6 +383,8 @@ class PublicAgentsListResponse(BaseModel):
     total: int = 0
     limit: int = 20
     offset: int = 0
+    # Pass as ``cursor`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 __all__ = [
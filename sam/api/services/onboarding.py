@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Optional
 
 from ...utils.connection_pool import get_db_connection
 from ...utils.crypto import decrypt_private_key, encrypt_private_key
+from ...utils.secret_cache import get_secret_cache
 from ...utils.wallets import generate_solana_wallet
 from ..dependencies import APIUser
 from ..schemas import (
@@ -138,7 +140,15 @@ class OnboardingService:
         """Get decrypted operational wallet private key for Solana operations.
 
         This is used internally by the trading/agent system, never exposed via API.
+        Kept briefly in the in-memory secret cache so repeated agent builds
+        don't decrypt it each time.
         """
+        cache = get_secret_cache()
+        cached = cache.get(user_id, scope="operational_wallet")
+        if cached is not None:
+            return cached.get("solana", {}).get("private_key")
+        version = cache.version(user_id)
+
         async with get_db_connection(self.db_path) as conn:
             cursor = await conn.execute(
                 "SELECT encrypted_private_key FROM operational_wallets WHERE user_id = ?",
@@ -146,10 +156,14 @@ class OnboardingService:
             )
             row = await cursor.fetchone()
 
-        if not row:
-            return None
-
-        return decrypt_private_key(row[0])
+        private_key = await asyncio.to_thread(decrypt_private_key, row[0]) if row else None
+        cache.put(
+            user_id,
+            {"solana": {"private_key": private_key}} if private_key else {},
+            version,
+            scope="operational_wallet",
+        )
+        return private_key
 
     async def get_operational_wallet_address(self, user_id: str) -> Optional[str]:
         """Get operational wallet public address."""
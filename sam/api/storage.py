@@ -18,7 +18,7 @@ from typing import List, Optional
 import tomli_w
 
 from ..agents.definition import AgentDefinition
-from ..agents.manager import find_agent_definition, list_agent_definitions
+from ..agents.manager import get_agent_index
 from ..config.settings import Settings
 from .db_storage import get_agent_db_storage
 from .utils import get_user_agents_dir, sanitize_agent_name
@@ -42,18 +42,17 @@ def _use_database_storage() -> bool:
 
 def _list_user_definitions_file(user_id: str) -> List[AgentDefinition]:
     """List agents from file storage."""
-    directory = get_user_agents_dir(user_id)
-    return list_agent_definitions(directory=directory)
+    return get_agent_index(get_user_agents_dir(user_id)).definitions()
 
 
 def _load_user_definition_file(user_id: str, name: str) -> Optional[AgentDefinition]:
     """Load agent from file storage."""
-    directory = get_user_agents_dir(user_id)
-    result = find_agent_definition(name, directory=directory)
+    index = get_agent_index(get_user_agents_dir(user_id))
+    result = index.get(name)
     if result is None:
         sanitized = sanitize_agent_name(name)
         if sanitized != name:
-            result = find_agent_definition(sanitized, directory=directory)
+            result = index.get(sanitized)
     return result
 
 
@@ -66,6 +65,7 @@ def _save_user_definition_file(user_id: str, definition: AgentDefinition) -> Pat
     payload = _definition_to_dict(definition)
     toml_text = tomli_w.dumps(payload)
     path.write_text(toml_text, encoding="utf-8")
+    get_agent_index(directory).invalidate(filename)
     definition.path = path
     return path
 
@@ -79,6 +79,7 @@ def _delete_user_definition_file(user_id: str, name: str) -> bool:
             candidate = directory / f"{try_name}{suffix}"
             if candidate.exists():
                 candidate.unlink()
+                get_agent_index(directory).invalidate(candidate.name)
                 return True
     return False
 
@@ -274,7 +275,7 @@ async def count_user_agents_async(user_id: str) -> int:
     """
     if _use_database_storage():
         return await _count_user_agents_db(user_id)
-    return len(_list_user_definitions_file(user_id))
+    return get_agent_index(get_user_agents_dir(user_id)).count()
 
 
 __all__ = [
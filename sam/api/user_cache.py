@@ -0,0 +1,162 @@
+"""Short-lived cache of users resolved from bearer tokens.
+
+``decode_access_token`` used to look the user up in SQLite on every
+authenticated request. Resolved users are kept here for
+``SAM_API_USER_CACHE_TTL`` seconds, keyed by the token's ``uid`` claim (or its
+subject for tokens without one). Entries are dropped when a user's refresh
+tokens are revoked or their account changes, so revocation and admin changes
+take effect immediately rather than after the TTL.
+
+With ``SAM_REDIS_URL`` set the entries live in Redis (via :mod:`sam.cache`), so
+every worker sees the same entries and the same invalidations.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from ..config.settings import Settings
+
+if TYPE_CHECKING:
+    from .auth import User
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "auth:user:"
+
+
+def user_cache_key(*, user_id: Optional[str] = None, wallet_address: Optional[str] = None) -> str:
+    if user_id:
+        return f"uid:{user_id}"
+    return f"sub:{wallet_address}"
+
+
+class UserCache:
+    """Bounded TTL cache of :class:`~sam.api.auth.User` records."""
+
+    def __init__(
+        self, ttl: float = 60.0, max_entries: int = 10000, redis_url: Optional[str] = None
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self._entries: OrderedDict[str, Tuple[User, float]] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def _shared(self) -> Any:
+        from ..cache.engine import get_cache
+
+        return await get_cache(self.redis_url)
+
+    async def get(self, key: str) -> Optional[User]:
+        if not self.enabled:
+            return None
+        if self.redis_url:
+            user = await self._get_shared(key)
+        else:
+            user = self._get_local(key)
+        self._stats["hits" if user is not None else "misses"] += 1
+        return user
+
+    def _get_local(self, key: str) -> Optional[User]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        user, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user
+
+    async def _get_shared(self, key: str) -> Optional[User]:
+        from .auth import User
+
+        try:
+            data = await (await self._shared()).get(_KEY_PREFIX + key)
+        except Exception as exc:
+            logger.warning(f"User cache read failed: {exc}")
+            return None
+        if not isinstance(data, dict):
+            return None
+        try:
+            return User(**data)
+        except TypeError:
+            return None
+
+    async def put(self, key: str, user: User) -> None:
+        if not self.enabled:
+            return
+        if self.redis_url:
+            try:
+                await (await self._shared()).set(
+                    _KEY_PREFIX + key, asdict(user), ttl=max(1, int(self.ttl))
+                )
+            except Exception as exc:
+                logger.warning(f"User cache write failed: {exc}")
+            return
+        self._entries[key] = (user, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(
+        self, *, user_id: Optional[str] = None, wallet_address: Optional[str] = None
+    ) -> None:
+        """Drop the cached user under either key."""
+        keys = [
+            user_cache_key(user_id=user_id) if user_id else None,
+            user_cache_key(wallet_address=wallet_address) if wallet_address else None,
+        ]
+        for key in filter(None, keys):
+            self._stats["invalidations"] += 1
+            self._entries.pop(key, None)
+            if self.redis_url:
+                try:
+                    await (await self._shared()).delete(_KEY_PREFIX + key)
+                except Exception as exc:
+                    logger.warning(f"User cache invalidation failed: {exc}")
+        if user_id and not self.redis_url:
+            # Subject-keyed entries of the same user (tokens without a uid claim)
+            for key in [k for k, (u, _) in self._entries.items() if u.user_id == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "backend": "redis" if self.redis_url else "memory",
+        }
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    """Process-wide user cache configured from Settings."""
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(
+            ttl=float(Settings.SAM_API_USER_CACHE_TTL), redis_url=Settings.SAM_REDIS_URL
+        )
+    return _user_cache
+
+
+def reset_user_cache() -> None:
+    """Forget the process-wide cache (tests, settings reload)."""
+    global _user_cache
+    _user_cache = None
+
+
+__all__ = ["UserCache", "get_user_cache", "reset_user_cache", "user_cache_key"]
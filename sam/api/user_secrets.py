@@ -6,13 +6,15 @@ Each user can only access their own secrets.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from cryptography.fernet import Fernet
 
 from ..config.settings import Settings
 from ..db import get_engine
+from ..utils.secret_cache import get_secret_cache
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,12 @@ class UserSecretsStore:
         except Exception:
             return value
 
+    def _decrypt_rows(self, rows: Iterable[Tuple[str, str, str]]) -> Dict[str, Dict[str, str]]:
+        secrets: Dict[str, Dict[str, str]] = {}
+        for integration, field, value in rows:
+            secrets.setdefault(integration, {})[field] = self._decrypt(value)
+        return secrets
+
     async def _ensure_table(self) -> None:
         """Ensure the user_secrets table exists."""
         db = await get_engine()
@@ -86,6 +94,7 @@ class UserSecretsStore:
                     (user_id, integration, field, encrypted, encrypted),
                 )
                 await conn.commit()
+            get_secret_cache().invalidate(user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to set secret: {e}")
@@ -126,6 +135,7 @@ class UserSecretsStore:
                     (user_id, integration, field),
                 )
                 await conn.commit()
+            get_secret_cache().invalidate(user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to delete secret: {e}")
@@ -145,6 +155,7 @@ class UserSecretsStore:
                     (user_id, integration),
                 )
                 await conn.commit()
+            get_secret_cache().invalidate(user_id)
             return True
         except Exception as e:
             logger.error(f"Failed to delete integration secrets: {e}")
@@ -188,21 +199,36 @@ class UserSecretsStore:
             logger.error(f"Failed to get secret statuses: {e}")
             return []
 
-    async def get_integration_secrets(self, user_id: str, integration: str) -> Dict[str, str]:
-        """Get all secrets for an integration (for use by tools)."""
+    async def get_user_secrets(self, user_id: str) -> Dict[str, Dict[str, str]]:
+        """Get all of a user's secrets as integration -> {field -> value}.
+
+        Loaded with one query and decrypted off the event loop, then served
+        from the in-memory secret cache until it expires or a write lands.
+        """
+        cache = get_secret_cache()
+        cached = cache.get(user_id)
+        if cached is not None:
+            return cached
+        version = cache.version(user_id)
         try:
             await self._ensure_table()
             db = await get_engine()
             async with db.connection() as conn:
                 cursor = await conn.execute(
                     """
-                    SELECT field, encrypted_value FROM user_secrets
-                    WHERE user_id = ? AND integration = ?
+                    SELECT integration, field, encrypted_value FROM user_secrets
+                    WHERE user_id = ?
                     """,
-                    (user_id, integration),
+                    (user_id,),
                 )
                 rows = await cursor.fetchall()
-                return {row[0]: self._decrypt(row[1]) for row in rows}
         except Exception as e:
-            logger.error(f"Failed to get integration secrets: {e}")
+            logger.error(f"Failed to get user secrets: {e}")
             return {}
+        secrets = await asyncio.to_thread(self._decrypt_rows, rows)
+        cache.put(user_id, secrets, version)
+        return secrets
+
+    async def get_integration_secrets(self, user_id: str, integration: str) -> Dict[str, str]:
+        """Get all secrets for an integration (for use by tools)."""
+        return (await self.get_user_secrets(user_id)).get(integration, {})
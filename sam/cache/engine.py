@@ -7,7 +7,7 @@ import logging
 import os
 from typing import Optional
 
-from .base import CacheBackend
+from .base import CacheBackend, CacheStats
 from .memory import MemoryCacheBackend
 
 logger = logging.getLogger(__name__)
@@ -141,6 +141,13 @@ async def get_cache(redis_url: Optional[str] = None) -> CacheEngine:
         return _cache
 
 
+async def get_cache_stats() -> Optional[CacheStats]:
+    """Stats of the global cache engine, or None when it is not initialized."""
+    if _cache is None or not _cache._initialized:
+        return None
+    return await _cache.backend.get_stats()
+
+
 async def cleanup_cache() -> None:
     """Cleanup the global cache engine."""
     global _cache, _cache_lock
@@ -27,7 +27,7 @@ except ImportError:
     pass  # Fallback to standard asyncio
 
 from .core.agent import SAMAgent
-from .core.builder import cleanup_agent_fast
+from .core.builder import shutdown_shared_resources
 from .core.agent_factory import AgentFactory, get_default_factory
 from .core.context import RequestContext
 from .config.plugin_policy import PluginPolicy, load_allowlist_document
@@ -386,8 +386,8 @@ async def cleanup_agent(
         await active_factory.clear(active_context)
     except Exception:
         pass
-    # Also run shared cleanup (HTTP client, DB pool, rate limiter, price service)
-    await cleanup_agent_fast()
+    # The CLI exits after this: also release process-wide resources (RPC routers, pools)
+    await shutdown_shared_resources()
 
 
 async def run_interactive_session(
@@ -1920,6 +1920,18 @@ async def main() -> int:
         print(f"  - SAM_PLUGINS: {env_plugins or 'unset'}")
         print(f"  - SAM_MEMORY_BACKEND: {env_mem or 'unset'}")
 
+        from .config.config_loader import get_config_stats
+
+        snapshot_stats = get_config_stats()
+        timings = snapshot_stats["timings"]
+        print(" Config snapshot:")
+        print(f"  - Source: {snapshot_stats['source'] or 'none'}")
+        print(
+            f"  - Built {snapshot_stats['builds']}x, reused {snapshot_stats['hits']}x "
+            f"(config {timings.get('config_ms', 0)} ms, "
+            f"entry points {timings.get('entry_points_ms', 0)} ms)"
+        )
+
         # Middlewares (best-effort introspection)
         print(colorize("\n🧩 Middlewares", Style.BOLD, Style.FG_CYAN))
         try:
@@ -7,10 +7,6 @@ import logging
 import sys
 from getpass import getpass
 
-import uvicorn
-
-from ..api import create_app
-
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +14,10 @@ async def run_api_server(
     host: str, port: int, reload: bool = False, log_level: str = "info"
 ) -> int:
     """Launch the FastAPI server with uvicorn."""
+    # Imported here so other CLI commands don't load the API stack
+    import uvicorn
+
+    from ..api import create_app
 
     config = uvicorn.Config(  # type: ignore[arg-type]
         create_app,
@@ -7,6 +7,7 @@ import os
 
 from ..config.settings import Settings
 from ..core.backup import BackupManager
+from ..utils.executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ async def create_backup(label: str | None = None) -> int:
     """
     try:
         manager = BackupManager(Settings.SAM_DB_PATH)
-        backup_path, filename = manager.create_backup(label=label)
+        backup_path, filename = await run_blocking("sqlite", manager.create_backup, label=label)
 
         print(f"✓ Backup created: {filename}")
         print(f"  Path: {backup_path}")
@@ -82,7 +83,7 @@ async def restore_backup(backup_path: str, force: bool = False) -> int:
                 print("Restore cancelled.")
                 return 0
 
-        manager.restore_backup(backup_path, force=force)
+        await run_blocking("sqlite", manager.restore_backup, backup_path, force=force)
         print(f"✓ Database restored from: {os.path.basename(backup_path)}")
         return 0
 
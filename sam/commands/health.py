@@ -57,10 +57,30 @@ async def run_health_check() -> int:
             stats = await tracker.get_error_stats(24)
             return {"recent_errors": stats.get("total_errors", 0)}
 
+        async def solana_rpc_health() -> Dict[str, Any]:
+            from ..integrations.solana.rpc_router import get_rpc_router
+
+            router = get_rpc_router([Settings.SAM_SOLANA_RPC_URL, *Settings.SAM_SOLANA_RPC_URLS])
+            try:
+                snapshot = await router.probe()
+            finally:
+                await router.close()
+            details: Dict[str, Any] = {"preferred": snapshot["preferred"]}
+            for endpoint in snapshot["endpoints"]:
+                latency = endpoint["ewma_latency_ms"]
+                details[endpoint["endpoint"]] = (
+                    f"{endpoint['state']}, "
+                    f"{'n/a' if latency is None else f'{latency}ms'}, "
+                    f"error rate {endpoint['error_rate']:.0%}"
+                )
+            return {"status": snapshot["status"], "details": details}
+
         health_checker.register_health_check("database", database_health, 0)
         health_checker.register_health_check("secure_storage", secure_storage_health, 0)
         health_checker.register_health_check("rate_limiter", rate_limiter_health, 0)
         health_checker.register_health_check("error_tracker", error_tracker_health, 0)
+        if Settings.SAM_SOLANA_RPC_URLS:
+            health_checker.register_health_check("solana_rpc", solana_rpc_health, 0)
 
         results: Dict[str, Optional[Dict[str, Any]]] = await health_checker.run_health_checks()
 
@@ -8,7 +8,7 @@ from typing import Optional
 
 from ..config.settings import Settings
 from ..core.migration_definitions import register_all_migrations
-from ..core.migrations import get_migration_manager
+from ..core.migrations import get_migration_manager, migration_lock, reset_schema_state
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +39,8 @@ async def migrate_database(target_version: Optional[int] = None) -> int:
             return 0
 
         print(f"\nApplying {status['pending_count']} migration(s)...")
-        applied = await manager.migrate(target_version=target_version)
+        async with migration_lock(db_path):
+            applied = await manager.migrate(target_version=target_version)
 
         if applied > 0:
             print(f"✅ Successfully applied {applied} migration(s)")
@@ -117,7 +118,9 @@ async def rollback_migration(target_version: int) -> int:
             print("❌ Rollback cancelled")
             return 1
 
-        rolled_back = await manager.rollback(target_version)
+        async with migration_lock(db_path):
+            rolled_back = await manager.rollback(target_version)
+        reset_schema_state(db_path)
 
         if rolled_back > 0:
             print(f"✅ Successfully rolled back {rolled_back} migration(s)")
@@ -1,9 +1,31 @@
+"""File configuration and plugin discovery, snapshotted once per process.
+
+Agent builds read ``sam.toml`` (middleware, memory backend) and look up plugin
+entry points for tools, LLM providers, memory backends and secure storage.
+Parsing TOML and walking installed distributions on every build is wasted work
+under build-per-request load, so both are captured in an immutable
+:class:`ConfigSnapshot`. The snapshot is rebuilt when a candidate config file
+appears, disappears or changes mtime (or its search path changes), and on
+:func:`reload_config_snapshot`, e.g. after installing a plugin.
+"""
+
 import os
 import logging
-from typing import Any, Dict, Optional
+import time
+from dataclasses import dataclass, field
+from importlib import metadata
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+ENTRY_POINT_GROUPS = (
+    "sam.plugins",
+    "sam.llm_providers",
+    "sam.memory_backends",
+    "sam.secure_storage",
+)
+
 
 def _read_toml(path: str) -> Optional[Dict[str, Any]]:
     try:
@@ -18,46 +40,166 @@ def _read_toml(path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def load_config() -> Dict[str, Any]:
-    """Load SAM configuration from file if present.
+def _config_paths() -> List[str]:
+    """Candidate config files in search order.
 
-    Search order:
     1) SAM_CONFIG env var (file path)
     2) ./sam.toml (cwd)
     3) $XDG_CONFIG_HOME/sam/sam.toml or ~/.config/sam/sam.toml
-    Returns an empty dict when no config is present.
     """
-    # 1) Explicit path
+    paths: List[str] = []
     env_path = os.getenv("SAM_CONFIG")
     if env_path:
-        cfg = _read_toml(env_path)
-        if cfg is not None:
-            return cfg
-
-    # 2) Current working directory
-    cwd_path = os.path.abspath(os.path.join(os.getcwd(), "sam.toml"))
-    cfg = _read_toml(cwd_path)
-    if cfg is not None:
-        return cfg
-
-    # 3) XDG config or ~/.config
+        paths.append(env_path)
+    paths.append(os.path.abspath(os.path.join(os.getcwd(), "sam.toml")))
     xdg = os.getenv("XDG_CONFIG_HOME")
     if xdg:
-        xdg_path = os.path.join(xdg, "sam", "sam.toml")
-        cfg = _read_toml(xdg_path)
+        paths.append(os.path.join(xdg, "sam", "sam.toml"))
+    paths.append(os.path.join(os.path.expanduser("~"), ".config", "sam", "sam.toml"))
+    return paths
+
+
+def _stamp(paths: List[str]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            stamps.append((path, None))
+    return tuple(stamps)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Parsed config file and discovered entry points at one point in time."""
+
+    config: Mapping[str, Any]
+    source: Optional[str]
+    entry_points: Mapping[str, Tuple[metadata.EntryPoint, ...]]
+    stamps: Tuple[Tuple[str, Optional[int]], ...]
+    # Milliseconds spent building the snapshot, per phase
+    timings: Mapping[str, float] = field(default_factory=dict)
+
+
+def _discover_entry_points() -> Dict[str, Tuple[metadata.EntryPoint, ...]]:
+    try:
+        eps = metadata.entry_points()
+    except Exception as e:
+        logger.debug(f"Entry point discovery skipped: {e}")
+        return {group: () for group in ENTRY_POINT_GROUPS}
+    return {group: tuple(eps.select(group=group)) for group in ENTRY_POINT_GROUPS}
+
+
+def _build_snapshot(
+    paths: List[str],
+    stamps: Tuple[Tuple[str, Optional[int]], ...],
+    entry_points: Optional[Mapping[str, Tuple[metadata.EntryPoint, ...]]],
+) -> ConfigSnapshot:
+    started = time.perf_counter()
+    config: Dict[str, Any] = {}
+    source = None
+    for path, mtime in stamps:
+        if mtime is None:
+            continue
+        cfg = _read_toml(path)
         if cfg is not None:
-            return cfg
+            config, source = cfg, path
+            break
+    config_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if entry_points is None:
+        entry_points = _discover_entry_points()
+    entry_points_ms = (time.perf_counter() - started) * 1000
+
+    return ConfigSnapshot(
+        config=_freeze(config),
+        source=source,
+        entry_points=MappingProxyType(dict(entry_points)),
+        stamps=stamps,
+        timings=MappingProxyType(
+            {"config_ms": round(config_ms, 3), "entry_points_ms": round(entry_points_ms, 3)}
+        ),
+    )
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+_stats = {"builds": 0, "hits": 0}
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """Current snapshot; re-reads the config file only if it changed on disk."""
+    global _snapshot
+    paths = _config_paths()
+    stamps = _stamp(paths)
+    if _snapshot is not None and _snapshot.stamps == stamps:
+        _stats["hits"] += 1
+        return _snapshot
+    # Config files changed: re-parse them but keep the discovered entry points
+    _snapshot = _build_snapshot(
+        paths, stamps, _snapshot.entry_points if _snapshot is not None else None
+    )
+    _stats["builds"] += 1
+    return _snapshot
+
+
+def reload_config_snapshot() -> ConfigSnapshot:
+    """Drop the snapshot so config files and entry points are read again."""
+    global _snapshot
+    _snapshot = None
+    return get_config_snapshot()
+
 
-    home = os.path.expanduser("~")
-    default_path = os.path.join(home, ".config", "sam", "sam.toml")
-    cfg = _read_toml(default_path)
-    if cfg is not None:
-        return cfg
+def plugin_entry_points(group: str) -> Tuple[metadata.EntryPoint, ...]:
+    """Entry points of a ``sam.*`` plugin group from the snapshot."""
+    snapshot = get_config_snapshot()
+    if group in snapshot.entry_points:
+        return snapshot.entry_points[group]
+    return tuple(metadata.entry_points(group=group))
 
-    return {}
+
+def get_config_stats() -> Dict[str, Any]:
+    """Snapshot reuse counters and the timing breakdown of the last build."""
+    snapshot = _snapshot
+    return {
+        **_stats,
+        "source": snapshot.source if snapshot else None,
+        "timings": dict(snapshot.timings) if snapshot else {},
+        "entry_points": (
+            {group: len(eps) for group, eps in snapshot.entry_points.items()} if snapshot else {}
+        ),
+    }
+
+
+def load_config() -> Dict[str, Any]:
+    """Load SAM configuration from file if present.
+
+    Search order:
+    1) SAM_CONFIG env var (file path)
+    2) ./sam.toml (cwd)
+    3) $XDG_CONFIG_HOME/sam/sam.toml or ~/.config/sam/sam.toml
+    Returns an empty dict when no config is present. The result is a private
+    copy of the cached snapshot.
+    """
+    return _thaw(get_config_snapshot().config)
 
 
 def load_middleware_config() -> Optional[Dict[str, Any]]:
-    cfg = load_config()
-    mw = cfg.get("middleware")
-    return mw if isinstance(mw, dict) else None
+    mw = get_config_snapshot().config.get("middleware")
+    return _thaw(mw) if isinstance(mw, Mapping) else None
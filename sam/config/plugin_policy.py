@@ -33,6 +33,16 @@ class ModuleMetadata:
     sha256: Optional[str]
 
 
+# origin -> ((origin, mtime_ns, size, inode), sha256)
+_DigestKey = Tuple[str, int, int, int]
+_digest_cache: Dict[str, Tuple[_DigestKey, str]] = {}
+
+
+def clear_digest_cache() -> None:
+    """Forget cached module digests (tests, after replacing files in place)."""
+    _digest_cache.clear()
+
+
 class PluginPolicy:
     """Represents plugin trust policy as loaded from configuration and env."""
 
@@ -184,8 +194,28 @@ class PluginPolicy:
         )
         return True
 
+    @classmethod
+    def _compute_digest(cls, spec, origin: Optional[str]) -> Optional[str]:  # type: ignore[no-untyped-def]
+        """SHA-256 of the module source, reused while the file's stat is unchanged."""
+        key: Optional[_DigestKey] = None
+        if origin:
+            try:
+                st = os.stat(origin)
+                key = (origin, st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                key = None
+        if key is not None:
+            cached = _digest_cache.get(origin)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+        digest = cls._read_digest(spec, origin)
+        if key is not None and digest is not None:
+            _digest_cache[key[0]] = (key, digest)
+        return digest
+
     @staticmethod
-    def _compute_digest(spec, origin: Optional[str]) -> Optional[str]:  # type: ignore[no-untyped-def]
+    def _read_digest(spec, origin: Optional[str]) -> Optional[str]:  # type: ignore[no-untyped-def]
         loader = spec.loader
         data: Optional[bytes] = None
 
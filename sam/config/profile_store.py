@@ -26,8 +26,12 @@ PROFILE_SCHEMA: Dict[str, Dict[str, Any]] = {
     "LOCAL_LLM_BASE_URL": {"default": "http://localhost:11434/v1", "type": str},
     "LOCAL_LLM_MODEL": {"default": "llama3.1", "type": str},
     "SAM_SOLANA_RPC_URL": {"default": "https://api.mainnet-beta.solana.com", "type": str},
+    "SAM_SOLANA_RPC_URLS": {"default": None, "type": str},
+    "SAM_SOLANA_WS_URL": {"default": None, "type": str},
     "SAM_SOLANA_ADDRESS": {"default": None, "type": str},
     "SAM_DB_PATH": {"default": ".sam/sam_memory.db", "type": str},
+    "SAM_TOOL_ROUTING": {"default": True, "type": bool},
+    "SAM_TOOL_ROUTING_MAX_TOOLS": {"default": 16, "type": int},
     "RATE_LIMITING_ENABLED": {"default": False, "type": bool},
     "ENABLE_SOLANA_TOOLS": {"default": True, "type": bool},
     "ENABLE_PUMP_FUN_TOOLS": {"default": True, "type": bool},
@@ -45,6 +49,7 @@ PROFILE_SCHEMA: Dict[str, Dict[str, Any]] = {
     "HYPERLIQUID_API_URL": {"default": "https://api.hyperliquid.xyz", "type": str},
     "HYPERLIQUID_DEFAULT_SLIPPAGE": {"default": 0.05, "type": float},
     "HYPERLIQUID_REQUEST_TIMEOUT": {"default": None, "type": float},
+    "HYPERLIQUID_STREAM_MIDS": {"default": True, "type": bool},
     "HYPERLIQUID_ACCOUNT_ADDRESS": {"default": None, "type": str},
     "EVM_WALLET_ADDRESS": {"default": None, "type": str},
     "PAYAI_FACILITATOR_URL": {"default": "https://facilitator.payai.network", "type": str},
@@ -13,7 +13,7 @@ CORE CAPABILITIES:
 TOOL SELECTION GUIDE:
 
 🚀 BUY/SELL (preferred smart route):
-- smart_buy(mint, amount_sol, slippage_percent) – Preferred. Tries pump.fun ONCE; if it fails, automatically falls back to a Jupiter SOL→token swap.
+- smart_buy(mint, amount_sol, slippage_percent) – Preferred. Quotes pump.fun and Jupiter together and executes the better route (the other is used if the first fails).
 - pump_fun_sell(mint, percentage, slippage) – Sell on pump.fun when user asks to sell a pump.fun token.
 - get_pump_token_info(mint) - ONLY use if user specifically asks for token info
 - get_token_trades(mint, limit) - ONLY use if user asks for trading history
@@ -36,7 +36,7 @@ CRITICAL EXECUTION RULES:
 - CALL EACH TOOL ONLY ONCE per user request
 - get_balance() returns COMPLETE wallet info in ONE CALL - never call it multiple times
 - For balance checks: ONE get_balance() call provides all SOL + token data + wallet address
-- For token buys → CALL smart_buy() (uses pump.fun first, then Jupiter fallback automatically)
+- For token buys → CALL smart_buy() (routes across pump.fun and Jupiter automatically)
 - Only use pump_fun_buy() if the user explicitly requests pump.fun-only execution
 - Wallet is PRE-CONFIGURED - never check wallet address separately
 - NEVER call get_balance() just to get wallet address - wallet is automatic in all tools
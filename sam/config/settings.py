@@ -282,9 +282,17 @@ class Settings:
     LOCAL_LLM_MODEL: str = "llama3.1"
 
     SAM_SOLANA_RPC_URL: str = "https://api.mainnet-beta.solana.com"
+    # Additional RPC endpoints; when set, calls are routed across all of them
+    SAM_SOLANA_RPC_URLS: List[str] = []
+    # Websocket endpoint for balance subscriptions; derived from SAM_SOLANA_RPC_URL when unset
+    SAM_SOLANA_WS_URL: Optional[str] = None
     SAM_SOLANA_ADDRESS: Optional[str] = None
     SAM_WALLET_PRIVATE_KEY: Optional[str] = None
 
+    # Send only the tools relevant to each turn (plus a request_tools escape hatch)
+    SAM_TOOL_ROUTING: bool = True
+    SAM_TOOL_ROUTING_MAX_TOOLS: int = 16
+
     SAM_DB_PATH: str = ".sam/sam_memory.db"
 
     # Production database and cache settings
@@ -305,6 +313,9 @@ class Settings:
     SAM_API_TOKEN_SECRET: Optional[str] = None
     SAM_API_TOKEN_EXPIRE_MINUTES: int = 15  # Reduced from 24 hours to 15 minutes for security
     SAM_API_REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # Refresh tokens valid for 7 days
+    SAM_API_USER_CACHE_TTL: int = 60  # Seconds a resolved bearer-token user is reused (0 = off)
+    SAM_SECRET_CACHE_TTL: int = 30  # Seconds decrypted user secrets stay in memory (0 = off)
+    SAM_API_METRICS_TOKEN: Optional[str] = None  # Bearer token required by /metrics when set
     SAM_API_ALLOW_REGISTRATION: bool = False
     SAM_API_MAX_LOGIN_ATTEMPTS: int = 5  # Maximum failed login attempts before lockout
     SAM_API_LOCKOUT_DURATION_MINUTES: int = 15  # Account lockout duration in minutes
@@ -353,6 +364,7 @@ class Settings:
     HYPERLIQUID_ACCOUNT_ADDRESS: Optional[str] = None
     HYPERLIQUID_DEFAULT_SLIPPAGE: float = 0.05
     HYPERLIQUID_REQUEST_TIMEOUT: Optional[float] = None
+    HYPERLIQUID_STREAM_MIDS: bool = True
     EVM_WALLET_ADDRESS: Optional[str] = None
     EVM_RPC_URL: str = "https://eth.llamarpc.com"
     EVM_PRIVATE_KEY: Optional[str] = None
@@ -419,11 +431,18 @@ class Settings:
         cls.SAM_SOLANA_RPC_URL = _as_str(
             _value_from_sources("SAM_SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
         )
+        cls.SAM_SOLANA_RPC_URLS = _as_list(_value_from_sources("SAM_SOLANA_RPC_URLS", []))
+        cls.SAM_SOLANA_WS_URL = _as_optional_str(_value_from_sources("SAM_SOLANA_WS_URL"))
         cls.SAM_SOLANA_ADDRESS = _as_optional_str(_value_from_sources("SAM_SOLANA_ADDRESS"))
         cls.SAM_WALLET_PRIVATE_KEY = _as_optional_str(
             _private_secret("SAM_WALLET_PRIVATE_KEY", "SAM_WALLET_PRIVATE_KEY")
         )
 
+        cls.SAM_TOOL_ROUTING = _as_bool(_value_from_sources("SAM_TOOL_ROUTING", "true"), True)
+        cls.SAM_TOOL_ROUTING_MAX_TOOLS = _as_int(
+            _value_from_sources("SAM_TOOL_ROUTING_MAX_TOOLS", 16), 16
+        )
+
         cls.SAM_DB_PATH = _as_str(_value_from_sources("SAM_DB_PATH", ".sam/sam_memory.db"))
 
         # Production database and cache settings
@@ -452,6 +471,15 @@ class Settings:
             _value_from_sources("SAM_API_TOKEN_EXPIRE_MINUTES", cls.SAM_API_TOKEN_EXPIRE_MINUTES),
             cls.SAM_API_TOKEN_EXPIRE_MINUTES,
         )
+        cls.SAM_API_USER_CACHE_TTL = _as_int(
+            _value_from_sources("SAM_API_USER_CACHE_TTL", cls.SAM_API_USER_CACHE_TTL),
+            cls.SAM_API_USER_CACHE_TTL,
+        )
+        cls.SAM_SECRET_CACHE_TTL = _as_int(
+            _value_from_sources("SAM_SECRET_CACHE_TTL", cls.SAM_SECRET_CACHE_TTL),
+            cls.SAM_SECRET_CACHE_TTL,
+        )
+        cls.SAM_API_METRICS_TOKEN = _as_optional_str(_value_from_sources("SAM_API_METRICS_TOKEN"))
         cls.SAM_API_ALLOW_REGISTRATION = _as_bool(
             _value_from_sources("SAM_API_ALLOW_REGISTRATION", False), False
         )
@@ -574,6 +602,9 @@ class Settings:
         cls.HYPERLIQUID_REQUEST_TIMEOUT = (
             _as_float(timeout_value) if timeout_value is not None else None
         )
+        cls.HYPERLIQUID_STREAM_MIDS = _as_bool(
+            _value_from_sources("HYPERLIQUID_STREAM_MIDS", "true"), True
+        )
         cls.EVM_WALLET_ADDRESS = _as_optional_str(_value_from_sources("EVM_WALLET_ADDRESS"))
         cls.EVM_RPC_URL = _as_str(_value_from_sources("EVM_RPC_URL", "https://eth.llamarpc.com"))
         cls.EVM_PRIVATE_KEY = _as_optional_str(_value_from_sources("EVM_PRIVATE_KEY"))
@@ -10,6 +10,8 @@ from .llm_provider import LLMProvider
 from .memory import MemoryManager
 from .events import EventBus, get_event_bus
 from .context import RequestContext
+from .tool_router import ToolRouter
+from ..utils.monitoring import record_operation_metric
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +37,8 @@ class SAMAgent:
         self.system_prompt = system_prompt
         self.events = event_bus or get_event_bus()
         self.tool_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        # Optional per-turn tool subsetting; when unset every tool schema is sent
+        self.tool_router: Optional[ToolRouter] = None
 
         # Usage tracking
         self.session_stats = {
@@ -108,6 +112,9 @@ class SAMAgent:
         # Update context length tracking
         self.session_stats["context_length"] = len(messages)
 
+        if self.tool_router is not None:
+            self.tool_router.reset(session_id)
+
         # Main execution loop - configurable max iterations
         max_iterations = int(os.getenv("SAM_MAX_AGENT_ITERATIONS", "5"))
         iteration = 0
@@ -116,15 +123,16 @@ class SAMAgent:
         serialization_cache: Dict[int, str] = {}
 
         # Helper to get cached serialized result
-        def serialize_result(result: Any) -> str:
-            """Serialize result with caching to avoid duplicate JSON encoding."""
+        def serialize_result(tool_name: str, result: Any) -> str:
+            """Serialize the transcript projection of a result, caching the encoding.
+
+            The transcript gets the tool's compact projection; events keep the full result.
+            """
             result_id = id(result)
             if result_id in serialization_cache:
                 return serialization_cache[result_id]
 
-            serialized = (
-                json.dumps(result, default=str) if isinstance(result, dict) else str(result)
-            )
+            serialized = self.tools.serialize_result(tool_name, result)
             serialization_cache[result_id] = serialized
             return serialized
 
@@ -174,7 +182,24 @@ class SAMAgent:
                 )
                 await flush_events()
                 # Pass a copy to avoid later mutations (we append to messages after the call)
-                resp = await self.llm.chat_completion(list(messages), tools=self.tools.list_specs())
+                tool_specs = (
+                    self.tool_router.list_specs(messages, session_id)
+                    if self.tool_router is not None
+                    else self.tools.list_specs()
+                )
+                llm_started = time.perf_counter()
+                try:
+                    resp = await self.llm.chat_completion(list(messages), tools=tool_specs)
+                except Exception as exc:
+                    record_operation_metric(
+                        "llm",
+                        "chat_completion",
+                        time.perf_counter() - llm_started,
+                        success=False,
+                        error_type=type(exc).__name__,
+                    )
+                    raise
+                record_operation_metric("llm", "chat_completion", time.perf_counter() - llm_started)
 
                 # Track token usage
                 if resp.usage:
@@ -319,9 +344,11 @@ class SAMAgent:
                         if self.tool_callback:
                             self.tool_callback(tool_name, tool_args)
 
+                        tool_started = time.perf_counter()
                         result = await self.tools.call(
                             tool_name, tool_args, context=ToolContext(session_id=session_id)
                         )
+                        tool_duration = time.perf_counter() - tool_started
 
                         # Determine success/failure in a normalized way
                         is_success = False
@@ -330,99 +357,19 @@ class SAMAgent:
                                 is_success = bool(result.get("success"))
                             else:
                                 is_success = "error" not in result
+                        record_operation_metric(
+                            "tool",
+                            tool_name,
+                            tool_duration,
+                            success=is_success,
+                            error_type=None if is_success else "tool_error",
+                        )
 
                         # Check if tool returned an error and categorize it
                         error_type = "unknown"
                         error_details = {}
 
                         if not is_success:
-                            # Automatic fallback: if pump.fun buy failed, try Jupiter swap
-                            try:
-                                if tool_name == "pump_fun_buy":
-                                    # Batch fallback status event
-                                    pending_events.append(
-                                        (
-                                            "agent.status",
-                                            {
-                                                "session_id": session_id,
-                                                "user_id": user_id,
-                                                "state": "fallback",
-                                                "message": "pump.fun failed — trying Jupiter",
-                                            },
-                                        )
-                                    )
-                                    await flush_events()
-
-                                    wsol = "So11111111111111111111111111111111111111112"
-                                    out_mint = str(tool_args.get("mint", ""))
-                                    amount_sol = float(tool_args.get("amount", 0))
-                                    slippage_pct = int(tool_args.get("slippage", 5) or 5)
-                                    amount_lamports = max(0, int(amount_sol * 1_000_000_000))
-                                    slippage_bps = max(1, min(1000, slippage_pct * 100))
-
-                                    jup_args = {
-                                        "input_mint": wsol,
-                                        "output_mint": out_mint,
-                                        "amount": amount_lamports,
-                                        "slippage_bps": slippage_bps,
-                                    }
-
-                                    # Batch fallback tool call event
-                                    pending_events.append(
-                                        (
-                                            "tool.called",
-                                            {
-                                                "session_id": session_id,
-                                                "user_id": user_id,
-                                                "name": "jupiter_swap",
-                                                "args": jup_args,
-                                                "tool_call_id": f"fallback-{tool_call_id}",
-                                            },
-                                        )
-                                    )
-
-                                    jup_res = await self.tools.call(
-                                        "jupiter_swap",
-                                        jup_args,
-                                        context=ToolContext(session_id=session_id),
-                                    )
-
-                                    # Append tool result into the transcript so the model can continue
-                                    messages.append(
-                                        {
-                                            "role": "tool",
-                                            "tool_call_id": f"fallback-{tool_call_id}",
-                                            "name": "jupiter_swap",
-                                            "content": serialize_result(jup_res),
-                                        }
-                                    )
-
-                                    # Batch fallback result events
-                                    jup_success = isinstance(jup_res, dict) and (
-                                        jup_res.get("success") is True or "error" not in jup_res
-                                    )
-                                    event_name = "tool.succeeded" if jup_success else "tool.failed"
-                                    pending_events.append(
-                                        (
-                                            event_name,
-                                            {
-                                                "session_id": session_id,
-                                                "user_id": user_id,
-                                                "name": "jupiter_swap",
-                                                "args": jup_args,
-                                                "result": jup_res,
-                                                "tool_call_id": f"fallback-{tool_call_id}",
-                                            },
-                                        )
-                                    )
-
-                                    # Continue loop to let the model react to the fallback result
-                                    error_count = 0
-                                    continue
-                            except Exception:
-                                # Fallback attempt errors are non-fatal; proceed with normal handling
-                                pass
-
                             error_count += 1
                             # Batch failure event
                             pending_events.append(
@@ -490,7 +437,7 @@ class SAMAgent:
                                     "role": "tool",
                                     "tool_call_id": tool_call_id,
                                     "name": tool_name,
-                                    "content": serialize_result(result),
+                                    "content": serialize_result(tool_name, result),
                                 }
                             )
 
@@ -595,7 +542,7 @@ class SAMAgent:
                                     "role": "tool",
                                     "tool_call_id": tool_call_id,
                                     "name": tool_name,
-                                    "content": serialize_result(result),
+                                    "content": serialize_result(tool_name, result),
                                 }
                             )
 
@@ -814,6 +761,14 @@ Respond with just the bullet points, no preamble."""
         except Exception:
             pass
 
+        # Release the Hyperliquid client's market-data feed
+        try:
+            hl = getattr(self, "_hyperliquid_client", None)
+            if hl and hasattr(hl, "close"):
+                await hl.close()
+        except Exception:
+            pass
+
         # Close LLM provider if it exposes close (no-op for shared HTTP client)
         try:
             if self.llm and hasattr(self.llm, "close"):
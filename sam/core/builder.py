@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
 
 from .agent import SAMAgent
 from .llm_provider import create_llm_provider
@@ -10,50 +10,49 @@ from .memory_provider import create_memory_manager
 from .tools import ToolRegistry
 from .middleware import LoggingMiddleware, RateLimitMiddleware, RetryMiddleware, ToolContext
 from .context import RequestContext
+from .quotas import flush_quota_usage
 from ..config.prompts import SOLANA_AGENT_PROMPT
 from ..config.settings import Settings
 from ..config.config_loader import load_middleware_config
 from ..utils.crypto import decrypt_private_key
+from ..utils.secret_cache import clear_secret_cache
 from ..utils.secure_storage import get_secure_storage, sync_stored_api_key
-from ..utils.http_client import cleanup_http_client
+from ..utils.http_client import cleanup_http_client, clear_http_cache
 from ..utils.connection_pool import cleanup_database_pool
 from ..utils.rate_limiter import cleanup_rate_limiter
 from ..utils.price_service import cleanup_price_service
-from ..utils.wallets import normalize_evm_private_key, WalletError
-
-# Integrations (kept optional behind flags)
-from ..integrations.solana.solana_tools import SolanaTools, create_solana_tools
-from ..integrations.pump_fun import PumpFunTools, create_pump_fun_tools
-from ..integrations.dexscreener import DexScreenerTools, create_dexscreener_tools
-from ..integrations.jupiter import JupiterTools, create_jupiter_tools
-from ..integrations.search import SearchTools, create_search_tools
-from ..integrations.polymarket import PolymarketTools, create_polymarket_tools
-from ..integrations.aster_futures import AsterFuturesClient, create_aster_futures_tools
-from ..integrations.hyperliquid import HyperliquidClient, create_hyperliquid_tools
-from ..integrations.smart_trader import SmartTrader, create_smart_trader_tools
-from ..integrations.uranus import UranusTools, create_uranus_tools
-from ..integrations.payai_facilitator import (
-    PayAIFacilitatorTools,
-    create_payai_facilitator_tools,
-)
-from ..integrations.kalshi import KalshiClient, KalshiTools, create_kalshi_tools
-from ..integrations.aixbt import AixbtClient, AixbtTools, create_aixbt_tools
-from ..integrations.coinbase_x402 import CoinbaseX402Tools, create_coinbase_x402_tools
-from ..integrations.evm import EvmClient, EvmTools, create_evm_tools
-from .plugins import load_plugins
+from ..utils.executors import shutdown_executors
 
-try:  # pragma: no cover - optional dependency
-    from eth_account import Account  # type: ignore[import-untyped]
-except ImportError:  # pragma: no cover
-    Account = None  # type: ignore[assignment]
+# Integrations are imported per build, and only for enabled bundles
+from ..integrations.registry import integration_factory, load_integration, loaded_shutdown_hooks
+from .plugins import load_plugins
+from .tool_router import ToolRouter
 
-try:  # pragma: no cover - optional dependency
-    from x402.facilitator import FacilitatorClient  # type: ignore[import-untyped]
-except ImportError:  # pragma: no cover
-    FacilitatorClient = None  # type: ignore[assignment]
+if TYPE_CHECKING:
+    from ..integrations.aixbt import AixbtClient, AixbtTools
+    from ..integrations.aster_futures import AsterFuturesClient
+    from ..integrations.coinbase_x402 import CoinbaseX402Tools
+    from ..integrations.evm import EvmClient, EvmTools
+    from ..integrations.hyperliquid import HyperliquidClient
+    from ..integrations.jupiter import JupiterTools
+    from ..integrations.pump_fun import PumpFunTools
 
 logger = logging.getLogger(__name__)
 
+# Integrations whose user_secrets entries are handed to agent builds
+USER_SECRET_INTEGRATIONS = (
+    "solana",
+    "evm",
+    "polymarket",
+    "hyperliquid",
+    "aster",
+    "uranus",
+    "kalshi",
+    "aixbt",
+    "coinbase",
+    "brave",
+)
+
 
 class AgentBuilder:
     """Constructs a SAMAgent with configurable components.
@@ -121,34 +120,19 @@ class AgentBuilder:
 
             store = UserSecretsStore()
 
-            # Get Solana secrets (may include operational wallet key)
-            solana_secrets = await store.get_integration_secrets(user_id, "solana")
-            if solana_secrets:
-                secrets["solana"] = solana_secrets
+            # One query for every integration, served from the secret cache when fresh
+            stored = await store.get_user_secrets(user_id)
+            for integration in USER_SECRET_INTEGRATIONS:
+                if stored.get(integration):
+                    secrets[integration] = dict(stored[integration])
 
             # If no solana private key in secrets, check operational wallet
-            if not solana_secrets.get("private_key"):
+            if not secrets.get("solana", {}).get("private_key"):
                 onboarding = OnboardingService(Settings.SAM_DB_PATH)
                 op_wallet_key = await onboarding.get_operational_wallet_key(user_id)
                 if op_wallet_key:
                     secrets.setdefault("solana", {})["private_key"] = op_wallet_key
 
-            # Get other integration secrets
-            for integration in [
-                "evm",
-                "polymarket",
-                "hyperliquid",
-                "aster",
-                "uranus",
-                "kalshi",
-                "aixbt",
-                "coinbase",
-                "brave",
-            ]:
-                int_secrets = await store.get_integration_secrets(user_id, integration)
-                if int_secrets:
-                    secrets[integration] = int_secrets
-
         except Exception as e:
             logger.warning(f"Failed to load user secrets for {user_id}: {e}")
 
@@ -437,7 +421,7 @@ class AgentBuilder:
             )
 
         # Secure storage and wallet discovery/migration
-        secure_storage = get_secure_storage()
+        secure_storage = await asyncio.to_thread(get_secure_storage)
 
         # Priority for Solana private key:
         # 1. User-specific secrets (from UserSecretsStore or operational wallet)
@@ -446,7 +430,7 @@ class AgentBuilder:
         private_key: Optional[str] = user_secrets.get("solana", {}).get("private_key")
 
         if not private_key:
-            private_key = secure_storage.get_private_key("default")
+            private_key = await asyncio.to_thread(secure_storage.get_private_key, "default")
 
         if not private_key and Settings.SAM_WALLET_PRIVATE_KEY:
             try:
@@ -455,7 +439,9 @@ class AgentBuilder:
                 else:
                     private_key = Settings.SAM_WALLET_PRIVATE_KEY
                 if private_key:
-                    secure_storage.store_private_key("default", private_key)
+                    await asyncio.to_thread(
+                        secure_storage.store_private_key, "default", private_key
+                    )
                     logger.info("Migrated private key from environment to secure storage")
             except Exception as e:
                 logger.warning(f"Could not decrypt private key: {e}")
@@ -463,8 +449,19 @@ class AgentBuilder:
         if private_key and ctx.user_id != "default":
             logger.info(f"Using user-specific Solana wallet for user {ctx.user_id[:8]}...")
 
-        # Core Solana tools (wallet-aware)
-        solana_tools = SolanaTools(Settings.SAM_SOLANA_RPC_URL, private_key)
+        # Core Solana tools (wallet-aware); always built since the CLI shows its wallet
+        from ..integrations.solana.token_registry import get_token_registry
+        from ..integrations.solana.wallet_cache import get_wallet_cache, ws_url_for
+
+        solana_tools = load_integration("solana").SolanaTools(
+            Settings.SAM_SOLANA_RPC_URL,
+            private_key,
+            rpc_urls=Settings.SAM_SOLANA_RPC_URLS,
+            token_registry=get_token_registry(Settings.SAM_DB_PATH),
+            wallet_cache=get_wallet_cache(
+                Settings.SAM_SOLANA_WS_URL or ws_url_for(Settings.SAM_SOLANA_RPC_URL)
+            ),
+        )
 
         # Create agent before registering tools (for potential caching hooks)
         agent = SAMAgent(llm=llm, tools=tools, memory=memory, system_prompt=self.system_prompt)
@@ -483,72 +480,86 @@ class AgentBuilder:
         )
         aixbt_enabled = self._tool_enabled("aixbt", Settings.ENABLE_AIXBT_TOOLS)
         coinbase_enabled = self._tool_enabled("coinbase_x402", Settings.ENABLE_COINBASE_X402_TOOLS)
+        # Smart trader (pump.fun -> Jupiter fallback) reuses the pump.fun and Jupiter clients
+        smart_trader_default = solana_enabled and (pump_enabled or jupiter_enabled)
+        smart_trader_enabled = self._tool_enabled("smart_trader", smart_trader_default)
 
         # Register integrations behind flags
         if solana_enabled:
-            for tool in create_solana_tools(solana_tools, agent=agent):
+            for tool in integration_factory("solana")(solana_tools, agent=agent):
                 tools.register(tool)
 
-        pump_tools = PumpFunTools(solana_tools)
+        pump_tools: Optional[PumpFunTools] = None
+        if pump_enabled or smart_trader_enabled:
+            pump_tools = load_integration("pump_fun").PumpFunTools(solana_tools)
         if pump_enabled:
-            for tool in create_pump_fun_tools(pump_tools, agent=agent):
+            for tool in integration_factory("pump_fun")(pump_tools, agent=agent):
                 tools.register(tool)
 
-        uranus_tools = UranusTools(solana_tools)
         if uranus_enabled:
-            for tool in create_uranus_tools(uranus_tools, agent=agent):
+            uranus_tools = load_integration("uranus").UranusTools(solana_tools)
+            for tool in integration_factory("uranus")(uranus_tools, agent=agent):
                 tools.register(tool)
 
-        dex_tools = DexScreenerTools()
+        dex_tools = None
         if dex_enabled:
-            for tool in create_dexscreener_tools(dex_tools):
+            dex_tools = load_integration("dexscreener").DexScreenerTools()
+            for tool in integration_factory("dexscreener")(dex_tools):
                 tools.register(tool)
 
-        jupiter_tools = JupiterTools(solana_tools)
+        jupiter_tools: Optional[JupiterTools] = None
+        if jupiter_enabled or smart_trader_enabled:
+            jupiter_tools = load_integration("jupiter").JupiterTools(solana_tools)
         if jupiter_enabled:
-            for tool in create_jupiter_tools(jupiter_tools):
+            for tool in integration_factory("jupiter")(jupiter_tools):
                 tools.register(tool)
 
-        # Priority for Brave API key:
-        # 1. User-specific secrets
-        # 2. Secure storage
-        # 3. Environment variable
-        brave_api_key = user_secrets.get("brave", {}).get("api_key")
-        if not brave_api_key:
-            try:
-                brave_api_key = secure_storage.get_api_key("brave_api_key")
-            except Exception:
-                brave_api_key = None
-        if not brave_api_key:
-            brave_api_key = os.getenv("BRAVE_API_KEY")
-        search_tools = SearchTools(api_key=brave_api_key)
+        search_tools = None
         if search_enabled:
-            for tool in create_search_tools(search_tools):
+            # Priority for Brave API key:
+            # 1. User-specific secrets
+            # 2. Secure storage
+            # 3. Environment variable
+            brave_api_key = user_secrets.get("brave", {}).get("api_key")
+            if not brave_api_key:
+                try:
+                    brave_api_key = await asyncio.to_thread(
+                        secure_storage.get_api_key, "brave_api_key"
+                    )
+                except Exception:
+                    brave_api_key = None
+            if not brave_api_key:
+                brave_api_key = os.getenv("BRAVE_API_KEY")
+            search_tools = load_integration("search").SearchTools(api_key=brave_api_key)
+            for tool in integration_factory("search")(search_tools):
                 tools.register(tool)
 
-        polymarket_tools = PolymarketTools()
+        polymarket_tools = None
         if polymarket_enabled:
-            for tool in create_polymarket_tools(polymarket_tools):
+            polymarket_tools = load_integration("polymarket").PolymarketTools()
+            for tool in integration_factory("polymarket")(polymarket_tools):
                 tools.register(tool)
 
-        kalshi_client = KalshiClient(
-            base_url=Settings.KALSHI_API_BASE_URL,
-            market_url_base=Settings.KALSHI_MARKET_URL,
-        )
-        kalshi_tools = KalshiTools(client=kalshi_client)
+        kalshi_tools = None
         if kalshi_enabled:
-            for tool in create_kalshi_tools(kalshi_tools):
+            kalshi = load_integration("kalshi")
+            kalshi_client = kalshi.KalshiClient(
+                base_url=Settings.KALSHI_API_BASE_URL,
+                market_url_base=Settings.KALSHI_MARKET_URL,
+            )
+            kalshi_tools = kalshi.KalshiTools(client=kalshi_client)
+            for tool in integration_factory("kalshi")(kalshi_tools):
                 tools.register(tool)
 
-        payai_tools = PayAIFacilitatorTools(
-            base_url=Settings.PAYAI_FACILITATOR_URL,
-            api_key=Settings.PAYAI_FACILITATOR_API_KEY,
-            default_network=Settings.PAYAI_FACILITATOR_DEFAULT_NETWORK,
-            solana_tools=solana_tools,
-        )
         if payai_enabled:
+            payai_tools = load_integration("payai_facilitator").PayAIFacilitatorTools(
+                base_url=Settings.PAYAI_FACILITATOR_URL,
+                api_key=Settings.PAYAI_FACILITATOR_API_KEY,
+                default_network=Settings.PAYAI_FACILITATOR_DEFAULT_NETWORK,
+                solana_tools=solana_tools,
+            )
             if payai_tools.is_configured:
-                for tool in create_payai_facilitator_tools(payai_tools):
+                for tool in integration_factory("payai_facilitator")(payai_tools):
                     tools.register(tool)
             else:
                 logger.warning(
@@ -557,6 +568,10 @@ class AgentBuilder:
 
         coinbase_facilitator = None
         if coinbase_enabled:
+            try:  # pragma: no cover - optional dependency
+                from x402.facilitator import FacilitatorClient  # type: ignore[import-untyped]
+            except ImportError:  # pragma: no cover
+                FacilitatorClient = None  # type: ignore[assignment,misc]
             if FacilitatorClient is None:
                 logger.warning(
                     "Coinbase x402 tools enabled but the 'x402' package is not installed. "
@@ -587,7 +602,9 @@ class AgentBuilder:
         ) or user_secrets.get("evm", {}).get("private_key")
         if not aixbt_private_key:
             try:
-                aixbt_private_key = secure_storage.get_private_key("aixbt_private_key")
+                aixbt_private_key = await asyncio.to_thread(
+                    secure_storage.get_private_key, "aixbt_private_key"
+                )
             except Exception:
                 aixbt_private_key = None
 
@@ -599,7 +616,9 @@ class AgentBuilder:
             except Exception as exc:
                 logger.warning(f"Failed to decrypt AIXBT private key: {exc}")
             if candidate_key:
-                if secure_storage.store_private_key("aixbt_private_key", candidate_key):
+                if await asyncio.to_thread(
+                    secure_storage.store_private_key, "aixbt_private_key", candidate_key
+                ):
                     aixbt_private_key = candidate_key
                 else:
                     aixbt_private_key = candidate_key
@@ -609,12 +628,16 @@ class AgentBuilder:
         hyper_private_key: Optional[str] = user_secrets.get("hyperliquid", {}).get("api_key")
         if not hyper_private_key:
             try:
-                hyper_private_key = secure_storage.get_private_key("hyperliquid_private_key")
+                hyper_private_key = await asyncio.to_thread(
+                    secure_storage.get_private_key, "hyperliquid_private_key"
+                )
             except Exception:
                 hyper_private_key = None
         if not hyper_private_key and Settings.HYPERLIQUID_PRIVATE_KEY:
-            if secure_storage.store_private_key(
-                "hyperliquid_private_key", Settings.HYPERLIQUID_PRIVATE_KEY
+            if await asyncio.to_thread(
+                secure_storage.store_private_key,
+                "hyperliquid_private_key",
+                Settings.HYPERLIQUID_PRIVATE_KEY,
             ):
                 hyper_private_key = Settings.HYPERLIQUID_PRIVATE_KEY
             else:
@@ -624,12 +647,17 @@ class AgentBuilder:
             aixbt_private_key = hyper_private_key
 
         aixbt_account = None
-        if aixbt_private_key:
+        if aixbt_private_key and (aixbt_enabled or coinbase_enabled):
+            from ..utils.wallets import WalletError, normalize_evm_private_key
+
             try:
                 normalized_key = normalize_evm_private_key(aixbt_private_key)
-                if Account is None:
+                try:  # pragma: no cover - optional dependency
+                    from eth_account import Account  # type: ignore[import-untyped]
+                except ImportError:  # pragma: no cover
                     raise RuntimeError(
-                        "eth-account is required for x402 payments. Install the optional dependency."
+                        "eth-account is required for x402 payments. "
+                        "Install the optional dependency."
                     )
                 aixbt_account = Account.from_key(normalized_key)
             except (WalletError, Exception) as exc:
@@ -648,26 +676,27 @@ class AgentBuilder:
                 )
             else:
                 try:
-                    aixbt_client = AixbtClient(
+                    aixbt = load_integration("aixbt")
+                    aixbt_client = aixbt.AixbtClient(
                         base_url=Settings.AIXBT_API_BASE_URL,
                         private_key=aixbt_private_key if not aixbt_account else None,
                         account=aixbt_account,
                         request_timeout=Settings.AIXBT_REQUEST_TIMEOUT,
                     )
-                    aixbt_tools = AixbtTools(client=aixbt_client)
-                    for tool in create_aixbt_tools(aixbt_tools):
+                    aixbt_tools = aixbt.AixbtTools(client=aixbt_client)
+                    for tool in integration_factory("aixbt")(aixbt_tools):
                         tools.register(tool)
                 except Exception as exc:
                     logger.warning(f"Failed to initialize AIXBT tools: {exc}")
 
         coinbase_tools: Optional[CoinbaseX402Tools] = None
         if coinbase_enabled:
-            coinbase_tools = CoinbaseX402Tools(
+            coinbase_tools = load_integration("coinbase_x402").CoinbaseX402Tools(
                 facilitator=coinbase_facilitator,
                 account=aixbt_account,
                 request_timeout=Settings.AIXBT_REQUEST_TIMEOUT,
             )
-            for tool in create_coinbase_x402_tools(coinbase_tools):
+            for tool in integration_factory("coinbase_x402")(coinbase_tools):
                 tools.register(tool)
 
         # EVM Tools (balance checking, token operations)
@@ -679,20 +708,22 @@ class AgentBuilder:
 
         if evm_enabled:
             try:
-                evm_client = EvmClient(
+                evm = load_integration("evm")
+                evm_client = evm.EvmClient(
                     rpc_url=Settings.EVM_RPC_URL,
                     private_key=evm_private_key,
                     timeout=Settings.AIXBT_REQUEST_TIMEOUT,  # Reuse timeout setting
                 )
-                evm_tools = EvmTools(client=evm_client)
-                for tool in create_evm_tools(evm_tools):
+                evm_tools = evm.EvmTools(client=evm_client)
+                for tool in integration_factory("evm")(evm_tools):
                     tools.register(tool)
                 logger.info("EVM tools initialized successfully")
             except Exception as exc:
                 logger.warning(f"Failed to initialize EVM tools: {exc}")
 
         desired_hyper_account = Settings.EVM_WALLET_ADDRESS or Settings.HYPERLIQUID_ACCOUNT_ADDRESS
-        hyper_account_address = sync_stored_api_key(
+        hyper_account_address = await asyncio.to_thread(
+            sync_stored_api_key,
             secure_storage,
             "hyperliquid_account_address",
             desired_hyper_account,
@@ -710,14 +741,15 @@ class AgentBuilder:
         if hyperliquid_enabled:
             if hyper_private_key or hyper_account_address:
                 try:
-                    hyperliquid_client = HyperliquidClient(
+                    hyperliquid_client = load_integration("hyperliquid").HyperliquidClient(
                         base_url=Settings.HYPERLIQUID_API_URL,
                         private_key=hyper_private_key,
                         account_address=hyper_account_address,
                         timeout=Settings.HYPERLIQUID_REQUEST_TIMEOUT,
                         default_slippage=Settings.HYPERLIQUID_DEFAULT_SLIPPAGE,
+                        stream_mids=Settings.HYPERLIQUID_STREAM_MIDS,
                     )
-                    for tool in create_hyperliquid_tools(hyperliquid_client):
+                    for tool in integration_factory("hyperliquid")(hyperliquid_client):
                         tools.register(tool)
                 except Exception as exc:
                     logger.warning(f"Failed to initialize Hyperliquid tools: {exc}")
@@ -729,28 +761,34 @@ class AgentBuilder:
 
         aster_client: Optional[AsterFuturesClient] = None
         if aster_enabled:
-            aster_api_key = secure_storage.get_api_key("aster_api")
+            aster_api_key = await asyncio.to_thread(secure_storage.get_api_key, "aster_api")
             if not aster_api_key and Settings.ASTER_API_KEY:
-                if secure_storage.store_api_key("aster_api", Settings.ASTER_API_KEY):
+                if await asyncio.to_thread(
+                    secure_storage.store_api_key, "aster_api", Settings.ASTER_API_KEY
+                ):
                     aster_api_key = Settings.ASTER_API_KEY
                 else:
                     aster_api_key = Settings.ASTER_API_KEY
 
-            aster_api_secret = secure_storage.get_private_key("aster_api_secret")
+            aster_api_secret = await asyncio.to_thread(
+                secure_storage.get_private_key, "aster_api_secret"
+            )
             if not aster_api_secret and Settings.ASTER_API_SECRET:
-                if secure_storage.store_private_key("aster_api_secret", Settings.ASTER_API_SECRET):
+                if await asyncio.to_thread(
+                    secure_storage.store_private_key, "aster_api_secret", Settings.ASTER_API_SECRET
+                ):
                     aster_api_secret = Settings.ASTER_API_SECRET
                 else:
                     aster_api_secret = Settings.ASTER_API_SECRET
 
             if aster_api_key and aster_api_secret:
-                aster_client = AsterFuturesClient(
+                aster_client = load_integration("aster_futures").AsterFuturesClient(
                     base_url=Settings.ASTER_BASE_URL,
                     api_key=aster_api_key,
                     api_secret=aster_api_secret,
                     default_recv_window=Settings.ASTER_DEFAULT_RECV_WINDOW,
                 )
-                for tool in create_aster_futures_tools(aster_client):
+                for tool in integration_factory("aster_futures")(aster_client):
                     tools.register(tool)
             else:
                 logger.warning(
@@ -767,11 +805,12 @@ class AgentBuilder:
             logger.warning(f"Plugin loading encountered an issue: {e}")
 
         # Smart trader (pump.fun -> Jupiter fallback)
-        smart_trader_default = solana_enabled and (pump_enabled or jupiter_enabled)
-        if self._tool_enabled("smart_trader", smart_trader_default):
+        if smart_trader_enabled:
             try:
-                trader = SmartTrader(pump_tools, jupiter_tools, solana_tools)
-                for tool in create_smart_trader_tools(trader):
+                trader = load_integration("smart_trader").SmartTrader(
+                    pump_tools, jupiter_tools, solana_tools
+                )
+                for tool in integration_factory("smart_trader")(trader):
                     tools.register(tool)
             except Exception as e:
                 logger.warning(f"Failed to register smart trader tools: {e}")
@@ -792,6 +831,9 @@ class AgentBuilder:
         setattr(agent, "_coinbase_x402_tools", coinbase_tools)
         setattr(agent, "_llm", llm)
 
+        if Settings.SAM_TOOL_ROUTING:
+            agent.tool_router = ToolRouter(tools, max_tools=Settings.SAM_TOOL_ROUTING_MAX_TOOLS)
+
         logger.info(f"Agent built with {len(tools.list_specs())} tools")
         return agent
 
@@ -814,3 +856,21 @@ async def cleanup_agent_fast() -> None:
                     t.cancel()
     except Exception:
         pass
+
+
+async def shutdown_shared_resources() -> None:
+    """Process-exit cleanup, including state meant to outlive individual requests.
+
+    RPC routers, the shared Hyperliquid price stream, wallet balance subscriptions,
+    buffered quota usage, the named executor pools, the HTTP response cache and
+    decrypted user secrets outlive agent builds, so they are only released here
+    (API shutdown, CLI exit) and never by ``cleanup_agent_fast``.
+    """
+    await cleanup_agent_fast()
+    clear_http_cache()
+    clear_secret_cache()
+    for func in (*loaded_shutdown_hooks(), flush_quota_usage, shutdown_executors):
+        try:
+            await asyncio.wait_for(func(), timeout=1.0)
+        except Exception:
+            pass
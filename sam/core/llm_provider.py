@@ -8,12 +8,13 @@ import json
 import logging
 import os
 import time
-from importlib.metadata import entry_points
 
 import aiohttp
 
+from ..config.config_loader import plugin_entry_points
 from ..config.settings import Settings
-from ..utils.http_client import get_session
+from ..utils.host_limits import CRITICAL_HOST_POLICY
+from ..utils.http_client import get_session, set_host_policy
 
 logger = logging.getLogger(__name__)
 
@@ -135,6 +136,9 @@ class LLMProvider:
         self.api_key = api_key
         self.model = model
         self.base_url = base_url
+        if base_url:
+            # Keep LLM calls on their own fixed budget, independent of market-data hosts
+            set_host_policy(base_url, CRITICAL_HOST_POLICY)
 
     async def close(self) -> None:
         """Close method for compatibility - shared client handles cleanup."""
@@ -717,7 +721,7 @@ def create_llm_provider(overrides: Optional[Dict[str, Any]] = None) -> LLMProvid
 
     # Try external provider plugins first (entry points)
     try:
-        eps = entry_points(group="sam.llm_providers")
+        eps = plugin_entry_points("sam.llm_providers")
         for ep in eps:
             if ep.name == provider:
                 try:
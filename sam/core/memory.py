@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple, cast
 from ..utils.connection_pool import get_db_connection, execute_with_logging
 from ..utils.sanitize import sanitize_messages, sanitize_session_name
 from .migration_definitions import register_all_migrations
-from .migrations import get_migration_manager
+from .migrations import ensure_schema, get_migration_manager
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,14 @@ class MemoryManager:
         return "default"
 
     async def initialize(self) -> None:
-        """Initialize database tables. Must be called after creating the manager."""
+        """Initialize database tables. Must be called after creating the manager.
+
+        Migrations and table setup run once per process for each database;
+        later calls only check that the database file is unchanged.
+        """
+        await ensure_schema(self.db_path, self._setup_schema)
+
+    async def _setup_schema(self) -> None:
         # Register and run migrations
         await register_all_migrations(self.db_path)
         manager = get_migration_manager(self.db_path)
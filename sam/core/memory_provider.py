@@ -3,11 +3,11 @@ from __future__ import annotations
 import importlib
 import logging
 import os
-from importlib.metadata import EntryPoint, entry_points
+from importlib.metadata import EntryPoint
 from typing import Callable, Iterable, Optional, cast
 
 from .memory import MemoryManager
-from ..config.config_loader import load_config
+from ..config.config_loader import load_config, plugin_entry_points
 from ..config.settings import Settings
 
 logger = logging.getLogger(__name__)
@@ -51,14 +51,7 @@ def _load_from_env(db_path: str) -> Optional[MemoryManager]:
 
 
 def _iter_memory_backends() -> Iterable[EntryPoint]:
-    eps = entry_points()
-    select = getattr(eps, "select", None)
-    if callable(select):
-        return cast(Iterable[EntryPoint], select(group="sam.memory_backends"))
-    group = getattr(eps, "get", None)
-    if callable(group):
-        return cast(Iterable[EntryPoint], group("sam.memory_backends", []))
-    return ()
+    return plugin_entry_points("sam.memory_backends")
 
 
 def create_memory_manager(db_path: Optional[str] = None) -> MemoryManager:
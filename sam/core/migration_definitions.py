@@ -567,5 +567,159 @@ async def register_all_migrations(db_path: str) -> None:
         )
     )
 
+    # Migration 15: Persistent token metadata shared across sessions
+    async def migration_015_up(conn):
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_metadata (
+                mint TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                refreshed_at REAL NOT NULL
+            )
+            """
+        )
+
+    manager.register(
+        Migration(
+            version=15,
+            name="add_token_metadata",
+            description="Add token_metadata table for the cross-session token registry",
+            up=migration_015_up,
+        )
+    )
+
+    # Migration 16: Maintained rating aggregates and per-sort marketplace indexes
+    async def migration_016_up(conn):
+        cursor = await conn.execute("PRAGMA table_info(public_agents)")
+        columns = [row[1] for row in await cursor.fetchall()]
+        if "rating_sum" not in columns:
+            await conn.execute(
+                "ALTER TABLE public_agents ADD COLUMN rating_sum INTEGER NOT NULL DEFAULT 0"
+            )
+        if "rating_count" not in columns:
+            await conn.execute(
+                "ALTER TABLE public_agents ADD COLUMN rating_count INTEGER NOT NULL DEFAULT 0"
+            )
+
+        # Backfill from existing ratings; add_rating keeps them current from now on
+        await conn.execute(
+            """
+            UPDATE public_agents SET
+                rating_sum = COALESCE(
+                    (SELECT SUM(rating) FROM agent_ratings r WHERE r.public_id = public_agents.public_id),
+                    0
+                ),
+                rating_count = (
+                    SELECT COUNT(*) FROM agent_ratings r WHERE r.public_id = public_agents.public_id
+                )
+            """
+        )
+
+        # One index per marketplace sort order (filter, sort key, keyset tie-breaker)
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_public_agents_popular "
+            "ON public_agents(visibility, download_count DESC, id DESC)"
+        )
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_public_agents_recent "
+            "ON public_agents(visibility, published_at DESC, id DESC)"
+        )
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_public_agents_rating "
+            "ON public_agents(visibility, (rating_sum * 1.0 / MAX(rating_count, 1)) DESC, id DESC)"
+        )
+
+    manager.register(
+        Migration(
+            version=16,
+            name="add_rating_aggregates",
+            description="Add rating_sum/rating_count to public_agents and marketplace sort indexes",
+            up=migration_016_up,
+        )
+    )
+
+    # Migration 17: Per-user usage counters maintained by triggers
+    async def migration_017_up(conn):
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_usage (
+                user_id TEXT PRIMARY KEY,
+                session_count INTEGER NOT NULL DEFAULT 0,
+                agent_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+        # Counters change in the same transaction as the rows they count
+        triggers = {
+            "trg_sessions_usage_insert": """
+                AFTER INSERT ON sessions BEGIN
+                    INSERT INTO user_usage (user_id, session_count) VALUES (NEW.user_id, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET session_count = session_count + 1;
+                END
+            """,
+            "trg_sessions_usage_delete": """
+                AFTER DELETE ON sessions BEGIN
+                    UPDATE user_usage SET session_count = MAX(session_count - 1, 0)
+                    WHERE user_id = OLD.user_id;
+                END
+            """,
+            "trg_sessions_usage_update": """
+                AFTER UPDATE OF user_id ON sessions BEGIN
+                    UPDATE user_usage SET session_count = MAX(session_count - 1, 0)
+                    WHERE user_id = OLD.user_id;
+                    INSERT INTO user_usage (user_id, session_count) VALUES (NEW.user_id, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET session_count = session_count + 1;
+                END
+            """,
+            "trg_agents_usage_insert": """
+                AFTER INSERT ON agents WHEN NEW.is_template = 0 BEGIN
+                    INSERT INTO user_usage (user_id, agent_count) VALUES (NEW.user_id, 1)
+                    ON CONFLICT(user_id) DO UPDATE SET agent_count = agent_count + 1;
+                END
+            """,
+            "trg_agents_usage_delete": """
+                AFTER DELETE ON agents WHEN OLD.is_template = 0 BEGIN
+                    UPDATE user_usage SET agent_count = MAX(agent_count - 1, 0)
+                    WHERE user_id = OLD.user_id;
+                END
+            """,
+            "trg_agents_usage_update": """
+                AFTER UPDATE OF user_id, is_template ON agents BEGIN
+                    UPDATE user_usage SET agent_count = MAX(agent_count - 1, 0)
+                    WHERE user_id = OLD.user_id AND OLD.is_template = 0;
+                    INSERT INTO user_usage (user_id, agent_count)
+                    SELECT NEW.user_id, 1 WHERE NEW.is_template = 0
+                    ON CONFLICT(user_id) DO UPDATE SET agent_count = agent_count + 1;
+                END
+            """,
+        }
+        for name, body in triggers.items():
+            await conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+        # Backfill from the existing rows
+        await conn.execute(
+            """
+            INSERT INTO user_usage (user_id, session_count, agent_count)
+            SELECT user_id, SUM(sessions), SUM(agents) FROM (
+                SELECT user_id, COUNT(*) AS sessions, 0 AS agents FROM sessions GROUP BY user_id
+                UNION ALL
+                SELECT user_id, 0, COUNT(*) FROM agents WHERE is_template = 0 GROUP BY user_id
+            ) WHERE true GROUP BY user_id
+            ON CONFLICT(user_id) DO UPDATE SET
+                session_count = excluded.session_count, agent_count = excluded.agent_count
+            """
+        )
+
+    manager.register(
+        Migration(
+            version=17,
+            name="add_user_usage_counters",
+            description="Add user_usage session/agent counters kept current by triggers",
+            up=migration_017_up,
+        )
+    )
+
 
 __all__ = ["register_all_migrations"]
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
 from ..utils.connection_pool import get_db_connection
 
@@ -222,6 +230,104 @@ def reset_migration_manager() -> None:
     """Reset the global migration manager (for testing)."""
     global _migration_manager
     _migration_manager = None
+    reset_schema_state()
+
+
+# Schema setups this process has completed: (database, scope) -> identity of the
+# database file at the time, so a deleted or replaced file is set up again.
+_schema_ready: Dict[Tuple[str, str], Tuple[int, int]] = {}
+_schema_locks: Dict[Tuple[str, str], Tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+
+def _schema_key(db_path: str, scope: str) -> Tuple[str, str]:
+    return (os.path.realpath(db_path), scope)
+
+
+def _file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
 
 
-__all__ = ["Migration", "MigrationManager", "get_migration_manager"]
+def is_schema_ready(db_path: str, scope: str = "memory") -> bool:
+    """Whether ``scope``'s schema setup already ran for this database in this process."""
+    marked = _schema_ready.get(_schema_key(db_path, scope))
+    return marked is not None and marked == _file_identity(db_path)
+
+
+def _setup_lock(key: Tuple[str, str]) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    entry = _schema_locks.get(key)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Lock())
+        _schema_locks[key] = entry
+    return entry[1]
+
+
+@asynccontextmanager
+async def migration_lock(db_path: str) -> AsyncIterator[None]:
+    """Exclusive lock across processes for migrating ``db_path``.
+
+    Uses an advisory ``flock`` on ``<db_path>.migrate.lock`` so that several
+    workers starting together don't apply the same migration twice. Platforms
+    without ``fcntl`` run unlocked.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = f"{db_path}.migrate.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+async def ensure_schema(
+    db_path: str, setup: Callable[[], Awaitable[None]], scope: str = "memory"
+) -> bool:
+    """Run ``setup`` once per process and database, under :func:`migration_lock`.
+
+    Later calls are a dictionary lookup plus one ``stat``. Returns ``True`` if
+    ``setup`` ran.
+    """
+    if is_schema_ready(db_path, scope):
+        return False
+    key = _schema_key(db_path, scope)
+    async with _setup_lock(key):
+        if is_schema_ready(db_path, scope):
+            return False
+        async with migration_lock(db_path):
+            await setup()
+        identity = _file_identity(db_path)
+        if identity is not None:
+            _schema_ready[key] = identity
+    return True
+
+
+def reset_schema_state(db_path: Optional[str] = None) -> None:
+    """Forget completed schema setups (all, or those for ``db_path``)."""
+    if db_path is None:
+        _schema_ready.clear()
+        return
+    path = os.path.realpath(db_path)
+    for key in [k for k in _schema_ready if k[0] == path]:
+        del _schema_ready[key]
+
+
+__all__ = [
+    "Migration",
+    "MigrationManager",
+    "ensure_schema",
+    "get_migration_manager",
+    "is_schema_ready",
+    "migration_lock",
+    "reset_schema_state",
+]
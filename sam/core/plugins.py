@@ -1,13 +1,23 @@
+import ast
 import logging
 import os
 from importlib import import_module
-from typing import Any, Callable, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from ..config.plugin_policy import PluginPolicy
-from .tools import ToolRegistry
+from pydantic import ValidationError
+
+from ..config.plugin_policy import ModuleMetadata, PluginPolicy
+from .tools import Tool, ToolRegistry, ToolSpec
 
 logger = logging.getLogger(__name__)
 
+# Top-level literal a plugin module can define to be registered without importing it
+MANIFEST_NAME = "SAM_PLUGIN_MANIFEST"
+
+# (origin, sha256) -> specs declared in the module source (None: no manifest)
+_manifest_cache: Dict[Tuple[str, str], Optional[List[ToolSpec]]] = {}
+
 
 def _call_plugin_register(
     fn: Callable[..., Any], registry: ToolRegistry, agent: Optional[Any]
@@ -36,6 +46,128 @@ def _call_plugin_register(
         logger.warning(f"Plugin register callable failed: {e}")
 
 
+def _module_register(mod_path: str) -> Optional[Callable[..., Any]]:
+    module = import_module(mod_path)
+    register_fn = getattr(module, "register", None) or getattr(module, "register_tools", None)
+    return register_fn if callable(register_fn) else None
+
+
+def read_manifest(metadata: ModuleMetadata) -> Optional[List[ToolSpec]]:
+    """Tool specs a plugin declares in a top-level ``SAM_PLUGIN_MANIFEST`` list.
+
+    The list is read from the verified source with ``ast`` rather than by
+    importing the module, and is cached per source digest.
+    """
+    if not metadata.origin or not metadata.sha256 or not metadata.origin.endswith(".py"):
+        return None
+    key = (metadata.origin, metadata.sha256)
+    if key in _manifest_cache:
+        return _manifest_cache[key]
+
+    manifest: Optional[List[ToolSpec]] = None
+    try:
+        tree = ast.parse(Path(metadata.origin).read_bytes())
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets = [node.target]
+            else:
+                continue
+            if any(isinstance(t, ast.Name) and t.id == MANIFEST_NAME for t in targets):
+                manifest = [ToolSpec(**entry) for entry in ast.literal_eval(node.value)]
+    except Exception as e:
+        logger.warning(f"Ignoring plugin manifest of {metadata.name}: {e}")
+        manifest = None
+    _manifest_cache[key] = manifest
+    return manifest
+
+
+class _LazyPlugin:
+    """Registers a plugin's manifest tools and imports it on the first call."""
+
+    def __init__(
+        self,
+        metadata: ModuleMetadata,
+        load_register: Callable[[], Optional[Callable[..., Any]]],
+        policy: PluginPolicy,
+        agent: Optional[Any],
+    ) -> None:
+        self.metadata = metadata
+        self._load_register = load_register
+        self._policy = policy
+        self._agent = agent
+        self._tools: Optional[Dict[str, Tool]] = None
+
+    def _resolve(self) -> Dict[str, Tool]:
+        if self._tools is None:
+            # The digest was checked when the manifest was registered; the file
+            # must not have changed since then.
+            current = self._policy.resolve_metadata(self.metadata.name)
+            if current.sha256 != self.metadata.sha256:
+                raise RuntimeError(
+                    f"Plugin {self.metadata.name} changed on disk since it was verified"
+                )
+            register_fn = self._load_register()
+            if register_fn is None:
+                raise RuntimeError(f"Plugin {self.metadata.name} has no register callable")
+            scratch = ToolRegistry()
+            _call_plugin_register(register_fn, scratch, self._agent)
+            self._tools = dict(scratch._tools)
+            logger.info(f"Imported plugin {self.metadata.name} on first use")
+        return self._tools
+
+    def tool(self, spec: ToolSpec) -> Tool:
+        async def handler(args: Dict[str, Any]) -> Dict[str, Any]:
+            real = self._resolve().get(spec.name)
+            if real is None:
+                raise RuntimeError(
+                    f"Plugin {self.metadata.name} did not register '{spec.name}' "
+                    "declared in its manifest"
+                )
+            # Later calls go straight to the real tool, validated by the registry
+            lazy.handler = real.handler
+            lazy.input_model = real.input_model
+            lazy.output_projection = real.output_projection
+            if real.input_model is not None:
+                try:
+                    args = real.input_model(**(args or {})).model_dump()
+                except ValidationError as ve:
+                    return {
+                        "success": False,
+                        "error": f"Validation failed: {ve.errors()}",
+                        "error_detail": {
+                            "code": "validation_error",
+                            "message": f"Validation failed: {ve.errors()}",
+                        },
+                    }
+            return await real.handler(args)
+
+        lazy = Tool(spec=spec, handler=handler)
+        return lazy
+
+
+def _register_plugin(
+    registry: ToolRegistry,
+    agent: Optional[Any],
+    policy: PluginPolicy,
+    metadata: ModuleMetadata,
+    load_register: Callable[[], Optional[Callable[..., Any]]],
+) -> bool:
+    """Register from the manifest when there is one, otherwise import now."""
+    manifest = read_manifest(metadata)
+    if manifest:
+        plugin = _LazyPlugin(metadata, load_register, policy, agent)
+        for spec in manifest:
+            registry.register(plugin.tool(spec))
+        return True
+    register_fn = load_register()
+    if register_fn is None:
+        return False
+    _call_plugin_register(register_fn, registry, agent)
+    return True
+
+
 def load_plugins(
     registry: ToolRegistry,
     agent: Optional[Any] = None,
@@ -49,6 +181,10 @@ def load_plugins(
       that takes (registry, agent) or (registry) and registers tools.
     - Environment variable: SAM_PLUGINS — comma-separated module paths.
       Each module may expose a 'register' or 'register_tools' callable.
+
+    A plugin module that defines ``SAM_PLUGIN_MANIFEST`` (a literal list of
+    tool spec dicts) is registered from that list and only imported when one
+    of its tools is first called.
     """
     policy = policy or PluginPolicy.from_env()
 
@@ -58,17 +194,16 @@ def load_plugins(
 
     # 1) Python entry points
     try:
-        from importlib.metadata import entry_points
+        from ..config.config_loader import plugin_entry_points
 
-        eps = entry_points(group="sam.plugins")
+        eps = plugin_entry_points("sam.plugins")
         for ep in eps:
             try:
                 metadata = policy.resolve_metadata(ep.module)
                 if not policy.permits(metadata=metadata, entry_point=ep.name):
                     continue
 
-                plugin = ep.load()
-                _call_plugin_register(plugin, registry, agent)
+                _register_plugin(registry, agent, policy, metadata, ep.load)
                 logger.info(f"Loaded plugin from entry point: {ep.name}")
             except Exception as e:
                 logger.warning(f"Failed loading plugin entry point {ep.name}: {e}")
@@ -87,12 +222,9 @@ def load_plugins(
             if not policy.permits(metadata=metadata, entry_point=None):
                 continue
 
-            module = import_module(mod_path)
-            register_fn = getattr(module, "register", None) or getattr(
-                module, "register_tools", None
-            )
-            if callable(register_fn):
-                _call_plugin_register(register_fn, registry, agent)
+            if _register_plugin(
+                registry, agent, policy, metadata, lambda m=mod_path: _module_register(m)
+            ):
                 logger.info(f"Loaded plugin module: {mod_path}")
             else:
                 logger.warning(
@@ -1,8 +1,22 @@
-"""Per-user resource quota management for SAM Framework."""
+"""Per-user resource quota management for SAM Framework.
+
+Quota checks are O(1):
+
+- session and agent counts come from the ``user_usage`` counters, which database
+  triggers keep current in the same transaction as the rows they count
+  (file-based agent storage is counted by file name instead);
+- quota limits and daily token usage are cached in-process for ``cache_ttl``
+  seconds;
+- token usage accumulates in memory and is written in one batch every
+  ``flush_interval`` seconds (and at shutdown). ``reconcile_usage`` flushes and
+  recomputes the counters from the source tables.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, Optional, Tuple
 from dataclasses import dataclass
@@ -45,8 +59,16 @@ class UserQuota:
 class QuotaManager:
     """Manages per-user resource quotas."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, cache_ttl: float = 30.0, flush_interval: float = 5.0):
         self.db_path = db_path
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        # user_id -> (quota as last read from the database, monotonic expiry)
+        self._quotas: Dict[str, Tuple[UserQuota, float]] = {}
+        # Token usage not yet written (pending) or being written (flushing)
+        self._pending_tokens: Dict[str, int] = {}
+        self._flushing_tokens: Dict[str, int] = {}
+        self._flush_task: Optional[asyncio.Task[None]] = None
 
     async def get_or_create_quota(
         self, user_id: str, defaults: Optional[Dict[str, int]] = None
@@ -142,18 +164,50 @@ class QuotaManager:
                     created_at=now,
                 )
 
-    async def check_session_quota(self, user_id: str) -> Tuple[bool, Optional[str]]:
-        """Check if user can create a new session."""
+    async def _cached_quota(self, user_id: str) -> UserQuota:
+        """Quota from the in-process cache, re-read once expired or past the daily reset."""
+        cached = self._quotas.get(user_id)
+        if cached is not None:
+            quota, expires_at = cached
+            if time.monotonic() < expires_at and datetime.now(timezone.utc) < quota.tokens_reset_at:
+                return quota
         quota = await self.get_or_create_quota(user_id)
+        self._quotas[user_id] = (quota, time.monotonic() + self.cache_ttl)
+        return quota
 
-        # Count existing sessions
-        from .memory_provider import create_memory_manager
+    async def _usage_counts(self, user_id: str) -> Tuple[int, int]:
+        """(sessions, agents) from the trigger-maintained counters."""
+        async with get_db_connection(self.db_path) as conn:
+            cursor = await conn.execute(
+                "SELECT session_count, agent_count FROM user_usage WHERE user_id = ?",
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    async def _agent_count(self, user_id: str, db_count: int) -> int:
+        if Settings.SAM_AGENT_STORAGE == "database":
+            return db_count
+        # File storage: the index only reparses files that changed
+        from ..agents.manager import get_agent_index
+        from ..api.utils import get_user_agents_dir
+
+        return get_agent_index(get_user_agents_dir(user_id)).count()
+
+    def _tokens_used(self, quota: UserQuota) -> int:
+        user_id = quota.user_id
+        return (
+            quota.tokens_used_today
+            + self._pending_tokens.get(user_id, 0)
+            + self._flushing_tokens.get(user_id, 0)
+        )
 
-        memory = create_memory_manager(self.db_path)
-        await memory.initialize()
-        sessions = await memory.list_sessions(limit=1000, user_id=user_id)
+    async def check_session_quota(self, user_id: str) -> Tuple[bool, Optional[str]]:
+        """Check if user can create a new session."""
+        quota = await self._cached_quota(user_id)
+        sessions, _ = await self._usage_counts(user_id)
 
-        if len(sessions) >= quota.max_sessions:
+        if sessions >= quota.max_sessions:
             return (
                 False,
                 f"Session limit reached ({quota.max_sessions} max). Please delete old sessions.",
@@ -163,23 +217,9 @@ class QuotaManager:
 
     async def check_agent_quota(self, user_id: str) -> Tuple[bool, Optional[str]]:
         """Check if user can create a new agent."""
-        quota = await self.get_or_create_quota(user_id)
-
-        # Count existing agents
-        from ..api.storage import list_user_definitions
-
-        try:
-            agents = list_user_definitions(user_id)
-            agent_count = len(agents)
-        except Exception:
-            # Fallback: count files directly
-            import os
-
-            agent_dir = os.path.join(Settings.SAM_API_AGENT_ROOT, user_id, "agents")
-            if os.path.exists(agent_dir):
-                agent_count = len([f for f in os.listdir(agent_dir) if f.endswith(".agent.toml")])
-            else:
-                agent_count = 0
+        quota = await self._cached_quota(user_id)
+        _, db_agents = await self._usage_counts(user_id)
+        agent_count = await self._agent_count(user_id, db_agents)
 
         if agent_count >= quota.max_agents:
             return False, f"Agent limit reached ({quota.max_agents} max). Please delete old agents."
@@ -187,90 +227,110 @@ class QuotaManager:
         return True, None
 
     async def check_token_quota(self, user_id: str, tokens: int) -> Tuple[bool, Optional[str]]:
-        """Check if user can use tokens, and reserve them."""
-        quota = await self.get_or_create_quota(user_id)
+        """Check if user can use tokens, and reserve them.
 
-        # Reset if past reset time
+        The reservation is recorded in memory and written with the next batch flush.
+        """
+        quota = await self._cached_quota(user_id)
         now = datetime.now(timezone.utc)
-        if now >= quota.tokens_reset_at:
-            # Reset tokens
-            new_reset_at = now + timedelta(days=1)
-            async with get_db_connection(self.db_path) as conn:
-                await conn.execute(
-                    """
-                    UPDATE user_quotas 
-                    SET tokens_used_today = 0, tokens_reset_at = ?
-                    WHERE user_id = ?
-                    """,
-                    (new_reset_at.isoformat(), user_id),
-                )
-                await conn.commit()
-            quota.tokens_used_today = 0
-            quota.tokens_reset_at = new_reset_at
+        used = self._tokens_used(quota)
 
-        if quota.tokens_used_today + tokens > quota.max_tokens_per_day:
-            remaining = quota.max_tokens_per_day - quota.tokens_used_today
+        if used + tokens > quota.max_tokens_per_day:
+            remaining = quota.max_tokens_per_day - used
             return (
                 False,
                 f"Token quota exceeded. {remaining} tokens remaining today. Quota resets in {int((quota.tokens_reset_at - now).total_seconds() / 3600)} hours.",
             )
 
         # Reserve tokens
+        self._pending_tokens[user_id] = self._pending_tokens.get(user_id, 0) + tokens
+        self._schedule_flush()
+        return True, None
+
+    def _schedule_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        # A task left behind by a previous (closed) event loop never reports done
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush_token_usage()
+        except Exception as e:
+            logger.warning(f"Failed to flush token usage: {e}")
+
+    async def flush_token_usage(self) -> int:
+        """Write accumulated token usage in one transaction; returns tokens written."""
+        pending, self._pending_tokens = self._pending_tokens, {}
+        if not pending:
+            return 0
+        for user_id, tokens in pending.items():
+            self._flushing_tokens[user_id] = self._flushing_tokens.get(user_id, 0) + tokens
+
+        written = False
+        try:
+            async with get_db_connection(self.db_path) as conn:
+                await conn.executemany(
+                    """
+                    UPDATE user_quotas
+                    SET tokens_used_today = tokens_used_today + ?
+                    WHERE user_id = ?
+                    """,
+                    [(tokens, user_id) for user_id, tokens in pending.items()],
+                )
+                await conn.commit()
+            written = True
+        finally:
+            for user_id, tokens in pending.items():
+                left = self._flushing_tokens.get(user_id, 0) - tokens
+                if left > 0:
+                    self._flushing_tokens[user_id] = left
+                else:
+                    self._flushing_tokens.pop(user_id, None)
+                if not written:
+                    # Keep the usage for the next flush
+                    self._pending_tokens[user_id] = self._pending_tokens.get(user_id, 0) + tokens
+                elif user_id in self._quotas:
+                    self._quotas[user_id][0].tokens_used_today += tokens
+        return sum(pending.values())
+
+    async def reconcile_usage(self) -> None:
+        """Hard reconciliation: flush tokens and recount usage from the source tables."""
+        await self.flush_token_usage()
         async with get_db_connection(self.db_path) as conn:
+            await conn.execute("UPDATE user_usage SET session_count = 0, agent_count = 0")
             await conn.execute(
                 """
-                UPDATE user_quotas 
-                SET tokens_used_today = tokens_used_today + ?
-                WHERE user_id = ?
-                """,
-                (tokens, user_id),
+                INSERT INTO user_usage (user_id, session_count, agent_count)
+                SELECT user_id, SUM(sessions), SUM(agents) FROM (
+                    SELECT user_id, COUNT(*) AS sessions, 0 AS agents
+                    FROM sessions GROUP BY user_id
+                    UNION ALL
+                    SELECT user_id, 0, COUNT(*) FROM agents WHERE is_template = 0 GROUP BY user_id
+                ) WHERE true GROUP BY user_id
+                ON CONFLICT(user_id) DO UPDATE SET
+                    session_count = excluded.session_count, agent_count = excluded.agent_count
+                """
             )
             await conn.commit()
-
-        return True, None
+        self._quotas.clear()
 
     async def get_quota_status(self, user_id: str) -> Dict[str, Any]:
         """Get current quota status for a user."""
-        quota = await self.get_or_create_quota(user_id)
-
-        # Count actual usage
-        from .memory_provider import create_memory_manager
-
-        memory = create_memory_manager(self.db_path)
-        await memory.initialize()
-        sessions = await memory.list_sessions(limit=1000, user_id=user_id)
-
-        # Count agents
-        from ..api.storage import list_user_definitions
-
-        try:
-            agents = list_user_definitions(user_id)
-            agent_count = len(agents)
-        except Exception:
-            # Fallback: count files directly
-            import os
-
-            agent_dir = os.path.join(Settings.SAM_API_AGENT_ROOT, user_id, "agents")
-            if os.path.exists(agent_dir):
-                agent_count = len([f for f in os.listdir(agent_dir) if f.endswith(".agent.toml")])
-            else:
-                agent_count = 0
-
-        # Count messages in sessions (approximate)
-        total_messages = 0
-        for session in sessions[:10]:  # Sample first 10 sessions
-            try:
-                messages, _, _ = await memory.load_session(session["session_id"], user_id=user_id)
-                total_messages += len(messages)
-            except Exception:
-                pass
+        quota = await self._cached_quota(user_id)
+        sessions, db_agents = await self._usage_counts(user_id)
+        agent_count = await self._agent_count(user_id, db_agents)
+        tokens_used = self._tokens_used(quota)
 
         return {
             "user_id": user_id,
             "sessions": {
-                "used": len(sessions),
+                "used": sessions,
                 "limit": quota.max_sessions,
-                "remaining": max(0, quota.max_sessions - len(sessions)),
+                "remaining": max(0, quota.max_sessions - sessions),
             },
             "agents": {
                 "used": agent_count,
@@ -278,9 +338,9 @@ class QuotaManager:
                 "remaining": max(0, quota.max_agents - agent_count),
             },
             "tokens": {
-                "used_today": quota.tokens_used_today,
+                "used_today": tokens_used,
                 "limit": quota.max_tokens_per_day,
-                "remaining": quota.get_tokens_remaining(),
+                "remaining": max(0, quota.max_tokens_per_day - tokens_used),
                 "resets_at": quota.tokens_reset_at.isoformat(),
             },
             "messages_per_session": {
@@ -325,7 +385,8 @@ class QuotaManager:
             await conn.commit()
 
         # Return updated quota
-        return await self.get_or_create_quota(user_id)
+        self._quotas.pop(user_id, None)
+        return await self._cached_quota(user_id)
 
 
 # Global quota manager instance
@@ -338,3 +399,9 @@ def get_quota_manager(db_path: Optional[str] = None) -> QuotaManager:
     if _quota_manager is None:
         _quota_manager = QuotaManager(db_path or Settings.SAM_DB_PATH)
     return _quota_manager
+
+
+async def flush_quota_usage() -> None:
+    """Write buffered token usage (process shutdown)."""
+    if _quota_manager is not None:
+        await _quota_manager.flush_token_usage()
@@ -0,0 +1,135 @@
+"""Compact projections of tool results for the LLM transcript.
+
+Tool results are re-sent to the model on every later iteration, so the copy that
+goes into the transcript is shaped: excluded fields are dropped, long lists are
+truncated with an "N more omitted" marker, floats are cut to six significant
+digits (so tiny token prices survive) and long strings clipped, and the
+serialized result is held to a byte budget (roughly four bytes per token). Event subscribers still receive the full, unshaped result.
+"""
+
+import json
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Sequence
+
+# Keys that carry the outcome of a call and are never projected away
+_PROTECTED_KEYS = frozenset({"success", "error", "error_detail", "message", "category", "title"})
+
+
+@dataclass(frozen=True)
+class ResultProjection:
+    """How a tool's result is shaped for the transcript.
+
+    ``include`` keeps only the listed top-level keys (plus outcome keys such as
+    ``success`` and ``error``); ``exclude`` drops dotted paths like ``"raw"`` or
+    ``"pair.info"``. ``max_bytes`` caps the serialized size; lists are shortened
+    further until the result fits.
+    """
+
+    include: Optional[Sequence[str]] = None
+    exclude: Sequence[str] = field(default_factory=tuple)
+    max_list_items: int = 20
+    float_digits: int = 6  # Significant digits, not decimal places
+    max_string: int = 1000
+    max_bytes: int = 16_000
+
+
+DEFAULT_PROJECTION = ResultProjection()
+
+
+def _drop_path(value: Any, path: List[str]) -> None:
+    if not path:
+        return
+    if isinstance(value, list):
+        for item in value:
+            _drop_path(item, path)
+        return
+    if not isinstance(value, dict):
+        return
+    head, rest = path[0], path[1:]
+    if head not in value:
+        return
+    if rest:
+        _drop_path(value[head], rest)
+    else:
+        del value[head]
+
+
+def _compact(value: Any, projection: ResultProjection) -> Any:
+    if isinstance(value, dict):
+        return {str(k): _compact(v, projection) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_compact(v, projection) for v in value[: projection.max_list_items]]
+        omitted = len(value) - len(items)
+        if omitted > 0:
+            items.append(f"... {omitted} more omitted")
+        return items
+    if isinstance(value, float):
+        return float(f"{value:.{projection.float_digits}g}")
+    if isinstance(value, str) and len(value) > projection.max_string:
+        return (
+            value[: projection.max_string]
+            + f"... [{len(value) - projection.max_string} chars omitted]"
+        )
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+def shape_result(result: Any, projection: Optional[ResultProjection] = None) -> Any:
+    """Return a compact copy of ``result``; the input is never modified."""
+    projection = projection or DEFAULT_PROJECTION
+    if not isinstance(result, dict):
+        return _compact(result, projection)
+
+    # Round-trip through JSON so projections never mutate the caller's result
+    # and non-JSON values (Pubkeys, Decimals, ...) become strings once.
+    working: Dict[str, Any] = json.loads(_dumps(result))
+    if projection.include is not None:
+        keep = set(projection.include) | _PROTECTED_KEYS
+        working = {k: v for k, v in working.items() if k in keep}
+    for path in projection.exclude:
+        if path.split(".", 1)[0] not in _PROTECTED_KEYS:
+            _drop_path(working, path.split("."))
+
+    shaped = _compact(working, projection)
+    # Tighten lists and strings until the result fits the byte budget
+    current = projection
+    while len(_dumps(shaped)) > projection.max_bytes and (
+        current.max_list_items > 1 or current.max_string > 80
+    ):
+        current = replace(
+            current,
+            max_list_items=max(1, current.max_list_items // 2),
+            max_string=max(80, current.max_string // 2),
+        )
+        shaped = _compact(working, current)
+
+    if len(_dumps(shaped)) > projection.max_bytes:
+        scalars = {
+            k: v
+            for k, v in shaped.items()
+            if not isinstance(v, (dict, list)) or k in _PROTECTED_KEYS
+        }
+        scalars["_truncated"] = (
+            f"Result exceeded {projection.max_bytes} bytes; nested fields "
+            f"{sorted(k for k in shaped if k not in scalars)} were omitted"
+        )
+        return scalars
+    return shaped
+
+
+def serialize_for_transcript(result: Any, projection: Optional[ResultProjection] = None) -> str:
+    """Shape ``result`` and serialize it for a ``role: tool`` message."""
+    if not isinstance(result, dict):
+        return str(result)
+    return _dumps(shape_result(result, projection))
+
+
+__all__ = [
+    "DEFAULT_PROJECTION",
+    "ResultProjection",
+    "serialize_for_transcript",
+    "shape_result",
+]
@@ -0,0 +1,297 @@
+"""Per-turn tool subsetting so the LLM only receives relevant tool schemas.
+
+Every registered tool schema used to be sent on every LLM iteration. The router
+scores tools against the latest user message with a small TF-IDF keyword index
+over tool names, descriptions, namespaces and parameter names, expands hits to
+their tool group (``ToolSpec.namespace`` or a shared name prefix such as
+``hyperliquid_``), seeds the selection with the groups of tools called in the
+previous turns (so "do it again" keeps working), and always exposes a ``request_tools`` escape hatch the model
+can call to pull in more tools for the rest of the turn.
+"""
+
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from .middleware import ToolCall, ToolContext
+from .tools import Tool, ToolRegistry, ToolSpec
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TOOLS_NAME = "request_tools"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "by",
+        "can",
+        "do",
+        "for",
+        "from",
+        "get",
+        "i",
+        "in",
+        "is",
+        "it",
+        "me",
+        "my",
+        "of",
+        "on",
+        "or",
+        "please",
+        "show",
+        "the",
+        "this",
+        "to",
+        "use",
+        "what",
+        "with",
+        "you",
+    }
+)
+# Leading name tokens too generic to group tools by
+_GENERIC_PREFIXES = frozenset({"get", "list", "search", "create", "close", "cancel", "set"})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and a naive plural strip."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _spec_text(spec: ToolSpec) -> str:
+    parts = [spec.name.replace("_", " "), spec.description, spec.namespace or ""]
+    schema = spec.input_schema or {}
+    params = schema.get("parameters") if isinstance(schema.get("parameters"), dict) else schema
+    properties = params.get("properties") if isinstance(params, dict) else None
+    if isinstance(properties, dict):
+        for key, prop in properties.items():
+            parts.append(key.replace("_", " "))
+            if isinstance(prop, dict) and isinstance(prop.get("description"), str):
+                parts.append(prop["description"])
+    return " ".join(parts)
+
+
+class RequestToolsInput(BaseModel):
+    query: str = Field("", description="What you need to do, e.g. 'hyperliquid positions'")
+    namespace: Optional[str] = Field(None, description="Optional tool group to load entirely")
+
+
+class ToolRouter:
+    """Selects the subset of registered tools to send to the LLM for a turn."""
+
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        *,
+        max_tools: int = 16,
+        always_include: Iterable[str] = (),
+        recent_turns: int = 1,
+    ) -> None:
+        self.registry = registry
+        self.max_tools = max_tools
+        self.recent_turns = recent_turns
+        self.always_include: Set[str] = set(always_include)
+        self._indexed_version: Optional[frozenset[str]] = None
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._idf: Dict[str, float] = {}
+        self._groups: Dict[str, str] = {}
+        self._group_members: Dict[str, List[str]] = {}
+        self._requested: Dict[str, Set[str]] = defaultdict(set)
+        registry.register(self._request_tools_tool())
+        # Middleware hook so request_tools sees the calling session
+        registry.add_middleware(self)
+
+    # Index -----------------------------------------------------------------
+
+    def _ensure_index(self) -> None:
+        names = frozenset(self.registry.tool_names())
+        if names == self._indexed_version:
+            return
+        specs = [s for s in self.registry.iter_specs() if s.name != REQUEST_TOOLS_NAME]
+
+        postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for spec in specs:
+            for token, count in Counter(tokenize(_spec_text(spec))).items():
+                postings[token][spec.name] = count
+        total = max(1, len(specs))
+        self._postings = dict(postings)
+        self._idf = {
+            token: math.log(1 + total / len(docs)) for token, docs in self._postings.items()
+        }
+
+        prefix_counts = Counter(spec.name.split("_", 1)[0] for spec in specs)
+        self._groups = {}
+        members: Dict[str, List[str]] = defaultdict(list)
+        for spec in specs:
+            prefix = spec.name.split("_", 1)[0]
+            if spec.namespace:
+                group = spec.namespace
+            elif prefix not in _GENERIC_PREFIXES and prefix_counts[prefix] > 1:
+                group = prefix
+            else:
+                group = spec.name
+            self._groups[spec.name] = group
+            members[group].append(spec.name)
+        self._group_members = dict(members)
+        self._indexed_version = names
+
+    def groups(self) -> Dict[str, List[str]]:
+        self._ensure_index()
+        return {group: list(names) for group, names in self._group_members.items()}
+
+    def score(self, text: str) -> Dict[str, float]:
+        self._ensure_index()
+        scores: Dict[str, float] = defaultdict(float)
+        for token in set(tokenize(text)):
+            docs = self._postings.get(token)
+            if not docs:
+                continue
+            idf = self._idf[token]
+            for name, count in docs.items():
+                scores[name] += idf * (1.0 + math.log(count))
+        # Mentioning a group by name ("kalshi", "hyperliquid") selects the whole group
+        for token in set(tokenize(text)):
+            for name in self._group_members.get(token, ()):
+                scores[name] += 5.0
+        return dict(scores)
+
+    # Selection -------------------------------------------------------------
+
+    def select(self, messages: List[Dict[str, Any]], session_id: Optional[str] = None) -> Set[str]:
+        """Names of the tools to expose for this turn's next LLM call."""
+        self._ensure_index()
+        if len(self._groups) <= self.max_tools:
+            return set(self._groups)
+
+        query = next(
+            (
+                str(m.get("content") or "")
+                for m in reversed(messages)
+                if m.get("role") == "user" and m.get("content")
+            ),
+            "",
+        )
+        # Groups of recently called tools come first; query hits fill the remaining budget
+        selected: Set[str] = set()
+        for name in self._recent_tool_names(messages):
+            selected.update(self._group_members[self._groups[name]])
+        ranked = sorted(self.score(query).items(), key=lambda item: (-item[1], item[0]))
+        for name, _ in ranked:
+            if len(selected) >= self.max_tools:
+                break
+            for member in self._group_members[self._groups[name]]:
+                selected.add(member)
+
+        # Tools already used in this transcript stay available
+        for message in messages:
+            if message.get("role") == "tool" and message.get("name") in self._groups:
+                selected.add(str(message["name"]))
+        if session_id is not None:
+            selected |= self._requested.get(session_id, set())
+        selected |= {name for name in self.always_include if name in self._groups}
+        selected.add(REQUEST_TOOLS_NAME)
+        return selected
+
+    def _recent_tool_names(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Tools called in the current turn and the ``recent_turns`` turns before it."""
+        names: List[str] = []
+        user_turns = 0
+        for message in reversed(messages):
+            role = message.get("role")
+            if role == "user":
+                user_turns += 1
+                if user_turns > self.recent_turns:
+                    break
+            elif role == "tool":
+                names.append(str(message.get("name") or ""))
+            elif role == "assistant":
+                for call in message.get("tool_calls") or []:
+                    if isinstance(call, dict):
+                        names.append(str((call.get("function") or {}).get("name") or ""))
+        return [name for name in dict.fromkeys(names) if name in self._groups]
+
+    def list_specs(
+        self, messages: List[Dict[str, Any]], session_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return self.registry.list_specs(names=self.select(messages, session_id))
+
+    def reset(self, session_id: str) -> None:
+        """Forget tools requested through the escape hatch (call at the start of a turn)."""
+        self._requested.pop(session_id, None)
+
+    # Escape hatch ----------------------------------------------------------
+
+    def request(self, session_id: str, query: str, namespace: Optional[str] = None) -> List[str]:
+        self._ensure_index()
+        added: Set[str] = set()
+        if namespace and namespace in self._group_members:
+            added.update(self._group_members[namespace])
+        if query:
+            ranked = sorted(self.score(query).items(), key=lambda item: (-item[1], item[0]))
+            for name, _ in ranked[: self.max_tools]:
+                added.update(self._group_members[self._groups[name]])
+        self._requested[session_id].update(added)
+        return sorted(added)
+
+    def _handle_request(self, session_id: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        added = self.request(session_id, args.get("query") or "", args.get("namespace"))
+        if not added:
+            return {
+                "error": "No matching tools found",
+                "available_groups": sorted(self.groups()),
+            }
+        return {"enabled_tools": added, "note": "These tools are available on your next step."}
+
+    def wrap(self, name: str, call_next: ToolCall) -> ToolCall:
+        if name != REQUEST_TOOLS_NAME:
+            return call_next
+
+        async def _call(args: Dict[str, Any], ctx: Optional[ToolContext]) -> Dict[str, Any]:
+            session_id = ctx.session_id if ctx and ctx.session_id else "default"
+            return self._handle_request(session_id, args)
+
+        return _call
+
+    def _request_tools_tool(self) -> Tool:
+        async def handle_request_tools(args: Dict[str, Any]) -> Dict[str, Any]:
+            return self._handle_request("default", args)
+
+        return Tool(
+            spec=ToolSpec(
+                name=REQUEST_TOOLS_NAME,
+                description=(
+                    "Load additional tools when none of the available tools fit the task. "
+                    "Describe the task or name a tool group (e.g. kalshi, hyperliquid, evm)."
+                ),
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string", "description": "What you need to do"},
+                        "namespace": {"type": "string", "description": "Tool group to load"},
+                    },
+                },
+            ),
+            handler=handle_request_tools,
+            input_model=RequestToolsInput,
+        )
+
+
+__all__ = ["REQUEST_TOOLS_NAME", "ToolRouter", "tokenize"]
@@ -1,8 +1,9 @@
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+from typing import Any, Awaitable, Callable, Collection, Dict, Iterator, List, Optional, Type
 import logging
 from pydantic import BaseModel, ValidationError
 from dataclasses import dataclass, field
 from .middleware import Middleware, ToolContext, ToolCall
+from .result_shaping import DEFAULT_PROJECTION, ResultProjection, serialize_for_transcript
 
 
 class ToolSpec(BaseModel):
@@ -23,23 +24,33 @@ class Tool:
         handler: Handler,
         *,
         input_model: Optional[Type[BaseModel]] = None,
+        output_projection: Optional[ResultProjection] = None,
     ) -> None:
         """A tool with schema and optional Pydantic input validation.
 
         input_model is optional and non-breaking. If provided, ToolRegistry
         will validate args using the model before invoking the handler,
         passing the validated dict to the handler.
+
+        output_projection controls how results are compacted for the LLM
+        transcript; the registry default applies when it is omitted.
         """
         self.spec = spec
         self.handler = handler
         self.input_model = input_model
+        self.output_projection = output_projection
 
 
 class ToolRegistry:
-    def __init__(self, middlewares: Optional[List[Middleware]] = None):
+    def __init__(
+        self,
+        middlewares: Optional[List[Middleware]] = None,
+        default_projection: ResultProjection = DEFAULT_PROJECTION,
+    ):
         self._tools: Dict[str, Tool] = {}
         self._middlewares: List[Middleware] = list(middlewares or [])
         self._logger = logging.getLogger(__name__)
+        self.default_projection = default_projection
 
     def register(self, tool: Tool) -> None:
         name = tool.spec.name
@@ -50,6 +61,13 @@ class ToolRegistry:
     def add_middleware(self, mw: Middleware) -> None:
         self._middlewares.append(mw)
 
+    def tool_names(self) -> List[str]:
+        return list(self._tools)
+
+    def iter_specs(self) -> Iterator[ToolSpec]:
+        for tool in self._tools.values():
+            yield tool.spec
+
     async def call(
         self, name: str, args: Dict[str, Any], context: Optional[ToolContext] = None
     ) -> Dict[str, Any]:
@@ -145,6 +163,16 @@ class ToolRegistry:
                 "error_detail": {"code": "normalization_error", "message": str(e)},
             }
 
+    def serialize_result(self, name: str, result: Any) -> str:
+        """Serialize a tool result for the LLM transcript using the tool's projection."""
+        tool = self._tools.get(name)
+        projection = (
+            tool.output_projection
+            if tool is not None and tool.output_projection is not None
+            else self.default_projection
+        )
+        return serialize_for_transcript(result, projection)
+
     def _derive_parameters_from_model(self, model_cls: Type[BaseModel]) -> Dict[str, Any]:
         """Derive JSON schema parameters for OpenAI tool format from a Pydantic model."""
         try:
@@ -156,11 +184,14 @@ class ToolRegistry:
             # Fallback minimal object shape
             return {"type": "object", "properties": {}, "required": []}
 
-    def list_specs(self) -> List[Dict[str, Any]]:
+    def list_specs(self, names: Optional[Collection[str]] = None) -> List[Dict[str, Any]]:
         # Emit tool specs; if input_model is provided and schema lacks parameters,
         # derive parameters to reduce duplication and keep providers happy.
+        # ``names`` restricts the output to a subset (used by the tool router).
         specs: List[Dict[str, Any]] = []
         for t in self._tools.values():
+            if names is not None and t.spec.name not in names:
+                continue
             spec = t.spec.model_dump()
             try:
                 if t.input_model is not None:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, TypeGuard, cast
 
@@ -8,9 +7,14 @@ from dexscreener import DexscreenerClient
 from pydantic import BaseModel, Field
 
 from ..core.tools import Tool, ToolSpec
+from ..core.result_shaping import ResultProjection
+from ..utils.executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
+# Pair listings can run to hundreds of entries; the model only needs the top few
+_PAIR_LISTING_PROJECTION = ResultProjection(max_list_items=10)
+
 
 class PriceWindow(Protocol):
     h1: Optional[float]
@@ -71,6 +75,9 @@ def _is_token_pair(pair: PairLike) -> TypeGuard[TokenPair]:
 
 
 class DexScreenerTools:
+    # Blocking SDK calls run on this named pool (see sam.utils.executors)
+    executor_name = "dexscreener"
+
     def __init__(self, client: Optional[DexClientProtocol] = None) -> None:
         self.client: DexClientProtocol = cast(DexClientProtocol, client or DexscreenerClient())
         logger.info("Initialized DexScreener client")
@@ -79,7 +86,7 @@ class DexScreenerTools:
         """Search for trading pairs by query."""
         try:
             # Run synchronous client in thread to avoid blocking event loop
-            results = await asyncio.to_thread(self.client.search_pairs, query)
+            results = await run_blocking(self.executor_name, self.client.search_pairs, query)
 
             pairs = [_serialize_pair_summary(pair) for pair in _ensure_sequence(results)]
 
@@ -94,7 +101,9 @@ class DexScreenerTools:
         """Get all trading pairs for a specific token."""
         try:
             # Run synchronous client in thread to avoid blocking event loop
-            results = await asyncio.to_thread(self.client.get_token_pairs, token_address)
+            results = await run_blocking(
+                self.executor_name, self.client.get_token_pairs, token_address
+            )
 
             pairs = [_serialize_pair_summary(pair) for pair in _ensure_sequence(results)]
 
@@ -109,7 +118,9 @@ class DexScreenerTools:
         """Get detailed information for a specific Solana pair."""
         try:
             # Run synchronous client in thread to avoid blocking event loop
-            results = await asyncio.to_thread(self.client.get_token_pairs, f"solana:{pair_address}")
+            results = await run_blocking(
+                self.executor_name, self.client.get_token_pairs, f"solana:{pair_address}"
+            )
 
             pair = _extract_single_pair(results)
             pair_info = _serialize_pair_detail(pair)
@@ -124,7 +135,7 @@ class DexScreenerTools:
     async def get_trending_pairs(self, chain: str = "solana") -> Dict[str, Any]:
         """Get trending pairs for a specific chain."""
         try:
-            results = await asyncio.to_thread(self.client.get_trending_pairs, chain)
+            results = await run_blocking(self.executor_name, self.client.get_trending_pairs, chain)
             seq = _ensure_sequence(results)
             trending_pairs = [_serialize_trending_pair(pair) for pair in seq]
             return {
@@ -145,7 +156,9 @@ class DexScreenerTools:
 
         for token in popular_tokens:
             try:
-                results = await asyncio.to_thread(self.client.search_pairs, f"{token} {chain}")
+                results = await run_blocking(
+                    self.executor_name, self.client.search_pairs, f"{token} {chain}"
+                )
                 all_pairs.extend(_ensure_sequence(results)[:5])
             except Exception as e:
                 logger.warning(f"Error getting pairs for {token}: {e}")
@@ -381,6 +394,7 @@ def create_dexscreener_tools(dex_tools: DexScreenerTools) -> List[Tool]:
             ),
             handler=handle_search_pairs,
             input_model=SearchPairsInput,
+            output_projection=_PAIR_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -403,6 +417,7 @@ def create_dexscreener_tools(dex_tools: DexScreenerTools) -> List[Tool]:
             ),
             handler=handle_get_token_pairs,
             input_model=GetTokenPairsInput,
+            output_projection=_PAIR_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -448,6 +463,7 @@ def create_dexscreener_tools(dex_tools: DexScreenerTools) -> List[Tool]:
             ),
             handler=handle_get_trending_pairs,
             input_model=GetTrendingPairsInput,
+            output_projection=_PAIR_LISTING_PROJECTION,
         ),
     ]
 
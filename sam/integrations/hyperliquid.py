@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import asyncio
+import functools
 import inspect
 import logging
 from typing import Any, Callable, Dict, List, Optional
@@ -10,6 +10,9 @@ from typing import Any, Callable, Dict, List, Optional
 from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
 
 from ..core.tools import Tool, ToolSpec
+from ..core.result_shaping import ResultProjection
+from ..utils.executors import get_executor
+from .hyperliquid_market_data import MetaCache, MidPriceFeed, get_mid_price_feed, ws_url_for
 
 try:  # pragma: no cover - guarded import for optional dependency
     from eth_account import Account
@@ -30,6 +33,9 @@ logger = logging.getLogger(__name__)
 class HyperliquidClient:
     """Minimal async-friendly wrapper around the Hyperliquid Python SDK."""
 
+    # Blocking SDK calls run on this named pool (see sam.utils.executors)
+    executor_name = "hyperliquid"
+
     def __init__(
         self,
         *,
@@ -40,13 +46,18 @@ class HyperliquidClient:
         default_slippage: float = 0.05,
         info: Optional[Any] = None,
         exchange: Optional[Any] = None,
-        to_thread: Callable[..., Any] = asyncio.to_thread,
+        to_thread: Optional[Callable[..., Any]] = None,
         skip_ws: bool = True,
+        stream_mids: bool = False,
+        meta_ttl: float = 300.0,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.default_slippage = default_slippage
-        self._to_thread = to_thread
+        # Bound each blocking SDK call by the client timeout (the pool default otherwise)
+        self._to_thread = to_thread or functools.partial(
+            get_executor(self.executor_name).run, _timeout=timeout
+        )
 
         self._wallet: Optional[LocalAccount] = None
         derived_address: Optional[str] = None
@@ -74,6 +85,15 @@ class HyperliquidClient:
         self._skip_ws = skip_ws
         self._exchange = exchange
 
+        # Prices and metadata are served locally; REST is only the fallback/refresh path
+        self._meta_cache = MetaCache(self.meta, ttl=meta_ttl)
+        # The streaming feed is shared process-wide so per-request clients reuse one websocket
+        self._owns_mid_feed = not stream_mids
+        if stream_mids:
+            self._mid_feed = get_mid_price_feed(ws_url_for(self.base_url), self.all_mids)
+        else:
+            self._mid_feed = MidPriceFeed(ws_url_for(self.base_url), self.all_mids, stream=False)
+
     def has_account(self) -> bool:
         return bool(self.account_address)
 
@@ -180,25 +200,20 @@ class HyperliquidClient:
         return await self._call_info("all_mids", dex=dex)
 
     async def get_mid_price(self, coin: str) -> Optional[float]:
-        """Get current mid price for a coin using all_mids endpoint."""
+        """Get the current mid price for a coin from the local price table.
+
+        The table is fed by the allMids websocket stream when streaming is enabled,
+        otherwise by a short-lived ``all_mids`` snapshot. Coins missing from the
+        mids map fall back to the cached exchange metadata.
+        """
         try:
-            mids = await self.all_mids()
-            if isinstance(mids, dict):
-                price_str = mids.get(coin.upper())
-                if price_str:
-                    return float(price_str)
-            if isinstance(mids, list):
-                for entry in mids:
-                    if isinstance(entry, dict):
-                        name = entry.get("name") or entry.get("coin")
-                        if isinstance(name, str) and name.upper() == coin.upper():
-                            price_val = entry.get("mid") or entry.get("markPx") or entry.get("px")
-                            if price_val is not None:
-                                return float(price_val)
+            price = await self._mid_feed.get_mid(coin)
+            if price is not None:
+                return price
         except Exception:
             pass
         try:
-            metadata = await self.meta()
+            metadata = await self._meta_cache.get()
             if isinstance(metadata, dict):
                 coins = metadata.get("coins")
                 if isinstance(coins, list):
@@ -221,24 +236,29 @@ class HyperliquidClient:
         """Get the size decimals for a coin from exchange metadata.
 
         Each asset has a szDecimals field that determines how many decimal places
-        the size must be rounded to.
+        the size must be rounded to. Metadata is cached and refreshed on a TTL.
         """
         try:
-            meta = await self.meta()
-            if isinstance(meta, dict):
-                universe = meta.get("universe", [])
-                if isinstance(universe, list):
-                    for asset_info in universe:
-                        if isinstance(asset_info, dict):
-                            if asset_info.get("name", "").upper() == coin.upper():
-                                sz_decimals: int = int(asset_info.get("szDecimals", 0))
-                                return sz_decimals
+            sz_decimals = await self._meta_cache.sz_decimals(coin)
+            if sz_decimals is not None:
+                return sz_decimals
             logger.warning(f"szDecimals not found for {coin}, using default 0")
             return 0
         except Exception:
             logger.exception(f"Failed to get szDecimals for {coin}")
             return 0
 
+    def market_data_stats(self) -> Dict[str, Any]:
+        return {
+            "mids": self._mid_feed.get_stats(),
+            "meta_refreshes": self._meta_cache.refreshes,
+        }
+
+    async def close(self) -> None:
+        """Stop this client's market-data feed; a shared stream idles out on its own."""
+        if self._owns_mid_feed:
+            await self._mid_feed.stop()
+
     async def update_leverage(
         self,
         *,
@@ -871,5 +891,6 @@ def create_hyperliquid_tools(client: HyperliquidClient) -> List[Tool]:
             ),
             handler=handle_user_fills,
             input_model=FillsInput,
+            output_projection=ResultProjection(max_list_items=25),
         ),
     ]
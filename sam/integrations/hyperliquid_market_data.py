@@ -0,0 +1,306 @@
+"""Local Hyperliquid market data: streamed mid prices and cached exchange metadata.
+
+``MidPriceFeed`` subscribes to the ``allMids`` websocket channel and keeps an
+in-process price table current, so order handlers read prices locally instead of
+fetching the full mids map over REST. Streaming feeds are shared per websocket URL
+(``get_mid_price_feed``) and disconnect after a period without readers. ``MetaCache`` holds the exchange ``meta``
+response (and its szDecimals index) with a TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from ..utils.http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+def ws_url_for(base_url: str) -> str:
+    """Map a Hyperliquid REST base URL to its websocket endpoint."""
+    base = base_url.rstrip("/")
+    if base.startswith("https://"):
+        base = "wss://" + base[len("https://") :]
+    elif base.startswith("http://"):
+        base = "ws://" + base[len("http://") :]
+    return f"{base}/ws"
+
+
+def parse_mids(payload: Any) -> Dict[str, float]:
+    """Normalize an ``all_mids`` response (dict or list of entries) to ``{COIN: price}``."""
+    mids: Dict[str, float] = {}
+    if isinstance(payload, dict):
+        for coin, value in payload.items():
+            try:
+                mids[str(coin).upper()] = float(value)
+            except (TypeError, ValueError):
+                continue
+    elif isinstance(payload, list):
+        for entry in payload:
+            if not isinstance(entry, dict):
+                continue
+            name = entry.get("name") or entry.get("coin")
+            value = entry.get("mid") or entry.get("markPx") or entry.get("px")
+            if isinstance(name, str) and value is not None:
+                try:
+                    mids[name.upper()] = float(value)
+                except (TypeError, ValueError):
+                    continue
+    return mids
+
+
+class MetaCache:
+    """TTL cache for the exchange ``meta`` response with a szDecimals index."""
+
+    def __init__(self, loader: Loader, *, ttl: float = 300.0) -> None:
+        self._loader = loader
+        self.ttl = ttl
+        self._meta: Any = None
+        self._sz_decimals: Dict[str, int] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    def _fresh(self) -> bool:
+        return self._meta is not None and time.monotonic() - self._fetched_at < self.ttl
+
+    async def get(self, *, force_refresh: bool = False) -> Any:
+        if not force_refresh and self._fresh():
+            return self._meta
+        async with self._lock:
+            # Another waiter may have refreshed while we queued on the lock
+            if not force_refresh and self._fresh():
+                return self._meta
+            meta = await self._loader()
+            self._meta = meta
+            self._sz_decimals = self._index(meta)
+            self._fetched_at = time.monotonic()
+            self.refreshes += 1
+            return meta
+
+    @staticmethod
+    def _index(meta: Any) -> Dict[str, int]:
+        index: Dict[str, int] = {}
+        universe = meta.get("universe") if isinstance(meta, dict) else None
+        if isinstance(universe, list):
+            for asset_info in universe:
+                if isinstance(asset_info, dict) and isinstance(asset_info.get("name"), str):
+                    try:
+                        index[asset_info["name"].upper()] = int(asset_info.get("szDecimals", 0))
+                    except (TypeError, ValueError):
+                        continue
+        return index
+
+    async def sz_decimals(self, coin: str) -> Optional[int]:
+        await self.get()
+        return self._sz_decimals.get(coin.upper())
+
+    def invalidate(self) -> None:
+        self._meta = None
+        self._sz_decimals = {}
+        self._fetched_at = 0.0
+
+
+class MidPriceFeed:
+    """In-process mid price table fed by the ``allMids`` websocket stream.
+
+    Until the stream delivers its first update (or while it is reconnecting),
+    ``get_mid`` falls back to a REST snapshot that is reused for
+    ``snapshot_ttl`` seconds. The stream stops after ``idle_timeout`` seconds
+    without readers and restarts on the next read.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        snapshot_loader: Loader,
+        *,
+        stream: bool = True,
+        stale_after: float = 10.0,
+        snapshot_ttl: float = 2.0,
+        max_backoff: float = 30.0,
+        idle_timeout: float = 300.0,
+        session_factory: Callable[[], Awaitable[aiohttp.ClientSession]] = get_session,
+    ) -> None:
+        self.ws_url = ws_url
+        self._snapshot_loader = snapshot_loader
+        self.stream = stream
+        self.stale_after = stale_after
+        self.snapshot_ttl = snapshot_ttl
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self._session_factory = session_factory
+        self._mids: Dict[str, float] = {}
+        self._updated_at = 0.0
+        self._streamed = False
+        self._snapshot_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._last_used = 0.0
+        self.stream_updates = 0
+        self.snapshot_fetches = 0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._streamed and time.monotonic() - self._updated_at < self.stale_after
+
+    def _table_fresh(self) -> bool:
+        if not self._mids:
+            return False
+        ttl = self.stale_after if self._streamed else self.snapshot_ttl
+        return time.monotonic() - self._updated_at < ttl
+
+    def apply(self, mids: Dict[str, float], *, streamed: bool) -> None:
+        self._mids.update(mids)
+        self._updated_at = time.monotonic()
+        self._streamed = streamed
+        if streamed:
+            self.stream_updates += 1
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self._last_used > self.idle_timeout
+
+    def ensure_started(self) -> None:
+        if not self.stream:
+            return
+        self._last_used = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # A task left behind by a previous (closed) event loop never reports done
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._streamed = False
+        self._task = loop.create_task(self._run(), name="hyperliquid-all-mids")
+
+    async def get_mid(self, coin: str) -> Optional[float]:
+        self.ensure_started()
+        if not self._table_fresh():
+            await self._refresh_snapshot()
+        return self._mids.get(coin.upper())
+
+    async def get_mids(self) -> Dict[str, float]:
+        self.ensure_started()
+        if not self._table_fresh():
+            await self._refresh_snapshot()
+        return dict(self._mids)
+
+    async def _refresh_snapshot(self) -> None:
+        async with self._snapshot_lock:
+            if self._table_fresh():
+                return
+            payload = await self._snapshot_loader()
+            self.snapshot_fetches += 1
+            self.apply(parse_mids(payload), streamed=False)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while not self._idle():
+            try:
+                session = await self._session_factory()
+                async with session.ws_connect(self.ws_url, heartbeat=30.0) as ws:
+                    await ws.send_str(
+                        json.dumps({"method": "subscribe", "subscription": {"type": "allMids"}})
+                    )
+                    logger.info(f"Subscribed to Hyperliquid allMids stream at {self.ws_url}")
+                    backoff = 1.0
+                    while not self._idle():
+                        try:
+                            message = await ws.receive(timeout=self.idle_timeout)
+                        except asyncio.TimeoutError:
+                            continue
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_message(message.data)
+                        elif message.type in (
+                            aiohttp.WSMsgType.CLOSE,
+                            aiohttp.WSMsgType.CLOSING,
+                            aiohttp.WSMsgType.CLOSED,
+                            aiohttp.WSMsgType.ERROR,
+                        ):
+                            break
+                    else:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Hyperliquid allMids stream error: {e}")
+            self._streamed = False
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        self._streamed = False
+        logger.info(f"Hyperliquid allMids stream idle; disconnected from {self.ws_url}")
+
+    def _handle_message(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(message, dict) or message.get("channel") != "allMids":
+            return
+        data = message.get("data")
+        if isinstance(data, dict):
+            mids = parse_mids(data.get("mids"))
+            if mids:
+                self.apply(mids, streamed=True)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._streamed = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "coins": len(self._mids),
+            "age_seconds": (
+                round(time.monotonic() - self._updated_at, 3) if self._updated_at else None
+            ),
+            "stream_updates": self.stream_updates,
+            "snapshot_fetches": self.snapshot_fetches,
+            "reconnects": self.reconnects,
+        }
+
+
+# Streaming feeds shared by every client in the process, keyed by websocket URL
+_shared_feeds: Dict[str, MidPriceFeed] = {}
+
+
+def get_mid_price_feed(ws_url: str, snapshot_loader: Loader) -> MidPriceFeed:
+    """Process-wide streaming feed for ``ws_url``, so agent builds share one websocket."""
+    feed = _shared_feeds.get(ws_url)
+    if feed is None:
+        feed = MidPriceFeed(ws_url, snapshot_loader, stream=True)
+        _shared_feeds[ws_url] = feed
+    return feed
+
+
+async def stop_mid_price_feeds() -> None:
+    """Stop every shared feed (process shutdown)."""
+    for feed in list(_shared_feeds.values()):
+        await feed.stop()
+    _shared_feeds.clear()
+
+
+__all__ = [
+    "MetaCache",
+    "MidPriceFeed",
+    "get_mid_price_feed",
+    "parse_mids",
+    "stop_mid_price_feeds",
+    "ws_url_for",
+]
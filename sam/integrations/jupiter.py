@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import base64
 import logging
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, Sequence, cast
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, cast
 
 import aiohttp
 from pydantic import BaseModel, Field, field_validator
 
 from ..core.tools import Tool, ToolSpec
 from ..integrations.smart_trader import SolanaTools
-from ..utils.http_client import get_session
+from ..utils.http_client import fetch_json, get_session
+from .solana.submission import (
+    SubmissionOptions,
+    SubmissionUncertainError,
+    unconfirmed_result,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +31,43 @@ class PriceInfo:
 
 RoutePlan = List[Dict[str, Any]]
 QuoteResponse = Dict[str, Any]
+QuoteKey = Tuple[str, str, int, int]
+
+# Upper bound on cached quotes; expired entries are pruned first
+_MAX_CACHED_QUOTES = 256
+# Price lookups are shared across concurrent sessions and reused this briefly
+PRICE_CACHE_TTL = 2.0
 
 
 class JupiterTools:
-    def __init__(self, solana_tools: Optional[SolanaTools] = None) -> None:
+    def __init__(self, solana_tools: Optional[SolanaTools] = None, quote_ttl: float = 5.0) -> None:
         # Jupiter v6 Quote/Swap API base
         self.base_url = "https://quote-api.jup.ag/v6"
         self.price_url = "https://api.jup.ag/price/v3"
         self.solana_tools = solana_tools
+        # Recent quotes, so quote-then-swap does not hit the quote API twice
+        self.quote_ttl = quote_ttl
+        self._quotes: Dict[QuoteKey, Tuple[float, Dict[str, Any]]] = {}
+
+    def _cached_quote(self, key: QuoteKey) -> Optional[Dict[str, Any]]:
+        entry = self._quotes.get(key)
+        if entry is None:
+            return None
+        stored_at, quote = entry
+        if time.monotonic() - stored_at > self.quote_ttl:
+            self._quotes.pop(key, None)
+            return None
+        return dict(quote, cached=True)
+
+    def _store_quote(self, key: QuoteKey, quote: Dict[str, Any]) -> None:
+        if self.quote_ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._quotes) >= _MAX_CACHED_QUOTES:
+            self._quotes = {k: v for k, v in self._quotes.items() if now - v[0] <= self.quote_ttl}
+            while len(self._quotes) >= _MAX_CACHED_QUOTES:
+                self._quotes.pop(next(iter(self._quotes)))
+        self._quotes[key] = (now, quote)
 
     async def close(self) -> None:
         """Close method for compatibility - shared client handles cleanup."""
@@ -45,37 +80,42 @@ class JupiterTools:
 
             params = {"ids": token_mint}
 
-            async with session.get(f"{self.price_url}/price", params=params) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Jupiter price API error {response.status}: {error_text}")
-                    return {"error": f"Price API error {response.status}: {error_text}"}
-
-                data = await response.json()
-
-                price_section = _get_mapping(data, "data")
-                token_data = _get_mapping(price_section or {}, token_mint)
-
-                if not token_data:
-                    return {"error": f"No price data found for token {token_mint}"}
-
-                price = float(token_data.get("price", 0) or 0)
-                info = PriceInfo(
-                    price_usd=price,
-                    symbol=str(token_data.get("symbol", "Unknown")),
-                    name=str(token_data.get("name", "Unknown")),
-                    decimals=int(token_data.get("decimals", 0) or 0),
-                )
-
-                logger.info(f"Got price for {token_mint}: ${info.price_usd}")
-                return {
-                    "token_mint": token_mint,
-                    "price_usd": info.price_usd,
-                    "symbol": info.symbol,
-                    "name": info.name,
-                    "decimals": info.decimals,
-                    "source": "jupiter",
-                }
+            response = await fetch_json(
+                f"{self.price_url}/price",
+                params=params,
+                cache_ttl=PRICE_CACHE_TTL,
+                session=session,
+            )
+            if response.status != 200:
+                error_text = response.text
+                logger.error(f"Jupiter price API error {response.status}: {error_text}")
+                return {"error": f"Price API error {response.status}: {error_text}"}
+
+            data = response.data
+
+            price_section = _get_mapping(data, "data")
+            token_data = _get_mapping(price_section or {}, token_mint)
+
+            if not token_data:
+                return {"error": f"No price data found for token {token_mint}"}
+
+            price = float(token_data.get("price", 0) or 0)
+            info = PriceInfo(
+                price_usd=price,
+                symbol=str(token_data.get("symbol", "Unknown")),
+                name=str(token_data.get("name", "Unknown")),
+                decimals=int(token_data.get("decimals", 0) or 0),
+            )
+
+            logger.info(f"Got price for {token_mint}: ${info.price_usd}")
+            return {
+                "token_mint": token_mint,
+                "price_usd": info.price_usd,
+                "symbol": info.symbol,
+                "name": info.name,
+                "decimals": info.decimals,
+                "source": "jupiter",
+            }
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error getting token price: {e}")
@@ -87,7 +127,13 @@ class JupiterTools:
     async def get_quote(
         self, input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50
     ) -> Dict[str, Any]:
-        """Get a swap quote from Jupiter."""
+        """Get a swap quote from Jupiter, reusing one fetched in the last ``quote_ttl`` seconds."""
+        key: QuoteKey = (input_mint, output_mint, int(amount), int(slippage_bps))
+        cached = self._cached_quote(key)
+        if cached is not None:
+            logger.debug(f"Using cached Jupiter quote for {input_mint} -> {output_mint}")
+            return cached
+
         try:
             session = await get_session()
 
@@ -131,7 +177,7 @@ class JupiterTools:
                 route_plan = data.get("routePlan", [])
                 plan: RoutePlan = route_plan if isinstance(route_plan, list) else []
 
-                return {
+                result = {
                     "quote": data,
                     "input_mint": input_mint,
                     "output_mint": output_mint,
@@ -140,6 +186,8 @@ class JupiterTools:
                     "price_impact_pct": float(data.get("priceImpactPct", 0) or 0),
                     "route_plan": plan,
                 }
+                self._store_quote(key, result)
+                return result
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error getting quote: {e}")
@@ -231,6 +279,8 @@ class JupiterTools:
             # Get quote
             logger.info(f"Getting quote for {amount} tokens from {input_mint} to {output_mint}")
             quote_result = await self.get_quote(input_mint, output_mint, amount, slippage_bps)
+            # A quote is consumed by the swap built from it
+            self._quotes.pop((input_mint, output_mint, int(amount), int(slippage_bps)), None)
             if "error" in quote_result:
                 error_msg = quote_result["error"]
                 logger.error(f"Quote failed: {error_msg}")
@@ -276,19 +326,40 @@ class JupiterTools:
                 # Deserialize the versioned transaction
                 versioned_tx = VersionedTransaction.from_bytes(transaction_data)
 
-                # Create a new signed transaction with the keypair
-                signed_tx = VersionedTransaction(versioned_tx.message, [self.solana_tools.keypair])
-
-                # Send the transaction to Solana
-                from solana.rpc.types import TxOpts
-
-                # Get the properly initialized client
-                client = await getattr(self.solana_tools, "_get_client")()
-                tx_hash = await client.send_transaction(
-                    signed_tx, opts=TxOpts(skip_preflight=False, max_retries=3)
+                # Sign, send and track confirmation; a stale blockhash is refreshed
+                # and the swap re-signed instead of failing.
+                last_valid_block_height = swap_result.get("last_valid_block_height")
+                pipeline = self.solana_tools.get_submission_pipeline()
+                submission = await pipeline.submit_transaction(
+                    versioned_tx,
+                    [self.solana_tools.keypair],
+                    SubmissionOptions(skip_preflight=False),
+                    last_valid_block_height=(
+                        int(last_valid_block_height)
+                        if isinstance(last_valid_block_height, (int, float))
+                        else None
+                    ),
                 )
 
-                logger.info(f"Swap transaction executed successfully: {tx_hash}")
+                if submission.status in ("failed", "expired"):
+                    logger.error(
+                        f"Swap transaction {submission.signature} {submission.status}: "
+                        f"{submission.error}"
+                    )
+                    return {
+                        "error": f"Swap {submission.status}: {submission.error}",
+                        "transaction_id": submission.signature,
+                        "confirmation": submission.to_dict(),
+                    }
+                if submission.status == "timeout":
+                    logger.warning(f"Swap transaction {submission.signature} unconfirmed")
+                    return unconfirmed_result(
+                        submission.signature,
+                        "Swap sent but not confirmed in time",
+                        submission.to_dict(),
+                    )
+
+                logger.info(f"Swap transaction {submission.status}: {submission.signature}")
 
                 return {
                     "success": True,
@@ -297,9 +368,13 @@ class JupiterTools:
                     "input_amount": amount,
                     "expected_output_amount": quote_result.get("output_amount", 0),
                     "price_impact_pct": quote_result.get("price_impact_pct", 0),
-                    "transaction_id": str(tx_hash),
+                    "transaction_id": submission.signature,
+                    "confirmation": submission.to_dict(),
                 }
 
+            except SubmissionUncertainError as e:
+                logger.error(f"Swap transaction {e.signature} outcome unknown: {e}")
+                return unconfirmed_result(e.signature, "Swap outcome unknown")
             except Exception as sign_error:
                 logger.error(f"Failed to execute swap transaction: {sign_error}")
                 return {"error": f"Swap failed: {str(sign_error)}"}
@@ -316,36 +391,41 @@ class JupiterTools:
             # Jupiter v3 API supports comma-separated mint addresses
             params = {"ids": ",".join(token_mints)}
 
-            async with session.get(f"{self.price_url}/price", params=params) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Jupiter price API error {response.status}: {error_text}")
-                    return {"error": f"Price API error {response.status}: {error_text}"}
-
-                data = await response.json()
-
-                price_section = _get_mapping(data, "data")
-                if not price_section:
-                    return {"error": "No price data received"}
-
-                result: Dict[str, Any] = {"prices": {}, "missing": []}
-
-                for mint in token_mints:
-                    token_data = _get_mapping(price_section, mint)
-                    if token_data:
-                        result["prices"][mint] = {
-                            "price_usd": float(token_data.get("price", 0) or 0),
-                            "symbol": str(token_data.get("symbol", "Unknown")),
-                            "name": str(token_data.get("name", "Unknown")),
-                            "decimals": int(token_data.get("decimals", 0) or 0),
-                        }
-                    else:
-                        cast(List[str], result["missing"]).append(mint)
+            response = await fetch_json(
+                f"{self.price_url}/price",
+                params=params,
+                cache_ttl=PRICE_CACHE_TTL,
+                session=session,
+            )
+            if response.status != 200:
+                error_text = response.text
+                logger.error(f"Jupiter price API error {response.status}: {error_text}")
+                return {"error": f"Price API error {response.status}: {error_text}"}
+
+            data = response.data
+
+            price_section = _get_mapping(data, "data")
+            if not price_section:
+                return {"error": "No price data received"}
+
+            result: Dict[str, Any] = {"prices": {}, "missing": []}
+
+            for mint in token_mints:
+                token_data = _get_mapping(price_section, mint)
+                if token_data:
+                    result["prices"][mint] = {
+                        "price_usd": float(token_data.get("price", 0) or 0),
+                        "symbol": str(token_data.get("symbol", "Unknown")),
+                        "name": str(token_data.get("name", "Unknown")),
+                        "decimals": int(token_data.get("decimals", 0) or 0),
+                    }
+                else:
+                    cast(List[str], result["missing"]).append(mint)
 
-                logger.info(
-                    f"Got prices for {len(result['prices'])} tokens, {len(result['missing'])} missing"
-                )
-                return result
+            logger.info(
+                f"Got prices for {len(result['prices'])} tokens, {len(result['missing'])} missing"
+            )
+            return result
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error getting token prices: {e}")
@@ -8,12 +8,11 @@ from __future__ import annotations
 
 import base64
 import logging
-import math
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
@@ -23,10 +22,17 @@ from pydantic import BaseModel, Field, field_validator
 
 from ..config.settings import Settings
 from ..core.tools import Tool, ToolSpec
+from ..core.result_shaping import ResultProjection
 from ..utils.http_client import get_session
+from .opportunity_ranking import ColumnarSnapshot, ScoringWeights, rank_top_k
 
 logger = logging.getLogger(__name__)
 
+# Market listings are compacted for the transcript; events keep the full result
+_LISTING_PROJECTION = ResultProjection(max_list_items=25)
+
+_KALSHI_WEIGHTS = ScoringWeights(volume=0.6, liquidity=0.4, spread_ceiling=0.04)
+
 
 class KalshiIntegrationError(RuntimeError):
     """Raised when Kalshi API calls fail."""
@@ -683,64 +689,50 @@ class KalshiTools:
         min_liquidity: float,
         max_yes_ask: float,
     ) -> List[Dict[str, Any]]:
-        scored: List[Tuple[float, Dict[str, Any]]] = []
-        for market in universe:
-            entry_price = market.entry_price
-            if entry_price is None:
-                continue
-            if entry_price <= 0 or entry_price > max_yes_ask:
-                continue
-            volume_24h = market.volume_24h or 0.0
-            liquidity = market.liquidity or 0.0
-            if volume_24h < min_volume:
-                continue
-            if liquidity < min_liquidity:
-                continue
-
-            roi = (1.0 - entry_price) / entry_price
-            if roi <= 0:
-                continue
-
-            spread_component = 0.0
-            if market.yes_ask is not None and market.yes_bid is not None:
-                spread = max(0.0, market.yes_ask - market.yes_bid)
-                spread_component = max(0.0, 0.04 - spread)
-
-            volume_component = math.log1p(volume_24h)
-            liquidity_component = math.log1p(liquidity)
-
-            score = (
-                roi * (1.0 + 0.6 * volume_component + 0.4 * liquidity_component)
-            ) + spread_component
-            scored.append(
-                (
-                    score,
-                    {
-                        "ticker": market.ticker,
-                        "title": market.title,
-                        "subtitle": market.subtitle,
-                        "event_ticker": market.event_ticker,
-                        "category": market.category,
-                        "entry_price": round(entry_price, 4),
-                        "yes_bid": market.yes_bid,
-                        "yes_ask": market.yes_ask,
-                        "implied_probability": round(entry_price, 4),
-                        "roi_if_yes_resolves": round(roi, 2),
-                        "volume_24h": volume_24h,
-                        "open_interest": market.open_interest,
-                        "liquidity": liquidity,
-                        "market_url": market.url,
-                        "score": round(score, 4),
-                        "notes": (
-                            "Higher volume/liquidity and tighter spreads increase the score. "
-                            "Verify order depth before executing."
-                        ),
-                    },
-                )
-            )
+        snapshot = ColumnarSnapshot.from_columns(
+            price=[market.entry_price for market in universe],
+            volume=[market.volume_24h for market in universe],
+            liquidity=[market.liquidity for market in universe],
+            bid=[market.yes_bid for market in universe],
+            ask=[market.yes_ask for market in universe],
+        )
+        winners = rank_top_k(
+            snapshot,
+            limit=limit,
+            min_volume=min_volume,
+            min_liquidity=min_liquidity,
+            max_price=max_yes_ask,
+            weights=_KALSHI_WEIGHTS,
+        )
 
-        scored.sort(key=lambda item: item[0], reverse=True)
-        return [item[1] for item in scored[:limit]]
+        ranked: List[Dict[str, Any]] = []
+        for winner in winners:
+            market = universe[winner.index]
+            entry_price = float(snapshot.price[winner.index])
+            ranked.append(
+                {
+                    "ticker": market.ticker,
+                    "title": market.title,
+                    "subtitle": market.subtitle,
+                    "event_ticker": market.event_ticker,
+                    "category": market.category,
+                    "entry_price": round(entry_price, 4),
+                    "yes_bid": market.yes_bid,
+                    "yes_ask": market.yes_ask,
+                    "implied_probability": round(entry_price, 4),
+                    "roi_if_yes_resolves": round(winner.roi, 2),
+                    "volume_24h": market.volume_24h or 0.0,
+                    "open_interest": market.open_interest,
+                    "liquidity": market.liquidity or 0.0,
+                    "market_url": market.url,
+                    "score": round(winner.score, 4),
+                    "notes": (
+                        "Higher volume/liquidity and tighter spreads increase the score. "
+                        "Verify order depth before executing."
+                    ),
+                }
+            )
+        return ranked
 
     def _craft_strategy_view(self, idea: Dict[str, Any]) -> Dict[str, Any]:
         """Generate entry/exit strategy with TP/SL levels for a market opportunity."""
@@ -874,6 +866,7 @@ def create_kalshi_tools(kalshi_tools: KalshiTools) -> List[Tool]:
             ),
             handler=handle_market_list,
             input_model=KalshiMarketListInput,
+            output_projection=_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -948,6 +941,7 @@ def create_kalshi_tools(kalshi_tools: KalshiTools) -> List[Tool]:
             ),
             handler=handle_opportunity_scan,
             input_model=KalshiOpportunityInput,
+            output_projection=_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -1003,6 +997,7 @@ def create_kalshi_tools(kalshi_tools: KalshiTools) -> List[Tool]:
             ),
             handler=handle_strategy_brief,
             input_model=KalshiStrategyBriefInput,
+            output_projection=_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
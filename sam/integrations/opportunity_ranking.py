@@ -0,0 +1,148 @@
+"""Vectorized opportunity ranking shared by the prediction-market integrations.
+
+Markets (or market outcomes) are loaded into a columnar snapshot of NumPy arrays,
+filtered and scored in a single pass, and only the top-k candidates are selected
+with ``argpartition``. Callers materialize result dicts for the winners only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+
+def _column(values: Iterable[Optional[float]], count: int, *, missing: float) -> np.ndarray:
+    return np.fromiter(
+        (missing if value is None else value for value in values),
+        dtype=np.float64,
+        count=count,
+    )
+
+
+@dataclass(frozen=True)
+class ColumnarSnapshot:
+    """Column-oriented view of a market universe.
+
+    Each row is one candidate (a Kalshi market or a Polymarket outcome). Missing
+    prices, bids and asks are stored as NaN; missing volume and liquidity as 0.
+    """
+
+    price: np.ndarray
+    volume: np.ndarray
+    liquidity: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        price: List[Optional[float]],
+        volume: List[Optional[float]],
+        liquidity: List[Optional[float]],
+        bid: List[Optional[float]],
+        ask: List[Optional[float]],
+    ) -> ColumnarSnapshot:
+        size = len(price)
+        if not all(len(column) == size for column in (volume, liquidity, bid, ask)):
+            raise ValueError("All snapshot columns must have the same length")
+        return cls(
+            price=_column(price, size, missing=np.nan),
+            volume=_column(volume, size, missing=0.0),
+            liquidity=_column(liquidity, size, missing=0.0),
+            bid=_column(bid, size, missing=np.nan),
+            ask=_column(ask, size, missing=np.nan),
+        )
+
+    def __len__(self) -> int:
+        return int(self.price.shape[0])
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """Weights for ``roi * (1 + v*log1p(volume) + l*log1p(liquidity)) + spread bonus``."""
+
+    volume: float
+    liquidity: float
+    spread_ceiling: float
+
+
+class RankedCandidate(NamedTuple):
+    index: int
+    score: float
+    roi: float
+
+
+def rank_top_k(
+    snapshot: ColumnarSnapshot,
+    *,
+    limit: int,
+    min_volume: float,
+    min_liquidity: float,
+    max_price: float,
+    weights: ScoringWeights,
+) -> List[RankedCandidate]:
+    """Return the ``limit`` best-scoring rows of ``snapshot`` in descending score order.
+
+    Rows are eligible when the price is in ``(0, max_price]``, the ROI on a win is
+    positive, and volume and liquidity meet the minimums. Ties keep row order.
+    """
+    if limit <= 0 or len(snapshot) == 0:
+        return []
+
+    price = snapshot.price
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mask = (
+            np.isfinite(price)
+            & (price > 0.0)
+            & (price <= max_price)
+            & (snapshot.volume >= min_volume)
+            & (snapshot.liquidity >= min_liquidity)
+        )
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        entry = price[candidates]
+        roi = (1.0 - entry) / entry
+        positive = roi > 0.0
+        candidates = candidates[positive]
+        roi = roi[positive]
+        if candidates.size == 0:
+            return []
+
+        bid = snapshot.bid[candidates]
+        ask = snapshot.ask[candidates]
+        spread = np.maximum(ask - bid, 0.0)
+        spread_bonus = np.where(
+            np.isfinite(spread), np.maximum(weights.spread_ceiling - spread, 0.0), 0.0
+        )
+
+    score = (
+        roi
+        * (
+            1.0
+            + weights.volume * np.log1p(snapshot.volume[candidates])
+            + weights.liquidity * np.log1p(snapshot.liquidity[candidates])
+        )
+        + spread_bonus
+    )
+
+    if limit < score.size:
+        # Partition on the k-th best score, then keep every row tied with it so the
+        # final stable ordering matches a full sort.
+        pivot = np.argpartition(score, score.size - limit)[score.size - limit]
+        kth = score[pivot]
+        keep = np.flatnonzero(score >= kth)
+    else:
+        keep = np.arange(score.size)
+
+    order = keep[np.lexsort((candidates[keep], -score[keep]))][:limit]
+    return [
+        RankedCandidate(int(candidates[pos]), float(score[pos]), float(roi[pos])) for pos in order
+    ]
+
+
+__all__ = ["ColumnarSnapshot", "RankedCandidate", "ScoringWeights", "rank_top_k"]
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import json
 import logging
-import math
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
@@ -12,11 +11,19 @@ from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field, field_validator
 
 from ..core.tools import Tool, ToolSpec
-from ..utils.http_client import get_session
+from ..core.result_shaping import ResultProjection
+from ..utils.http_client import fetch_json, get_session
+from .opportunity_ranking import ColumnarSnapshot, ScoringWeights, rank_top_k
 
 logger = logging.getLogger(__name__)
 
+# Market listings are compacted for the transcript; events keep the full result
+_LISTING_PROJECTION = ResultProjection(max_list_items=25)
+
 _POLYMARKET_BASE_URL = "https://gamma-api.polymarket.com"
+# Gamma market listings are reused briefly across concurrent sessions
+MARKET_CACHE_TTL = 5.0
+_POLYMARKET_WEIGHTS = ScoringWeights(volume=1.0, liquidity=0.5, spread_ceiling=0.05)
 
 
 class PolymarketIntegrationError(RuntimeError):
@@ -131,14 +138,18 @@ class PolymarketGammaClient:
         query = dict(params or {})
         url = f"{self.base_url}/markets"
 
-        async with session.get(url, params=self._encode_params(query)) as response:
-            if response.status != 200:
-                text = await response.text()
-                logger.error("Polymarket markets request failed: %s - %s", response.status, text)
-                raise PolymarketIntegrationError(
-                    f"Polymarket markets request failed with status {response.status}"
-                )
-            data = await response.json()
+        # Concurrent sessions asking for the same listing share one request
+        response = await fetch_json(
+            url, params=self._encode_params(query), cache_ttl=MARKET_CACHE_TTL, session=session
+        )
+        if response.status != 200:
+            logger.error(
+                "Polymarket markets request failed: %s - %s", response.status, response.text
+            )
+            raise PolymarketIntegrationError(
+                f"Polymarket markets request failed with status {response.status}"
+            )
+        data = response.data
 
         if not isinstance(data, list):
             raise PolymarketIntegrationError("Unexpected response payload for markets endpoint")
@@ -155,14 +166,13 @@ class PolymarketGammaClient:
     async def fetch_market(self, market_id: str) -> MarketSnapshot:
         session = await get_session()
         url = f"{self.base_url}/markets/{market_id}"
-        async with session.get(url) as response:
-            if response.status != 200:
-                text = await response.text()
-                logger.error("Polymarket market detail failed: %s - %s", response.status, text)
-                raise PolymarketIntegrationError(
-                    f"Polymarket market {market_id} request failed with status {response.status}"
-                )
-            data = await response.json()
+        response = await fetch_json(url, cache_ttl=MARKET_CACHE_TTL, session=session)
+        if response.status != 200:
+            logger.error("Polymarket market detail failed: %s - %s", response.status, response.text)
+            raise PolymarketIntegrationError(
+                f"Polymarket market {market_id} request failed with status {response.status}"
+            )
+        data = response.data
 
         if not isinstance(data, dict):
             raise PolymarketIntegrationError("Unexpected market detail payload")
@@ -407,53 +417,47 @@ class PolymarketTools:
         min_liquidity: float,
         max_entry_price: float,
     ) -> List[Dict[str, Any]]:
-        ranked: List[Tuple[float, Dict[str, Any]]] = []
-
-        for market in universe:
-            if market.volume_24h < min_volume:
-                continue
-            if market.liquidity < min_liquidity:
-                continue
-            for outcome in market.outcomes:
-                if outcome.price <= 0 or outcome.price > max_entry_price:
-                    continue
-                roi = outcome.roi
-                if roi is None or roi <= 0:
-                    continue
-                volume_component = math.log1p(market.volume_24h)
-                liquidity_component = math.log1p(market.liquidity)
-                spread_component = 0.0
-                if market.best_bid is not None and market.best_ask is not None:
-                    spread = max(0.0, market.best_ask - market.best_bid)
-                    spread_component = max(0.0, 0.05 - spread)
-
-                score = (
-                    roi * (1.0 + volume_component + 0.5 * liquidity_component)
-                ) + spread_component
-                ranked.append(
-                    (
-                        score,
-                        {
-                            "market_id": market.id,
-                            "question": market.question,
-                            "outcome": outcome.name,
-                            "entry_price": round(outcome.price, 4),
-                            "implied_probability": round(outcome.implied_prob, 4),
-                            "net_payout_if_win": round(outcome.net_payout, 4),
-                            "roi_if_win": round(roi, 2),
-                            "volume_24h": round(market.volume_24h, 2),
-                            "liquidity": round(market.liquidity, 2),
-                            "best_bid": market.best_bid,
-                            "best_ask": market.best_ask,
-                            "market_url": market.url,
-                            "ends_at": market.end_date,
-                            "score": round(score, 4),
-                        },
-                    )
-                )
+        rows: List[Tuple[MarketSnapshot, MarketOutcome]] = [
+            (market, outcome) for market in universe for outcome in market.outcomes
+        ]
+        snapshot = ColumnarSnapshot.from_columns(
+            price=[outcome.price for _, outcome in rows],
+            volume=[market.volume_24h for market, _ in rows],
+            liquidity=[market.liquidity for market, _ in rows],
+            bid=[market.best_bid for market, _ in rows],
+            ask=[market.best_ask for market, _ in rows],
+        )
+        winners = rank_top_k(
+            snapshot,
+            limit=limit,
+            min_volume=min_volume,
+            min_liquidity=min_liquidity,
+            max_price=max_entry_price,
+            weights=_POLYMARKET_WEIGHTS,
+        )
 
-        ranked.sort(key=lambda item: item[0], reverse=True)
-        return [idea for _, idea in ranked[:limit]]
+        ideas: List[Dict[str, Any]] = []
+        for winner in winners:
+            market, outcome = rows[winner.index]
+            ideas.append(
+                {
+                    "market_id": market.id,
+                    "question": market.question,
+                    "outcome": outcome.name,
+                    "entry_price": round(outcome.price, 4),
+                    "implied_probability": round(outcome.implied_prob, 4),
+                    "net_payout_if_win": round(outcome.net_payout, 4),
+                    "roi_if_win": round(winner.roi, 2),
+                    "volume_24h": round(market.volume_24h, 2),
+                    "liquidity": round(market.liquidity, 2),
+                    "best_bid": market.best_bid,
+                    "best_ask": market.best_ask,
+                    "market_url": market.url,
+                    "ends_at": market.end_date,
+                    "score": round(winner.score, 4),
+                }
+            )
+        return ideas
 
     def _craft_strategy_view(self, idea: Dict[str, Any]) -> Dict[str, Any]:
         entry_price = idea["entry_price"]
@@ -546,6 +550,7 @@ def create_polymarket_tools(polymarket_tools: PolymarketTools) -> List[Tool]:
             ),
             handler=handle_market_list,
             input_model=MarketListInput,
+            output_projection=_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -601,6 +606,7 @@ def create_polymarket_tools(polymarket_tools: PolymarketTools) -> List[Tool]:
             ),
             handler=handle_opportunity_scan,
             input_model=OpportunityScanInput,
+            output_projection=_LISTING_PROJECTION,
         ),
         Tool(
             spec=ToolSpec(
@@ -645,5 +651,6 @@ def create_polymarket_tools(polymarket_tools: PolymarketTools) -> List[Tool]:
             ),
             handler=handle_strategy_brief,
             input_model=StrategyBriefInput,
+            output_projection=_LISTING_PROJECTION,
         ),
     ]
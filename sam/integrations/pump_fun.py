@@ -7,13 +7,22 @@ import aiohttp
 from pydantic import BaseModel, Field, field_validator
 
 from ..core.tools import Tool, ToolSpec
+from ..core.result_shaping import ResultProjection
 from ..utils.error_messages import handle_error_gracefully
 from ..utils.http_client import get_session
 from ..utils.transaction_validator import validate_pump_buy, validate_pump_sell
 from ..utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from .solana.submission import (
+    SubmissionOptions,
+    SubmissionUncertainError,
+    unconfirmed_result,
+)
 
 logger = logging.getLogger(__name__)
 
+# pump.fun bonding-curve trading fee
+PUMP_FEE_RATE = 0.01
+
 
 class SolanaClientProtocol(Protocol):
     wallet_address: Optional[str]
@@ -25,6 +34,8 @@ class SolanaClientProtocol(Protocol):
 
     async def _get_client(self) -> Any: ...
 
+    def get_submission_pipeline(self) -> Any: ...
+
 
 class PumpFunTools:
     def __init__(self, solana_tools: Optional[SolanaClientProtocol] = None) -> None:
@@ -47,7 +58,7 @@ class PumpFunTools:
         pass  # Shared HTTP client handles session lifecycle
 
     async def _sign_and_send_transaction(self, transaction_hex: str, action: str) -> Dict[str, Any]:
-        """Sign and send a pump.fun transaction with fresh blockhash."""
+        """Sign, send and confirm a pump.fun transaction, refreshing a stale blockhash."""
         if not self.solana_tools or not getattr(self.solana_tools, "keypair", None):
             return {"error": "No wallet configured for signing transactions"}
 
@@ -59,48 +70,46 @@ class PumpFunTools:
             transaction_data = bytes.fromhex(transaction_hex)
             versioned_tx = VersionedTransaction.from_bytes(transaction_data)
 
-            # MessageV0 objects are immutable, so we can't patch the blockhash
-            # Instead, just sign the transaction as-is with our keypair
-            # The pump.fun API should already provide a valid blockhash
-
-            # Create a new signed transaction with our keypair
-            signed_tx = VersionedTransaction(versioned_tx.message, [self.solana_tools.keypair])
-
-            # Send the transaction to Solana with optimized settings
-            from solana.rpc.types import TxOpts
+            # The pipeline signs with our keypair, re-signs with a fresh blockhash if the
+            # one provided by pump.fun is stale, and re-broadcasts until confirmed.
+            pipeline = self.solana_tools.get_submission_pipeline()
+            submission = await pipeline.submit_transaction(
+                versioned_tx,
+                [self.solana_tools.keypair],
+                SubmissionOptions(skip_preflight=True),
+            )
 
-            # Try sending with skip preflight first for better success rate on pump.fun
-            try:
-                client = await getattr(self.solana_tools, "_get_client")()
-                result = await client.send_transaction(
-                    signed_tx, opts=TxOpts(skip_preflight=True, max_retries=2)
+            if submission.status in ("failed", "expired"):
+                logger.error(
+                    f"Pump.fun {action} transaction {submission.signature} "
+                    f"{submission.status}: {submission.error}"
+                )
+                return {
+                    "error": f"Transaction {submission.status}: {submission.error}",
+                    "transaction_id": submission.signature,
+                    "confirmation": submission.to_dict(),
+                }
+            if submission.status == "timeout":
+                logger.warning(f"Pump.fun {action} transaction {submission.signature} unconfirmed")
+                return unconfirmed_result(
+                    submission.signature,
+                    f"Pump.fun {action} sent but not confirmed in time",
+                    submission.to_dict(),
                 )
-            except Exception as first_attempt_error:
-                error_msg = str(first_attempt_error)
-                if "blockhash" in error_msg.lower():
-                    logger.warning(
-                        f"Blockhash error, transaction may be stale: {first_attempt_error}"
-                    )
-                    return {"error": "Transaction expired (stale blockhash). Please try again."}
-                else:
-                    logger.warning(
-                        f"Preflight skip failed, retrying with preflight: {first_attempt_error}"
-                    )
-                    # If that fails, try with preflight enabled
-                    client = await getattr(self.solana_tools, "_get_client")()
-                    result = await client.send_transaction(
-                        signed_tx, opts=TxOpts(skip_preflight=False, max_retries=1)
-                    )
-
-            if result.value:
-                tx_signature = str(result.value)
-                logger.info(f"Pump.fun {action} transaction executed successfully: {tx_signature}")
 
-                return {"success": True, "transaction_id": tx_signature, "action": action}
-            else:
-                logger.error("Transaction failed to send - no signature returned")
-                return {"error": "Transaction failed: No signature returned"}
+            logger.info(
+                f"Pump.fun {action} transaction {submission.status}: {submission.signature}"
+            )
+            return {
+                "success": True,
+                "transaction_id": submission.signature,
+                "action": action,
+                "confirmation": submission.to_dict(),
+            }
 
+        except SubmissionUncertainError as e:
+            logger.error(f"Pump.fun {action} transaction {e.signature} outcome unknown: {e}")
+            return unconfirmed_result(e.signature, f"Pump.fun {action} outcome unknown")
         except Exception as e:
             logger.error(f"Failed to execute pump.fun transaction: {e}")
             return {"error": f"Transaction failed: {str(e)}"}
@@ -135,46 +144,48 @@ class PumpFunTools:
             logger.error(f"Error getting trades (circuit breaker): {e}")
             return {"error": str(e)}
 
-    async def create_buy_transaction(
-        self, public_key: str, mint: str, amount: float, slippage: int = 1
+    async def submit_transaction(self, transaction_hex: str, action: str) -> Dict[str, Any]:
+        """Sign and send a transaction previously returned by ``build_*_transaction``."""
+        return await self._sign_and_send_transaction(transaction_hex, action)
+
+    async def _build_trade_transaction(
+        self, public_key: str, action: str, mint: str, amount: float, slippage: int
     ) -> Dict[str, Any]:
-        """Create a buy transaction for a token on pump.fun."""
-        try:
-            session = await get_session()
+        """Request an unsigned trade transaction from pumpportal without sending it."""
+        session = await get_session()
+
+        payload = {
+            "publicKey": public_key,
+            "action": action,
+            "mint": mint,
+            # Buys are sized in SOL, sells as a percentage of holdings
+            "denominatedInSol": action == "buy",
+            "amount": amount,
+            "slippage": slippage,
+            "priorityFee": 0.00001,
+        }
+
+        async with session.post(f"{self.base_url}/trade-local", json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(
+                    f"{action.capitalize()} transaction creation failed {response.status}: "
+                    f"{error_text}"
+                )
+                return {"error": f"Transaction creation failed: {error_text}"}
 
-            payload = {
-                "publicKey": public_key,
-                "action": "buy",
-                "mint": mint,
-                "denominatedInSol": True,
-                "amount": amount,
-                "slippage": slippage,
-                "priorityFee": 0.00001,
-            }
+            # Response is raw transaction data
+            transaction_data = await response.read()
+            logger.info(f"{action.capitalize()} transaction created successfully for {mint}")
+            return {"transaction_hex": transaction_data.hex(), "action": action, "mint": mint}
 
+    async def build_buy_transaction(
+        self, public_key: str, mint: str, amount: float, slippage: int = 1
+    ) -> Dict[str, Any]:
+        """Build (but do not send) a pump.fun buy transaction."""
+        try:
             logger.info(f"Creating buy transaction: {amount} SOL for {mint}")
-
-            async with session.post(f"{self.base_url}/trade-local", json=payload) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(f"Buy transaction creation failed {response.status}: {error_text}")
-                    return {"error": f"Transaction creation failed: {error_text}"}
-
-                # Response is raw transaction data
-                transaction_data = await response.read()
-                transaction_hex = transaction_data.hex()
-
-                logger.info(f"Buy transaction created successfully for {mint}")
-
-                # Sign and send the transaction automatically
-                sign_result = await self._sign_and_send_transaction(transaction_hex, "buy")
-
-                # Add transaction details to the result
-                if "success" in sign_result:
-                    sign_result.update({"mint": mint, "amount_sol": amount, "slippage": slippage})
-
-                return sign_result
-
+            return await self._build_trade_transaction(public_key, "buy", mint, amount, slippage)
         except aiohttp.ClientError as e:
             logger.error(f"Network error creating buy transaction: {e}")
             return {"error": f"Network error: {str(e)}"}
@@ -182,56 +193,89 @@ class PumpFunTools:
             logger.error(f"Unexpected error creating buy transaction: {e}")
             return handle_error_gracefully(e, {"operation": "pump_fun_buy"})
 
-    async def create_sell_transaction(
+    async def build_sell_transaction(
         self, public_key: str, mint: str, percentage: int = 100, slippage: int = 1
     ) -> Dict[str, Any]:
-        """Create a sell transaction for a token on pump.fun."""
+        """Build (but do not send) a pump.fun sell transaction."""
         try:
-            session = await get_session()
+            logger.info(f"Creating sell transaction: {percentage}% of {mint}")
+            return await self._build_trade_transaction(
+                public_key, "sell", mint, percentage, slippage
+            )
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error creating sell transaction: {e}")
+            return {"error": f"Network error: {str(e)}"}
+        except Exception as e:
+            logger.error(f"Unexpected error creating sell transaction: {e}")
+            return {"error": str(e)}
 
-            payload = {
-                "publicKey": public_key,
-                "action": "sell",
-                "mint": mint,
-                "denominatedInSol": False,
-                "amount": percentage,  # Percentage of holdings to sell
-                "slippage": slippage,
-                "priorityFee": 0.00001,
-            }
+    async def create_buy_transaction(
+        self, public_key: str, mint: str, amount: float, slippage: int = 1
+    ) -> Dict[str, Any]:
+        """Create a buy transaction for a token on pump.fun."""
+        built = await self.build_buy_transaction(public_key, mint, amount, slippage)
+        if "error" in built:
+            return built
 
-            logger.info(f"Creating sell transaction: {percentage}% of {mint}")
+        # Sign and send the transaction automatically
+        sign_result = await self._sign_and_send_transaction(built["transaction_hex"], "buy")
 
-            async with session.post(f"{self.base_url}/trade-local", json=payload) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Sell transaction creation failed {response.status}: {error_text}"
-                    )
-                    return {"error": f"Transaction creation failed: {error_text}"}
+        # Add transaction details to the result
+        if "success" in sign_result:
+            sign_result.update({"mint": mint, "amount_sol": amount, "slippage": slippage})
 
-                # Response is raw transaction data
-                transaction_data = await response.read()
-                transaction_hex = transaction_data.hex()
+        return sign_result
 
-                logger.info(f"Sell transaction created successfully for {mint}")
+    async def create_sell_transaction(
+        self, public_key: str, mint: str, percentage: int = 100, slippage: int = 1
+    ) -> Dict[str, Any]:
+        """Create a sell transaction for a token on pump.fun."""
+        built = await self.build_sell_transaction(public_key, mint, percentage, slippage)
+        if "error" in built:
+            return built
 
-                # Sign and send the transaction automatically
-                sign_result = await self._sign_and_send_transaction(transaction_hex, "sell")
+        # Sign and send the transaction automatically
+        sign_result = await self._sign_and_send_transaction(built["transaction_hex"], "sell")
 
-                # Add transaction details to the result
-                if "success" in sign_result:
-                    sign_result.update(
-                        {"mint": mint, "percentage": percentage, "slippage": slippage}
-                    )
+        # Add transaction details to the result
+        if "success" in sign_result:
+            sign_result.update({"mint": mint, "percentage": percentage, "slippage": slippage})
 
-                return sign_result
+        return sign_result
 
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error creating sell transaction: {e}")
-            return {"error": f"Network error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Unexpected error creating sell transaction: {e}")
-            return {"error": str(e)}
+    async def estimate_trade(self, mint: str, action: str, amount: int) -> Dict[str, Any]:
+        """Estimate a bonding-curve trade from the curve's virtual reserves.
+
+        ``amount`` is lamports for a buy and token base units for a sell. Returns
+        ``expected_output`` in the opposite unit and ``price_impact_pct`` as a
+        fraction, or an error when the token has no active bonding curve.
+        """
+        info = await self.get_token_info(mint)
+        raw = info.get("raw") if isinstance(info, dict) else None
+        if not isinstance(raw, dict) or info.get("source") != "pump.fun":
+            return {"error": "No bonding curve data available"}
+        if raw.get("complete"):
+            return {"error": "Bonding curve complete; token has migrated"}
+        try:
+            sol_reserves = int(raw.get("virtual_sol_reserves") or 0)
+            token_reserves = int(raw.get("virtual_token_reserves") or 0)
+        except (TypeError, ValueError):
+            return {"error": "Invalid bonding curve reserves"}
+        if sol_reserves <= 0 or token_reserves <= 0 or amount <= 0:
+            return {"error": "Invalid bonding curve reserves"}
+
+        # Constant-product curve with the 1% protocol fee taken on the SOL side
+        if action == "buy":
+            sol_in = amount * (1 - PUMP_FEE_RATE)
+            expected = token_reserves - (sol_reserves * token_reserves) / (sol_reserves + sol_in)
+            spot = token_reserves / sol_reserves
+            impact = 1 - expected / (sol_in * spot)
+        else:
+            sol_out = sol_reserves - (sol_reserves * token_reserves) / (token_reserves + amount)
+            expected = sol_out * (1 - PUMP_FEE_RATE)
+            spot = sol_reserves / token_reserves
+            impact = 1 - sol_out / (amount * spot)
+        return {"expected_output": int(expected), "price_impact_pct": max(0.0, impact)}
 
     async def get_token_info(self, mint: str) -> Dict[str, Any]:
         """Get basic information about a token.
@@ -610,6 +654,7 @@ def create_pump_fun_tools(pump_fun_tools: PumpFunTools, agent: Optional[Any] = N
             ),
             handler=handle_get_pump_token_info,
             input_model=PumpTokenInfoInput,
+            output_projection=ResultProjection(exclude=("raw",)),
         ),
     ]
 
@@ -0,0 +1,82 @@
+"""Lazy lookup of the integrations behind each tool bundle.
+
+Integration modules pull in heavy SDKs (solders/solana, web3, eth_account, the
+Hyperliquid SDK, x402, ...). The builder resolves a bundle here only once
+``AgentBuilder._tool_enabled`` says it is on, so importing the builder (and with
+it the CLI and the API app) does not pay for every integration.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple
+
+
+class IntegrationSpec(NamedTuple):
+    """Where a bundle lives: its module and the name of its tools factory."""
+
+    module: str
+    factory: str
+
+
+INTEGRATIONS: Dict[str, IntegrationSpec] = {
+    "solana": IntegrationSpec("sam.integrations.solana.solana_tools", "create_solana_tools"),
+    "pump_fun": IntegrationSpec("sam.integrations.pump_fun", "create_pump_fun_tools"),
+    "dexscreener": IntegrationSpec("sam.integrations.dexscreener", "create_dexscreener_tools"),
+    "jupiter": IntegrationSpec("sam.integrations.jupiter", "create_jupiter_tools"),
+    "search": IntegrationSpec("sam.integrations.search", "create_search_tools"),
+    "polymarket": IntegrationSpec("sam.integrations.polymarket", "create_polymarket_tools"),
+    "kalshi": IntegrationSpec("sam.integrations.kalshi", "create_kalshi_tools"),
+    "aster_futures": IntegrationSpec(
+        "sam.integrations.aster_futures", "create_aster_futures_tools"
+    ),
+    "hyperliquid": IntegrationSpec("sam.integrations.hyperliquid", "create_hyperliquid_tools"),
+    "smart_trader": IntegrationSpec("sam.integrations.smart_trader", "create_smart_trader_tools"),
+    "uranus": IntegrationSpec("sam.integrations.uranus", "create_uranus_tools"),
+    "payai_facilitator": IntegrationSpec(
+        "sam.integrations.payai_facilitator", "create_payai_facilitator_tools"
+    ),
+    "aixbt": IntegrationSpec("sam.integrations.aixbt", "create_aixbt_tools"),
+    "coinbase_x402": IntegrationSpec(
+        "sam.integrations.coinbase_x402", "create_coinbase_x402_tools"
+    ),
+    "evm": IntegrationSpec("sam.integrations.evm", "create_evm_tools"),
+}
+
+# Process-wide state owned by integration modules. Released at shutdown, but
+# only for modules that were actually imported.
+SHUTDOWN_HOOKS = (
+    ("sam.integrations.solana.rpc_router", "cleanup_rpc_routers"),
+    ("sam.integrations.hyperliquid_market_data", "stop_mid_price_feeds"),
+    ("sam.integrations.solana.wallet_cache", "stop_wallet_caches"),
+)
+
+
+def load_integration(bundle: str) -> ModuleType:
+    """Import (once) and return the module implementing ``bundle``."""
+    return importlib.import_module(INTEGRATIONS[bundle].module)
+
+
+def integration_factory(bundle: str) -> Callable[..., List[Any]]:
+    """The ``create_*_tools`` function of ``bundle``."""
+    return getattr(load_integration(bundle), INTEGRATIONS[bundle].factory)
+
+
+def loaded_shutdown_hooks() -> List[Callable[[], Awaitable[None]]]:
+    hooks: List[Callable[[], Awaitable[None]]] = []
+    for module_name, func_name in SHUTDOWN_HOOKS:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            hooks.append(getattr(module, func_name))
+    return hooks
+
+
+__all__ = [
+    "INTEGRATIONS",
+    "IntegrationSpec",
+    "integration_factory",
+    "load_integration",
+    "loaded_shutdown_hooks",
+]
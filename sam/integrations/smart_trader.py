@@ -1,5 +1,18 @@
+"""Smart routing between pump.fun and Jupiter.
+
+Both providers are asked for a route concurrently: pump.fun builds an unsigned
+transaction (and estimates the bonding-curve output) while Jupiter quotes the
+swap. The better route by expected output, then price impact, is executed and
+the other is discarded, so routing costs the slower provider's latency rather
+than the sum of both. If the chosen route fails to execute the other one is
+tried before giving up.
+"""
+
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Protocol
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, List, Optional, Protocol, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -10,18 +23,29 @@ logger = logging.getLogger(__name__)
 
 WSOL_MINT = "So11111111111111111111111111111111111111112"
 
+# Providers in order of preference when expected outputs cannot be compared
+PROVIDER_PREFERENCE = ("pump.fun", "jupiter")
+
 
 class PumpTools(Protocol):
-    async def create_buy_transaction(
+    async def build_buy_transaction(
         self, wallet: str, mint: str, amount_sol: float, slippage_percent: int
     ) -> Dict[str, Any]: ...
 
-    async def create_sell_transaction(
+    async def build_sell_transaction(
         self, wallet: str, mint: str, percentage: int, slippage_percent: int
     ) -> Dict[str, Any]: ...
 
+    async def estimate_trade(self, mint: str, action: str, amount: int) -> Dict[str, Any]: ...
+
+    async def submit_transaction(self, transaction_hex: str, action: str) -> Dict[str, Any]: ...
+
 
 class JupiterTools(Protocol):
+    async def get_quote(
+        self, input_mint: str, output_mint: str, amount: int, slippage_bps: int
+    ) -> Dict[str, Any]: ...
+
     async def execute_swap(
         self, input_mint: str, output_mint: str, amount: int, slippage_bps: int
     ) -> Dict[str, Any]: ...
@@ -35,6 +59,73 @@ class SolanaTools(Protocol):
 
     async def _get_client(self) -> Any: ...
 
+    def get_submission_pipeline(self) -> Any: ...
+
+
+@dataclass
+class RouteQuote:
+    """One provider's answer in a routing race."""
+
+    provider: str
+    expected_output: Optional[int] = None
+    price_impact_pct: Optional[float] = None
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def summary(self) -> Dict[str, Any]:
+        if self.error is not None:
+            return {"provider": self.provider, "error": self.error}
+        return {
+            "provider": self.provider,
+            "expected_output": self.expected_output,
+            "price_impact_pct": self.price_impact_pct,
+            "latency_ms": round(self.latency_ms, 1),
+        }
+
+
+def choose_route(quotes: List[RouteQuote]) -> List[RouteQuote]:
+    """Order successful quotes from best to worst.
+
+    Routes are compared on expected output (then lower price impact) when every
+    candidate reports one; otherwise the provider preference order is used.
+    """
+    candidates = [q for q in quotes if q.ok]
+
+    def preference(q: RouteQuote) -> int:
+        try:
+            return PROVIDER_PREFERENCE.index(q.provider)
+        except ValueError:
+            return len(PROVIDER_PREFERENCE)
+
+    if candidates and all(q.expected_output is not None for q in candidates):
+        return sorted(
+            candidates,
+            key=lambda q: (
+                -(q.expected_output or 0),
+                q.price_impact_pct if q.price_impact_pct is not None else float("inf"),
+                preference(q),
+            ),
+        )
+    return sorted(candidates, key=preference)
+
+
+def _safe_to_fall_back(result: Any) -> bool:
+    """Whether a failed route definitely left nothing in flight.
+
+    True for errors raised before anything was sent (no signature) and for
+    transactions confirmed ``failed`` or ``expired`` on chain.
+    """
+    if not isinstance(result, dict) or not result.get("transaction_id"):
+        return True
+    confirmation = result.get("confirmation")
+    status = confirmation.get("status") if isinstance(confirmation, dict) else None
+    return status in ("failed", "expired")
+
 
 class SmartTrader:
     def __init__(
@@ -42,15 +133,137 @@ class SmartTrader:
         pump_tools: Optional[PumpTools] = None,
         jupiter_tools: Optional[JupiterTools] = None,
         solana_tools: Optional[SolanaTools] = None,
+        *,
+        quote_timeout: float = 15.0,
+        race_grace: float = 2.0,
     ) -> None:
         self.pump: Optional[PumpTools] = pump_tools
         self.jupiter: Optional[JupiterTools] = jupiter_tools
         self.solana: Optional[SolanaTools] = solana_tools
+        # Overall budget for collecting quotes, and how long to keep waiting for the
+        # other providers once the first usable quote is in
+        self.quote_timeout = quote_timeout
+        self.race_grace = race_grace
+
+    async def _timed(self, provider: str, fetch: Awaitable[RouteQuote]) -> RouteQuote:
+        start = time.perf_counter()
+        try:
+            quote = await fetch
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            quote = RouteQuote(provider=provider, error=str(e))
+        quote.latency_ms = (time.perf_counter() - start) * 1000
+        return quote
+
+    async def race_quotes(self, fetchers: Dict[str, Awaitable[RouteQuote]]) -> List[RouteQuote]:
+        """Run provider quote requests concurrently and collect their answers.
+
+        Once one provider has a usable quote the rest get ``race_grace`` seconds to
+        answer before they are cancelled.
+        """
+        tasks: Dict[asyncio.Task[RouteQuote], str] = {
+            asyncio.create_task(self._timed(provider, fetch)): provider
+            for provider, fetch in fetchers.items()
+        }
+        quotes: List[RouteQuote] = []
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.quote_timeout
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if any(q.ok for q in quotes):
+                    remaining = min(remaining, self.race_grace)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                quotes.extend(task.result() for task in done)
+        finally:
+            for task in pending:
+                task.cancel()
+                logger.info(f"smart route: cancelled slow {tasks[task]} quote")
+                quotes.append(RouteQuote(provider=tasks[task], error="Quote timed out"))
+        return quotes
+
+    async def _pump_quote(
+        self, action: str, wallet: str, mint: str, size: float, slippage_percent: int, units: int
+    ) -> RouteQuote:
+        assert self.pump is not None
+        if action == "buy":
+            build = self.pump.build_buy_transaction(wallet, mint, size, slippage_percent)
+        else:
+            build = self.pump.build_sell_transaction(wallet, mint, int(size), slippage_percent)
+        built, estimate = await asyncio.gather(
+            build, self.pump.estimate_trade(mint, action, units), return_exceptions=True
+        )
+        if isinstance(built, BaseException):
+            return RouteQuote(provider="pump.fun", error=str(built))
+        if "error" in built:
+            return RouteQuote(provider="pump.fun", error=str(built["error"]), payload=built)
+        quote = RouteQuote(provider="pump.fun", payload=built)
+        if isinstance(estimate, dict) and "error" not in estimate:
+            quote.expected_output = int(estimate["expected_output"])
+            quote.price_impact_pct = float(estimate["price_impact_pct"])
+        return quote
+
+    async def _jupiter_quote(
+        self, input_mint: str, output_mint: str, amount: int, slippage_bps: int
+    ) -> RouteQuote:
+        assert self.jupiter is not None
+        res = await self.jupiter.get_quote(input_mint, output_mint, amount, slippage_bps)
+        if "error" in res:
+            return RouteQuote(provider="jupiter", error=str(res["error"]), payload=res)
+        return RouteQuote(
+            provider="jupiter",
+            expected_output=int(res.get("output_amount", 0) or 0),
+            price_impact_pct=float(res.get("price_impact_pct", 0) or 0),
+            payload=res,
+        )
+
+    async def _execute(
+        self,
+        routes: List[RouteQuote],
+        action: str,
+        jupiter_args: Tuple[str, str, int, int],
+        details: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        res: Dict[str, Any] = {"error": "No route available"}
+        for route in routes:
+            logger.info(f"smart_{action}: executing via {route.provider}")
+            try:
+                if route.provider == "pump.fun":
+                    assert self.pump is not None
+                    res = await self.pump.submit_transaction(
+                        route.payload["transaction_hex"], action
+                    )
+                    if isinstance(res, dict) and "error" not in res:
+                        res.update(details)
+                else:
+                    assert self.jupiter is not None
+                    res = await self.jupiter.execute_swap(*jupiter_args)
+            except Exception as e:
+                logger.warning(f"{route.provider} {action} raised: {e}")
+                res = {"error": f"{route.provider} {action} failed: {str(e)}"}
+            if isinstance(res, dict) and "error" not in res:
+                res.setdefault("provider", route.provider)
+                return res
+            if not _safe_to_fall_back(res):
+                # A transaction may still land: trading on another route could fill twice
+                logger.error(f"{route.provider} {action} outcome unknown; not falling back: {res}")
+                res.setdefault("provider", route.provider)
+                return res
+            logger.warning(f"{route.provider} {action} failed: {res}")
+        return res
 
     async def smart_buy(
         self, mint: str, amount_sol: float, slippage_percent: int = 5
     ) -> Dict[str, Any]:
-        """Try pump.fun first; on failure fall back to Jupiter SOL->mint swap."""
+        """Buy via whichever of pump.fun and Jupiter SOL->mint gives the better route."""
         if not self.solana or not getattr(self.solana, "wallet_address", None):
             return {"error": "No wallet configured for trading"}
 
@@ -59,44 +272,43 @@ class SmartTrader:
             return {"error": "No wallet configured for trading"}
 
         wallet = wallet_address
+        slippage_bps = max(1, min(1000, int(slippage_percent * 100)))
+        amount_lamports = int(amount_sol * 1_000_000_000)
 
-        # 1) Try pump.fun
+        fetchers: Dict[str, Awaitable[RouteQuote]] = {}
         if self.pump is not None:
-            try:
-                logger.info("smart_buy: attempting pump.fun buy")
-                res = await self.pump.create_buy_transaction(
-                    wallet, mint, amount_sol, slippage_percent
-                )
-                if isinstance(res, dict) and "error" not in res:
-                    res.setdefault("provider", "pump.fun")
-                    return res
-                else:
-                    logger.warning(f"pump.fun buy failed, will fallback: {res}")
-            except Exception as e:
-                logger.warning(f"pump.fun buy raised, falling back: {e}")
-
-        # 2) Fallback to Jupiter
-        if self.jupiter is None:
-            return {"error": "Jupiter swap unavailable for fallback"}
-
-        try:
-            slippage_bps = max(1, min(1000, int(slippage_percent * 100)))
-            amount_lamports = int(amount_sol * 1_000_000_000)
-            logger.info(
-                f"smart_buy: attempting Jupiter swap SOL->{mint} amount={amount_lamports} bps={slippage_bps}"
+            fetchers["pump.fun"] = self._pump_quote(
+                "buy", wallet, mint, amount_sol, slippage_percent, amount_lamports
             )
-            res = await self.jupiter.execute_swap(WSOL_MINT, mint, amount_lamports, slippage_bps)
-            if isinstance(res, dict) and "error" not in res:
-                res.setdefault("provider", "jupiter")
-            return res
-        except Exception as e:
-            logger.error(f"Jupiter fallback failed: {e}")
-            return {"error": f"Jupiter swap failed: {str(e)}"}
+        if self.jupiter is not None:
+            fetchers["jupiter"] = self._jupiter_quote(
+                WSOL_MINT, mint, amount_lamports, slippage_bps
+            )
+        if not fetchers:
+            return {"error": "No trading provider available"}
+
+        logger.info(f"smart_buy: racing {list(fetchers)} for {amount_lamports} lamports -> {mint}")
+        quotes = await self.race_quotes(fetchers)
+        routes = choose_route(quotes)
+        if not routes:
+            return {
+                "error": "No provider could route this buy",
+                "routes": [q.summary() for q in quotes],
+            }
+
+        res = await self._execute(
+            routes,
+            "buy",
+            (WSOL_MINT, mint, amount_lamports, slippage_bps),
+            {"mint": mint, "amount_sol": amount_sol, "slippage": slippage_percent},
+        )
+        res["routes"] = [q.summary() for q in quotes]
+        return res
 
     async def smart_sell(
         self, mint: str, percentage: int = 100, slippage_percent: int = 5
     ) -> Dict[str, Any]:
-        """Try pump.fun sell first; on failure fall back to Jupiter token->SOL swap.
+        """Sell via whichever of pump.fun and Jupiter token->SOL gives the better route.
 
         percentage: 1..100 of current holdings to sell.
         """
@@ -109,7 +321,7 @@ class SmartTrader:
 
         wallet = wallet_address
 
-        # Determine token balance (in smallest units) to sell via Jupiter fallback
+        # Determine token balance (in smallest units) to size the Jupiter quote
         sell_amount_smallest = 0
         try:
             accs = await self.solana.get_token_accounts(wallet)
@@ -119,47 +331,45 @@ class SmartTrader:
                     sell_amount_smallest = max(0, int(amt * (percentage / 100.0)))
                     break
         except Exception:
-            # Best-effort; if we can't compute, Jupiter fallback may fail and return a helpful error
+            # Best-effort; pump.fun sells by percentage and does not need the amount
             sell_amount_smallest = 0
 
-        # 1) Try pump.fun
-        if self.pump is not None:
-            try:
-                logger.info("smart_sell: attempting pump.fun sell")
-                res = await self.pump.create_sell_transaction(
-                    wallet, mint, percentage, slippage_percent
-                )
-                if isinstance(res, dict) and "error" not in res:
-                    res.setdefault("provider", "pump.fun")
-                    return res
-                else:
-                    logger.warning(f"pump.fun sell failed, will fallback: {res}")
-            except Exception as e:
-                logger.warning(f"pump.fun sell raised, falling back: {e}")
-
-        # 2) Fallback to Jupiter token->SOL
-        if self.jupiter is None:
-            return {"error": "Jupiter swap unavailable for fallback"}
+        slippage_bps = max(1, min(1000, int(slippage_percent * 100)))
 
-        try:
-            slippage_bps = max(1, min(1000, int(slippage_percent * 100)))
-            if sell_amount_smallest <= 0:
+        fetchers: Dict[str, Awaitable[RouteQuote]] = {}
+        if self.pump is not None:
+            fetchers["pump.fun"] = self._pump_quote(
+                "sell", wallet, mint, percentage, slippage_percent, sell_amount_smallest
+            )
+        if self.jupiter is not None and sell_amount_smallest > 0:
+            fetchers["jupiter"] = self._jupiter_quote(
+                mint, WSOL_MINT, sell_amount_smallest, slippage_bps
+            )
+        if not fetchers:
+            if self.jupiter is not None:
                 return {
                     "error": "No balance available to sell for the specified token",
                     "help": "Holdings may be zero or could not be determined.",
                 }
-            logger.info(
-                f"smart_sell: attempting Jupiter swap {mint}->SOL amount={sell_amount_smallest} bps={slippage_bps}"
-            )
-            res = await self.jupiter.execute_swap(
-                mint, WSOL_MINT, sell_amount_smallest, slippage_bps
-            )
-            if isinstance(res, dict) and "error" not in res:
-                res.setdefault("provider", "jupiter")
-            return res
-        except Exception as e:
-            logger.error(f"Jupiter fallback sell failed: {e}")
-            return {"error": f"Jupiter swap failed: {str(e)}"}
+            return {"error": "No trading provider available"}
+
+        logger.info(f"smart_sell: racing {list(fetchers)} for {percentage}% of {mint}")
+        quotes = await self.race_quotes(fetchers)
+        routes = choose_route(quotes)
+        if not routes:
+            return {
+                "error": "No provider could route this sell",
+                "routes": [q.summary() for q in quotes],
+            }
+
+        res = await self._execute(
+            routes,
+            "sell",
+            (mint, WSOL_MINT, sell_amount_smallest, slippage_bps),
+            {"mint": mint, "percentage": percentage, "slippage": slippage_percent},
+        )
+        res["routes"] = [q.summary() for q in quotes]
+        return res
 
 
 def create_smart_trader_tools(
@@ -214,7 +424,7 @@ def create_smart_trader_tools(
         Tool(
             spec=ToolSpec(
                 name="smart_buy",
-                description="Buy a token using best available route: tries pump.fun first, falls back to Jupiter SOL->token.",
+                description="Buy a token using the best route: quotes pump.fun and Jupiter SOL->token concurrently and executes the better one.",
                 input_schema={
                     "name": "smart_buy",
                     "description": "Smart buy with fallback",
@@ -246,7 +456,7 @@ def create_smart_trader_tools(
         Tool(
             spec=ToolSpec(
                 name="smart_sell",
-                description="Sell a token using best route: tries pump.fun first, falls back to Jupiter token->SOL.",
+                description="Sell a token using the best route: quotes pump.fun and Jupiter token->SOL concurrently and executes the better one.",
                 input_schema={
                     "name": "smart_sell",
                     "description": "Smart sell with fallback",
@@ -0,0 +1,339 @@
+"""Multi-endpoint Solana RPC routing with latency-based selection and failover.
+
+Reads go to the fastest healthy endpoint and fail over to the next one on
+transport errors; ``sendTransaction`` is fanned out to several endpoints. Each
+endpoint is guarded by its own :class:`~sam.utils.circuit_breaker.CircuitBreaker`.
+"""
+
+import asyncio
+import logging
+import time
+from asyncio import AbstractEventLoop
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from solana.exceptions import SolanaRpcException
+from solana.rpc.async_api import AsyncClient
+
+from ...utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    CircuitState,
+    get_circuit_breaker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors that say something about the endpoint rather than the request
+TRANSPORT_ERRORS: Tuple[type[BaseException], ...] = (
+    SolanaRpcException,
+    httpx.HTTPError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+_SEND_METHODS = frozenset({"send_transaction", "send_raw_transaction"})
+
+
+def _endpoint_label(url: str) -> str:
+    """Host and path only, so API keys passed as query parameters never leak into logs."""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path.rstrip('/')}" or url
+
+
+# Clients from a previous event loop being closed in the background
+_closing: Set["asyncio.Task[None]"] = set()
+
+
+async def _close_quietly(client: AsyncClient) -> None:
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Closing stale Solana RPC client failed: {e}")
+
+
+class RpcEndpoint:
+    """One RPC endpoint with its client, rolling latency/error window and circuit."""
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        window: int = 50,
+        breaker_config: Optional[CircuitBreakerConfig] = None,
+    ) -> None:
+        self.url = url
+        self.label = _endpoint_label(url)
+        self.breaker: CircuitBreaker = get_circuit_breaker(
+            f"solana_rpc:{self.label}",
+            breaker_config
+            or CircuitBreakerConfig(
+                failure_threshold=3,
+                recovery_timeout=30.0,
+                success_threshold=1,
+                timeout=15.0,
+                exceptions=TRANSPORT_ERRORS,
+                min_requests=10,
+            ),
+        )
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self.ewma_latency: Optional[float] = None
+        self._client: Optional[AsyncClient] = None
+        self._loop: Optional[AbstractEventLoop] = None
+
+    @property
+    def available(self) -> bool:
+        if self.breaker.stats.state != CircuitState.OPEN:
+            return True
+        elapsed = time.time() - self.breaker.stats.last_failure_time
+        return elapsed >= self.breaker.config.recovery_timeout
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def score(self) -> float:
+        """Lower is better: smoothed latency inflated by the recent error rate."""
+        latency = self.ewma_latency if self.ewma_latency is not None else 0.0
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        self._outcomes.append(ok)
+        if ok and latency is not None:
+            self._latencies.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = 0.8 * self.ewma_latency + 0.2 * latency
+
+    def client(self) -> AsyncClient:
+        try:
+            current_loop: Optional[AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if self._client is None or self._loop is not current_loop:
+            if self._client is not None:
+                self._discard(self._client, self._loop)
+            self._client = AsyncClient(self.url)
+            self._loop = current_loop
+        return self._client
+
+    @staticmethod
+    def _discard(client: AsyncClient, loop: Optional[AbstractEventLoop]) -> None:
+        """Close a client created on another event loop without blocking the caller."""
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+            return
+        # The owning loop has stopped; close what can still be closed from this one
+        try:
+            task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        except RuntimeError:
+            return
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        self._loop = None
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def health(self) -> Dict[str, Any]:
+        ordered = sorted(self._latencies)
+        return {
+            "endpoint": self.label,
+            "state": self.breaker.stats.state.value,
+            "available": self.available,
+            "ewma_latency_ms": (
+                round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None
+            ),
+            "p50_latency_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+            "error_rate": round(self.error_rate, 3),
+            "samples": len(self._outcomes),
+        }
+
+
+class SolanaRpcRouter:
+    """Routes Solana RPC calls across several endpoints."""
+
+    def __init__(self, urls: Sequence[str], *, send_fanout: int = 3) -> None:
+        unique = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        if not unique:
+            raise ValueError("At least one Solana RPC endpoint is required")
+        self.endpoints = [RpcEndpoint(url) for url in unique]
+        self.send_fanout = max(1, send_fanout)
+        self._background: Set[asyncio.Task[Any]] = set()
+
+    @property
+    def primary_url(self) -> str:
+        return self.endpoints[0].url
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """Available endpoints, fastest first; configured order breaks ties."""
+        available = [endpoint for endpoint in self.endpoints if endpoint.available]
+        if not available:
+            # Every circuit is open. Return them all so callers fail fast with the
+            # breakers' CircuitBreakerError (no request is sent) instead of an empty route.
+            available = list(self.endpoints)
+        return sorted(available, key=lambda endpoint: endpoint.score())
+
+    def best_url(self) -> str:
+        return self.ranked()[0].url
+
+    async def _invoke(self, endpoint: RpcEndpoint, method: str, *args: Any, **kwargs: Any) -> Any:
+        func = getattr(endpoint.client(), method)
+        start = time.perf_counter()
+        try:
+            result = await endpoint.breaker.call(func, *args, **kwargs)
+        except TRANSPORT_ERRORS + (CircuitBreakerError,):
+            endpoint.record(False)
+            raise
+        endpoint.record(True, time.perf_counter() - start)
+        return result
+
+    async def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call ``method`` on the fastest healthy endpoint, failing over on transport errors."""
+        last_error: Optional[BaseException] = None
+        for endpoint in self.ranked():
+            try:
+                return await self._invoke(endpoint, method, *args, **kwargs)
+            except TRANSPORT_ERRORS + (CircuitBreakerError,) as e:
+                logger.warning(f"Solana RPC {method} failed on {endpoint.label}: {e}")
+                last_error = e
+        assert last_error is not None
+        raise last_error
+
+    async def broadcast(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Send to up to ``send_fanout`` endpoints at once and return the first success.
+
+        Remaining sends are left to finish in the background. If every endpoint
+        fails, an RPC-level error (e.g. a preflight failure) is preferred over a
+        transport error when re-raising.
+        """
+        targets = self.ranked()[: self.send_fanout]
+        tasks = [
+            asyncio.create_task(self._invoke(endpoint, method, *args, **kwargs))
+            for endpoint in targets
+        ]
+        pending: Set[asyncio.Task[Any]] = set(tasks)
+        errors: List[BaseException] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    errors.append(error)
+        finally:
+            for task in pending:
+                self._background.add(task)
+                task.add_done_callback(self._finish_background)
+
+        request_errors = [e for e in errors if not isinstance(e, TRANSPORT_ERRORS)]
+        raise (request_errors or errors)[0]
+
+    def _finish_background(self, task: "asyncio.Task[Any]") -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Fan-out send failed on a secondary endpoint: {task.exception()}")
+
+    def client(self) -> "RoutedClient":
+        return RoutedClient(self)
+
+    async def probe(self) -> Dict[str, Any]:
+        """Ping every endpoint with ``getSlot`` and return the refreshed health."""
+
+        async def _ping(endpoint: RpcEndpoint) -> None:
+            try:
+                await self._invoke(endpoint, "get_slot")
+            except Exception as e:
+                logger.debug(f"Probe of {endpoint.label} failed: {e}")
+
+        await asyncio.gather(*(_ping(endpoint) for endpoint in self.endpoints))
+        return self.health()
+
+    def health(self) -> Dict[str, Any]:
+        endpoints = [endpoint.health() for endpoint in self.endpoints]
+        available = sum(1 for endpoint in endpoints if endpoint["available"])
+        if available == len(endpoints):
+            status = "healthy"
+        elif available:
+            status = "degraded"
+        else:
+            status = "unhealthy"
+        return {
+            "status": status,
+            "preferred": self.ranked()[0].label,
+            "endpoints": endpoints,
+        }
+
+    async def close(self) -> None:
+        for endpoint in self.endpoints:
+            await endpoint.close()
+
+
+class RoutedClient:
+    """Drop-in stand-in for ``AsyncClient`` that routes every call through a router."""
+
+    def __init__(self, router: SolanaRpcRouter) -> None:
+        self._router = router
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or not callable(getattr(AsyncClient, name, None)):
+            raise AttributeError(name)
+        router = self._router
+
+        async def _routed(*args: Any, **kwargs: Any) -> Any:
+            if name in _SEND_METHODS:
+                return await router.broadcast(name, *args, **kwargs)
+            return await router.call(name, *args, **kwargs)
+
+        return _routed
+
+    async def close(self) -> None:
+        """Endpoint clients are shared through the router registry; nothing to close."""
+
+
+_routers: Dict[Tuple[str, ...], SolanaRpcRouter] = {}
+
+
+def get_rpc_router(urls: Sequence[str]) -> SolanaRpcRouter:
+    """Get or create the process-wide router for an ordered set of endpoints."""
+    key = tuple(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+    router = _routers.get(key)
+    if router is None:
+        router = SolanaRpcRouter(key)
+        _routers[key] = router
+    return router
+
+
+def get_rpc_router_health() -> List[Dict[str, Any]]:
+    """Health snapshots for every router created in this process."""
+    return [router.health() for router in _routers.values()]
+
+
+async def cleanup_rpc_routers() -> None:
+    """Close all router endpoint clients."""
+    for router in list(_routers.values()):
+        await router.close()
+    _routers.clear()
+
+
+__all__ = [
+    "RoutedClient",
+    "RpcEndpoint",
+    "SolanaRpcRouter",
+    "cleanup_rpc_routers",
+    "get_rpc_router",
+    "get_rpc_router_health",
+]
@@ -2,11 +2,10 @@ import asyncio
 import base58
 import logging
 from asyncio import AbstractEventLoop
-from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence, cast
 
 from pydantic import BaseModel, Field, field_validator
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.system_program import TransferParams, transfer
@@ -15,6 +14,15 @@ from ...core.tools import Tool, ToolSpec
 from ...utils.error_messages import handle_error_gracefully
 from ...utils.http_client import get_session
 from ...utils.price_service import get_price_service
+from .rpc_router import SolanaRpcRouter, get_rpc_router
+from .submission import (
+    SubmissionOptions,
+    SubmissionUncertainError,
+    TransactionPipeline,
+    unconfirmed_result,
+)
+from .token_registry import TokenRegistry
+from .wallet_cache import WalletStateCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,14 +51,73 @@ def _extract_token_info(account: Any) -> Optional[Mapping[str, Any]]:
     return info
 
 
+def _asset_metadata(mint: str, asset: Mapping[str, Any]) -> Dict[str, Any]:
+    """Flatten a Helius DAS asset into the ``get_token_data`` result shape."""
+    content = asset.get("content") or {}
+    metadata = content.get("metadata") or {}
+    files = content.get("files") or [{}]
+    return {
+        "success": True,
+        "mint": mint,
+        "name": metadata.get("name", "Unknown"),
+        "symbol": metadata.get("symbol", "Unknown"),
+        "description": metadata.get("description", ""),
+        "image": files[0].get("uri", ""),
+        "supply": asset.get("supply", {}),
+        "creators": asset.get("creators", []),
+        "ownership": asset.get("ownership", {}),
+        "token_info": asset.get("token_info", {}),
+        "mutable": asset.get("mutable", False),
+        "burnt": asset.get("burnt", False),
+    }
+
+
+def _mint_account_metadata(mint: str, account: Any) -> Optional[Dict[str, Any]]:
+    """Supply and decimals from a jsonParsed mint account, or None if it isn't one."""
+    if not isinstance(account, Mapping):
+        return None
+    data = account.get("data")
+    parsed = data.get("parsed") if isinstance(data, Mapping) else None
+    if not isinstance(parsed, Mapping) or parsed.get("type") != "mint":
+        return None
+    info = parsed.get("info") or {}
+    return {
+        "mint": mint,
+        "name": "Unknown",
+        "symbol": "Unknown",
+        "description": "",
+        "image": "",
+        "supply": {"amount": info.get("supply"), "decimals": info.get("decimals")},
+        "source": "rpc_mint_account",
+    }
+
+
 class SolanaTools:
-    def __init__(self, rpc_url: str, private_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        rpc_url: str,
+        private_key: Optional[str] = None,
+        rpc_urls: Optional[Sequence[str]] = None,
+        token_registry: Optional[TokenRegistry] = None,
+        wallet_cache: Optional[WalletStateCache] = None,
+    ) -> None:
         self.rpc_url = rpc_url
+        # Shared, persistent metadata cache; None fetches on every lookup
+        self._token_registry = token_registry
+        # Process-wide balance cache; None leaves balance caching to the agent
+        self.wallet_cache = wallet_cache
+        # Extra endpoints turn on latency-based routing with failover across all of them
+        endpoints = [rpc_url, *(rpc_urls or [])]
+        self._router: Optional[SolanaRpcRouter] = (
+            get_rpc_router(endpoints) if len(set(endpoints)) > 1 else None
+        )
         # Lazily create AsyncClient to avoid binding to a closed/other loop
         self.client: Optional[AsyncClient] = None
         self._loop: Optional[AbstractEventLoop] = None
         self.keypair: Optional[Keypair] = None
         self.wallet_address: Optional[str] = None
+        self._pipeline: Optional[TransactionPipeline] = None
+        self._pipeline_loop: Optional[AbstractEventLoop] = None
 
         if private_key:
             try:
@@ -93,6 +160,9 @@ class SolanaTools:
 
     async def _get_client(self) -> AsyncClient:
         """Get or (re)create AsyncClient bound to current loop."""
+        if self._router is not None:
+            return cast(AsyncClient, self._router.client())
+
         try:
             current_loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -121,8 +191,37 @@ class SolanaTools:
         assert self.client is not None
         return self.client
 
+    def _rpc_endpoint(self) -> str:
+        """URL for raw JSON-RPC posts: the fastest healthy endpoint when routing."""
+        return self._router.best_url() if self._router is not None else self.rpc_url
+
+    def get_submission_pipeline(self) -> TransactionPipeline:
+        """Return the transaction pipeline bound to this client and the running loop."""
+        try:
+            current_loop: Optional[AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if self._pipeline is None or self._pipeline_loop is not current_loop:
+            self._pipeline = TransactionPipeline(
+                self._get_client, on_complete=self.invalidate_wallet_balance
+            )
+            self._pipeline_loop = current_loop
+        return self._pipeline
+
+    def invalidate_wallet_balance(self) -> None:
+        """Drop the configured wallet's cached balance after one of our own sends."""
+        if self.wallet_cache is not None and self.wallet_address:
+            self.wallet_cache.invalidate(self.wallet_address)
+
     async def close(self) -> None:
         """Close the Solana client connection."""
+        if self._pipeline is not None:
+            try:
+                await self._pipeline.close()
+            except Exception:
+                pass
+            self._pipeline = None
+            self._pipeline_loop = None
         if self.client:
             try:
                 await self.client.close()
@@ -171,7 +270,7 @@ class SolanaTools:
             tokens: List[Dict[str, Any]] = []
 
             async with session.post(
-                self.rpc_url, json=payload, headers={"Content-Type": "application/json"}
+                self._rpc_endpoint(), json=payload, headers={"Content-Type": "application/json"}
             ) as token_response:
                 if token_response.status == 200:
                     token_data = await token_response.json()
@@ -257,49 +356,51 @@ class SolanaTools:
                 )
             )
 
-            # Get recent blockhash
-            client = await self._get_client()
-            recent_blockhash = await client.get_latest_blockhash()
-            if not recent_blockhash.value:
-                return {"error": "Failed to get recent blockhash"}
-
-            # Create and sign transaction
-            from solders.transaction import VersionedTransaction
-            from solders.message import MessageV0
-
-            # Create a simple versioned transaction
-            message = MessageV0.try_compile(
-                payer=self.keypair.pubkey(),
-                instructions=[transfer_instruction],
-                address_lookup_table_accounts=[],
-                recent_blockhash=recent_blockhash.value.blockhash,
+            # Compile against the cached blockhash, send and wait for confirmation
+            pipeline = self.get_submission_pipeline()
+            options = SubmissionOptions(skip_preflight=False)
+            message, last_valid_block_height = await pipeline.compile_message(
+                self.keypair.pubkey(), [transfer_instruction], options
+            )
+            submission = await pipeline.submit(
+                message,
+                [self.keypair],
+                options,
+                last_valid_block_height=last_valid_block_height,
             )
 
-            # Create versioned transaction and sign
-            versioned_tx = VersionedTransaction(message, [self.keypair])
-
-            # Send transaction
-            client = await self._get_client()
-            result = await client.send_transaction(versioned_tx, TxOpts(skip_preflight=False))
-
-            if result.value:
-                tx_signature = str(result.value)
-                logger.info(
-                    f"Transfer successful: {amount} SOL from {self.wallet_address} to {to_address}"
-                )
-                logger.info(f"Transaction signature: {tx_signature}")
-
+            if submission.status in ("failed", "expired"):
                 return {
-                    "success": True,
-                    "transaction_id": tx_signature,
-                    "from_address": self.wallet_address,
-                    "to_address": to_address,
-                    "amount_sol": amount,
-                    "amount_lamports": amount_lamports,
+                    "error": f"Transfer {submission.status}: {submission.error}",
+                    "transaction_id": submission.signature,
+                    "confirmation": submission.to_dict(),
                 }
-            else:
-                return {"error": "Transaction failed to send"}
+            if submission.status == "timeout":
+                return unconfirmed_result(
+                    submission.signature,
+                    "Transfer sent but not confirmed in time",
+                    submission.to_dict(),
+                )
+
+            tx_signature = submission.signature
+            logger.info(
+                f"Transfer successful: {amount} SOL from {self.wallet_address} to {to_address}"
+            )
+            logger.info(f"Transaction signature: {tx_signature}")
+
+            return {
+                "success": True,
+                "transaction_id": tx_signature,
+                "from_address": self.wallet_address,
+                "to_address": to_address,
+                "amount_sol": amount,
+                "amount_lamports": amount_lamports,
+                "confirmation": submission.to_dict(),
+            }
 
+        except SubmissionUncertainError as e:
+            logger.error(f"Transfer {e.signature} outcome unknown: {e}")
+            return unconfirmed_result(e.signature, "Transfer outcome unknown")
         except Exception as e:
             logger.error(f"Transfer failed: {e}")
             return handle_error_gracefully(
@@ -370,74 +471,60 @@ class SolanaTools:
             return {"error": str(e)}
 
     async def get_token_metadata(self, mint_address: str) -> Dict[str, Any]:
-        """Get comprehensive token metadata using Helius getAsset method."""
+        """Get comprehensive token metadata, served from the token registry when cached."""
+        try:
+            metadata = await self.get_token_metadata_batch([mint_address])
+        except Exception as e:
+            logger.error(f"Failed to get token metadata: {e}")
+            return {"error": str(e)}
+        return metadata.get(mint_address) or {"error": f"Asset not found for mint: {mint_address}"}
+
+    async def get_token_metadata_batch(self, mints: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata for several mints at once; unknown mints are left out."""
+        if self._token_registry is None:
+            return await self.fetch_token_metadata(list(dict.fromkeys(mints)))
+        return await self._token_registry.get_many(mints, self.fetch_token_metadata)
+
+    async def fetch_token_metadata(self, mints: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch metadata from the RPC in one Helius ``getAssetBatch`` call.
+
+        Mints the endpoint can't describe (or non-Helius endpoints) fall back to a
+        single jsonParsed ``getMultipleAccounts`` call for supply and decimals.
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        assets = await self._rpc_post("getAssetBatch", {"ids": mints})
+        for mint, asset in zip(mints, assets if isinstance(assets, list) else []):
+            if isinstance(asset, Mapping):
+                found[mint] = _asset_metadata(mint, asset)
+        logger.info(f"Retrieved comprehensive token data for {len(found)}/{len(mints)} mints")
+
+        missing = [m for m in mints if m not in found]
+        if missing:
+            accounts = await self._rpc_post(
+                "getMultipleAccounts", [missing, {"encoding": "jsonParsed"}]
+            )
+            values = accounts.get("value") if isinstance(accounts, Mapping) else None
+            for mint, account in zip(missing, values if isinstance(values, list) else []):
+                metadata = _mint_account_metadata(mint, account)
+                if metadata is not None:
+                    found[mint] = metadata
+        return found
+
+    async def _rpc_post(self, method: str, params: Any) -> Any:
+        """Raw JSON-RPC call; returns ``result`` or None on any error response."""
+        payload = {"jsonrpc": "2.0", "id": "1", "method": method, "params": params}
         try:
-            # Use Helius getAsset method for comprehensive token data
-            payload = {
-                "jsonrpc": "2.0",
-                "id": "1",
-                "method": "getAsset",
-                "params": {"id": mint_address},
-            }
-
             session = await get_session()
             async with session.post(
-                self.rpc_url, json=payload, headers={"Content-Type": "application/json"}
+                self._rpc_endpoint(), json=payload, headers={"Content-Type": "application/json"}
             ) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    if "result" in data and data["result"]:
-                        asset = data["result"]
-                        content = asset.get("content", {})
-
-                        logger.info(f"Retrieved comprehensive token data for {mint_address}")
-                        return {
-                            "success": True,
-                            "mint": mint_address,
-                            "name": content.get("metadata", {}).get("name", "Unknown"),
-                            "symbol": content.get("metadata", {}).get("symbol", "Unknown"),
-                            "description": content.get("metadata", {}).get("description", ""),
-                            "image": content.get("files", [{}])[0].get("uri", "")
-                            if content.get("files")
-                            else "",
-                            "supply": asset.get("supply", {}),
-                            "creators": asset.get("creators", []),
-                            "ownership": asset.get("ownership", {}),
-                            "token_info": asset.get("token_info", {}),
-                            "mutable": asset.get("mutable", False),
-                            "burnt": asset.get("burnt", False),
-                        }
-                    # Fall through to fallback if no result
-
-                # Non-Helius or error: fallback to standard RPC supply lookup
-                try:
-                    pubkey = Pubkey.from_string(mint_address)
-                    client = await self._get_client()
-                    supply_resp = await client.get_token_supply(pubkey)
-                    if getattr(supply_resp, "value", None):
-                        v = supply_resp.value
-                        # UiTokenAmount has amount (str), decimals (int)
-                        return {
-                            "mint": mint_address,
-                            "name": "Unknown",
-                            "symbol": "Unknown",
-                            "description": "",
-                            "image": "",
-                            "supply": {
-                                "amount": getattr(v, "amount", None),
-                                "decimals": getattr(v, "decimals", None),
-                            },
-                            "source": "rpc_token_supply",
-                        }
-                except Exception as fb_err:
-                    logger.warning(f"Fallback token supply lookup failed: {fb_err}")
-
-                return {"error": f"Asset not found for mint: {mint_address}"}
-
+                if response.status != 200:
+                    return None
+                data = await response.json()
         except Exception as e:
-            logger.error(f"Failed to get token metadata: {e}")
-            return {"error": str(e)}
+            logger.warning(f"{method} request failed: {e}")
+            return None
+        return data.get("result") if isinstance(data, Mapping) else None
 
 
 class SolanaAgentProtocol(Protocol):
@@ -506,6 +593,19 @@ def create_solana_tools(
 
     async def handle_get_balance(args: Dict[str, Any]) -> Dict[str, Any]:
         address = args.get("address")
+        target = address or solana_tools.wallet_address
+        wallet_cache = solana_tools.wallet_cache
+
+        # Process-wide cache, kept current by account subscriptions
+        if wallet_cache is not None and target:
+            cached_balance = wallet_cache.get(target)
+            if cached_balance:
+                return cached_balance
+            version = wallet_cache.version(target)
+            result = await solana_tools.get_balance(address)
+            if "error" not in result:
+                wallet_cache.put(target, result, version)
+            return result
 
         # Use agent cache if available and no specific address requested
         if agent and not address:
@@ -526,8 +626,12 @@ def create_solana_tools(
         result = await solana_tools.transfer_sol(args["to_address"], args["amount"])
 
         # Invalidate balance cache after transfer
-        if agent and isinstance(result, dict) and result.get("success") is True:
-            agent.invalidate_balance_cache()
+        if isinstance(result, dict) and result.get("success") is True:
+            # The sender was dropped by the submission pipeline; the recipient changed too
+            if solana_tools.wallet_cache is not None:
+                solana_tools.wallet_cache.invalidate(args["to_address"])
+            if agent:
+                agent.invalidate_balance_cache()
 
         return result
 
@@ -0,0 +1,617 @@
+"""Shared Solana transaction submission pipeline.
+
+Provides a background-refreshed recent-blockhash cache, priority-fee aware
+transaction compilation, and a confirmation tracker that polls many in-flight
+signatures with a single batched ``getSignatureStatuses`` call and re-broadcasts
+them until their blockhash expires.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from solana.rpc.commitment import Commitment
+from solana.rpc.core import RPCException
+from solana.rpc.types import TxOpts
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.hash import Hash
+from solders.instruction import Instruction
+from solders.message import MessageV0
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[[], Awaitable[Any]]
+
+# getSignatureStatuses accepts at most 256 signatures per request
+_MAX_STATUS_BATCH = 256
+
+# Ordinal of solders' TransactionConfirmationStatus (processed < confirmed < finalized)
+_COMMITMENT_RANK = {"processed": 0, "confirmed": 1, "finalized": 2}
+
+
+class SubmissionUncertainError(RuntimeError):
+    """A signed transaction may have reached the network but its outcome is unknown.
+
+    Raised instead of the underlying error (a transport failure while sending, or
+    any failure after a send) so callers never retry or re-route a trade that can
+    still land.
+    """
+
+    def __init__(self, signature: str, message: str) -> None:
+        super().__init__(message)
+        self.signature = signature
+
+
+def _is_blockhash_error(error: BaseException) -> bool:
+    message = str(error).lower()
+    return "blockhash" in message and ("not found" in message or "expired" in message)
+
+
+@dataclass
+class CachedBlockhash:
+    blockhash: Hash
+    last_valid_block_height: int
+    fetched_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+@dataclass
+class SubmissionOptions:
+    """Per-submission settings."""
+
+    skip_preflight: bool = True
+    max_retries: int = 0  # the pipeline re-broadcasts itself
+    compute_unit_price_micro_lamports: Optional[int] = None
+    compute_unit_limit: Optional[int] = None
+    confirm: bool = True
+    commitment: str = "confirmed"
+    confirm_timeout: float = 60.0
+
+
+@dataclass
+class SubmissionResult:
+    """Outcome of a submission, including measured confirmation latency."""
+
+    signature: str
+    status: str  # processed | confirmed | finalized | failed | expired | timeout | sent
+    latency_seconds: Optional[float] = None
+    slot: Optional[int] = None
+    error: Optional[str] = None
+    broadcasts: int = 1
+    blockhash_refreshed: bool = False
+
+    @property
+    def landed(self) -> bool:
+        return self.status in _COMMITMENT_RANK
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "status": self.status,
+            "broadcasts": self.broadcasts,
+        }
+        if self.latency_seconds is not None:
+            data["latency_seconds"] = round(self.latency_seconds, 3)
+        if self.slot is not None:
+            data["slot"] = self.slot
+        if self.error:
+            data["error"] = self.error
+        if self.blockhash_refreshed:
+            data["blockhash_refreshed"] = True
+        return data
+
+
+def unconfirmed_result(
+    signature: str, detail: str, confirmation: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Tool result for a transaction that was sent but whose outcome is unknown.
+
+    It may still land, so callers must not retry it or route the trade elsewhere.
+    """
+    result: Dict[str, Any] = {
+        "success": False,
+        "confirmed": False,
+        "status": "unconfirmed",
+        "transaction_id": signature,
+        "error": f"{detail}; check transaction {signature} before retrying",
+    }
+    if confirmation is not None:
+        result["confirmation"] = confirmation
+    return result
+
+
+class BlockhashCache:
+    """Keeps a recent blockhash warm so submissions never wait on getLatestBlockhash.
+
+    The background refresher starts on first use and stops itself after
+    ``idle_timeout`` seconds without callers.
+    """
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        *,
+        refresh_interval: float = 5.0,
+        max_age: float = 20.0,
+        idle_timeout: float = 120.0,
+        commitment: str = "confirmed",
+    ) -> None:
+        self._client_factory = client_factory
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.commitment = commitment
+        self._current: Optional[CachedBlockhash] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._last_used = 0.0
+
+    @property
+    def current(self) -> Optional[CachedBlockhash]:
+        return self._current
+
+    async def get(self, *, force_refresh: bool = False) -> CachedBlockhash:
+        self._last_used = time.monotonic()
+        self._ensure_refresher()
+        cached = self._current
+        if not force_refresh and cached is not None and cached.age_seconds < self.max_age:
+            return cached
+        now = time.monotonic()
+        return await self.refresh(min_fetched_at=now if force_refresh else now - self.max_age)
+
+    async def refresh(self, *, min_fetched_at: Optional[float] = None) -> CachedBlockhash:
+        async with self._lock:
+            cached = self._current
+            # Another caller refreshed while we waited on the lock
+            if (
+                cached is not None
+                and min_fetched_at is not None
+                and cached.fetched_at >= min_fetched_at
+            ):
+                return cached
+            client = await self._client_factory()
+            response = await client.get_latest_blockhash(Commitment(self.commitment))
+            value = getattr(response, "value", None)
+            if value is None:
+                raise RuntimeError("Failed to get recent blockhash")
+            self._current = CachedBlockhash(
+                blockhash=value.blockhash,
+                last_valid_block_height=int(value.last_valid_block_height),
+                fetched_at=time.monotonic(),
+            )
+            return self._current
+
+    def _ensure_refresher(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while time.monotonic() - self._last_used < self.idle_timeout:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Background blockhash refresh failed: {e}")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+@dataclass
+class _PendingTransaction:
+    signature: Signature
+    raw: bytes
+    last_valid_block_height: int
+    commitment: str
+    submitted_at: float
+    future: "asyncio.Future[SubmissionResult]"
+    broadcasts: int = 1
+    last_broadcast_at: float = field(default_factory=time.monotonic)
+    blockhash_refreshed: bool = False
+
+
+class ConfirmationTracker:
+    """Confirms in-flight signatures with batched status polling and re-broadcasts."""
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        *,
+        poll_interval: float = 0.5,
+        rebroadcast_interval: float = 2.0,
+    ) -> None:
+        self._client_factory = client_factory
+        self.poll_interval = poll_interval
+        self.rebroadcast_interval = rebroadcast_interval
+        self._pending: Dict[Signature, _PendingTransaction] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def track(
+        self,
+        signature: Signature,
+        raw: bytes,
+        *,
+        last_valid_block_height: int,
+        commitment: str = "confirmed",
+        submitted_at: Optional[float] = None,
+        blockhash_refreshed: bool = False,
+    ) -> "asyncio.Future[SubmissionResult]":
+        loop = asyncio.get_running_loop()
+        existing = self._pending.get(signature)
+        if existing is not None:
+            return existing.future
+        future: asyncio.Future[SubmissionResult] = loop.create_future()
+        self._pending[signature] = _PendingTransaction(
+            signature=signature,
+            raw=raw,
+            last_valid_block_height=last_valid_block_height,
+            commitment=commitment,
+            submitted_at=submitted_at if submitted_at is not None else time.monotonic(),
+            future=future,
+            blockhash_refreshed=blockhash_refreshed,
+        )
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self._poll_loop())
+        return future
+
+    async def _poll_loop(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Signature status polling failed: {e}")
+
+    async def poll_once(self) -> None:
+        """Run one status/expiry/re-broadcast cycle over every pending signature."""
+        if not self._pending:
+            return
+        client = await self._client_factory()
+        pending = list(self._pending.values())
+
+        for start in range(0, len(pending), _MAX_STATUS_BATCH):
+            chunk = pending[start : start + _MAX_STATUS_BATCH]
+            response = await client.get_signature_statuses([entry.signature for entry in chunk])
+            statuses = getattr(response, "value", None) or []
+            for entry, status in zip(chunk, statuses):
+                if status is not None:
+                    self._apply_status(entry, status)
+
+        if not self._pending:
+            return
+
+        height_response = await client.get_block_height(Commitment("confirmed"))
+        block_height = getattr(height_response, "value", None)
+        now = time.monotonic()
+        for entry in list(self._pending.values()):
+            if isinstance(block_height, int) and block_height > entry.last_valid_block_height:
+                self._resolve(
+                    entry, status="expired", error="Blockhash expired before confirmation"
+                )
+                continue
+            if now - entry.last_broadcast_at >= self.rebroadcast_interval:
+                entry.last_broadcast_at = now
+                entry.broadcasts += 1
+                try:
+                    await client.send_raw_transaction(
+                        entry.raw, opts=TxOpts(skip_preflight=True, max_retries=0)
+                    )
+                except Exception as e:
+                    logger.debug(f"Re-broadcast of {entry.signature} failed: {e}")
+
+    def _apply_status(self, entry: _PendingTransaction, status: Any) -> None:
+        err = getattr(status, "err", None)
+        slot = getattr(status, "slot", None)
+        if err is not None:
+            self._resolve(entry, status="failed", error=str(err), slot=slot)
+            return
+        confirmation = getattr(status, "confirmation_status", None)
+        if confirmation is None:
+            return
+        rank = int(confirmation)
+        if rank >= _COMMITMENT_RANK.get(entry.commitment, 1):
+            name = next(name for name, value in _COMMITMENT_RANK.items() if value == rank)
+            self._resolve(entry, status=name, slot=slot)
+
+    def _resolve(
+        self,
+        entry: _PendingTransaction,
+        *,
+        status: str,
+        error: Optional[str] = None,
+        slot: Optional[int] = None,
+    ) -> None:
+        self._pending.pop(entry.signature, None)
+        if entry.future.done():
+            return
+        entry.future.set_result(
+            SubmissionResult(
+                signature=str(entry.signature),
+                status=status,
+                latency_seconds=time.monotonic() - entry.submitted_at,
+                slot=slot,
+                error=error,
+                broadcasts=entry.broadcasts,
+                blockhash_refreshed=entry.blockhash_refreshed,
+            )
+        )
+
+    def forget(self, signature: Signature) -> None:
+        self._pending.pop(signature, None)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for entry in list(self._pending.values()):
+            if not entry.future.done():
+                entry.future.cancel()
+        self._pending.clear()
+
+
+class TransactionPipeline:
+    """Signs, submits and confirms Solana transactions for the trading integrations."""
+
+    def __init__(
+        self,
+        client_factory: ClientFactory,
+        *,
+        blockhash_cache: Optional[BlockhashCache] = None,
+        tracker: Optional[ConfirmationTracker] = None,
+        on_complete: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._client_factory = client_factory
+        # Called after every submission, e.g. to drop cached balances of the payer
+        self._on_complete = on_complete
+        self.blockhashes = blockhash_cache or BlockhashCache(client_factory)
+        self.tracker = tracker or ConfirmationTracker(client_factory)
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "landed": 0,
+            "failed": 0,
+            "expired": 0,
+            "timeouts": 0,
+            "blockhash_refreshes": 0,
+        }
+        self._latencies: List[float] = []
+
+    async def compile_message(
+        self,
+        payer: Any,
+        instructions: Sequence[Instruction],
+        options: Optional[SubmissionOptions] = None,
+    ) -> Tuple[MessageV0, int]:
+        """Compile instructions against the cached blockhash, prepending priority-fee ones.
+
+        Returns the message and the last block height at which it is valid.
+        """
+        options = options or SubmissionOptions()
+        budget: List[Instruction] = []
+        if options.compute_unit_limit:
+            budget.append(set_compute_unit_limit(options.compute_unit_limit))
+        if options.compute_unit_price_micro_lamports:
+            budget.append(set_compute_unit_price(options.compute_unit_price_micro_lamports))
+        cached = await self.blockhashes.get()
+        message = MessageV0.try_compile(
+            payer=payer,
+            instructions=[*budget, *instructions],
+            address_lookup_table_accounts=[],
+            recent_blockhash=cached.blockhash,
+        )
+        return message, cached.last_valid_block_height
+
+    async def submit(
+        self,
+        message: MessageV0,
+        signers: Sequence[Any],
+        options: Optional[SubmissionOptions] = None,
+        *,
+        last_valid_block_height: Optional[int] = None,
+    ) -> SubmissionResult:
+        """Sign ``message``, send it and (optionally) wait for confirmation.
+
+        A stale blockhash is replaced with a fresh cached one and the message is
+        re-signed instead of failing the submission. A transaction whose blockhash
+        expires unconfirmed is re-signed and submitted once more. Failures that may
+        have left a transaction in flight raise :class:`SubmissionUncertainError`.
+        """
+        try:
+            return await self._submit(message, signers, options, last_valid_block_height)
+        finally:
+            if self._on_complete is not None:
+                self._on_complete()
+
+    async def _submit(
+        self,
+        message: MessageV0,
+        signers: Sequence[Any],
+        options: Optional[SubmissionOptions],
+        last_valid_block_height: Optional[int],
+    ) -> SubmissionResult:
+        options = options or SubmissionOptions()
+        opts = TxOpts(skip_preflight=options.skip_preflight, max_retries=options.max_retries)
+        client = await self._client_factory()
+        refreshed = False
+
+        if last_valid_block_height is None:
+            # Prebuilt transactions carry a blockhash we did not fetch and cannot bound.
+            # They are re-signed anyway, so stamp them with the cached blockhash whose
+            # validity window we know; expiry (and the re-sign path) then works for them.
+            message, last_valid_block_height = await self._restamp(message, force_refresh=False)
+
+        attempt = 0
+        while True:
+            if attempt:
+                message, last_valid_block_height = await self._restamp(message)
+                refreshed = True
+            transaction = VersionedTransaction(message, list(signers))
+            submitted_at = time.monotonic()
+            try:
+                await self._send(client, transaction, opts)
+            except Exception as e:
+                if not _is_blockhash_error(e):
+                    raise
+                logger.warning(f"Stale blockhash, re-signing with a fresh one: {e}")
+                message, last_valid_block_height = await self._restamp(message)
+                refreshed = True
+                transaction = VersionedTransaction(message, list(signers))
+                await self._send(client, transaction, opts)
+
+            self._stats["submitted"] += 1
+            signature = transaction.signatures[0]
+            if not options.confirm:
+                return SubmissionResult(
+                    signature=str(signature), status="sent", blockhash_refreshed=refreshed
+                )
+
+            try:
+                future = self.tracker.track(
+                    signature,
+                    bytes(transaction),
+                    last_valid_block_height=last_valid_block_height,
+                    commitment=options.commitment,
+                    submitted_at=submitted_at,
+                    blockhash_refreshed=refreshed,
+                )
+                result = await asyncio.wait_for(asyncio.shield(future), options.confirm_timeout)
+            except asyncio.TimeoutError:
+                self.tracker.forget(signature)
+                self._stats["timeouts"] += 1
+                return SubmissionResult(
+                    signature=str(signature),
+                    status="timeout",
+                    latency_seconds=time.monotonic() - submitted_at,
+                    blockhash_refreshed=refreshed,
+                )
+            except Exception as e:
+                self.tracker.forget(signature)
+                raise SubmissionUncertainError(
+                    str(signature), f"Tracking {signature} failed after it was sent: {e}"
+                ) from e
+
+            if result.status == "expired" and attempt == 0:
+                logger.info(f"Transaction {signature} expired unconfirmed; re-signing")
+                attempt += 1
+                continue
+            self._record(result)
+            return result
+
+    @staticmethod
+    async def _send(client: Any, transaction: VersionedTransaction, opts: TxOpts) -> None:
+        """Send once; errors that leave the transaction's fate unknown become uncertain."""
+        try:
+            await client.send_raw_transaction(bytes(transaction), opts=opts)
+        except RPCException:
+            # The node answered with an error (e.g. preflight failure): nothing was sent
+            raise
+        except Exception as e:
+            if _is_blockhash_error(e):
+                raise
+            signature = str(transaction.signatures[0])
+            raise SubmissionUncertainError(
+                signature, f"Sending {signature} failed with an unknown outcome: {e}"
+            ) from e
+
+    async def _restamp(
+        self, message: MessageV0, force_refresh: bool = True
+    ) -> Tuple[MessageV0, int]:
+        cached = await self.blockhashes.get(force_refresh=force_refresh)
+        if force_refresh:
+            self._stats["blockhash_refreshes"] += 1
+        restamped = MessageV0(
+            message.header,
+            message.account_keys,
+            cached.blockhash,
+            message.instructions,
+            message.address_table_lookups,
+        )
+        return restamped, cached.last_valid_block_height
+
+    async def submit_transaction(
+        self,
+        transaction: VersionedTransaction,
+        signers: Sequence[Any],
+        options: Optional[SubmissionOptions] = None,
+        *,
+        last_valid_block_height: Optional[int] = None,
+    ) -> SubmissionResult:
+        """Convenience wrapper re-signing a prebuilt (e.g. API-provided) transaction."""
+        return await self.submit(
+            transaction.message,
+            signers,
+            options,
+            last_valid_block_height=last_valid_block_height,
+        )
+
+    def _record(self, result: SubmissionResult) -> None:
+        if result.landed:
+            self._stats["landed"] += 1
+            if result.latency_seconds is not None:
+                self._latencies.append(result.latency_seconds)
+                if len(self._latencies) > 1000:
+                    self._latencies = self._latencies[-1000:]
+        elif result.status == "failed":
+            self._stats["failed"] += 1
+        elif result.status == "expired":
+            self._stats["expired"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["in_flight"] = self.tracker.in_flight
+        if self._latencies:
+            ordered = sorted(self._latencies)
+            stats["confirmation_latency"] = {
+                "count": len(ordered),
+                "avg": sum(ordered) / len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p90": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+                "max": ordered[-1],
+            }
+        return stats
+
+    async def close(self) -> None:
+        await self.blockhashes.stop()
+        await self.tracker.stop()
+
+
+__all__ = [
+    "BlockhashCache",
+    "CachedBlockhash",
+    "ConfirmationTracker",
+    "SubmissionOptions",
+    "SubmissionResult",
+    "SubmissionUncertainError",
+    "TransactionPipeline",
+    "unconfirmed_result",
+]
@@ -0,0 +1,279 @@
+"""Process-wide, persistent registry of Solana token metadata.
+
+A mint's name, symbol, decimals, image and creators never change, yet every
+agent build used to fetch them again with Helius ``getAsset``. The registry
+keeps them in the ``token_metadata`` SQLite table behind an in-process LRU:
+
+- lookups hit the LRU first, then one ``SELECT ... IN`` for the rest;
+- remaining misses are fetched in a single batch call, and concurrent lookups of
+  the same mint share that fetch;
+- records older than ``refresh_after`` are served as-is while a background task
+  refreshes only their mutable fields (supply, ownership, ...).
+
+Failures of the database are logged and the registry falls back to fetching,
+so it never turns a working lookup into an error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ...utils.connection_pool import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Fields that can change after a mint is created; everything else is cached for good
+MUTABLE_FIELDS = ("supply", "ownership", "token_info", "mutable", "burnt")
+
+TokenRecord = Dict[str, Any]
+BatchFetcher = Callable[[List[str]], Awaitable[Dict[str, TokenRecord]]]
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS token_metadata (
+        mint TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        refreshed_at REAL NOT NULL
+    )
+"""
+
+
+class TokenRegistry:
+    """LRU + SQLite cache of token metadata shared by every integration."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = 2048,
+        refresh_after: float = 3600.0,
+    ) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.refresh_after = refresh_after
+        # mint -> (record, wall time its mutable fields were last refreshed)
+        self._lru: "OrderedDict[str, Tuple[TokenRecord, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future[Optional[TokenRecord]]] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._table_ready = False
+        self._stats = {"memory_hits": 0, "db_hits": 0, "fetched": 0, "refreshed": 0}
+
+        dirpath = os.path.dirname(db_path) or "."
+        os.makedirs(dirpath, exist_ok=True)
+
+    async def get(self, mint: str, fetcher: BatchFetcher) -> Optional[TokenRecord]:
+        return (await self.get_many([mint], fetcher)).get(mint)
+
+    async def get_many(self, mints: Iterable[str], fetcher: BatchFetcher) -> Dict[str, TokenRecord]:
+        """Return metadata for every mint that could be resolved, keyed by mint."""
+        self._bind_loop()
+        found: Dict[str, TokenRecord] = {}
+        stale: List[str] = []
+        missing: List[str] = []
+        now = time.time()
+
+        for mint in dict.fromkeys(mints):
+            entry = self._lru.get(mint)
+            if entry is None:
+                missing.append(mint)
+                continue
+            self._lru.move_to_end(mint)
+            self._stats["memory_hits"] += 1
+            found[mint] = entry[0]
+            if now - entry[1] >= self.refresh_after:
+                stale.append(mint)
+
+        if missing:
+            stored = await self._load(missing)
+            for mint, (record, refreshed_at) in stored.items():
+                self._remember(mint, record, refreshed_at)
+                self._stats["db_hits"] += 1
+                found[mint] = record
+                if now - refreshed_at >= self.refresh_after:
+                    stale.append(mint)
+            missing = [m for m in missing if m not in stored]
+
+        if missing:
+            found.update(await self._fetch(missing, fetcher))
+        if stale:
+            self._schedule_refresh(stale, fetcher)
+        return found
+
+    def invalidate(self, mint: str) -> None:
+        """Forget the in-memory copy; the next lookup reloads it from the database."""
+        self._lru.pop(mint, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "entries": len(self._lru), "refreshing": len(self._refreshing)}
+
+    async def close(self) -> None:
+        """Cancel background refreshes still running on this loop."""
+        tasks = [t for t in self._tasks if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._refreshing.clear()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures and tasks of a previous loop can never complete here
+            self._inflight.clear()
+            self._refreshing.clear()
+            self._tasks.clear()
+            self._loop = loop
+
+    def _remember(self, mint: str, record: TokenRecord, refreshed_at: float) -> None:
+        self._lru[mint] = (record, refreshed_at)
+        self._lru.move_to_end(mint)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def _fetch(self, mints: List[str], fetcher: BatchFetcher) -> Dict[str, TokenRecord]:
+        """Fetch misses in one batch, joining fetches already in flight for the same mints."""
+        loop = asyncio.get_running_loop()
+        joined = {m: self._inflight[m] for m in mints if m in self._inflight}
+        owned = [m for m in mints if m not in joined]
+        futures = {m: loop.create_future() for m in owned}
+        self._inflight.update(futures)
+
+        results: Dict[str, TokenRecord] = {}
+        try:
+            if owned:
+                fetched = await fetcher(owned)
+                self._stats["fetched"] += len(fetched)
+                now = time.time()
+                for mint, record in fetched.items():
+                    self._remember(mint, record, now)
+                await self._save(fetched, now)
+                results.update(fetched)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so joiners that never come don't log a warning
+                    future.exception()
+            raise
+        finally:
+            for mint, future in futures.items():
+                if not future.done():
+                    future.set_result(results.get(mint))
+                if self._inflight.get(mint) is future:
+                    del self._inflight[mint]
+
+        for mint, future in joined.items():
+            record = await future
+            if record is not None:
+                results[mint] = record
+        return results
+
+    def _schedule_refresh(self, mints: List[str], fetcher: BatchFetcher) -> None:
+        pending = [m for m in mints if m not in self._refreshing]
+        if not pending:
+            return
+        self._refreshing.update(pending)
+        task = asyncio.create_task(self._refresh(pending, fetcher))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, mints: List[str], fetcher: BatchFetcher) -> None:
+        """Re-fetch stale mints and merge only their mutable fields."""
+        try:
+            fetched = await fetcher(mints)
+            now = time.time()
+            merged: Dict[str, TokenRecord] = {}
+            for mint, fresh in fetched.items():
+                entry = self._lru.get(mint)
+                record = dict(entry[0]) if entry else dict(fresh)
+                for field in MUTABLE_FIELDS:
+                    if field in fresh:
+                        record[field] = fresh[field]
+                merged[mint] = record
+                self._remember(mint, record, now)
+            await self._save(merged, now)
+            self._stats["refreshed"] += len(merged)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Token metadata refresh failed for {len(mints)} mint(s): {e}")
+        finally:
+            self._refreshing.difference_update(mints)
+
+    async def _ensure_table(self, conn: Any) -> None:
+        # The migration creates the table too; this covers databases that skip MemoryManager
+        if not self._table_ready:
+            await conn.execute(CREATE_TABLE_SQL)
+            self._table_ready = True
+
+    async def _load(self, mints: List[str]) -> Dict[str, Tuple[TokenRecord, float]]:
+        placeholders = ",".join("?" for _ in mints)
+        try:
+            async with get_db_connection(self.db_path) as conn:
+                await self._ensure_table(conn)
+                cursor = await conn.execute(
+                    f"SELECT mint, data, refreshed_at FROM token_metadata WHERE mint IN ({placeholders})",
+                    mints,
+                )
+                rows = await cursor.fetchall()
+        except Exception as e:
+            logger.warning(f"Token metadata lookup failed: {e}")
+            return {}
+
+        loaded: Dict[str, Tuple[TokenRecord, float]] = {}
+        for mint, data, refreshed_at in rows:
+            try:
+                loaded[mint] = (json.loads(data), float(refreshed_at))
+            except (TypeError, ValueError):
+                continue
+        return loaded
+
+    async def _save(self, records: Dict[str, TokenRecord], refreshed_at: float) -> None:
+        if not records:
+            return
+        rows = [
+            (mint, json.dumps(record), refreshed_at, refreshed_at)
+            for mint, record in records.items()
+        ]
+        try:
+            async with get_db_connection(self.db_path) as conn:
+                await self._ensure_table(conn)
+                await conn.executemany(
+                    """
+                    INSERT INTO token_metadata (mint, data, fetched_at, refreshed_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(mint) DO UPDATE SET
+                        data = excluded.data, refreshed_at = excluded.refreshed_at
+                    """,
+                    rows,
+                )
+                await conn.commit()
+        except Exception as e:
+            logger.warning(f"Token metadata write failed: {e}")
+
+
+_registries: Dict[str, TokenRegistry] = {}
+
+
+def get_token_registry(db_path: str) -> TokenRegistry:
+    """Return the process-wide registry for a database path."""
+    registry = _registries.get(db_path)
+    if registry is None:
+        registry = TokenRegistry(db_path)
+        _registries[db_path] = registry
+    return registry
+
+
+__all__ = [
+    "MUTABLE_FIELDS",
+    "TokenRegistry",
+    "get_token_registry",
+]
@@ -0,0 +1,247 @@
+"""Process-wide wallet balance cache kept current by Solana websocket subscriptions.
+
+Balances used to be cached per agent for 60 seconds, so every new session and
+every API request fetched them again over RPC. :class:`WalletStateCache` keeps
+the last ``get_balance`` result per address for the whole process:
+
+- while an address is read, a websocket subscribes to the wallet account
+  (``accountSubscribe``) and to its SPL token accounts (``programSubscribe``
+  filtered by owner). Any notification invalidates the entry, so reads of a
+  quiet wallet are memory reads for as long as the subscription is live;
+- our own submissions invalidate the entry explicitly (see
+  ``SolanaTools.get_submission_pipeline``);
+- without a live subscription (no websocket endpoint, connection failing) an
+  entry is served for ``ttl`` seconds, like the old per-agent cache.
+
+Subscriptions stop after ``idle_timeout`` seconds without reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import aiohttp
+
+from ...utils.http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+# SPL token accounts are 165 bytes with the owner at offset 32
+TOKEN_ACCOUNT_SIZE = 165
+TOKEN_ACCOUNT_OWNER_OFFSET = 32
+
+_CLOSED_TYPES = (
+    aiohttp.WSMsgType.CLOSE,
+    aiohttp.WSMsgType.CLOSING,
+    aiohttp.WSMsgType.CLOSED,
+    aiohttp.WSMsgType.ERROR,
+)
+
+
+def ws_url_for(rpc_url: str) -> str:
+    """Websocket endpoint served next to an HTTP JSON-RPC endpoint."""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://") :]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://") :]
+    return rpc_url
+
+
+def subscription_requests(address: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """``accountSubscribe`` for the wallet and ``programSubscribe`` for its token accounts."""
+    account = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "accountSubscribe",
+        "params": [address, {"encoding": "base64", "commitment": "confirmed"}],
+    }
+    tokens = {
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": "programSubscribe",
+        "params": [
+            TOKEN_PROGRAM_ID,
+            {
+                "encoding": "base64",
+                "commitment": "confirmed",
+                "filters": [
+                    {"dataSize": TOKEN_ACCOUNT_SIZE},
+                    {"memcmp": {"offset": TOKEN_ACCOUNT_OWNER_OFFSET, "bytes": address}},
+                ],
+            },
+        ],
+    }
+    return account, tokens
+
+
+class WalletStateCache:
+    """Balance snapshots per address, invalidated by account notifications."""
+
+    def __init__(
+        self,
+        ws_url: Optional[str],
+        *,
+        ttl: float = 60.0,
+        idle_timeout: float = 300.0,
+        max_backoff: float = 30.0,
+        session_factory: Callable[[], Awaitable[aiohttp.ClientSession]] = get_session,
+    ) -> None:
+        self.ws_url = ws_url
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self.max_backoff = max_backoff
+        self._session_factory = session_factory
+        # address -> (balance, monotonic time it was stored)
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        # Bumped on every invalidation so a fetch racing a change isn't stored
+        self._versions: Dict[str, int] = {}
+        self._live: Set[str] = set()
+        self._last_used: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task[None]] = {}
+        self._stats = {"hits": 0, "misses": 0, "notifications": 0, "invalidations": 0}
+
+    def subscribed(self, address: str) -> bool:
+        return address in self._live
+
+    def get(self, address: str) -> Optional[Dict[str, Any]]:
+        """Cached balance if it is still current, starting a subscription for the address."""
+        self._watch(address)
+        entry = self._entries.get(address)
+        if entry is not None and (address in self._live or time.monotonic() - entry[1] < self.ttl):
+            self._stats["hits"] += 1
+            return entry[0]
+        self._stats["misses"] += 1
+        return None
+
+    def version(self, address: str) -> int:
+        """Pass to :meth:`put` so a balance fetched across a change is discarded."""
+        return self._versions.get(address, 0)
+
+    def put(self, address: str, balance: Dict[str, Any], version: Optional[int] = None) -> None:
+        if version is not None and version != self.version(address):
+            return
+        self._entries[address] = (balance, time.monotonic())
+
+    def invalidate(self, address: str) -> None:
+        self._versions[address] = self.version(address) + 1
+        if self._entries.pop(address, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def _idle(self, address: str) -> bool:
+        return time.monotonic() - self._last_used.get(address, 0.0) > self.idle_timeout
+
+    def _watch(self, address: str) -> None:
+        self._last_used[address] = time.monotonic()
+        if not self.ws_url:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._tasks.get(address)
+        # A task left behind by a previous (closed) event loop never reports done
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._live.discard(address)
+        self._tasks[address] = loop.create_task(
+            self._run(address), name=f"solana-wallet-{address[:8]}"
+        )
+
+    async def _run(self, address: str) -> None:
+        assert self.ws_url is not None
+        backoff = 1.0
+        while not self._idle(address):
+            try:
+                session = await self._session_factory()
+                async with session.ws_connect(self.ws_url, heartbeat=30.0) as ws:
+                    for request in subscription_requests(address):
+                        await ws.send_str(json.dumps(request))
+                    confirmed: Set[Any] = set()
+                    while not self._idle(address):
+                        try:
+                            message = await ws.receive(timeout=self.idle_timeout)
+                        except asyncio.TimeoutError:
+                            continue
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_message(address, message.data, confirmed)
+                            if len(confirmed) == 2:
+                                backoff = 1.0
+                        elif message.type in _CLOSED_TYPES:
+                            break
+                    else:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Solana account subscription error for {address}: {e}")
+            self._live.discard(address)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+        self._live.discard(address)
+        logger.info(f"Wallet {address} idle; closed its account subscriptions")
+
+    def _handle_message(self, address: str, raw: str, confirmed: Set[Any]) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        if "id" in message and "result" in message:
+            confirmed.add(message["id"])
+            if len(confirmed) == 2 and address not in self._live:
+                # Changes before the subscriptions were confirmed may have been missed
+                self.invalidate(address)
+                self._live.add(address)
+                logger.info(f"Subscribed to account changes for wallet {address}")
+        elif message.get("method") in ("accountNotification", "programNotification"):
+            self._stats["notifications"] += 1
+            self.invalidate(address)
+
+    async def stop(self) -> None:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._live.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "wallets": len(self._entries), "subscribed": len(self._live)}
+
+
+_shared_caches: Dict[Optional[str], WalletStateCache] = {}
+
+
+def get_wallet_cache(ws_url: Optional[str]) -> WalletStateCache:
+    """Process-wide cache for ``ws_url``, so agent builds share balances and subscriptions."""
+    cache = _shared_caches.get(ws_url)
+    if cache is None:
+        cache = WalletStateCache(ws_url)
+        _shared_caches[ws_url] = cache
+    return cache
+
+
+async def stop_wallet_caches() -> None:
+    """Close every subscription (process shutdown)."""
+    for cache in list(_shared_caches.values()):
+        await cache.stop()
+    _shared_caches.clear()
+
+
+__all__ = [
+    "WalletStateCache",
+    "get_wallet_cache",
+    "stop_wallet_caches",
+    "subscription_requests",
+    "ws_url_for",
+]
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+import struct
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Set, Tuple
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.types import TxOpts
+from solana.rpc.types import MemcmpOpts, TxOpts
 from solders.instruction import AccountMeta, Instruction
 from solders.message import MessageV0
 from solders.pubkey import Pubkey
@@ -37,6 +39,20 @@ DEX_FEES_PUBKEY = Pubkey.from_string("URAfeAaGMoavvTe8vqPwMX6cUvTjq8WMG5c9nFo7Q8
 METAPLEX_PROGRAM_ID = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
 SYSTEM_PROGRAM_ID = Pubkey.from_string("11111111111111111111111111111111")
 
+# Position account layout: owner, market mint, symbol, then entry price, liquidation
+# price, paid amount and size (u64 lamports), leverage, closed flag, nonce, pnl (i64)
+# and the direction byte.
+_POSITION_LAYOUT = struct.Struct("<32s32s32sQQQQBBQqB")
+# Accounts that end before the direction byte are treated as LONG
+_POSITION_LAYOUT_NO_DIRECTION = struct.Struct("<32s32s32sQQQQBBQq")
+POSITION_ACCOUNT_SIZE = _POSITION_LAYOUT.size
+LEGACY_POSITION_ACCOUNT_SIZE = _POSITION_LAYOUT_NO_DIRECTION.size
+# Position scans query each size separately; ``dataSize`` only matches exact lengths
+POSITION_ACCOUNT_SIZES = (POSITION_ACCOUNT_SIZE, LEGACY_POSITION_ACCOUNT_SIZE)
+POSITION_OWNER_OFFSET = 0
+POSITION_MINT_OFFSET = 32
+POSITION_CLOSED_OFFSET = 129
+
 
 def _string_to_fixed_array(value: str, length: int = 32) -> bytes:
     encoded = value.encode("utf-8", errors="ignore")
@@ -45,14 +61,6 @@ def _string_to_fixed_array(value: str, length: int = 32) -> bytes:
     return trimmed + padding
 
 
-def _read_le_i64(data: bytes) -> int:
-    return int.from_bytes(data, byteorder="little", signed=True)
-
-
-def _read_le_u64(data: bytes) -> int:
-    return int.from_bytes(data, byteorder="little", signed=False)
-
-
 def _extract_base64_data(data: Any) -> bytes:
     if data is None:
         return b""
@@ -169,6 +177,90 @@ class UranusPosition:
         }
 
 
+def _position_from_fields(account: Any, lamports: int, fields: Tuple[Any, ...]) -> UranusPosition:
+    (
+        owner,
+        market_mint,
+        symbol,
+        entry_price,
+        liquidation_price,
+        paid_amount,
+        position_size,
+        leverage,
+        closed,
+        position_nonce,
+        pnl,
+        direction_flag,
+    ) = fields
+    return UranusPosition(
+        account=str(account),
+        owner=str(Pubkey.from_bytes(owner)),
+        market_mint=str(Pubkey.from_bytes(market_mint)),
+        market_symbol=symbol.decode("utf-8", errors="ignore").strip("\x00").strip(),
+        entry_price=entry_price / LAMPORTS_PER_SOL,
+        liquidation_price=liquidation_price / LAMPORTS_PER_SOL,
+        paid_amount=paid_amount / LAMPORTS_PER_SOL,
+        position_size=position_size / LAMPORTS_PER_SOL,
+        leverage=leverage,
+        closed=bool(closed),
+        position_nonce=position_nonce,
+        pnl=pnl / LAMPORTS_PER_SOL,
+        direction="LONG" if direction_flag == 1 else "SHORT",
+        lamports=lamports,
+    )
+
+
+def decode_positions(accounts: Sequence[Tuple[Any, int, bytes]]) -> List[UranusPosition]:
+    """Decode ``(pubkey, lamports, raw)`` position accounts in one pass.
+
+    When every buffer has the current layout size (the normal case, since legacy
+    accounts are rare) they are joined and unpacked with
+    ``Struct.iter_unpack``; otherwise each buffer is unpacked on its own.
+    """
+    if not accounts:
+        return []
+    if all(len(raw) == POSITION_ACCOUNT_SIZE for _, _, raw in accounts):
+        rows = _POSITION_LAYOUT.iter_unpack(b"".join(raw for _, _, raw in accounts))
+        return [
+            _position_from_fields(account, lamports, fields)
+            for (account, lamports, _), fields in zip(accounts, rows)
+        ]
+
+    positions: List[UranusPosition] = []
+    for account, lamports, raw in accounts:
+        if len(raw) >= POSITION_ACCOUNT_SIZE:
+            fields = _POSITION_LAYOUT.unpack_from(raw)
+        elif len(raw) >= _POSITION_LAYOUT_NO_DIRECTION.size:
+            fields = (*_POSITION_LAYOUT_NO_DIRECTION.unpack_from(raw), 1)
+        else:
+            continue
+        positions.append(_position_from_fields(account, lamports, fields))
+    return positions
+
+
+def position_scan_filters(
+    *,
+    data_size: int = POSITION_ACCOUNT_SIZE,
+    owner: Optional[Pubkey] = None,
+    market_mint: Optional[Pubkey] = None,
+    include_closed: bool = False,
+) -> List[Any]:
+    """RPC-side ``getProgramAccounts`` filters for position accounts of one size.
+
+    Legacy positions without the direction byte are ``LEGACY_POSITION_ACCOUNT_SIZE``
+    bytes long; scan both ``POSITION_ACCOUNT_SIZES`` to include them.
+    """
+    filters: List[Any] = [data_size]
+    if owner is not None:
+        filters.append(MemcmpOpts(offset=POSITION_OWNER_OFFSET, bytes=str(owner)))
+    if market_mint is not None:
+        filters.append(MemcmpOpts(offset=POSITION_MINT_OFFSET, bytes=str(market_mint)))
+    if not include_closed:
+        # base58 of a single zero byte: the closed flag is false
+        filters.append(MemcmpOpts(offset=POSITION_CLOSED_OFFSET, bytes="1"))
+    return filters
+
+
 class UranusTools:
     def __init__(self, solana_tools: Optional[SolanaClientProtocol] = None) -> None:
         self.solana_tools = solana_tools
@@ -208,53 +300,6 @@ class UranusTools:
         )
         return position_pda
 
-    def _deserialize_position(self, account: Pubkey, lamports: int, raw: bytes) -> UranusPosition:
-        idx = 0
-        owner = Pubkey.from_bytes(raw[idx : idx + 32])
-        idx += 32
-        market_mint = Pubkey.from_bytes(raw[idx : idx + 32])
-        idx += 32
-        market_symbol_bytes = raw[idx : idx + 32]
-        market_symbol = market_symbol_bytes.decode("utf-8", errors="ignore").strip("\x00").strip()
-        idx += 32
-
-        entry_price = _read_le_u64(raw[idx : idx + 8]) / LAMPORTS_PER_SOL
-        idx += 8
-        liquidation_price = _read_le_u64(raw[idx : idx + 8]) / LAMPORTS_PER_SOL
-        idx += 8
-        paid_amount = _read_le_u64(raw[idx : idx + 8]) / LAMPORTS_PER_SOL
-        idx += 8
-        position_size = _read_le_u64(raw[idx : idx + 8]) / LAMPORTS_PER_SOL
-        idx += 8
-
-        leverage = raw[idx]
-        idx += 1
-        closed = bool(raw[idx])
-        idx += 1
-        position_nonce = _read_le_u64(raw[idx : idx + 8])
-        idx += 8
-        pnl = _read_le_i64(raw[idx : idx + 8]) / LAMPORTS_PER_SOL
-        idx += 8
-        direction_flag = raw[idx] if idx < len(raw) else 1
-        direction = "LONG" if direction_flag == 1 else "SHORT"
-
-        return UranusPosition(
-            account=str(account),
-            owner=str(owner),
-            market_mint=str(market_mint),
-            market_symbol=market_symbol,
-            entry_price=entry_price,
-            liquidation_price=liquidation_price,
-            paid_amount=paid_amount,
-            position_size=position_size,
-            leverage=leverage,
-            closed=closed,
-            position_nonce=position_nonce,
-            pnl=pnl,
-            direction=direction,
-            lamports=lamports,
-        )
-
     async def create_position(
         self,
         market_mint: str,
@@ -431,29 +476,46 @@ class UranusTools:
     ) -> Dict[str, Any]:
         try:
             client = await self._get_client()
-            response = await client.get_program_accounts(
-                PROGRAM_ID, encoding="base64", commitment="confirmed"
+            owner_key = Pubkey.from_string(owner) if owner else None
+            mint_key = Pubkey.from_string(market_mint) if market_mint else None
+            responses = await asyncio.gather(
+                *(
+                    client.get_program_accounts(
+                        PROGRAM_ID,
+                        encoding="base64",
+                        commitment="confirmed",
+                        filters=position_scan_filters(
+                            data_size=size,
+                            owner=owner_key,
+                            market_mint=mint_key,
+                            include_closed=include_closed,
+                        ),
+                    )
+                    for size in POSITION_ACCOUNT_SIZES
+                )
             )
-            accounts = response.value or []
-            owner_filter = owner.lower() if owner else None
-            mint_filter = market_mint.lower() if market_mint else None
             ticker_filter = ticker.lower() if ticker else None
 
-            positions: List[Dict[str, Any]] = []
-            for keyed_account in accounts:
+            raw_accounts: List[Tuple[Any, int, bytes]] = []
+            seen: Set[Any] = set()
+            for keyed_account in (a for response in responses for a in response.value or []):
+                if keyed_account.pubkey in seen:
+                    continue
+                seen.add(keyed_account.pubkey)
                 raw = _extract_base64_data(keyed_account.account.data)
                 if not raw:
                     continue
-                if len(raw) == 0:
+                # The RPC already filtered these; re-check the raw bytes cheaply
+                # in case a node ignores filters.
+                if owner_key is not None and raw[:32] != bytes(owner_key):
                     continue
-                position = self._deserialize_position(
-                    account=keyed_account.pubkey, lamports=keyed_account.account.lamports, raw=raw
-                )
-                if not include_closed and position.closed:
+                if mint_key is not None and raw[32:64] != bytes(mint_key):
                     continue
-                if owner_filter and position.owner.lower() != owner_filter:
-                    continue
-                if mint_filter and position.market_mint.lower() != mint_filter:
+                raw_accounts.append((keyed_account.pubkey, keyed_account.account.lamports, raw))
+
+            positions: List[Dict[str, Any]] = []
+            for position in decode_positions(raw_accounts):
+                if not include_closed and position.closed:
                     continue
                 if ticker_filter and ticker_filter not in position.market_symbol.lower():
                     continue
@@ -122,8 +122,13 @@ class CircuitBreaker:
             f"recovery_timeout={self.config.recovery_timeout}s"
         )
 
-    async def call(self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs) -> T:
-        """Execute a function with circuit breaker protection."""
+    async def allow_request(self) -> None:
+        """Admit one call or raise :class:`CircuitBreakerError`.
+
+        For calls that cannot be wrapped in :meth:`call` (e.g. HTTP trace hooks);
+        every admitted call must be followed by :meth:`record_success` or
+        :meth:`record_failure`.
+        """
         async with self._lock:
             await self._check_state()
 
@@ -143,6 +148,31 @@ class CircuitBreaker:
             self.stats.half_open_calls += 1
 
         self.stats.total_requests += 1
+
+    async def record_success(self, start_time: float) -> None:
+        """Record the outcome of a call admitted by :meth:`allow_request`."""
+        await self._on_success(start_time)
+        await self._release_half_open()
+
+    async def record_failure(self, start_time: float, timed_out: bool = False) -> None:
+        """Record the outcome of a call admitted by :meth:`allow_request`."""
+        if timed_out:
+            self.stats.total_timeouts += 1
+        await self._on_failure(start_time)
+        await self._release_half_open()
+
+    async def abandon_request(self) -> None:
+        """Release a call admitted by :meth:`allow_request` that ended without an outcome."""
+        await self._release_half_open()
+
+    async def _release_half_open(self) -> None:
+        if self.stats.state == CircuitState.HALF_OPEN:
+            async with self._lock:
+                self.stats.half_open_calls = max(0, self.stats.half_open_calls - 1)
+
+    async def call(self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Execute a function with circuit breaker protection."""
+        await self.allow_request()
         start_time = time.time()
 
         try:
@@ -164,9 +194,7 @@ class CircuitBreaker:
 
         finally:
             # Decrement half-open call counter
-            if self.stats.state == CircuitState.HALF_OPEN:
-                async with self._lock:
-                    self.stats.half_open_calls = max(0, self.stats.half_open_calls - 1)
+            await self._release_half_open()
 
     async def _check_state(self) -> None:
         """Check and update circuit breaker state."""
@@ -581,6 +581,12 @@ async def get_database_pool(db_path: str, pool_size: int = 5) -> DatabasePool:
         return _global_pool
 
 
+async def get_database_pool_stats() -> Optional[PoolStats]:
+    """Stats of the global pool, or None when no pool has been created."""
+    pool = _global_pool
+    return await pool.get_stats() if pool is not None else None
+
+
 async def cleanup_database_pool() -> None:
     """Cleanup global database pool (thread-safe)."""
     global _global_pool, _pool_lock
@@ -0,0 +1,238 @@
+"""Named, bounded thread pools for blocking SDK and I/O calls.
+
+Each integration runs its blocking work on its own pool instead of the loop's
+shared default executor, so a slow SDK can only exhaust its own workers. Pools
+track queue depth and wait time, reject work once their queue is full, and
+support per-call timeouts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a bounded executor's queue is full."""
+
+
+@dataclass
+class ExecutorConfig:
+    """Sizing for a named executor with environment variable support."""
+
+    max_workers: int = 4
+    max_queue: int = 64  # Calls waiting for a worker before new work is rejected
+    timeout: Optional[float] = None  # Default per-call timeout in seconds
+
+    @classmethod
+    def from_env(cls, name: str, defaults: Optional["ExecutorConfig"] = None) -> "ExecutorConfig":
+        """Apply overrides such as SAM_EXECUTOR_{NAME}_MAX_WORKERS=8."""
+        base = defaults or cls()
+        prefix = f"SAM_EXECUTOR_{name.upper().replace('-', '_')}_"
+        timeout = os.getenv(f"{prefix}TIMEOUT")
+        return cls(
+            max_workers=int(os.getenv(f"{prefix}MAX_WORKERS", str(base.max_workers))),
+            max_queue=int(os.getenv(f"{prefix}MAX_QUEUE", str(base.max_queue))),
+            timeout=float(timeout) if timeout else base.timeout,
+        )
+
+
+# Executors integrations declare by name; anything else gets ExecutorConfig()
+DEFAULT_EXECUTOR_CONFIGS: Dict[str, ExecutorConfig] = {
+    "hyperliquid": ExecutorConfig(max_workers=4, max_queue=32, timeout=30.0),
+    "dexscreener": ExecutorConfig(max_workers=4, max_queue=32, timeout=30.0),
+    "sqlite": ExecutorConfig(max_workers=1, max_queue=8),
+    # No timeout: psutil reads are local, and wait_for with a timeout can swallow
+    # a cancellation that races the result on Python 3.11
+    "metrics": ExecutorConfig(max_workers=1, max_queue=2),
+}
+
+
+class BoundedExecutor:
+    """A named thread pool with a bounded queue and latency metrics."""
+
+    def __init__(self, name: str, config: Optional[ExecutorConfig] = None) -> None:
+        self.name = name
+        self.config = config or ExecutorConfig()
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._wait_times: Deque[float] = deque(maxlen=500)
+        self._run_times: Deque[float] = deque(maxlen=500)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+
+    def _get_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.config.max_workers,
+                thread_name_prefix=f"sam-{self.name}",
+            )
+        return self._pool
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        _timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``func(*args, **kwargs)`` on this pool and await its result.
+
+        ``_timeout`` overrides the pool's default per-call timeout; it is underscored
+        so a ``timeout`` keyword is passed through to ``func``. On timeout a call that
+        has not started yet is cancelled; one that is already running cannot be
+        interrupted, so its result is discarded.
+        """
+        with self._lock:
+            if self._queued >= self.config.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Executor '{self.name}' is saturated ({self._queued} calls queued)"
+                )
+            self._queued += 1
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queued)
+
+        enqueued_at = time.perf_counter()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+
+        def _work() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_times.append(started - enqueued_at)
+            try:
+                return call()
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._run_times.append(time.perf_counter() - started)
+
+        try:
+            future = self._get_pool().submit(_work)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+        def _on_done(done: concurrent.futures.Future[T]) -> None:
+            # Cancelled before a worker picked it up: _work never ran to dequeue it
+            if done.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future.add_done_callback(_on_done)
+
+        effective_timeout = _timeout if _timeout is not None else self.config.timeout
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), effective_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                f"Executor '{self.name}' call {getattr(func, '__name__', func)!s} "
+                f"timed out after {effective_timeout}s"
+            )
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {"p50_ms": None, "p95_ms": None, "max_ms": None}
+        ordered = sorted(samples)
+        return {
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.config.max_workers,
+                "max_queue": self.config.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "wait_time": self._summary(self._wait_times),
+                "run_time": self._summary(self._run_times),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global executor registry
+_executors: Dict[str, BoundedExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def get_executor(name: str, config: Optional[ExecutorConfig] = None) -> BoundedExecutor:
+    """Get or create the named executor."""
+    with _registry_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = BoundedExecutor(
+                name,
+                config or ExecutorConfig.from_env(name, DEFAULT_EXECUTOR_CONFIGS.get(name)),
+            )
+            _executors[name] = executor
+        return executor
+
+
+async def run_blocking(
+    executor_name: str,
+    func: Callable[..., T],
+    *args: Any,
+    _timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """Run a blocking callable on the named executor (``_timeout`` as in ``run``)."""
+    return await get_executor(executor_name).run(func, *args, _timeout=_timeout, **kwargs)
+
+
+def get_all_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for all named executors."""
+    return {name: executor.get_stats() for name, executor in _executors.items()}
+
+
+async def shutdown_executors() -> None:
+    """Shut down all named executor pools without waiting for running calls."""
+    with _registry_lock:
+        executors = list(_executors.values())
+    for executor in executors:
+        executor.shutdown(wait=False)
@@ -0,0 +1,356 @@
+"""Per-host concurrency budgets and circuit breaking for the shared HTTP session.
+
+Every integration and LLM provider shares one ``aiohttp`` session. Without
+per-host limits a burst against one market-data API can take every pooled
+connection and stall LLM calls. The shared session installs a trace config
+from :class:`HostLimiter` which, for each request:
+
+- waits for a slot in the host's concurrency budget. The budget adapts with
+  AIMD: it grows additively while responses are fast and halves on ``429``/
+  ``503`` or when latency exceeds the host's target;
+- rejects the request with :class:`HostCircuitOpenError` while the host's
+  circuit breaker (``get_circuit_breaker(host)``) is open;
+- records latency and outcome for :meth:`HostLimiter.get_stats`.
+
+LLM hosts register a fixed budget without a breaker (``CRITICAL_HOST_POLICY``)
+so they keep flowing while a market-data host degrades. Hosts that are slow by
+nature get a longer ``latency_target`` (``parse_latency_targets`` reads them from
+configuration).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    CircuitState,
+    get_circuit_breaker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down" rather than "broken request"
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class HostCircuitOpenError(CircuitBreakerError, aiohttp.ClientConnectionError):
+    """Request rejected because the host's circuit breaker is open.
+
+    Also an ``aiohttp.ClientError`` so integrations treat it as a network error.
+    """
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Concurrency and breaker settings for one host."""
+
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    initial_concurrency: int = 8
+    adaptive: bool = True
+    latency_target: float = 2.0  # Seconds; slower responses shrink the budget
+    circuit_breaker: bool = True
+
+
+DEFAULT_HOST_POLICY = HostPolicy()
+# LLM APIs: fixed, generous budget and no breaker (providers retry on their own)
+CRITICAL_HOST_POLICY = HostPolicy(
+    max_concurrency=32, initial_concurrency=32, adaptive=False, circuit_breaker=False
+)
+
+
+def host_of(url: str) -> str:
+    """Lowercased host (and non-default port) of a URL or bare host name."""
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    host = (parsed.hostname or url).lower()
+    return f"{host}:{parsed.port}" if parsed.port else host
+
+
+def parse_latency_targets(value: str) -> Dict[str, float]:
+    """Parse ``"host=seconds,host2=seconds"`` into ``{host: seconds}``, skipping bad entries."""
+    targets: Dict[str, float] = {}
+    for entry in value.split(","):
+        host, sep, seconds = entry.partition("=")
+        if not sep or not host.strip():
+            continue
+        try:
+            targets[host_of(host.strip())] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid latency target: {entry.strip()!r}")
+    return targets
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with additive increase / multiplicative decrease."""
+
+    def __init__(self, policy: HostPolicy) -> None:
+        self.policy = policy
+        self.limit = float(
+            policy.initial_concurrency if policy.adaptive else policy.max_concurrency
+        )
+        self.in_flight = 0
+        # Slots held per event loop, so a closed loop's slots can be reclaimed
+        self._held: Dict[asyncio.AbstractEventLoop, int] = {}
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._last_decrease = 0.0
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    def _capacity(self) -> int:
+        return max(self.policy.min_concurrency, int(self.limit))
+
+    def _take(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.in_flight += 1
+        self._held[loop] = self._held.get(loop, 0) + 1
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.in_flight < self._capacity() and not self.waiting:
+            self._take(loop)
+            return
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        loop = asyncio.get_running_loop()
+        held = self._held.get(loop, 0)
+        if held:
+            # Otherwise the slot was already reclaimed by reset()
+            self.in_flight -= 1
+            if held == 1:
+                del self._held[loop]
+            else:
+                self._held[loop] = held - 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self._capacity():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._take(waiter.get_loop())
+            waiter.set_result(None)
+
+    def record(self, latency: float, throttled: bool) -> None:
+        if not self.policy.adaptive:
+            return
+        now = time.monotonic()
+        if throttled or latency > self.policy.latency_target:
+            # Halve at most once per latency target so one burst doesn't collapse the budget
+            if now - self._last_decrease >= self.policy.latency_target:
+                self.limit = max(float(self.policy.min_concurrency), self.limit / 2)
+                self._last_decrease = now
+        else:
+            self.limit = min(float(self.policy.max_concurrency), self.limit + 1 / self.limit)
+            self._wake()
+
+    def reset(self) -> None:
+        """Reclaim slots and waiters stranded on closed event loops.
+
+        Requests still running on a live loop keep their slots; live waiters are
+        woken as soon as the reclaimed capacity allows, so no acquire hangs.
+        """
+        for loop in [loop for loop in self._held if loop.is_closed()]:
+            self.in_flight -= self._held.pop(loop)
+        self._waiters = deque(
+            w for w in self._waiters if not w.done() and not w.get_loop().is_closed()
+        )
+        self._wake()
+
+
+class HostState:
+    """Limiter, breaker and latency samples for one host."""
+
+    def __init__(self, host: str, policy: HostPolicy) -> None:
+        self.host = host
+        self.policy = policy
+        self.limiter = AdaptiveLimiter(policy)
+        self.breaker: Optional[CircuitBreaker] = None
+        if policy.circuit_breaker:
+            self.breaker = get_circuit_breaker(
+                host,
+                CircuitBreakerConfig(
+                    failure_threshold=5,
+                    recovery_timeout=30.0,
+                    success_threshold=1,
+                    min_requests=20,
+                ),
+            )
+        self.latencies: Deque[float] = deque(maxlen=256)
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.rejected = 0
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.breaker is not None and self.breaker.stats.state == CircuitState.OPEN
+
+    def get_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "host": self.host,
+            "in_flight": self.limiter.in_flight,
+            "waiting": self.limiter.waiting,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "p50_latency_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+            "p99_latency_ms": (
+                round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1)
+                if ordered
+                else None
+            ),
+            "requests": self.requests,
+            "failures": self.failures,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "circuit": self.breaker.stats.state.value if self.breaker else None,
+        }
+
+
+class HostLimiter:
+    """Registry of per-host policies and state, wired in through an aiohttp trace config."""
+
+    def __init__(self, default_policy: HostPolicy = DEFAULT_HOST_POLICY) -> None:
+        self.default_policy = default_policy
+        self._policies: Dict[str, HostPolicy] = {}
+        self._hosts: Dict[str, HostState] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def policy_for(self, host_or_url: str) -> HostPolicy:
+        return self._policies.get(host_of(host_or_url), self.default_policy)
+
+    def set_latency_target(self, host_or_url: str, seconds: float) -> None:
+        """Keep the host's policy but shrink its budget only above ``seconds`` latency."""
+        self.set_policy(host_or_url, replace(self.policy_for(host_or_url), latency_target=seconds))
+
+    def set_policy(self, host_or_url: str, policy: HostPolicy) -> None:
+        host = host_of(host_or_url)
+        if self._policies.get(host) == policy:
+            return
+        self._policies[host] = policy
+        # Rebuild lazily so the next request picks up the new budget
+        self._hosts.pop(host, None)
+
+    def state_for(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(host, self._policies.get(host, self.default_policy))
+            self._hosts[host] = state
+        return state
+
+    def reset(self) -> None:
+        for state in self._hosts.values():
+            state.limiter.reset()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        return trace
+
+    async def _on_request_start(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Requests from a previous (now closed) loop will never release their slots
+            if self._loop is not None:
+                self.reset()
+            self._loop = loop
+        state = self.state_for(host_of(str(params.url)))
+        await state.limiter.acquire()
+        if state.breaker is not None:
+            try:
+                await state.breaker.allow_request()
+            except CircuitBreakerError as e:
+                state.limiter.release()
+                state.rejected += 1
+                raise HostCircuitOpenError(str(e)) from e
+        ctx.host_state = state
+        ctx.started = time.monotonic()
+        ctx.wall_started = time.time()
+
+    async def _on_request_end(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        await self._finish(ctx, status=int(params.response.status))
+
+    async def _on_request_exception(
+        self, _session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        await self._finish(ctx, exception=params.exception)
+
+    async def _finish(
+        self,
+        ctx: SimpleNamespace,
+        status: Optional[int] = None,
+        exception: Optional[BaseException] = None,
+    ) -> None:
+        state: Optional[HostState] = getattr(ctx, "host_state", None)
+        if state is None:
+            return
+        ctx.host_state = None
+        latency = time.monotonic() - ctx.started
+        state.limiter.release()
+
+        if isinstance(exception, asyncio.CancelledError):
+            # Caller gave up; says nothing about the host
+            if state.breaker is not None:
+                await state.breaker.abandon_request()
+            return
+
+        throttled = status in THROTTLE_STATUSES
+        timed_out = isinstance(exception, asyncio.TimeoutError)
+        failed = exception is not None or (status is not None and status >= 500) or throttled
+        state.requests += 1
+        state.latencies.append(latency)
+        state.throttled += int(throttled)
+        state.failures += int(failed)
+        state.limiter.record(latency, throttled or timed_out)
+        if state.breaker is not None:
+            if failed:
+                await state.breaker.record_failure(ctx.wall_started, timed_out=timed_out)
+            else:
+                await state.breaker.record_success(ctx.wall_started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hosts: List[Dict[str, Any]] = [s.get_stats() for s in self._hosts.values()]
+        return {
+            "hosts": hosts,
+            "open_circuits": sorted(s.host for s in self._hosts.values() if s.circuit_open),
+        }
+
+
+__all__ = [
+    "AdaptiveLimiter",
+    "CRITICAL_HOST_POLICY",
+    "DEFAULT_HOST_POLICY",
+    "HostCircuitOpenError",
+    "HostLimiter",
+    "HostPolicy",
+    "HostState",
+    "host_of",
+    "parse_latency_targets",
+]
@@ -3,16 +3,289 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import os
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Optional
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Tuple
 
 import aiohttp
 
+from .host_limits import (
+    CRITICAL_HOST_POLICY,
+    DEFAULT_HOST_POLICY,
+    HostLimiter,
+    HostPolicy,
+    parse_latency_targets,
+)
+
 
 logger = logging.getLogger(__name__)
 
+# Methods whose identical in-flight requests may share one upstream call
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+# Request headers that distinguish otherwise identical requests; others are ignored
+COALESCE_HEADER_WHITELIST = frozenset(
+    {"accept", "accept-encoding", "accept-language", "authorization", "x-api-key"}
+)
+_MAX_CACHED_RESPONSES = 512
+
+CoalesceKey = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class FetchedResponse:
+    """A fully read response that can be shared between callers.
+
+    ``data`` is the parsed JSON body (or ``None`` when the body is not JSON). It
+    may be handed to several callers at once, so treat it as read-only.
+    """
+
+    status: int
+    data: Any
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    shared: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+@dataclass
+class _CachedResponse:
+    response: FetchedResponse
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _cache_lifetime(headers: Mapping[str, str], cache_ttl: float) -> Optional[float]:
+    """Seconds a response may be reused, honouring ``Cache-Control``.
+
+    Returns ``None`` when the response must not be stored at all.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().lower().partition("=")
+        if name:
+            directives[name] = value.strip('"') or None
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        # Stored only so it can be revalidated with its validators
+        return 0.0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(0.0, min(cache_ttl, float(max_age)))
+        except ValueError:
+            pass
+    return cache_ttl
+
+
+class RequestCoalescer:
+    """Single-flight de-duplication and a short response cache for idempotent requests.
+
+    Identical requests (method, URL, params and whitelisted headers) that are in
+    flight at the same time share one upstream call and one parsed body. With a
+    ``cache_ttl`` the response is also kept for up to that many seconds, bounded
+    by ``Cache-Control: max-age``; stale entries carrying an ``ETag`` or
+    ``Last-Modified`` are revalidated with a conditional request.
+    """
+
+    def __init__(self, enabled: bool = True, max_entries: int = _MAX_CACHED_RESPONSES) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[CoalesceKey, asyncio.Task[FetchedResponse]] = {}
+        self._cache: "OrderedDict[CoalesceKey, _CachedResponse]" = OrderedDict()
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "upstream": 0,
+            "coalesced": 0,
+            "cache_hits": 0,
+            "revalidated": 0,
+        }
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> CoalesceKey:
+        return (
+            method.upper(),
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+            tuple(
+                sorted(
+                    (k.lower(), str(v))
+                    for k, v in (headers or {}).items()
+                    if k.lower() in COALESCE_HEADER_WHITELIST
+                )
+            ),
+        )
+
+    def _bind_loop(self) -> None:
+        # In-flight tasks and sessions are loop-bound; start fresh on a new loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight.clear()
+            self._cache.clear()
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        cache_ttl: float = 0.0,
+    ) -> FetchedResponse:
+        self._bind_loop()
+        self._stats["requests"] += 1
+        method = method.upper()
+        if not self.enabled or method not in IDEMPOTENT_METHODS:
+            self._stats["upstream"] += 1
+            return await _read_response(session, method, url, params, headers)
+
+        key = self.make_key(method, url, params, headers)
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() < cached.expires_at:
+            self._cache.move_to_end(key)
+            self._stats["cache_hits"] += 1
+            return replace(cached.response, from_cache=True)
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return replace(await asyncio.shield(task), shared=True)
+
+        task = asyncio.get_running_loop().create_task(
+            self._fetch_upstream(session, key, method, url, params, headers, cache_ttl, cached)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        # Shielded so a cancelled first caller does not fail the callers sharing its request
+        return await asyncio.shield(task)
+
+    def _finish(self, key: CoalesceKey, task: "asyncio.Task[FetchedResponse]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every waiter went away
+
+    async def _fetch_upstream(
+        self,
+        session: aiohttp.ClientSession,
+        key: CoalesceKey,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]],
+        cache_ttl: float,
+        cached: Optional[_CachedResponse],
+    ) -> FetchedResponse:
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        self._stats["upstream"] += 1
+        response = await _read_response(session, method, url, params, request_headers)
+
+        if response.status == 304 and cached is not None:
+            self._stats["revalidated"] += 1
+            self._store(key, cached.response, cached.response.headers, cache_ttl)
+            return replace(cached.response, from_cache=True)
+        if cache_ttl > 0 and response.status == 200:
+            self._store(key, response, response.headers, cache_ttl)
+        return response
+
+    def _store(
+        self,
+        key: CoalesceKey,
+        response: FetchedResponse,
+        headers: Mapping[str, str],
+        cache_ttl: float,
+    ) -> None:
+        lifetime = _cache_lifetime(headers, cache_ttl)
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if lifetime is None or (lifetime <= 0 and not (etag or last_modified)):
+            self._cache.pop(key, None)
+            return
+        self._cache[key] = _CachedResponse(
+            response=response,
+            expires_at=time.monotonic() + lifetime,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "inflight": len(self._inflight),
+            "cached": len(self._cache),
+        }
+
+
+async def _read_response(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+) -> FetchedResponse:
+    kwargs: Dict[str, Any] = {}
+    if params is not None:
+        kwargs["params"] = params
+    if headers:
+        kwargs["headers"] = dict(headers)
+    request = (
+        session.get(url, **kwargs) if method == "GET" else session.request(method, url, **kwargs)
+    )
+    async with request as response:
+        status = int(response.status)
+        response_headers = {
+            str(k).lower(): str(v)
+            for k, v in (getattr(response, "headers", None) or {}).items()
+            if isinstance(k, str)
+        }
+        if status == 200:
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                # Not JSON; callers can still use the raw text
+                return FetchedResponse(
+                    status=status, data=None, text=await response.text(), headers=response_headers
+                )
+            return FetchedResponse(status=status, data=data, text="", headers=response_headers)
+        text = await response.text() if status != 304 else ""
+        try:
+            data = json.loads(text) if text else None
+        except ValueError:
+            data = None
+        return FetchedResponse(status=status, data=data, text=text, headers=response_headers)
+
 
 class SharedHTTPClient:
     """Shared HTTP client with connection pooling and resource management."""
@@ -23,6 +296,7 @@ class SharedHTTPClient:
     def __init__(self) -> None:
         self._closed = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.coalescer = RequestCoalescer(enabled=os.getenv("SAM_HTTP_COALESCE", "1") != "0")
 
     @classmethod
     async def get_instance(cls) -> "SharedHTTPClient":
@@ -63,10 +337,11 @@ class SharedHTTPClient:
 
     async def _create_session(self) -> None:
         """Create new HTTP session with optimized settings."""
-        # Connection pooling and timeout configuration
+        # Connection pooling and timeout configuration. Budgets are per host (see
+        # sam.utils.host_limits) so one busy API cannot take the whole pool.
         connector = aiohttp.TCPConnector(
-            limit=100,  # Total connection limit
-            limit_per_host=20,  # Per-host connection limit
+            limit=0,  # No shared total; each host has its own budget
+            limit_per_host=CRITICAL_HOST_POLICY.max_concurrency,  # Upper bound for any host
             ttl_dns_cache=300,  # DNS cache TTL
             use_dns_cache=True,
             keepalive_timeout=30,
@@ -84,6 +359,7 @@ class SharedHTTPClient:
             timeout=timeout,
             headers={"User-Agent": "SAM-Framework/0.1.0"},
             trust_env=True,  # honor HTTP(S)_PROXY and system SSL settings
+            trace_configs=[_host_limiter.trace_config()],
         )
 
         logger.info("Created shared HTTP session with connection pooling")
@@ -106,8 +382,29 @@ class SharedHTTPClient:
             logger.error(f"HTTP request failed: {method} {url} - {e}")
             raise
 
+    async def fetch_json(
+        self,
+        url: str,
+        *,
+        method: str = "GET",
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        cache_ttl: float = 0.0,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> FetchedResponse:
+        """Fetch and parse a JSON response, coalescing identical in-flight requests."""
+        if session is None:
+            session = await self.get_session()
+        return await self.coalescer.fetch(
+            session, method, url, params=params, headers=headers, cache_ttl=cache_ttl
+        )
+
     async def close(self) -> None:
-        """Close HTTP session and cleanup resources."""
+        """Close HTTP session and cleanup resources.
+
+        The response cache is kept: this runs after every API request, and the cache
+        is only dropped on an event-loop change or by ``clear_http_cache``.
+        """
         if self._session and not self._session.closed:
             await self._session.close()
             logger.info("Closed shared HTTP session")
@@ -126,6 +423,46 @@ class SharedHTTPClient:
         await self.close()
 
 
+# Per-host budgets and breakers; module-level so policies can be set before the
+# session exists (LLM providers register theirs on construction)
+def _build_host_limiter() -> HostLimiter:
+    """Default policy from SAM_HTTP_LATENCY_TARGET, per-host targets from
+    SAM_HTTP_HOST_LATENCY_TARGETS ("host=seconds,...")."""
+    default_target = os.getenv("SAM_HTTP_LATENCY_TARGET")
+    limiter = HostLimiter(
+        replace(DEFAULT_HOST_POLICY, latency_target=float(default_target))
+        if default_target
+        else DEFAULT_HOST_POLICY
+    )
+    targets = parse_latency_targets(os.getenv("SAM_HTTP_HOST_LATENCY_TARGETS", ""))
+    for host, seconds in targets.items():
+        limiter.set_latency_target(host, seconds)
+    return limiter
+
+
+_host_limiter = _build_host_limiter()
+
+def set_host_policy(host_or_url: str, policy: HostPolicy) -> None:
+    """Set the concurrency/breaker policy for a host (a URL or bare host name)."""
+    _host_limiter.set_policy(host_or_url, policy)
+
+
+def set_host_latency_target(host_or_url: str, seconds: float) -> None:
+    """Latency above which the host's adaptive budget shrinks (default 2s)."""
+    _host_limiter.set_latency_target(host_or_url, seconds)
+
+
+def get_http_host_stats() -> Dict[str, Any]:
+    """Per-host in-flight counts, concurrency limits, latency percentiles and open circuits."""
+    return _host_limiter.get_stats()
+
+
+def clear_http_cache() -> None:
+    """Drop coalesced in-flight requests and cached responses (process shutdown)."""
+    if SharedHTTPClient._instance is not None:
+        SharedHTTPClient._instance.coalescer.clear()
+
+
 # Global instance functions
 _global_client: Optional[SharedHTTPClient] = None
 _client_lock: Optional[asyncio.Lock] = None
@@ -156,6 +493,12 @@ async def get_http_client() -> SharedHTTPClient:
         return _global_client
 
 
+def get_http_client_stats() -> Optional[Dict[str, Any]]:
+    """Request coalescer stats of the shared client, or None when it has not been created."""
+    client = _global_client
+    return client.coalescer.get_stats() if client is not None else None
+
+
 async def cleanup_http_client() -> None:
     """Cleanup global HTTP client (thread-safe)."""
     global _global_client, _client_lock
@@ -179,6 +522,26 @@ async def get_session() -> aiohttp.ClientSession:
     return await client.get_session()
 
 
+async def fetch_json(
+    url: str,
+    *,
+    method: str = "GET",
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    cache_ttl: float = 0.0,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> FetchedResponse:
+    """Fetch JSON through the global client's single-flight layer.
+
+    Pass the ``session`` from ``get_session()`` when the caller already has one.
+    ``cache_ttl`` (seconds) opts into briefly caching 200 responses.
+    """
+    client = await get_http_client()
+    return await client.fetch_json(
+        url, method=method, params=params, headers=headers, cache_ttl=cache_ttl, session=session
+    )
+
+
 @asynccontextmanager
 async def http_request(
     method: str, url: str, **kwargs: Any
@@ -5,12 +5,15 @@ from asyncio import Task
 from collections import deque
 import functools
 import logging
+import math
 import time
 import psutil
 import os
-from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar, cast
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, cast
 from dataclasses import dataclass
 
+from .executors import run_blocking
+
 logger = logging.getLogger(__name__)
 
 F = TypeVar("F", bound=Callable[..., Any])
@@ -43,9 +46,89 @@ class ComponentMetric:
     error_type: Optional[str] = None
 
 
+class LatencyHistogram:
+    """Fixed-memory log-linear histogram of durations (HDR style).
+
+    Durations are bucketed in microseconds with 16 sub-buckets per power of
+    two, so a quantile is within about 3% of the true value however many
+    samples were recorded, and memory stays a fixed array of counters.
+    """
+
+    _SUB_BITS = 4
+    _SUB_BUCKETS = 1 << _SUB_BITS
+    _OCTAVES = 32  # Up to 2**36 us (~19 hours); longer durations land in the last bucket
+
+    def __init__(self) -> None:
+        self._counts = [0] * ((self._OCTAVES + 1) * self._SUB_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        if micros < 2 * cls._SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - (cls._SUB_BITS + 1)
+        index = (shift + 1) * cls._SUB_BUCKETS + (micros >> shift) - cls._SUB_BUCKETS
+        return min(index, (cls._OCTAVES + 1) * cls._SUB_BUCKETS - 1)
+
+    @classmethod
+    def _bucket_midpoint(cls, index: int) -> float:
+        if index < 2 * cls._SUB_BUCKETS:
+            return index + 0.5
+        shift = index // cls._SUB_BUCKETS - 1
+        low = (index % cls._SUB_BUCKETS + cls._SUB_BUCKETS) << shift
+        return low + (1 << shift) / 2
+
+    def record(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self._counts[self._index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Duration in seconds at quantile ``q`` (0..1); 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                value = self._bucket_midpoint(index) / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
 class MetricsCollector:
     """Collect and track performance metrics with automatic memory management."""
 
+    # Durations above these (seconds) are logged as slow operations
+    slow_thresholds: Dict[str, float] = {"llm": 30.0}
+    default_slow_threshold = 5.0
+    # Distinct (component, operation) histograms kept; the rest share "_other"
+    max_histograms = 512
+
     def __init__(self, max_metrics: int = 1000, collection_interval: int = 60) -> None:
         self.max_metrics = max_metrics
         self.collection_interval = collection_interval
@@ -61,6 +144,10 @@ class MetricsCollector:
         # Performance tracking (keep fewer slow operations)
         self.slow_operations: Deque[ComponentMetric] = deque(maxlen=100)
 
+        # Lifetime latency distribution per (component, operation)
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._process: Optional[psutil.Process] = None
+
         self._collection_task: Optional[Task[None]] = None
         self._shutdown = False
 
@@ -73,8 +160,36 @@ class MetricsCollector:
         if self._collection_task is None or self._collection_task.done():
             self._collection_task = asyncio.create_task(self._collect_system_metrics())
 
+    def _sample_system_metrics(self) -> SystemMetrics:
+        """Read system metrics; blocking, so it runs on the ``metrics`` executor."""
+        if self._process is None:
+            self._process = psutil.Process(os.getpid())
+            # CPU percentages are measured between calls; prime both counters
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent()
+        process = self._process
+        memory = psutil.virtual_memory()
+        with process.oneshot():
+            return SystemMetrics(
+                timestamp=time.time(),
+                cpu_percent=psutil.cpu_percent(interval=None),
+                memory_percent=memory.percent,
+                memory_used_mb=memory.used / (1024 * 1024),
+                disk_percent=psutil.disk_usage("/").percent,
+                process_memory_mb=process.memory_info().rss / (1024 * 1024),
+                process_cpu_percent=process.cpu_percent(),
+                open_files=len(process.open_files()),
+                thread_count=process.num_threads(),
+            )
+
     async def _collect_system_metrics(self) -> None:
-        """Collect system metrics periodically."""
+        """Collect system metrics periodically, off the event loop."""
+        # Prime CPU counters so the first sample covers a full interval
+        try:
+            await run_blocking("metrics", self._sample_system_metrics)
+        except Exception as e:
+            logger.debug(f"Initial system metrics sample failed: {e}")
+
         while not self._shutdown:
             try:
                 await asyncio.sleep(self.collection_interval)
@@ -82,18 +197,7 @@ class MetricsCollector:
                 if self._shutdown:
                     break
 
-                # Get system metrics
-                metrics = SystemMetrics(
-                    timestamp=time.time(),
-                    cpu_percent=psutil.cpu_percent(interval=1),
-                    memory_percent=psutil.virtual_memory().percent,
-                    memory_used_mb=psutil.virtual_memory().used / (1024 * 1024),
-                    disk_percent=psutil.disk_usage("/").percent,
-                    process_memory_mb=psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024),
-                    process_cpu_percent=psutil.Process(os.getpid()).cpu_percent(),
-                    open_files=len(psutil.Process(os.getpid()).open_files()),
-                    thread_count=psutil.Process(os.getpid()).num_threads(),
-                )
+                metrics = await run_blocking("metrics", self._sample_system_metrics)
 
                 # Store metrics (deque automatically handles maxlen)
                 self.system_metrics.append(metrics)
@@ -108,6 +212,8 @@ class MetricsCollector:
                 if metrics.open_files > 100:
                     logger.warning(f"High number of open files: {metrics.open_files}")
 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Error collecting system metrics: {e}")
                 await asyncio.sleep(60)  # Wait before retry
@@ -141,8 +247,16 @@ class MetricsCollector:
             error_key = f"{component}.{error_type}"
             self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
 
-        # Track slow operations (>5 seconds) - deque automatically handles maxlen
-        if duration > 5.0:
+        hist_key = (component, operation)
+        histogram = self.latency.get(hist_key)
+        if histogram is None:
+            if len(self.latency) >= self.max_histograms:
+                hist_key = (component, "_other")
+            histogram = self.latency.setdefault(hist_key, LatencyHistogram())
+        histogram.record(duration)
+
+        # Track slow operations - deque automatically handles maxlen
+        if duration > self.slow_thresholds.get(component, self.default_slow_threshold):
             self.slow_operations.append(metric)
             logger.warning(f"Slow operation: {component}.{operation} took {duration:.3f}s")
 
@@ -216,6 +330,12 @@ class MetricsCollector:
 
         top_errors = sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:5]
 
+        # Percentiles come from the lifetime histograms, not only the window above
+        merged = LatencyHistogram()
+        for (hist_component, _), histogram in self.latency.items():
+            if component is None or hist_component == component:
+                merged.merge(histogram)
+
         return {
             "component": component or "all",
             "hours": hours,
@@ -229,10 +349,17 @@ class MetricsCollector:
                 "avg_duration": avg_duration,
                 "max_duration": max_duration,
                 "min_duration": min_duration,
+                "p50_duration": merged.quantile(0.5),
+                "p90_duration": merged.quantile(0.9),
+                "p99_duration": merged.quantile(0.99),
             },
             "top_errors": top_errors,
         }
 
+    def get_latency_summaries(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """Count, sum and p50/p90/p99 (seconds) per (component, operation)."""
+        return {key: histogram.summary() for key, histogram in self.latency.items()}
+
     def get_slow_operations(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent slow operations."""
         recent_slow = sorted(self.slow_operations, key=lambda x: x.duration, reverse=True)[:limit]
@@ -293,8 +420,12 @@ def record_operation_metric(
     error_type: Optional[str] = None,
 ) -> None:
     """Convenience function to record operation metrics."""
+    collector = _global_metrics_collector
+    if collector is not None:
+        collector.record_operation(component, operation, duration, success, error_type)
+        return
     try:
-        # Create a task to record the metric asynchronously
+        # First metric: create the collector (and its collection task) on the loop
         async def _record() -> None:
             collector = await get_metrics_collector()
             collector.record_operation(component, operation, duration, success, error_type)
@@ -0,0 +1,211 @@
+"""Prometheus text exposition of SAM's runtime metrics.
+
+Only reads state that already exists: a pool, cache or client that was never
+created is simply absent from the output, so scraping ``/metrics`` does not
+open connections or start background tasks.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from . import monitoring
+from .circuit_breaker import get_all_circuit_breaker_stats
+from .connection_pool import get_database_pool_stats
+from .executors import get_all_executor_stats
+from .http_client import get_http_client_stats, get_http_host_stats
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_QUANTILES = (("p50", "0.5"), ("p90", "0.9"), ("p99", "0.99"))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsWriter:
+    """Collects samples grouped by metric family and renders them in order."""
+
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, str, List[Tuple[str, Labels, float]]]] = {}
+
+    def add(
+        self,
+        name: str,
+        value: Any,
+        labels: Optional[Mapping[str, Any]] = None,
+        help_text: str = "",
+        kind: str = "gauge",
+        family: Optional[str] = None,
+    ) -> None:
+        """Add one sample; values that are not numbers (or bools) are skipped."""
+        if isinstance(value, bool):
+            value = int(value)
+        if not isinstance(value, (int, float)):
+            return
+        family = family or name
+        entry = self._families.setdefault(family, (kind, help_text, []))
+        label_pairs = tuple((key, str(val)) for key, val in (labels or {}).items())
+        entry[2].append((name, label_pairs, float(value)))
+
+    def add_stats(
+        self,
+        prefix: str,
+        stats: Mapping[str, Any],
+        labels: Optional[Mapping[str, Any]] = None,
+        help_text: str = "",
+    ) -> None:
+        """Export every numeric field of a stats dict as ``<prefix>_<field>``."""
+        for key, value in stats.items():
+            if isinstance(value, Mapping):
+                self.add_stats(f"{prefix}_{key}", value, labels, help_text)
+            else:
+                self.add(f"{prefix}_{key}", value, labels, help_text)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family, (kind, help_text, samples) in self._families.items():
+            if help_text:
+                lines.append(f"# HELP {family} {_escape(help_text)}")
+            lines.append(f"# TYPE {family} {kind}")
+            for name, labels, value in samples:
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _add_operation_metrics(writer: MetricsWriter, collector: monitoring.MetricsCollector) -> None:
+    family = "sam_operation_duration_seconds"
+    for (component, operation), summary in sorted(collector.get_latency_summaries().items()):
+        labels = {"component": component, "operation": operation}
+        for key, quantile in _QUANTILES:
+            writer.add(
+                family,
+                summary[key],
+                {**labels, "quantile": quantile},
+                "Operation latency by component and operation",
+                kind="summary",
+            )
+        writer.add(f"{family}_sum", summary["sum"], labels, kind="summary", family=family)
+        writer.add(f"{family}_count", summary["count"], labels, kind="summary", family=family)
+
+    for key, count in sorted(collector.operation_counts.items()):
+        component, _, operation = key.partition(".")
+        writer.add(
+            "sam_operations_total",
+            count,
+            {"component": component, "operation": operation},
+            "Operations recorded",
+            kind="counter",
+        )
+    for key, count in sorted(collector.error_counts.items()):
+        component, _, error_type = key.partition(".")
+        writer.add(
+            "sam_operation_errors_total",
+            count,
+            {"component": component, "error_type": error_type},
+            "Failed operations by error type",
+            kind="counter",
+        )
+
+    if collector.system_metrics:
+        latest = collector.system_metrics[-1]
+        for field, value in vars(latest).items():
+            if field != "timestamp":
+                writer.add(f"sam_system_{field}", value, help_text="Latest system sample")
+
+
+def _loaded(module_name: str, attr: str) -> Any:
+    """``module.attr`` if the module has been imported, else None."""
+    module = sys.modules.get(module_name)
+    return getattr(module, attr, None) if module is not None else None
+
+
+async def _add_cache_metrics(writer: MetricsWriter) -> None:
+    from ..cache.engine import get_cache_stats
+
+    cache_stats = await get_cache_stats()
+    if cache_stats is not None:
+        writer.add_stats(
+            "sam_cache",
+            {
+                "hits": cache_stats.hits,
+                "misses": cache_stats.misses,
+                "size": cache_stats.size,
+                "max_size": cache_stats.max_size,
+            },
+            {"backend": cache_stats.backend_type},
+            "Cache engine",
+        )
+    prompt_cache = _loaded("sam.core.llm_provider", "_prompt_cache")
+    if prompt_cache is not None:
+        writer.add_stats("sam_prompt_cache", prompt_cache.stats(), help_text="LLM prompt cache")
+    user_cache = _loaded("sam.api.user_cache", "_user_cache")
+    if user_cache is not None:
+        writer.add_stats("sam_user_cache", user_cache.get_stats(), help_text="API user cache")
+    secret_cache = _loaded("sam.utils.secret_cache", "_secret_cache")
+    if secret_cache is not None:
+        writer.add_stats("sam_secret_cache", secret_cache.get_stats(), help_text="Secret cache")
+
+
+async def render_metrics() -> str:
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    writer = MetricsWriter()
+
+    collector = monitoring._global_metrics_collector
+    if collector is not None:
+        _add_operation_metrics(writer, collector)
+
+    pool_stats = await get_database_pool_stats()
+    if pool_stats is not None:
+        writer.add_stats("sam_db_pool", pool_stats, help_text="SQLite connection pool")
+
+    event_bus = _loaded("sam.core.events", "_global_bus")
+    if event_bus is not None:
+        writer.add_stats("sam_event_bus", event_bus.get_stats(), help_text="Event bus")
+
+    try:
+        await _add_cache_metrics(writer)
+    except Exception as e:
+        logger.debug(f"Cache metrics unavailable: {e}")
+
+    client_stats = get_http_client_stats()
+    if client_stats is not None:
+        writer.add_stats("sam_http_coalescer", client_stats, help_text="HTTP request coalescer")
+    for host in get_http_host_stats()["hosts"]:
+        writer.add_stats("sam_http_host", host, {"host": host["host"]}, "Per-host HTTP limits")
+
+    for name, stats in sorted(get_all_executor_stats().items()):
+        writer.add_stats("sam_executor", stats, {"executor": name}, "Blocking-call executors")
+
+    for name, breaker in sorted(get_all_circuit_breaker_stats().items()):
+        writer.add_stats(
+            "sam_circuit_breaker",
+            {**breaker, "open": breaker["state"] == "open"},
+            {"name": name},
+            "Circuit breakers",
+        )
+
+    return writer.render()
+
+
+__all__ = ["CONTENT_TYPE", "MetricsWriter", "render_metrics"]
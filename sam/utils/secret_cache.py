@@ -0,0 +1,130 @@
+"""In-memory cache of decrypted per-user secrets.
+
+Agent builds need a user's integration secrets (API keys, private keys). They
+are stored Fernet-encrypted in ``user_secrets``; decrypting them on every build
+is wasted work when the same user builds several agents in a row. Entries here
+live for a short TTL, are never persisted, and the buffers holding the
+plaintext are overwritten with zeros when an entry expires, is evicted or is
+invalidated by a write. Values handed to callers are ordinary ``str`` copies.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+SecretMap = Dict[str, Dict[str, str]]
+_Buffers = Dict[str, Dict[str, bytearray]]
+
+
+def _zeroize(buffers: _Buffers) -> None:
+    for fields in buffers.values():
+        for buf in fields.values():
+            buf[:] = b"\x00" * len(buf)
+        fields.clear()
+    buffers.clear()
+
+
+class SecretCache:
+    """TTL + LRU cache of ``integration -> {field -> value}`` maps per user.
+
+    A user can have several entries under different ``scope`` names (e.g. the
+    ``user_secrets`` rows and the operational wallet); :meth:`invalidate`
+    drops all of them.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 2048) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], Tuple[_Buffers, float]] = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _drop(self, key: Tuple[str, str]) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _zeroize(entry[0])
+        return True
+
+    def get(self, user_id: str, scope: str = "secrets") -> Optional[SecretMap]:
+        """Cached secrets for the user, or ``None`` when absent or expired."""
+        key = (user_id, scope)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] >= self.ttl:
+            self._drop(key)
+            self._stats["evictions"] += 1
+            entry = None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return {
+            name: {field: buf.decode() for field, buf in fields.items()}
+            for name, fields in entry[0].items()
+        }
+
+    def version(self, user_id: str) -> int:
+        """Pass to :meth:`put` so secrets loaded across a write are not cached."""
+        return self._versions.get(user_id, 0)
+
+    def put(
+        self,
+        user_id: str,
+        secrets: SecretMap,
+        version: Optional[int] = None,
+        scope: str = "secrets",
+    ) -> None:
+        if self.ttl <= 0 or (version is not None and version != self.version(user_id)):
+            return
+        key = (user_id, scope)
+        self._drop(key)
+        buffers = {
+            name: {field: bytearray(value.encode()) for field, value in fields.items()}
+            for name, fields in secrets.items()
+        }
+        self._entries[key] = (buffers, time.monotonic())
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop every entry of the user; loads already in flight won't be stored."""
+        self._versions[user_id] = self.version(user_id) + 1
+        for key in [k for k in self._entries if k[0] == user_id]:
+            self._drop(key)
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._drop(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "entries": len(self._entries)}
+
+
+_secret_cache: Optional[SecretCache] = None
+
+
+def get_secret_cache() -> SecretCache:
+    """Process-wide cache shared by agent builds and secret writes."""
+    global _secret_cache
+    if _secret_cache is None:
+        _secret_cache = SecretCache(ttl=float(Settings.SAM_SECRET_CACHE_TTL))
+    return _secret_cache
+
+
+def clear_secret_cache() -> None:
+    """Zeroize every cached secret (process shutdown)."""
+    if _secret_cache is not None:
+        _secret_cache.clear()
+
+
+__all__ = ["SecretCache", "clear_secret_cache", "get_secret_cache"]
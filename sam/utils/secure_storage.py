@@ -9,7 +9,8 @@ from typing import Dict, Iterator, Optional, Any, Protocol, Tuple, runtime_check
 
 import keyring
 from cryptography.fernet import Fernet
-from importlib.metadata import entry_points
+
+from ..config.config_loader import plugin_entry_points
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +130,11 @@ class EncryptedFileVault:
 
     def store_cipher(self, key: str, value: str, *, source: str, kind: str) -> bool:
         with self._lock:
+            if self._data.get(key) == value and self._index.get(key) == {
+                "source": source,
+                "kind": kind,
+            }:
+                return True
             self._data[key] = value
             self._index[key] = {"source": source, "kind": kind}
             try:
@@ -143,6 +149,9 @@ class EncryptedFileVault:
     def record_key(self, key: str, *, source: str, kind: str) -> None:
         with self._lock:
             entry = self._index.get(key, {}).copy()
+            # Called on every keyring read/write; only rewrite the file on change
+            if entry.get("source") == source and entry.get("kind") == kind:
+                return
             entry["source"] = source
             entry["kind"] = kind
             self._index[key] = entry
@@ -184,6 +193,8 @@ class EncryptedFileVault:
 
     def set_meta(self, key: str, value: str) -> None:
         with self._lock:
+            if self._meta.get(key) == value:
+                return
             self._meta[key] = value
             try:
                 self._dump()
@@ -844,7 +855,7 @@ def configure_secure_storage(store: BaseSecretStore) -> None:
 
 def _load_plugin_storage() -> Optional[BaseSecretStore]:
     try:
-        eps = entry_points(group="sam.secure_storage")
+        eps = plugin_entry_points("sam.secure_storage")
     except Exception as exc:
         logger.debug("Failed to load secure storage entry points: %s", exc)
         return None
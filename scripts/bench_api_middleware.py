@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark the API middleware stack: plain request throughput and SSE event latency.
+
+Drives the app from ``sam.api.app.create_app`` directly over ASGI (no sockets),
+so the numbers isolate the cost of the middleware stack itself. Two probe
+routes are mounted on the app for the run:
+
+- ``GET /bench/ping`` returns a small JSON body (req/s);
+- ``GET /bench/stream`` emits SSE events; latency is measured from the moment
+  an event is yielded to when it reaches the server's ``send``.
+
+Usage:
+    SAM_TEST_MODE=1 uv run python scripts/bench_api_middleware.py [--requests 5000] [--events 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SAM_TEST_MODE", "1")
+
+from fastapi.responses import StreamingResponse  # noqa: E402
+
+from sam.api.app import create_app  # noqa: E402
+
+
+def _scope(path: str) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"cookie", b"sam_csrf_token=bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+def _receiver() -> Any:
+    """ASGI ``receive``: the (empty) request body, then wait for a disconnect."""
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+async def bench_requests(app: Any, count: int) -> float:
+    async def send(message: Dict[str, Any]) -> None:
+        pass
+
+    for _ in range(100):  # warm up
+        await app(_scope("/bench/ping"), _receiver(), send)
+    started = time.perf_counter()
+    for _ in range(count):
+        await app(_scope("/bench/ping"), _receiver(), send)
+    return count / (time.perf_counter() - started)
+
+
+async def bench_stream(app: Any, events: int, yielded_at: List[float]) -> List[float]:
+    latencies: List[float] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            latencies.append((time.perf_counter() - yielded_at[-1]) * 1e6)
+
+    os.environ["SAM_BENCH_EVENTS"] = str(events)
+    await app(_scope("/bench/stream"), _receiver(), send)
+    return latencies
+
+
+def build_app(yielded_at: List[float]) -> Any:
+    app = create_app()
+
+    async def ping() -> Dict[str, bool]:
+        return {"ok": True}
+
+    async def events() -> AsyncIterator[bytes]:
+        for i in range(int(os.environ.get("SAM_BENCH_EVENTS", "1000"))):
+            yielded_at.append(time.perf_counter())
+            yield f"data: {i}\n\n".encode()
+            await asyncio.sleep(0)
+
+    async def stream() -> StreamingResponse:
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_api_route("/bench/ping", ping, methods=["GET"])
+    app.add_api_route("/bench/stream", stream, methods=["GET"])
+    return app
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    yielded_at: List[float] = []
+    app = build_app(yielded_at)
+    rps = await bench_requests(app, args.requests)
+    latencies = await bench_stream(app, args.events, yielded_at)
+    latencies.sort()
+
+    print(f"requests: {args.requests}  throughput: {rps:,.0f} req/s")
+    print(
+        f"sse events: {len(latencies)}  latency p50: {statistics.median(latencies):.1f} µs  "
+        f"p99: {latencies[int(len(latencies) * 0.99) - 1]:.1f} µs"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
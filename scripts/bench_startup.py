@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark cold-start import cost of the CLI, the API app and the agent builder.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``;
+the cumulative time reported for the module itself is taken as its import
+cost (best of ``--runs``). The slowest imports underneath it are listed, and
+any integration SDK that got imported anyway is flagged: those should only be
+loaded by ``AgentBuilder.build`` for enabled bundles.
+
+Usage:
+    uv run python scripts/bench_startup.py [--runs 5] [--top 15] [module ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+DEFAULT_MODULES = ["sam.core.builder", "sam.cli", "sam.api.app"]
+
+# Heavy SDKs that only enabled integrations should pull in
+INTEGRATION_MODULES = (
+    "web3",
+    "hyperliquid",
+    "x402",
+    "sam.integrations.solana.solana_tools",
+    "sam.integrations.evm",
+    "sam.integrations.hyperliquid",
+    "sam.integrations.kalshi",
+    "sam.integrations.polymarket",
+    "sam.integrations.aixbt",
+    "sam.integrations.coinbase_x402",
+)
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """``{module: (self_us, cumulative_us)}`` for one cold import of ``module``."""
+    env = {**os.environ, "SAM_TEST_MODE": "1", "PYTHONPATH": ROOT}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def best_of(module: str, runs: int) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    best_ms = float("inf")
+    best: Dict[str, Tuple[int, int]] = {}
+    for _ in range(runs):
+        times = import_times(module)
+        total_ms = times[module][1] / 1000
+        if total_ms < best_ms:
+            best_ms, best = total_ms, times
+    return best_ms, best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        total_ms, times = best_of(module, args.runs)
+        print(f"{module}: {total_ms:.0f} ms ({len(times)} modules, best of {args.runs})")
+        slowest: List[Tuple[str, int]] = sorted(
+            ((name, self_us) for name, (self_us, _) in times.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, self_us in slowest[: args.top]:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+        leaked = [name for name in INTEGRATION_MODULES if name in times]
+        if leaked:
+            print(f"    integrations imported eagerly: {', '.join(leaked)}")
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,38 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from sam.api.routes import metrics
+from sam.config.settings import Settings
+from sam.utils import monitoring
+from sam.utils.monitoring import MetricsCollector
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_metrics_endpoint_serves_prometheus_text(monkeypatch):
+    monkeypatch.setattr(Settings, "SAM_API_METRICS_TOKEN", None)
+    collector = MetricsCollector()
+    collector.record_operation("tool", "get_balance", 0.05, True)
+    monkeypatch.setattr(monitoring, "_global_metrics_collector", collector)
+
+    response = _client().get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'sam_operation_duration_seconds{component="tool",operation="get_balance",quantile="0.5"}'
+        in response.text
+    )
+
+
+def test_metrics_endpoint_requires_configured_token(monkeypatch):
+    monkeypatch.setattr(Settings, "SAM_API_METRICS_TOKEN", "scrape-me")
+    client = _client()
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+    ok = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert ok.status_code == 200
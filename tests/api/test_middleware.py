@@ -0,0 +1,80 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from sam.api.middleware import (
+    CSRF_COOKIE_NAME,
+    CSRFMiddleware,
+    RequestIDMiddleware,
+    get_request_id,
+)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CSRFMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+
+    @app.get("/ids")
+    async def ids(request: Request):
+        return {"context": get_request_id(), "state": request.state.request_id}
+
+    @app.post("/items")
+    async def create():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {get_request_id()}-{i}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def test_request_id_reaches_handler_context_and_response():
+    client = TestClient(_app())
+
+    response = client.get("/ids", headers={"X-Request-ID": "abc"})
+    assert response.json() == {"context": "abc", "state": "abc"}
+    assert response.headers["X-Request-ID"] == "abc"
+
+    generated = client.get("/ids")
+    assert generated.json()["context"] == generated.headers["X-Request-ID"]
+    assert get_request_id() is None
+
+
+def test_csrf_cookie_issued_on_get_and_required_for_post():
+    client = TestClient(_app())
+
+    first = client.get("/ids")
+    token = first.cookies.get(CSRF_COOKIE_NAME)
+    assert token
+    assert "samesite=lax" in first.headers["set-cookie"].lower()
+    # The cookie is Secure, so send it back explicitly over the http test client
+    cookie = {"Cookie": f"{CSRF_COOKIE_NAME}={token}"}
+    # An existing cookie is not replaced
+    assert "set-cookie" not in client.get("/ids", headers=cookie).headers
+
+    missing = client.post("/items", headers=cookie)
+    assert missing.status_code == 403
+    assert missing.json() == {"detail": "CSRF token missing"}
+    assert missing.headers["X-Request-ID"]
+
+    invalid = client.post("/items", headers={**cookie, "X-CSRF-Token": "wrong"})
+    assert invalid.json() == {"detail": "CSRF token invalid"}
+
+    ok = client.post("/items", headers={**cookie, "X-CSRF-Token": token})
+    assert ok.status_code == 200
+
+
+def test_streaming_responses_pass_through_with_headers():
+    client = TestClient(_app())
+
+    with client.stream("GET", "/stream", headers={"X-Request-ID": "sse"}) as response:
+        assert response.headers["X-Request-ID"] == "sse"
+        assert response.headers.get("set-cookie", "").startswith(CSRF_COOKIE_NAME)
+        body = "".join(response.iter_text())
+    assert body == "data: sse-0\n\ndata: sse-1\n\ndata: sse-2\n\n"
@@ -0,0 +1,90 @@
+import pytest
+
+from sam.api import auth
+from sam.api.auth import (
+    UserStore,
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    revoke_all_user_refresh_tokens,
+    revoke_refresh_token,
+)
+from sam.api.user_cache import UserCache, get_user_cache, reset_user_cache
+from sam.config.settings import Settings
+from sam.utils.connection_pool import cleanup_database_pool
+
+WALLET = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+
+
+@pytest.fixture
+async def store(tmp_path, monkeypatch):
+    # The real _secret_key() reloads Settings, which would drop the patches below
+    monkeypatch.setattr(auth, "_secret_key", lambda: "test-secret")
+    monkeypatch.setattr(Settings, "SAM_DB_PATH", str(tmp_path / "auth.db"))
+    monkeypatch.setattr(Settings, "SAM_API_USER_CACHE_TTL", 60)
+    monkeypatch.setattr(Settings, "SAM_REDIS_URL", None)
+    monkeypatch.setattr(auth, "_USER_STORE", None)
+    reset_user_cache()
+    user_store = await auth.get_user_store()
+    await user_store.create_wallet_user(WALLET)
+    yield user_store
+    reset_user_cache()
+    await cleanup_database_pool()
+
+
+class CountingLookups:
+    def __init__(self, monkeypatch, store: UserStore):
+        self.calls = 0
+        original = store.get_user_by_wallet
+
+        async def counting(wallet_address):
+            self.calls += 1
+            return await original(wallet_address)
+
+        monkeypatch.setattr(store, "get_user_by_wallet", counting)
+
+
+@pytest.mark.asyncio
+async def test_bearer_tokens_resolve_from_cache_until_revoked(store, monkeypatch):
+    lookups = CountingLookups(monkeypatch, store)
+    user = await store.get_user_by_wallet(WALLET)
+    token, _ = create_access_token(wallet_address=WALLET, user_id=user.user_id)
+    refresh, _ = await create_refresh_token(wallet_address=WALLET, user_id=user.user_id)
+    lookups.calls = 0
+
+    for _ in range(3):
+        assert (await decode_access_token(token)).user_id == user.user_id
+    assert lookups.calls == 1
+
+    assert await revoke_refresh_token(refresh) is True
+    assert await revoke_refresh_token("unknown") is False
+    await decode_access_token(token)
+    assert lookups.calls == 2
+
+    await revoke_all_user_refresh_tokens(user.user_id)
+    await decode_access_token(token)
+    assert lookups.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_admin_change_is_visible_on_next_request(store):
+    user = await store.get_user_by_wallet(WALLET)
+    token, _ = create_access_token(wallet_address=WALLET, user_id=user.user_id)
+    assert (await decode_access_token(token)).is_admin is False
+
+    assert await store.set_admin(user.user_id, True) is True
+    assert (await decode_access_token(token)).is_admin is True
+    assert get_user_cache().get_stats()["invalidations"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_and_expires(store):
+    user = await store.get_user_by_wallet(WALLET)
+    cache = UserCache(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        await cache.put(key, user)
+    assert await cache.get("a") is None
+    assert await cache.get("c") is user
+
+    cache.ttl = 0
+    assert await cache.get("c") is None
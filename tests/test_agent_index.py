@@ -0,0 +1,65 @@
+import os
+
+from sam.agents.definition import AgentDefinition
+from sam.agents.manager import AgentDefinitionIndex, find_agent_definition
+from sam.api import storage
+from sam.config.settings import Settings
+
+
+def _write(path, name, description="v1"):
+    path.write_text(
+        f'name = "{name}"\ndescription = "{description}"\nsystem_prompt = "hi"\n', encoding="utf-8"
+    )
+
+
+def test_index_reparses_only_changed_files(tmp_path):
+    _write(tmp_path / "alpha.agent.toml", "alpha")
+    _write(tmp_path / "beta.toml", "beta")
+    (tmp_path / "broken.agent.toml").write_text("not = [valid", encoding="utf-8")
+    index = AgentDefinitionIndex(tmp_path)
+
+    assert [d.name for d in index.definitions()] == ["alpha", "beta"]
+    assert index.get_stats()["parses"] == 3
+    first_hash = index.content_hash("alpha")
+
+    for _ in range(3):
+        assert index.get("alpha").description == "v1"
+        assert index.count() == 2
+    assert index.get_stats()["parses"] == 3
+
+    # Returned definitions are copies
+    index.get("alpha").description = "mutated"
+    assert index.get("alpha").description == "v1"
+
+    _write(tmp_path / "alpha.agent.toml", "alpha", "second version")
+    assert index.get("alpha").description == "second version"
+    assert index.get_stats()["parses"] == 4
+    assert index.content_hash("alpha") not in (None, first_hash)
+
+    os.remove(tmp_path / "beta.toml")
+    assert index.get("beta") is None
+    assert index.get("broken") is None
+    assert (
+        find_agent_definition("alpha", directory=tmp_path).path
+        == (tmp_path / "alpha.agent.toml").resolve()
+    )
+
+
+async def test_file_storage_sees_its_own_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "SAM_AGENT_STORAGE", "file")
+    monkeypatch.setattr(Settings, "SAM_API_AGENT_ROOT", str(tmp_path))
+    definition = AgentDefinition(name="trader", description="v1", system_prompt="hi")
+
+    await storage.save_user_definition_async("u1", definition)
+    assert (await storage.load_user_definition_async("u1", "trader")).description == "v1"
+
+    # Same size, possibly the same mtime tick: still visible after the save
+    await storage.save_user_definition_async(
+        "u1", AgentDefinition(name="trader", description="v2", system_prompt="hi")
+    )
+    assert (await storage.load_user_definition_async("u1", "trader")).description == "v2"
+    assert await storage.count_user_agents_async("u1") == 1
+    assert await storage.load_user_definition_async("u2", "trader") is None
+
+    assert await storage.delete_user_definition_async("u1", "trader") is True
+    assert await storage.list_user_definitions_async("u1") == []
@@ -0,0 +1,72 @@
+import os
+from importlib import metadata
+
+import pytest
+
+from sam.config import config_loader
+from sam.config.config_loader import (
+    get_config_snapshot,
+    get_config_stats,
+    load_config,
+    load_middleware_config,
+    plugin_entry_points,
+    reload_config_snapshot,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "sam.toml"
+    path.write_text('[memory]\nbackend = "sqlite"\n\n[middleware]\nlogging = true\n')
+    monkeypatch.setenv("SAM_CONFIG", str(path))
+    yield path
+    # Entry points may still be patched here; let the next caller rebuild
+    config_loader._snapshot = None
+
+
+def test_snapshot_is_reused_until_the_file_changes(config_file):
+    first = reload_config_snapshot()
+    assert first.source == str(config_file)
+    assert get_config_snapshot() is first
+    assert set(first.timings) == {"config_ms", "entry_points_ms"}
+
+    # Callers get private copies; the snapshot itself is read-only
+    cfg = load_config()
+    cfg["memory"]["backend"] = "redis"
+    assert load_config()["memory"]["backend"] == "sqlite"
+    with pytest.raises(TypeError):
+        first.config["memory"]["backend"] = "redis"  # type: ignore[index]
+
+    config_file.write_text('[memory]\nbackend = "redis"\n')
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = get_config_snapshot()
+    assert second is not first
+    assert load_config()["memory"]["backend"] == "redis"
+    assert load_middleware_config() is None
+    # A config edit doesn't rescan installed distributions
+    assert second.entry_points is not None
+    assert dict(second.entry_points) == dict(first.entry_points)
+
+
+def test_entry_points_are_discovered_once_until_reload(config_file, monkeypatch):
+    calls = []
+    ep = metadata.EntryPoint(name="custom", value="pkg.mod:create", group="sam.plugins")
+
+    def fake_entry_points():
+        calls.append(1)
+        return metadata.EntryPoints([ep])
+
+    monkeypatch.setattr(config_loader.metadata, "entry_points", fake_entry_points)
+    reload_config_snapshot()
+    for _ in range(3):
+        assert [e.name for e in plugin_entry_points("sam.plugins")] == ["custom"]
+        assert plugin_entry_points("sam.memory_backends") == ()
+    assert calls == [1]
+
+    reload_config_snapshot()
+    assert calls == [1, 1]
+    stats = get_config_stats()
+    assert stats["entry_points"]["sam.plugins"] == 1
+    assert stats["source"] == str(config_file)
@@ -0,0 +1,83 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from sam.utils.executors import (
+    BoundedExecutor,
+    ExecutorConfig,
+    ExecutorSaturatedError,
+    get_executor,
+)
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_on_named_threads_and_keeps_context():
+    var = contextvars.ContextVar("request_id", default=None)
+    var.set("abc")
+    executor = BoundedExecutor("unit", ExecutorConfig(max_workers=2))
+
+    def work(x, *, y):
+        return threading.current_thread().name, var.get(), x + y
+
+    name, value, total = await executor.run(work, 1, y=2)
+
+    assert name.startswith("sam-unit")
+    assert value == "abc"
+    assert total == 3
+    stats = executor.get_stats()
+    assert stats["completed"] == 1
+    assert stats["wait_time"]["p50_ms"] is not None
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_is_full_and_cancels_queued_calls_on_timeout():
+    release = threading.Event()
+    executor = BoundedExecutor("tiny", ExecutorConfig(max_workers=1, max_queue=2))
+
+    blocker = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    assert executor.get_stats()["running"] == 1
+
+    ran = []
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run(ran.append, 1, _timeout=0.05)
+    # The timed-out call never started, so it was cancelled and left the queue
+    assert executor.get_stats()["queued"] == 0
+
+    queued = [asyncio.create_task(executor.run(ran.append, i)) for i in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(ExecutorSaturatedError):
+        await executor.run(ran.append, 99)
+
+    release.set()
+    await blocker
+    await asyncio.gather(*queued)
+
+    assert sorted(ran) == [0, 1]
+    stats = executor.get_stats()
+    assert stats["timeouts"] == 1
+    assert stats["rejected"] == 1
+    assert stats["max_queue_depth"] == 2
+    executor.shutdown()
+
+
+def test_get_executor_applies_defaults_and_env_overrides(monkeypatch):
+    monkeypatch.setenv("SAM_EXECUTOR_ENV_TEST_MAX_WORKERS", "7")
+    executor = get_executor("env-test")
+    assert executor.config.max_workers == 7
+    assert get_executor("env-test") is executor
+    assert get_executor("sqlite").config.max_workers == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_passes_timeout_keyword_through_to_the_callable():
+    executor = BoundedExecutor("kwargs-test", ExecutorConfig(max_workers=1))
+
+    def sdk_call(coin, timeout=None):
+        return coin, timeout
+
+    assert await executor.run(sdk_call, "SOL", timeout=5, _timeout=1.0) == ("SOL", 5)
+    executor.shutdown()
@@ -0,0 +1,123 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sam.utils.host_limits import (
+    CRITICAL_HOST_POLICY,
+    AdaptiveLimiter,
+    HostCircuitOpenError,
+    HostLimiter,
+    HostPolicy,
+    host_of,
+    parse_latency_targets,
+)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_aimd_and_waiters():
+    limiter = AdaptiveLimiter(HostPolicy(initial_concurrency=2, max_concurrency=4))
+
+    await limiter.acquire()
+    await limiter.acquire()
+    third = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not third.done() and limiter.waiting == 1
+
+    limiter.release()
+    await third
+    assert limiter.in_flight == 2
+
+    for _ in range(10):
+        limiter.record(0.01, throttled=False)
+    assert 3 < limiter.limit <= 4
+
+    limiter.record(0.01, throttled=True)
+    assert limiter.limit < 2.5
+    # Only one decrease per latency target window
+    limiter.record(0.01, throttled=True)
+    assert limiter.limit > 1.2
+
+
+def test_reset_reclaims_only_slots_stranded_on_closed_loops():
+    limiter = AdaptiveLimiter(HostPolicy(initial_concurrency=1, max_concurrency=1))
+    old_loop = asyncio.new_event_loop()
+    old_loop.run_until_complete(limiter.acquire())
+    old_loop.close()
+
+    async def main():
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        # The closed loop's slot is reclaimed and handed to the pending waiter
+        limiter.reset()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert limiter.in_flight == 1
+
+        # A request still running on a live loop keeps its slot
+        limiter.reset()
+        assert limiter.in_flight == 1
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_latency_targets_are_configurable_per_host():
+    assert parse_latency_targets("api.slow.test=5, https://Other.test:8443/x=1.5,bad,x=y") == {
+        "api.slow.test": 5.0,
+        "other.test:8443": 1.5,
+    }
+    limiter = HostLimiter()
+    limiter.set_latency_target("https://api.slow.test/v1", 5.0)
+    assert limiter.state_for("api.slow.test").policy.latency_target == 5.0
+    assert limiter.state_for("api.slow.test").policy.max_concurrency == 16
+    assert limiter.state_for("fast.test").policy.latency_target == 2.0
+
+
+@pytest.mark.asyncio
+async def test_failing_host_opens_circuit_while_critical_host_keeps_flowing():
+    async def broken(_request):
+        return web.Response(status=500)
+
+    async def ok(_request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/broken", broken)
+    app.router.add_get("/ok", ok)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+
+    limiter = HostLimiter()
+    market = f"http://127.0.0.1:{server.port}"
+    llm = f"http://localhost:{server.port}"
+    limiter.set_policy(llm, CRITICAL_HOST_POLICY)
+
+    try:
+        async with aiohttp.ClientSession(trace_configs=[limiter.trace_config()]) as session:
+            for _ in range(5):
+                async with session.get(f"{market}/broken") as resp:
+                    assert resp.status == 500
+
+            with pytest.raises(aiohttp.ClientError) as excinfo:
+                await session.get(f"{market}/ok")
+            assert isinstance(excinfo.value, HostCircuitOpenError)
+
+            for _ in range(10):
+                async with session.get(f"{llm}/ok") as resp:
+                    assert resp.status == 200
+    finally:
+        await server.close()
+
+    stats = limiter.get_stats()
+    assert stats["open_circuits"] == [host_of(market)]
+    by_host = {h["host"]: h for h in stats["hosts"]}
+    assert by_host[host_of(market)]["rejected"] == 1
+    assert by_host[host_of(market)]["in_flight"] == 0
+    assert by_host[host_of(llm)]["requests"] == 10
+    assert by_host[host_of(llm)]["circuit"] is None
+    assert by_host[host_of(llm)]["p99_latency_ms"] is not None
@@ -176,8 +176,10 @@ class TestSharedHTTPClient:
                     # Check connector configuration
                     mock_connector_class.assert_called_once()
                     connector_call = mock_connector_class.call_args
-                    assert connector_call[1]["limit"] == 100
-                    assert connector_call[1]["limit_per_host"] == 20
+                    # Budgets are enforced per host; the connector only sets an upper bound
+                    assert connector_call[1]["limit"] == 0
+                    assert connector_call[1]["limit_per_host"] == 32
+                    assert mock_session_class.call_args[1]["trace_configs"]
 
                     # Check timeout configuration
                     mock_timeout_class.assert_called_once()
@@ -255,5 +257,135 @@ class TestGlobalHTTPClient:
                 assert response == mock_response
 
 
+class _FakeResponse:
+    def __init__(self, status, body, headers):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def json(self, content_type=None):
+        return self._body
+
+    async def text(self):
+        return "" if self._body is None else str(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Records requests and answers each with the next scripted response."""
+
+    def __init__(self, responses, delay=0.0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        session = self
+
+        class _Pending:
+            async def __aenter__(self):
+                import asyncio
+
+                await asyncio.sleep(session.delay)
+                status, body, headers = session.responses.pop(0)
+                return _FakeResponse(status, body, headers)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Pending()
+
+
+class TestRequestCoalescer:
+    """Single-flight de-duplication and the short response cache."""
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_requests_share_one_call(self):
+        import asyncio
+        from sam.utils.http_client import RequestCoalescer
+
+        coalescer = RequestCoalescer()
+        session = _FakeSession([(200, {"price": 1}, {})], delay=0.05)
+
+        results = await asyncio.gather(
+            *(
+                coalescer.fetch(
+                    session,
+                    "GET",
+                    "https://api.example.com/price",
+                    params={"ids": "SOL"},
+                    headers={"Accept": "application/json", "X-Request-Id": str(i)},
+                )
+                for i in range(10)
+            )
+        )
+
+        assert len(session.calls) == 1
+        assert all(r.data == {"price": 1} for r in results)
+        assert sum(r.shared for r in results) == 9
+        stats = coalescer.get_stats()
+        assert stats["upstream"] == 1
+        assert stats["coalesced"] == 9
+        assert stats["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_honours_max_age_no_store_and_etag(self):
+        from sam.utils.http_client import RequestCoalescer
+
+        coalescer = RequestCoalescer()
+        url = "https://api.example.com/markets"
+        session = _FakeSession(
+            [
+                (200, [1], {"Cache-Control": "max-age=0", "ETag": '"v1"'}),
+                (304, None, {}),
+                (200, [2], {"Cache-Control": "no-store"}),
+                (200, [3], {}),
+            ]
+        )
+
+        first = await coalescer.fetch(session, "GET", url, cache_ttl=30)
+        assert first.data == [1] and not first.from_cache
+
+        # max-age=0 forces revalidation; the 304 reuses the cached body
+        second = await coalescer.fetch(session, "GET", url, cache_ttl=30)
+        assert second.data == [1] and second.from_cache
+        assert session.calls[1][1]["headers"]["If-None-Match"] == '"v1"'
+        assert coalescer.get_stats()["revalidated"] == 1
+
+        # A different query is a different key; no-store responses are never kept
+        other = await coalescer.fetch(session, "GET", url, params={"p": 1}, cache_ttl=30)
+        assert other.data == [2]
+        again = await coalescer.fetch(session, "GET", url, params={"p": 1}, cache_ttl=30)
+        assert again.data == [3] and not again.from_cache
+        assert len(session.calls) == 4
+
+
+    @pytest.mark.asyncio
+    async def test_cache_survives_session_close(self, monkeypatch):
+        from sam.utils.http_client import SharedHTTPClient, clear_http_cache
+
+        url = "https://api.example.com/cached"
+        session = _FakeSession([(200, {"v": 1}, {}), (200, {"v": 2}, {})])
+        client = SharedHTTPClient()
+        monkeypatch.setattr(SharedHTTPClient, "_instance", client)
+
+        first = await client.fetch_json(url, cache_ttl=30, session=session)
+        # Per-request cleanup closes the session but must keep cached responses
+        await client.close()
+        again = await client.fetch_json(url, cache_ttl=30, session=session)
+        assert again.data == first.data and again.from_cache
+        assert len(session.calls) == 1
+
+        clear_http_cache()
+        fresh = await client.fetch_json(url, cache_ttl=30, session=session)
+        assert fresh.data == {"v": 2}
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,3 +1,6 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 
 from sam.integrations.hyperliquid import HyperliquidClient, create_hyperliquid_tools
@@ -370,3 +373,104 @@ async def test_market_order_computes_size_from_margin_and_leverage():
     exchange_call = exchange.calls[1]
     assert exchange_call[0] == "market_open"
     assert exchange_call[1]["sz"] == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_mid_price_and_sz_decimals_are_served_from_local_cache():
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    info = StubInfo()
+    client = HyperliquidClient(
+        base_url="https://api.hyperliquid.xyz",
+        account_address="0xABCDEF",
+        info=info,
+        to_thread=fake_to_thread,
+    )
+
+    for _ in range(3):
+        assert await client.get_mid_price("sol") == 200.0
+        assert await client.get_sz_decimals("SOL") == 1
+
+    assert [call[0] for call in info.calls].count("all_mids") == 1
+    assert [call[0] for call in info.calls].count("meta") == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_mids_update_local_table():
+    from sam.integrations.hyperliquid_market_data import MidPriceFeed, ws_url_for
+
+    snapshots = []
+
+    async def snapshot():
+        snapshots.append(True)
+        return {"SOL": "150.0"}
+
+    feed = MidPriceFeed(ws_url_for("https://api.hyperliquid.xyz"), snapshot, stream=False)
+    assert feed.ws_url == "wss://api.hyperliquid.xyz/ws"
+
+    feed._handle_message('{"channel": "allMids", "data": {"mids": {"SOL": "201.5", "BTC": "1"}}}')
+    feed._handle_message('{"channel": "pong"}')
+
+    assert await feed.get_mid("SOL") == 201.5
+    assert feed.connected
+    assert snapshots == []
+    assert feed.get_stats()["stream_updates"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_feed_is_shared_and_stops_when_idle():
+    import aiohttp
+
+    from sam.integrations import hyperliquid_market_data as market_data
+
+    class FakeWebSocket:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def send_str(self, data):
+            pass
+
+        async def receive(self, timeout=None):
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(
+                type=aiohttp.WSMsgType.TEXT,
+                data='{"channel": "allMids", "data": {"mids": {"SOL": "201.5"}}}',
+            )
+
+    async def session_factory():
+        return SimpleNamespace(ws_connect=lambda url, heartbeat=None: FakeWebSocket())
+
+    async def fake_to_thread(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    base_url = "https://shared-feed.hyperliquid.test"
+    clients = [
+        HyperliquidClient(
+            base_url=base_url, info=StubInfo(), to_thread=fake_to_thread, stream_mids=True
+        )
+        for _ in range(2)
+    ]
+    feed = clients[0]._mid_feed
+    assert clients[1]._mid_feed is feed
+    feed._session_factory = session_factory
+    feed.idle_timeout = 0.1
+
+    await clients[0].get_mid_price("SOL")
+    task = feed._task
+    await asyncio.sleep(0.05)
+    assert feed.connected
+
+    # Closing a client leaves the shared stream to the other readers
+    await clients[0].close()
+    assert not task.done()
+
+    await asyncio.wait_for(task, timeout=2)
+    assert not feed.connected
+
+    await market_data.stop_mid_price_feeds()
+    assert market_data.get_mid_price_feed(feed.ws_url, clients[1].all_mids) is not feed
+    await market_data.stop_mid_price_feeds()
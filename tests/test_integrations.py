@@ -8,7 +8,13 @@ from sam.integrations.pump_fun import PumpFunTools
 from sam.integrations.jupiter import JupiterTools
 from sam.integrations.dexscreener import DexScreenerTools
 from sam.integrations.search import SearchTools
-from sam.integrations.uranus import LAMPORTS_PER_SOL, UranusTools
+from sam.integrations.uranus import (
+    LAMPORTS_PER_SOL,
+    LEGACY_POSITION_ACCOUNT_SIZE,
+    POSITION_ACCOUNT_SIZE,
+    UranusTools,
+    decode_positions,
+)
 
 
 class TestPumpFunTools:
@@ -201,6 +207,34 @@ class TestJupiterTools:
             )
             assert isinstance(result, dict)
 
+    @pytest.mark.asyncio
+    async def test_get_quote_is_cached_briefly(self, jupiter_tools):
+        """Repeated quotes within the TTL reuse the first response."""
+        mock_quote_data = {"outAmount": "200000000", "priceImpactPct": "0.1", "routePlan": []}
+
+        with patch("sam.integrations.jupiter.get_session") as mock_get_session:
+            mock_session = MagicMock()
+            mock_response = MagicMock()
+            mock_response.status = 200
+            mock_response.json = AsyncMock(return_value=mock_quote_data)
+            mock_cm = MagicMock()
+            mock_cm.__aenter__ = AsyncMock(return_value=mock_response)
+            mock_cm.__aexit__ = AsyncMock(return_value=False)
+            mock_session.get.return_value = mock_cm
+            mock_get_session.return_value = mock_session
+
+            sol = "So11111111111111111111111111111111111111112"
+            usdc = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+            first = await jupiter_tools.get_quote(sol, usdc, 1000000000, 50)
+            second = await jupiter_tools.get_quote(sol, usdc, 1000000000, 50)
+            assert mock_session.get.call_count == 1
+            assert second["output_amount"] == first["output_amount"] == 200000000
+            assert second["cached"] is True
+
+            jupiter_tools.quote_ttl = 0
+            await jupiter_tools.get_quote(sol, usdc, 1000000000, 50)
+            assert mock_session.get.call_count == 2
+
 
 class TestDexScreenerTools:
     """Test DexScreener integration functionality."""
@@ -414,6 +448,79 @@ class TestUranusTools:
         assert position["market_mint"] == str(market_mint)
         assert position["direction"] == "LONG"
 
+    @pytest.mark.asyncio
+    async def test_get_open_positions_pushes_filters_to_rpc(self):
+        """Owner, mint and closed-flag filters are sent with the program account scan."""
+        owner = Pubkey.new_unique()
+        market_mint = Pubkey.new_unique()
+        mock_client = AsyncMock()
+        mock_client.get_program_accounts = AsyncMock(return_value=SimpleNamespace(value=[]))
+
+        tools = UranusTools(self._StubSolanaTools(mock_client))
+        await tools.get_open_positions(owner=str(owner), market_mint=str(market_mint))
+
+        calls = mock_client.get_program_accounts.call_args_list
+        assert sorted(call.kwargs["filters"][0] for call in calls) == [
+            LEGACY_POSITION_ACCOUNT_SIZE,
+            POSITION_ACCOUNT_SIZE,
+        ]
+        for call in calls:
+            memcmps = {(f.offset, f.bytes) for f in call.kwargs["filters"][1:]}
+            assert memcmps == {(0, str(owner)), (32, str(market_mint)), (129, "1")}
+
+    @pytest.mark.asyncio
+    async def test_get_open_positions_includes_legacy_accounts(self):
+        """Legacy 146-byte positions (no direction byte) are scanned and listed."""
+        owner = Pubkey.new_unique()
+        market_mint = Pubkey.new_unique()
+
+        def keyed(raw):
+            return SimpleNamespace(
+                pubkey=Pubkey.new_unique(),
+                account=SimpleNamespace(
+                    data=[base64.b64encode(raw).decode("utf-8"), "base64"], lamports=1
+                ),
+            )
+
+        current = keyed(self._build_position_bytes(owner, market_mint, direction=0))
+        legacy = keyed(self._build_position_bytes(owner, market_mint, nonce=2)[:-1])
+
+        async def scan(*_args, filters, **_kwargs):
+            by_size = {POSITION_ACCOUNT_SIZE: [current], LEGACY_POSITION_ACCOUNT_SIZE: [legacy]}
+            return SimpleNamespace(value=by_size[filters[0]])
+
+        mock_client = AsyncMock()
+        mock_client.get_program_accounts = AsyncMock(side_effect=scan)
+
+        tools = UranusTools(self._StubSolanaTools(mock_client))
+        result = await tools.get_open_positions(owner=str(owner))
+
+        assert result["count"] == 2
+        assert sorted(p["direction"] for p in result["positions"]) == ["LONG", "SHORT"]
+
+    def test_decode_positions_matches_layout(self):
+        """Batch decoding handles many accounts, including legacy ones without direction."""
+        owner = Pubkey.new_unique()
+        market_mint = Pubkey.new_unique()
+        accounts = [
+            (
+                Pubkey.new_unique(),
+                i,
+                self._build_position_bytes(owner, market_mint, nonce=i, direction=i % 2),
+            )
+            for i in range(5)
+        ]
+        positions = decode_positions(accounts)
+        assert [p.position_nonce for p in positions] == list(range(5))
+        assert [p.direction for p in positions] == ["SHORT", "LONG"] * 2 + ["SHORT"]
+        assert positions[0].entry_price == pytest.approx(1.2)
+        assert positions[0].market_symbol == "URA"
+
+        legacy = self._build_position_bytes(owner, market_mint)[:-1]
+        mixed = decode_positions([accounts[0], (Pubkey.new_unique(), 0, legacy)])
+        assert mixed[1].direction == "LONG"
+        assert mixed[1].owner == str(owner)
+
     @pytest.mark.asyncio
     async def test_get_market_liquidity_handles_missing_account(self):
         """Liquidity checks should handle missing accounts gracefully."""
@@ -0,0 +1,78 @@
+import asyncio
+import random
+import threading
+
+import pytest
+
+from sam.utils import monitoring
+from sam.utils.monitoring import LatencyHistogram, MetricsCollector, record_operation_metric
+from sam.utils.prometheus import render_metrics
+
+
+def test_histogram_quantiles_stay_within_bucket_error():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-3, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+
+    ordered = sorted(samples)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=0.05)
+    assert histogram.count == len(samples)
+    assert histogram.quantile(1.0) <= max(samples)
+
+    other = LatencyHistogram()
+    other.record(120.0)
+    histogram.merge(other)
+    assert histogram.max == 120.0
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_system_metrics_are_sampled_off_the_event_loop(monkeypatch):
+    collector = MetricsCollector(collection_interval=0)
+    threads = []
+    sample = collector._sample_system_metrics
+
+    def recording_sample():
+        threads.append(threading.get_ident())
+        return sample()
+
+    monkeypatch.setattr(collector, "_sample_system_metrics", recording_sample)
+    collector.start_collection()
+    for _ in range(100):
+        if collector.system_metrics:
+            break
+        await asyncio.sleep(0.02)
+    await collector.shutdown()
+
+    assert collector.system_metrics
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_percentiles_reported_per_component_and_exported(monkeypatch):
+    collector = MetricsCollector()
+    monkeypatch.setattr(monitoring, "_global_metrics_collector", collector)
+    for i in range(100):
+        record_operation_metric("llm", "chat_completion", 0.01 * (i + 1), True)
+    record_operation_metric("tool", 'get "price"', 0.2, False, "tool_error")
+
+    stats = collector.get_performance_stats("llm")["performance"]
+    assert stats["p50_duration"] == pytest.approx(0.5, rel=0.05)
+    assert stats["p99_duration"] == pytest.approx(0.99, rel=0.05)
+    # 10s LLM calls are normal; the same duration elsewhere is slow
+    record_operation_metric("llm", "chat_completion", 10.0, True)
+    record_operation_metric("tool", "swap", 10.0, True)
+    assert [m["component"] for m in collector.get_slow_operations()] == ["tool"]
+
+    text = await render_metrics()
+    assert "# TYPE sam_operation_duration_seconds summary" in text
+    assert (
+        'sam_operation_duration_seconds_count{component="llm",operation="chat_completion"} 101.0'
+        in text
+    )
+    assert 'operation="get \\"price\\"",quantile="0.99"' in text
+    assert 'sam_operation_errors_total{component="tool",error_type="tool_error"} 1.0' in text
@@ -0,0 +1,117 @@
+import math
+import random
+
+import pytest
+
+from sam.integrations.opportunity_ranking import ColumnarSnapshot, ScoringWeights, rank_top_k
+
+WEIGHTS = ScoringWeights(volume=0.6, liquidity=0.4, spread_ceiling=0.04)
+
+
+def _reference_rank(rows, *, limit, min_volume, min_liquidity, max_price, weights):
+    scored = []
+    for index, (price, volume, liquidity, bid, ask) in enumerate(rows):
+        if price is None or price <= 0 or price > max_price:
+            continue
+        volume = volume or 0.0
+        liquidity = liquidity or 0.0
+        if volume < min_volume or liquidity < min_liquidity:
+            continue
+        roi = (1.0 - price) / price
+        if roi <= 0:
+            continue
+        spread_bonus = 0.0
+        if bid is not None and ask is not None:
+            spread_bonus = max(0.0, weights.spread_ceiling - max(0.0, ask - bid))
+        score = (
+            roi
+            * (
+                1.0
+                + weights.volume * math.log1p(volume)
+                + weights.liquidity * math.log1p(liquidity)
+            )
+            + spread_bonus
+        )
+        scored.append((score, index))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored[:limit]
+
+
+def _snapshot(rows):
+    return ColumnarSnapshot.from_columns(
+        price=[row[0] for row in rows],
+        volume=[row[1] for row in rows],
+        liquidity=[row[2] for row in rows],
+        bid=[row[3] for row in rows],
+        ask=[row[4] for row in rows],
+    )
+
+
+def test_rank_top_k_matches_reference_ordering():
+    rng = random.Random(7)
+    rows = []
+    for _ in range(500):
+        price = rng.choice([None, 0.0, 1.0, round(rng.uniform(0.01, 0.99), 2)])
+        bid = round(rng.uniform(0.0, 1.0), 2) if rng.random() > 0.3 else None
+        ask = round(rng.uniform(0.0, 1.0), 2) if rng.random() > 0.3 else None
+        rows.append(
+            (
+                price,
+                rng.choice([None, rng.uniform(0, 50_000)]),
+                rng.choice([None, rng.uniform(0, 10_000)]),
+                bid,
+                ask,
+            )
+        )
+
+    expected = _reference_rank(
+        rows, limit=25, min_volume=100, min_liquidity=50, max_price=0.8, weights=WEIGHTS
+    )
+    ranked = rank_top_k(
+        _snapshot(rows),
+        limit=25,
+        min_volume=100,
+        min_liquidity=50,
+        max_price=0.8,
+        weights=WEIGHTS,
+    )
+
+    assert [item.index for item in ranked] == [index for _, index in expected]
+    for item, (score, _) in zip(ranked, expected):
+        assert item.score == pytest.approx(score)
+
+
+def test_rank_top_k_keeps_row_order_for_ties():
+    rows = [(0.5, 1000.0, 1000.0, None, None)] * 6
+    ranked = rank_top_k(
+        _snapshot(rows), limit=3, min_volume=0, min_liquidity=0, max_price=1.0, weights=WEIGHTS
+    )
+    assert [item.index for item in ranked] == [0, 1, 2]
+
+
+def test_rank_top_k_handles_empty_and_filtered_universe():
+    empty = _snapshot([])
+    assert (
+        rank_top_k(empty, limit=5, min_volume=0, min_liquidity=0, max_price=1.0, weights=WEIGHTS)
+        == []
+    )
+
+    rows = [(0.9, 10.0, 10.0, None, None)]
+    assert (
+        rank_top_k(
+            _snapshot(rows),
+            limit=5,
+            min_volume=0,
+            min_liquidity=0,
+            max_price=0.5,
+            weights=WEIGHTS,
+        )
+        == []
+    )
+
+
+def test_snapshot_rejects_mismatched_columns():
+    with pytest.raises(ValueError):
+        ColumnarSnapshot.from_columns(
+            price=[0.1], volume=[], liquidity=[1.0], bid=[None], ask=[None]
+        )
@@ -8,7 +8,8 @@ import pytest
 from sam.core.plugins import load_plugins
 from sam.core.tools import ToolRegistry
 from sam.commands.plugins import trust_plugin
-from sam.config.plugin_policy import load_allowlist_document
+from sam.config import plugin_policy
+from sam.config.plugin_policy import PluginPolicy, load_allowlist_document
 
 
 PLUGIN_SOURCE = """
@@ -20,9 +21,38 @@ def register(registry, agent=None):
 """
 
 
-def _write_plugin(tmp_path, name="test_plugin"):
+LAZY_PLUGIN_SOURCE = """
+from pydantic import BaseModel
+
+from sam.core.tools import Tool, ToolSpec
+
+SAM_PLUGIN_MANIFEST = [
+    {"name": "shout", "description": "Upper-case text", "input_schema": {"parameters": {}}},
+]
+
+
+class ShoutInput(BaseModel):
+    text: str
+
+
+async def shout(args):
+    return {"text": args["text"].upper()}
+
+
+def register(registry, agent=None):
+    registry.register(
+        Tool(
+            spec=ToolSpec(name="shout", description="Upper-case text", input_schema={}),
+            handler=shout,
+            input_model=ShoutInput,
+        )
+    )
+"""
+
+
+def _write_plugin(tmp_path, name="test_plugin", source=PLUGIN_SOURCE):
     module_path = tmp_path / f"{name}.py"
-    module_path.write_text(PLUGIN_SOURCE)
+    module_path.write_text(source)
     return module_path, name
 
 
@@ -45,7 +75,9 @@ def _restore_policy_env(monkeypatch):
     monkeypatch.delenv("SAM_PLUGIN_ALLOW_UNVERIFIED", raising=False)
     monkeypatch.delenv("SAM_PLUGIN_ALLOWLIST_FILE", raising=False)
     monkeypatch.delenv("SAM_PLUGINS", raising=False)
+    plugin_policy.clear_digest_cache()
     yield
+    plugin_policy.clear_digest_cache()
 
 
 def test_plugins_disabled_by_default(tmp_path, monkeypatch):
@@ -148,3 +180,55 @@ def test_trust_command_updates_allowlist(tmp_path, monkeypatch):
     doc = load_allowlist_document(allowlist)
     assert doc["modules"][module_name]["sha256"] == digest
     assert doc["entry_points"]["trusted"]["module"] == module_name
+
+
+def test_digest_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    plugin_file, module_name = _write_plugin(tmp_path, name="digest_plugin")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    reads = []
+    read_digest = PluginPolicy._read_digest
+
+    def counting(spec, origin):
+        reads.append(origin)
+        return read_digest(spec, origin)
+
+    monkeypatch.setattr(PluginPolicy, "_read_digest", staticmethod(counting))
+    policy = PluginPolicy.from_env()
+
+    first = policy.resolve_metadata(module_name)
+    assert policy.resolve_metadata(module_name).sha256 == first.sha256
+    assert len(reads) == 1
+
+    plugin_file.write_text(PLUGIN_SOURCE + "\n# upgraded\n")
+    changed = policy.resolve_metadata(module_name)
+    assert len(reads) == 2
+    assert changed.sha256 == hashlib.sha256(plugin_file.read_bytes()).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_manifest_plugin_is_imported_on_first_call(tmp_path, monkeypatch):
+    _patch_entry_points(monkeypatch)
+    plugin_file, module_name = _write_plugin(tmp_path, "lazy_plugin", LAZY_PLUGIN_SOURCE)
+    digest = hashlib.sha256(plugin_file.read_bytes()).hexdigest()
+    allowlist = tmp_path / "allowlist.json"
+    allowlist.write_text(
+        json.dumps({"modules": {module_name: {"sha256": digest}}, "entry_points": {}})
+    )
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("SAM_PLUGINS", module_name)
+    monkeypatch.setenv("SAM_PLUGIN_ALLOWLIST_FILE", str(allowlist))
+    monkeypatch.setenv("SAM_ENABLE_PLUGINS", "true")
+
+    registry = ToolRegistry()
+    load_plugins(registry, agent=None)
+
+    assert registry.tool_names() == ["shout"]
+    assert module_name not in sys.modules
+
+    invalid = await registry.call("shout", {})
+    assert invalid["error_detail"]["code"] == "validation_error"
+    assert module_name in sys.modules
+    assert (await registry.call("shout", {"text": "gm"}))["text"] == "GM"
+    assert (await registry.call("shout", {}))["error_detail"]["code"] == "validation_error"
+    monkeypatch.delitem(sys.modules, module_name)
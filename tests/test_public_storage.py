@@ -0,0 +1,81 @@
+import pytest
+
+from sam.api.public_storage import PublicAgentStorage
+from sam.core.memory import MemoryManager
+from sam.utils.connection_pool import cleanup_database_pool, get_db_connection
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    db_path = str(tmp_path / "marketplace.db")
+    await MemoryManager(db_path).initialize()
+    yield PublicAgentStorage(db_path)
+    await cleanup_database_pool()
+
+
+async def _publish(storage, count):
+    return [
+        (await storage.publish_agent(f"owner{i}", f"agent{i}", "public")).public_id
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rating_aggregates_follow_new_and_updated_ratings(storage):
+    first, second = await _publish(storage, 2)
+
+    await storage.add_rating(first, "u1", 5)
+    await storage.add_rating(first, "u2", 2)
+    await storage.add_rating(first, "u2", 4)  # update replaces, doesn't add
+    await storage.add_rating(second, "u1", 3)
+
+    entry = await storage.get_by_public_id(first)
+    assert (entry.rating, entry.rating_count) == (4.5, 2)
+
+    stats = await storage.get_marketplace_stats()
+    assert stats.total_public_agents == 2
+    assert stats.rated_agents == 2
+    assert stats.average_rating == 4.0
+
+
+@pytest.mark.asyncio
+async def test_listing_sorts_by_rating_and_pages_with_a_cursor(storage):
+    ids = await _publish(storage, 5)
+    for stars, public_id in zip([2, 5, 3, 4], ids):
+        await storage.add_rating(public_id, "rater", stars)
+
+    page, total, cursor = await storage.list_public_agents(limit=2, sort="rating")
+    assert total == 5
+    assert [e.public_id for e in page] == [ids[1], ids[3]]
+    assert cursor
+
+    page, total, cursor = await storage.list_public_agents(limit=2, sort="rating", cursor=cursor)
+    assert [e.public_id for e in page] == [ids[2], ids[0]]
+    assert total == 5
+
+    page, _, cursor = await storage.list_public_agents(limit=2, sort="rating", cursor=cursor)
+    assert [e.public_id for e in page] == [ids[4]]
+    assert page[0].rating is None
+    assert cursor is None
+
+    empty, total, _ = await storage.list_public_agents(limit=0)
+    assert empty == [] and total == 5
+
+    with pytest.raises(ValueError):
+        await storage.list_public_agents(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_each_sort_order_is_served_by_an_index(storage):
+    async with get_db_connection(storage.db_path) as conn:
+        for index, key in (
+            ("idx_public_agents_popular", "download_count"),
+            ("idx_public_agents_rating", "(rating_sum * 1.0 / MAX(rating_count, 1))"),
+        ):
+            cursor = await conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM public_agents WHERE visibility = 'public' "
+                f"ORDER BY {key} DESC, id DESC LIMIT 20"
+            )
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+            assert index in plan
+            assert "TEMP B-TREE" not in plan
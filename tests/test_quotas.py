@@ -0,0 +1,69 @@
+import pytest
+
+from sam.core.memory import MemoryManager
+from sam.core.quotas import QuotaManager
+from sam.utils.connection_pool import cleanup_database_pool, get_db_connection
+
+
+@pytest.fixture
+async def db(tmp_path):
+    db_path = str(tmp_path / "quotas.db")
+    memory = MemoryManager(db_path)
+    await memory.initialize()
+    yield memory
+    await cleanup_database_pool()
+
+
+@pytest.mark.asyncio
+async def test_session_counter_follows_inserts_and_deletes(db):
+    quotas = QuotaManager(db.db_path)
+    await quotas.update_quota("alice", max_sessions=2)
+
+    await db.create_session("s1", user_id="alice")
+    await db.save_session("s1", [{"role": "user", "content": "hi"}], user_id="alice")
+    assert await quotas.check_session_quota("alice") == (True, None)
+
+    await db.create_session("s2", user_id="alice")
+    await db.create_session("s3", user_id="bob")
+    allowed, message = await quotas.check_session_quota("alice")
+    assert not allowed and "Session limit reached" in message
+
+    await db.clear_session("s2", user_id="alice")
+    assert await quotas.check_session_quota("alice") == (True, None)
+    assert (await quotas.get_quota_status("bob"))["sessions"]["used"] == 1
+
+
+@pytest.mark.asyncio
+async def test_token_usage_is_buffered_and_flushed_in_one_batch(db):
+    quotas = QuotaManager(db.db_path, flush_interval=3600)
+    await quotas.update_quota("alice", max_tokens_per_day=100)
+
+    assert await quotas.check_token_quota("alice", 60) == (True, None)
+    allowed, _ = await quotas.check_token_quota("alice", 50)
+    assert not allowed
+
+    async with get_db_connection(db.db_path) as conn:
+        cursor = await conn.execute(
+            "SELECT tokens_used_today FROM user_quotas WHERE user_id = ?", ("alice",)
+        )
+        assert (await cursor.fetchone())[0] == 0
+
+    assert await quotas.flush_token_usage() == 60
+    assert (await quotas.get_quota_status("alice"))["tokens"]["used_today"] == 60
+
+    # A fresh manager (another worker) sees the flushed usage
+    other = QuotaManager(db.db_path)
+    assert (await other.get_quota_status("alice"))["tokens"]["remaining"] == 40
+    quotas._flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_recounts_usage_from_source_tables(db):
+    quotas = QuotaManager(db.db_path)
+    await db.create_session("s1", user_id="alice")
+    async with get_db_connection(db.db_path) as conn:
+        await conn.execute("UPDATE user_usage SET session_count = 7")
+        await conn.commit()
+
+    await quotas.reconcile_usage()
+    assert (await quotas.get_quota_status("alice"))["sessions"]["used"] == 1
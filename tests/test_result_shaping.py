@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from sam.core.result_shaping import ResultProjection, serialize_for_transcript, shape_result
+from sam.core.tools import Tool, ToolRegistry, ToolSpec
+
+
+def test_shape_result_truncates_rounds_and_excludes_without_mutating():
+    result = {
+        "success": True,
+        "price": 0.123456789123,
+        "pairs": [{"id": i, "info": {"big": "x" * 50}} for i in range(30)],
+        "raw": {"huge": list(range(1000))},
+    }
+    shaped = shape_result(result, ResultProjection(exclude=("raw", "pairs.info"), max_list_items=5))
+
+    assert "raw" not in shaped
+    assert shaped["price"] == 0.123457
+    assert shaped["pairs"][:5] == [{"id": i} for i in range(5)]
+    assert shaped["pairs"][-1] == "... 25 more omitted"
+    # The caller's result (and therefore event payloads) is untouched
+    assert len(result["pairs"]) == 30
+    assert "info" in result["pairs"][0]
+
+
+def test_shape_result_keeps_significant_digits_of_tiny_floats():
+    shaped = shape_result({"price": 2.1e-8, "pnl": 4.23e-6, "big": 65432.123456})
+
+    assert shaped["price"] == 2.1e-8
+    assert shaped["pnl"] == 4.23e-6
+    assert shaped["big"] == 65432.1
+
+
+def test_shape_result_enforces_byte_budget_and_keeps_outcome_keys():
+    result = {
+        "success": False,
+        "error": "boom",
+        "rows": [{"name": f"market-{i}", "blob": "y" * 400} for i in range(200)],
+    }
+    projection = ResultProjection(max_bytes=2_000)
+    encoded = serialize_for_transcript(result, projection)
+
+    assert len(encoded) <= 2_000
+    decoded = json.loads(encoded)
+    assert decoded["success"] is False
+    assert decoded["error"] == "boom"
+    assert "more omitted" in decoded["rows"][-1]
+
+    include_only = shape_result(result, ResultProjection(include=("rows",), max_bytes=100))
+    assert include_only["error"] == "boom"
+    assert "_truncated" in include_only
+
+
+@pytest.mark.asyncio
+async def test_registry_uses_tool_projection_for_transcript_only():
+    async def handler(_args):
+        return {"items": list(range(100)), "raw": {"a": 1}}
+
+    registry = ToolRegistry()
+    registry.register(
+        Tool(
+            spec=ToolSpec(name="listing", description="d", input_schema={}),
+            handler=handler,
+            output_projection=ResultProjection(exclude=("raw",), max_list_items=3),
+        )
+    )
+
+    result = await registry.call("listing", {})
+    assert len(result["items"]) == 100
+
+    transcript = json.loads(registry.serialize_result("listing", result))
+    assert transcript["items"] == [0, 1, 2, "... 97 more omitted"]
+    assert "raw" not in transcript
+    assert transcript["success"] is True
@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+import pytest
+
+from sam.core import memory as memory_module
+from sam.core.memory import MemoryManager
+from sam.core.migrations import ensure_schema, is_schema_ready, reset_schema_state
+from sam.utils.connection_pool import cleanup_database_pool
+
+
+@pytest.mark.asyncio
+async def test_initialize_runs_migrations_once_per_database(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "sam.db")
+    calls = []
+    register = memory_module.register_all_migrations
+
+    async def counting_register(path):
+        calls.append(path)
+        await register(path)
+
+    monkeypatch.setattr(memory_module, "register_all_migrations", counting_register)
+
+    await asyncio.gather(*(MemoryManager(db_path).initialize() for _ in range(5)))
+    await MemoryManager(db_path).initialize()
+    assert calls == [db_path]
+    assert is_schema_ready(db_path)
+    assert os.path.exists(f"{db_path}.migrate.lock")
+
+    # A replaced database file is set up again
+    await cleanup_database_pool()
+    os.rename(db_path, f"{db_path}.old")
+    assert not is_schema_ready(db_path)
+    await MemoryManager(db_path).initialize()
+    assert calls == [db_path, db_path]
+
+    reset_schema_state(db_path)
+    assert not is_schema_ready(db_path)
+    await cleanup_database_pool()
+
+
+@pytest.mark.asyncio
+async def test_failed_setup_is_retried(tmp_path):
+    db_path = str(tmp_path / "sam.db")
+    open(db_path, "w").close()
+    attempts = []
+
+    async def flaky_setup():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+
+    with pytest.raises(RuntimeError):
+        await ensure_schema(db_path, flaky_setup, scope="test")
+    assert await ensure_schema(db_path, flaky_setup, scope="test") is True
+    assert await ensure_schema(db_path, flaky_setup, scope="test") is False
+    assert len(attempts) == 2
+    # Scopes are tracked separately
+    assert not is_schema_ready(db_path)
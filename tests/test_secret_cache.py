@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+
+from sam.api import user_secrets
+from sam.api.user_secrets import UserSecretsStore
+from sam.config.settings import Settings
+from sam.db.engine import cleanup_engine, get_engine
+from sam.utils import secret_cache
+from sam.utils.secret_cache import SecretCache
+from sam.utils.secure_storage import EncryptedFileVault
+
+
+def test_evicted_and_invalidated_entries_are_zeroized():
+    cache = SecretCache(ttl=60, max_entries=1)
+    cache.put("alice", {"brave": {"api_key": "k-alice"}})
+    buffer = cache._entries[("alice", "secrets")][0]["brave"]["api_key"]
+
+    cache.put("bob", {"brave": {"api_key": "k-bob"}})
+    assert cache.get("alice") is None
+    assert buffer == bytearray(len("k-alice"))
+
+    # A load that started before a write is not cached
+    version = cache.version("bob")
+    cache.invalidate("bob")
+    cache.put("bob", {"brave": {"api_key": "stale"}}, version)
+    assert cache.get("bob") is None
+
+
+@pytest.mark.asyncio
+async def test_user_secrets_load_in_one_query_until_a_write(tmp_path, monkeypatch):
+    monkeypatch.setenv("SAM_DATABASE_URL", f"sqlite:///{tmp_path / 'secrets.db'}")
+    monkeypatch.setattr(Settings, "SAM_FERNET_KEY", Fernet.generate_key().decode())
+    monkeypatch.setattr(secret_cache, "_secret_cache", SecretCache(ttl=60))
+    await cleanup_engine()
+    store = UserSecretsStore()
+    await store.set_secret("u1", "brave", "api_key", "brave-key")
+    await store.set_secret("u1", "aster", "api_secret", "aster-secret")
+
+    loads = []
+    decrypt_rows = store._decrypt_rows
+
+    def counting(rows):
+        loads.append(len(rows))
+        return decrypt_rows(rows)
+
+    monkeypatch.setattr(store, "_decrypt_rows", counting)
+
+    assert await store.get_user_secrets("u1") == {
+        "brave": {"api_key": "brave-key"},
+        "aster": {"api_secret": "aster-secret"},
+    }
+    assert await store.get_integration_secrets("u1", "brave") == {"api_key": "brave-key"}
+    assert loads == [2]
+
+    await store.delete_integration("u1", "aster")
+    assert await store.get_user_secrets("u1") == {"brave": {"api_key": "brave-key"}}
+    assert loads == [2, 1]
+
+    # Values are encrypted at rest
+    async with (await get_engine()).connection() as conn:
+        cursor = await conn.execute("SELECT encrypted_value FROM user_secrets")
+        assert "brave-key" not in {row[0] for row in await cursor.fetchall()}
+    assert user_secrets.get_secret_cache().get_stats()["invalidations"] >= 1
+    await cleanup_engine()
+
+
+def test_vault_skips_rewrites_when_nothing_changed(tmp_path, monkeypatch):
+    vault = EncryptedFileVault(str(tmp_path / "vault.json"))
+    writes = []
+    dump = vault._dump
+
+    def counting_dump():
+        writes.append(1)
+        dump()
+
+    monkeypatch.setattr(vault, "_dump", counting_dump)
+
+    for _ in range(3):
+        vault.record_key("api_key_brave", source="keyring", kind="plaintext")
+        vault.set_meta("key_fingerprint", "abc")
+    assert len(writes) == 2
+
+    vault.record_key("api_key_brave", source="fallback", kind="fernet_b64")
+    assert len(writes) == 3
+    payload = json.loads((tmp_path / "vault.json").read_text())
+    assert payload["index"]["api_key_brave"]["source"] == "fallback"
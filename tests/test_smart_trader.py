@@ -1,6 +1,18 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
 import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
 
+from sam.integrations.pump_fun import PumpFunTools
 from sam.integrations.smart_trader import SmartTrader, WSOL_MINT
+from sam.integrations.solana.submission import TransactionPipeline
 
 
 class FakeSolana:
@@ -18,20 +30,45 @@ class FakeSolana:
 
 
 class FakePump:
-    def __init__(self, succeed=False):
+    def __init__(self, succeed=False, expected_output=None, delay=0.0):
         self.succeed = succeed
+        self.expected_output = expected_output
+        self.delay = delay
         self.called = False
 
-    async def create_sell_transaction(self, public_key, mint, percentage, slippage):
-        self.called = True
+    async def _build(self):
+        await asyncio.sleep(self.delay)
         if self.succeed:
-            return {"success": True, "transaction_id": "pump_tx"}
+            return {"transaction_hex": "00"}
         return {"error": "pump fail"}
 
+    async def build_buy_transaction(self, public_key, mint, amount_sol, slippage):
+        return await self._build()
+
+    async def build_sell_transaction(self, public_key, mint, percentage, slippage):
+        return await self._build()
+
+    async def estimate_trade(self, mint, action, amount):
+        if self.expected_output is None:
+            return {"error": "no curve"}
+        return {"expected_output": self.expected_output, "price_impact_pct": 0.02}
+
+    async def submit_transaction(self, transaction_hex, action):
+        self.called = True
+        return {"success": True, "transaction_id": "pump_tx"}
+
 
 class FakeJupiter:
-    def __init__(self):
+    def __init__(self, output_amount=1_000, delay=0.0):
+        self.output_amount = output_amount
+        self.delay = delay
         self.calls = []
+        self.quotes = 0
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps):
+        self.quotes += 1
+        await asyncio.sleep(self.delay)
+        return {"output_amount": self.output_amount, "price_impact_pct": 0.01}
 
     async def execute_swap(self, input_mint, output_mint, amount, slippage_bps):
         self.calls.append((input_mint, output_mint, amount, slippage_bps))
@@ -72,3 +109,117 @@ async def test_smart_sell_uses_pump_when_available():
     assert pump.called is True
     # Ensure no Jupiter call when pump succeeds
     assert not jup.calls
+
+
+@pytest.mark.asyncio
+async def test_smart_buy_quotes_concurrently_and_picks_better_output():
+    mint = "FakeMint3333333333333333333333333333333333333"
+    sol = FakeSolana("Wallet333", {})
+    pump = FakePump(succeed=True, expected_output=900, delay=0.2)
+    jup = FakeJupiter(output_amount=1_000, delay=0.2)
+    trader = SmartTrader(pump_tools=pump, jupiter_tools=jup, solana_tools=sol)
+
+    start = time.perf_counter()
+    res = await trader.smart_buy(mint, amount_sol=0.5, slippage_percent=5)
+    elapsed = time.perf_counter() - start
+
+    # Quotes ran concurrently: latency is max(providers), not the sum
+    assert elapsed < 0.35
+    assert res["provider"] == "jupiter"
+    assert jup.calls == [(WSOL_MINT, mint, 500_000_000, 500)]
+    assert pump.called is False
+    assert {r["provider"] for r in res["routes"]} == {"pump.fun", "jupiter"}
+
+
+@pytest.mark.asyncio
+async def test_smart_buy_cancels_slow_loser_after_grace():
+    mint = "FakeMint4444444444444444444444444444444444444"
+    sol = FakeSolana("Wallet444", {})
+    pump = FakePump(succeed=True, delay=0.0)
+    jup = FakeJupiter(delay=5.0)
+    trader = SmartTrader(pump_tools=pump, jupiter_tools=jup, solana_tools=sol, race_grace=0.05)
+
+    start = time.perf_counter()
+    res = await trader.smart_buy(mint, amount_sol=0.1)
+
+    assert time.perf_counter() - start < 1.0
+    assert res["provider"] == "pump.fun"
+    assert res["mint"] == mint
+    assert {"provider": "jupiter", "error": "Quote timed out"} in res["routes"]
+
+
+class LostSendRpcClient:
+    """Accepts the transaction onto the wire, then loses the connection."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def get_latest_blockhash(self, commitment=None):
+        return SimpleNamespace(
+            value=SimpleNamespace(blockhash=Hash.new_unique(), last_valid_block_height=250)
+        )
+
+    async def send_raw_transaction(self, raw, opts=None):
+        self.sent.append(VersionedTransaction.from_bytes(raw))
+        raise httpx.ReadTimeout("connection lost after the request was written")
+
+
+@pytest.mark.asyncio
+async def test_smart_buy_does_not_fall_back_when_pump_send_outcome_is_unknown():
+    mint = "FakeMint5555555555555555555555555555555555555"
+    payer = Keypair()
+    client = LostSendRpcClient()
+
+    async def client_factory():
+        return client
+
+    pipeline = TransactionPipeline(client_factory)
+    signer = SimpleNamespace(keypair=payer, get_submission_pipeline=lambda: pipeline)
+    ix = transfer(
+        TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1)
+    )
+    message = MessageV0.try_compile(payer.pubkey(), [ix], [], Hash.new_unique())
+    tx_hex = bytes(VersionedTransaction(message, [payer])).hex()
+
+    pump = FakePump(succeed=True, expected_output=2_000)
+
+    async def submit_transaction(transaction_hex, action):
+        pump.called = True
+        return await PumpFunTools(signer)._sign_and_send_transaction(tx_hex, action)
+
+    pump.submit_transaction = submit_transaction
+    jup = FakeJupiter(output_amount=1_000)
+    trader = SmartTrader(pump_tools=pump, jupiter_tools=jup, solana_tools=FakeSolana("W5", {}))
+
+    res = await trader.smart_buy(mint, amount_sol=0.1)
+
+    assert pump.called is True
+    assert jup.calls == []
+    assert res["provider"] == "pump.fun"
+    assert res["status"] == "unconfirmed" and res["success"] is False
+    assert res["transaction_id"] == str(client.sent[0].signatures[0])
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_smart_buy_falls_back_after_pump_transaction_expires():
+    mint = "FakeMint6666666666666666666666666666666666666"
+    pump = FakePump(succeed=True, expected_output=2_000)
+
+    async def submit_transaction(transaction_hex, action):
+        pump.called = True
+        return {
+            "error": "Transaction expired: Blockhash expired before confirmation",
+            "transaction_id": "pump_tx",
+            "confirmation": {"status": "expired", "broadcasts": 3},
+        }
+
+    pump.submit_transaction = submit_transaction
+    jup = FakeJupiter(output_amount=1_000)
+    trader = SmartTrader(pump_tools=pump, jupiter_tools=jup, solana_tools=FakeSolana("W6", {}))
+
+    res = await trader.smart_buy(mint, amount_sol=0.1)
+
+    assert pump.called is True
+    assert res["provider"] == "jupiter" and res["success"] is True
+    assert len(jup.calls) == 1
@@ -0,0 +1,130 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from solana.rpc.core import RPCException
+
+from sam.integrations.solana.rpc_router import SolanaRpcRouter
+from sam.utils.circuit_breaker import CircuitState
+
+
+class FakeEndpointClient:
+    def __init__(self, name, *, delay=0.0, fail=None):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    async def _respond(self, method, value):
+        self.calls.append(method)
+        await asyncio.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        return SimpleNamespace(value=value)
+
+    async def get_slot(self, commitment=None):
+        return await self._respond("get_slot", self.name)
+
+    async def send_raw_transaction(self, raw, opts=None):
+        return await self._respond("send_raw_transaction", self.name)
+
+    async def close(self):
+        pass
+
+
+def _router(clients, **kwargs):
+    # Unique URLs keep the process-wide circuit breakers isolated per test
+    urls = [f"https://{name}-{id(clients)}.example/rpc?api-key=secret" for name in clients]
+    router = SolanaRpcRouter(urls, **kwargs)
+    for endpoint, client in zip(router.endpoints, clients.values()):
+        endpoint.client = lambda client=client: client
+    return router
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_lowest_latency_endpoint():
+    slow = FakeEndpointClient("slow", delay=0.02)
+    fast = FakeEndpointClient("fast")
+    router = _router({"slow": slow, "fast": fast})
+
+    await router.probe()
+    result = await router.client().get_slot()
+
+    assert result.value == "fast"
+    assert router.health()["preferred"].startswith("fast-")
+    assert "secret" not in str(router.health())
+
+
+@pytest.mark.asyncio
+async def test_router_fails_over_on_transport_error_and_opens_circuit():
+    broken = FakeEndpointClient("broken", fail=httpx.ConnectError("refused"))
+    healthy = FakeEndpointClient("healthy", delay=0.001)
+    router = _router({"broken": broken, "healthy": healthy})
+
+    for _ in range(3):
+        result = await router.call("get_slot")
+        assert result.value == "healthy"
+        # Keep the broken endpoint at the front so every call tries it first
+        router.endpoints[1].ewma_latency = 10.0
+
+    broken_endpoint = router.endpoints[0]
+    assert broken_endpoint.breaker.stats.state == CircuitState.OPEN
+    assert router.ranked() == [router.endpoints[1]]
+    assert router.health()["status"] == "degraded"
+
+    await router.call("get_slot")
+    assert len(broken.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_router_does_not_fail_over_on_rpc_errors():
+    rejecting = FakeEndpointClient("rejecting", fail=RPCException({"message": "bad params"}))
+    other = FakeEndpointClient("other", delay=0.01)
+    router = _router({"rejecting": rejecting, "other": other})
+
+    with pytest.raises(RPCException):
+        await router.call("get_slot")
+    assert other.calls == []
+
+
+@pytest.mark.asyncio
+async def test_routed_send_fans_out_and_returns_first_success():
+    down = FakeEndpointClient("down", fail=httpx.ConnectError("refused"))
+    slow = FakeEndpointClient("slow", delay=0.05)
+    quick = FakeEndpointClient("quick", delay=0.001)
+    router = _router({"down": down, "slow": slow, "quick": quick})
+
+    result = await router.client().send_raw_transaction(b"tx")
+
+    assert result.value == "quick"
+    assert down.calls == slow.calls == quick.calls == ["send_raw_transaction"]
+    await asyncio.sleep(0.06)
+    assert not router._background
+
+
+def test_endpoint_closes_client_left_on_a_previous_event_loop(monkeypatch):
+    from sam.integrations.solana import rpc_router
+
+    closed = []
+
+    class RecordingClient:
+        def __init__(self, url):
+            self.url = url
+
+        async def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(rpc_router, "AsyncClient", RecordingClient)
+    endpoint = SolanaRpcRouter(["https://loops.example/rpc"]).endpoints[0]
+
+    async def get_client():
+        client = endpoint.client()
+        await asyncio.sleep(0)
+        return client
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+    assert closed == [first]
@@ -0,0 +1,244 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+from solders.transaction_status import TransactionConfirmationStatus
+
+from sam.integrations.solana.submission import (
+    BlockhashCache,
+    ConfirmationTracker,
+    SubmissionOptions,
+    TransactionPipeline,
+)
+
+
+class FakeRpcClient:
+    def __init__(self, *, block_height=100, stale_first_send=False):
+        self.block_height = block_height
+        self.stale_first_send = stale_first_send
+        self.blockhash_calls = 0
+        self.status_calls = []
+        self.sent = []
+        self.statuses = {}
+
+    async def get_latest_blockhash(self, commitment=None):
+        self.blockhash_calls += 1
+        return SimpleNamespace(
+            value=SimpleNamespace(
+                blockhash=Hash.new_unique(), last_valid_block_height=self.block_height + 150
+            )
+        )
+
+    async def send_raw_transaction(self, raw, opts=None):
+        if self.stale_first_send and not self.sent:
+            self.sent.append(None)
+            raise RuntimeError("Transaction simulation failed: Blockhash not found")
+        tx = VersionedTransaction.from_bytes(raw)
+        self.sent.append(tx)
+        return SimpleNamespace(value=tx.signatures[0])
+
+    async def get_signature_statuses(self, signatures, search_transaction_history=False):
+        self.status_calls.append(list(signatures))
+        return SimpleNamespace(value=[self.statuses.get(sig) for sig in signatures])
+
+    async def get_block_height(self, commitment=None):
+        return SimpleNamespace(value=self.block_height)
+
+
+def _confirmed(slot=42, err=None):
+    return SimpleNamespace(
+        err=err, slot=slot, confirmation_status=TransactionConfirmationStatus.Confirmed
+    )
+
+
+def _message(payer, blockhash=None):
+    ix = transfer(
+        TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1)
+    )
+    return MessageV0.try_compile(payer.pubkey(), [ix], [], blockhash or Hash.new_unique())
+
+
+def _factory(client):
+    async def get_client():
+        return client
+
+    return get_client
+
+
+@pytest.mark.asyncio
+async def test_blockhash_cache_reuses_fresh_value():
+    client = FakeRpcClient()
+    cache = BlockhashCache(_factory(client), refresh_interval=60)
+    first = await cache.get()
+    second = await cache.get()
+    assert first is second
+    assert client.blockhash_calls == 1
+
+    refreshed = await cache.get(force_refresh=True)
+    assert refreshed is not first
+    assert client.blockhash_calls == 2
+    await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_tracker_batches_status_polling():
+    client = FakeRpcClient()
+    tracker = ConfirmationTracker(_factory(client), poll_interval=60)
+    payer = Keypair()
+    futures = []
+    signatures = []
+    for _ in range(3):
+        tx = VersionedTransaction(_message(payer), [payer])
+        signatures.append(tx.signatures[0])
+        futures.append(tracker.track(tx.signatures[0], bytes(tx), last_valid_block_height=500))
+
+    client.statuses[signatures[0]] = _confirmed()
+    client.statuses[signatures[1]] = _confirmed(err="InstructionError")
+    await tracker.poll_once()
+
+    assert len(client.status_calls) == 1
+    assert len(client.status_calls[0]) == 3
+    assert futures[0].result().status == "confirmed"
+    assert futures[1].result().status == "failed"
+    assert not futures[2].done()
+    assert tracker.in_flight == 1
+
+    client.block_height = 501
+    await tracker.poll_once()
+    assert futures[2].result().status == "expired"
+    await tracker.stop()
+
+
+@pytest.mark.asyncio
+async def test_tracker_rebroadcasts_pending_transactions():
+    client = FakeRpcClient()
+    tracker = ConfirmationTracker(_factory(client), poll_interval=60, rebroadcast_interval=0)
+    payer = Keypair()
+    tx = VersionedTransaction(_message(payer), [payer])
+    future = tracker.track(tx.signatures[0], bytes(tx), last_valid_block_height=500)
+
+    await tracker.poll_once()
+    await tracker.poll_once()
+
+    assert len(client.sent) == 2
+    client.statuses[tx.signatures[0]] = _confirmed()
+    await tracker.poll_once()
+    assert future.result().broadcasts == 3
+    await tracker.stop()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_refreshes_stale_blockhash_and_confirms():
+    client = FakeRpcClient(stale_first_send=True)
+    pipeline = TransactionPipeline(
+        _factory(client), tracker=ConfirmationTracker(_factory(client), poll_interval=0.01)
+    )
+    payer = Keypair()
+    original = _message(payer)
+
+    async def confirm_when_sent():
+        while len(client.sent) < 2:
+            await asyncio.sleep(0)
+        client.statuses[client.sent[1].signatures[0]] = _confirmed()
+
+    helper = asyncio.create_task(confirm_when_sent())
+    result = await pipeline.submit(original, [payer], SubmissionOptions(confirm_timeout=5))
+    await helper
+
+    assert result.status == "confirmed"
+    assert result.blockhash_refreshed is True
+    assert client.sent[1].message.recent_blockhash != original.recent_blockhash
+    stats = pipeline.get_stats()
+    assert stats["landed"] == 1
+    assert stats["blockhash_refreshes"] == 1
+    assert stats["confirmation_latency"]["count"] == 1
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_restamps_prebuilt_transactions_so_expiry_is_detected():
+    client = FakeRpcClient()
+    pipeline = TransactionPipeline(
+        _factory(client), tracker=ConfirmationTracker(_factory(client), poll_interval=0.01)
+    )
+    payer = Keypair()
+    prebuilt = VersionedTransaction(_message(payer), [payer])
+
+    async def expire_then_confirm():
+        while len(client.sent) < 1:
+            await asyncio.sleep(0)
+        # The first send used the cached blockhash, valid until height 250
+        client.block_height = 251
+        while len(client.sent) < 2:
+            await asyncio.sleep(0)
+        client.statuses[client.sent[1].signatures[0]] = _confirmed()
+
+    helper = asyncio.create_task(expire_then_confirm())
+    result = await pipeline.submit_transaction(
+        prebuilt, [payer], SubmissionOptions(confirm_timeout=5)
+    )
+    await helper
+
+    assert result.status == "confirmed"
+    assert result.blockhash_refreshed is True
+    assert client.sent[0].message.recent_blockhash != prebuilt.message.recent_blockhash
+    assert pipeline.get_stats()["blockhash_refreshes"] == 1
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_compiles_priority_fee_instructions():
+    client = FakeRpcClient()
+    pipeline = TransactionPipeline(_factory(client))
+    payer = Keypair()
+    ix = transfer(
+        TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1)
+    )
+
+    message, last_valid = await pipeline.compile_message(
+        payer.pubkey(),
+        [ix],
+        SubmissionOptions(compute_unit_limit=200_000, compute_unit_price_micro_lamports=5_000),
+    )
+
+    assert len(message.instructions) == 3
+    assert last_valid == client.block_height + 150
+
+    result = await pipeline.submit(message, [payer], SubmissionOptions(confirm=False))
+    assert result.status == "sent"
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_confirmation_timeout_is_reported_as_unconfirmed():
+    from sam.integrations.pump_fun import PumpFunTools
+
+    client = FakeRpcClient()
+    pipeline = TransactionPipeline(
+        _factory(client), tracker=ConfirmationTracker(_factory(client), poll_interval=0.01)
+    )
+    payer = Keypair()
+    solana_tools = SimpleNamespace(keypair=payer, get_submission_pipeline=lambda: pipeline)
+    pipeline_submit = pipeline.submit_transaction
+
+    async def submit_with_short_timeout(tx, signers, options=None, **kwargs):
+        options.confirm_timeout = 0.05
+        return await pipeline_submit(tx, signers, options, **kwargs)
+
+    pipeline.submit_transaction = submit_with_short_timeout
+    prebuilt = VersionedTransaction(_message(payer), [payer])
+
+    result = await PumpFunTools(solana_tools)._sign_and_send_transaction(
+        bytes(prebuilt).hex(), "buy"
+    )
+
+    assert result["success"] is False and result["confirmed"] is False
+    assert result["status"] == "unconfirmed"
+    assert result["transaction_id"] == str(client.sent[0].signatures[0])
+    assert result["confirmation"]["status"] == "timeout"
+    await pipeline.close()
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+# About twice the current cost; importing every integration eagerly costs
+# more than this on a developer laptop.
+BUILDER_BUDGET_MS = float(os.getenv("SAM_IMPORT_BUDGET_MS", "1000"))
+
+INTEGRATION_MODULES = {
+    "web3",
+    "hyperliquid",
+    "x402",
+    "sam.integrations.solana.solana_tools",
+    "sam.integrations.evm",
+    "sam.integrations.hyperliquid",
+    "sam.integrations.kalshi",
+    "sam.integrations.polymarket",
+    "sam.integrations.aixbt",
+    "sam.integrations.coinbase_x402",
+}
+
+
+def _import_times(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "SAM_TEST_MODE": "1", "PYTHONPATH": ROOT},
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1]) / 1000
+    return times
+
+
+@pytest.mark.parametrize("module", ["sam.core.builder", "sam.cli"])
+def test_entrypoints_do_not_import_integrations(module):
+    assert INTEGRATION_MODULES.isdisjoint(_import_times(module))
+
+
+def test_builder_import_stays_within_budget():
+    best = min(_import_times("sam.core.builder")["sam.core.builder"] for _ in range(3))
+    assert best < BUILDER_BUDGET_MS, f"importing sam.core.builder took {best:.0f} ms"
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from sam.integrations.solana.solana_tools import SolanaTools
+from sam.integrations.solana.token_registry import TokenRegistry
+from sam.utils.connection_pool import cleanup_database_pool
+
+MINT_A = "So11111111111111111111111111111111111111112"
+MINT_B = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+class CountingFetcher:
+    def __init__(self, supply: int = 1):
+        self.calls = []
+        self.supply = supply
+
+    async def __call__(self, mints):
+        self.calls.append(list(mints))
+        await asyncio.sleep(0.01)
+        return {
+            m: {"mint": m, "name": f"Token {m[:4]}", "supply": {"amount": self.supply}}
+            for m in mints
+        }
+
+
+@pytest.mark.asyncio
+async def test_registry_batches_misses_and_persists_across_instances(tmp_path):
+    db_path = str(tmp_path / "tokens.db")
+    fetcher = CountingFetcher()
+    registry = TokenRegistry(db_path)
+
+    # Concurrent lookups of the same mints share one batch fetch
+    first, second = await asyncio.gather(
+        registry.get_many([MINT_A, MINT_B], fetcher), registry.get(MINT_A, fetcher)
+    )
+    assert set(first) == {MINT_A, MINT_B}
+    assert second["name"] == "Token So11"
+    assert fetcher.calls == [[MINT_A, MINT_B]]
+
+    # A fresh registry (new process) reads from SQLite instead of the RPC
+    reloaded = TokenRegistry(db_path)
+    record = await reloaded.get(MINT_B, fetcher)
+    assert record["name"] == "Token EPjF"
+    assert fetcher.calls == [[MINT_A, MINT_B]]
+    assert reloaded.get_stats()["db_hits"] == 1
+
+    await cleanup_database_pool()
+
+
+@pytest.mark.asyncio
+async def test_stale_records_refresh_only_mutable_fields_in_background(tmp_path):
+    registry = TokenRegistry(str(tmp_path / "tokens.db"), refresh_after=60.0)
+    await registry.get(MINT_A, CountingFetcher(supply=1))
+    record, _ = registry._lru[MINT_A]
+    registry._lru[MINT_A] = (record, time.time() - 120)
+
+    async def renamed(mints):
+        return {m: {"mint": m, "name": "Renamed", "supply": {"amount": 2}} for m in mints}
+
+    # The stale copy is served immediately; the refresh lands afterwards
+    served = await registry.get(MINT_A, renamed)
+    assert served["supply"] == {"amount": 1}
+    await asyncio.gather(*registry._tasks)
+
+    refreshed = await registry.get(MINT_A, renamed)
+    assert refreshed["supply"] == {"amount": 2}
+    assert refreshed["name"] == "Token So11"
+    assert registry.get_stats()["refreshed"] == 1
+
+    await cleanup_database_pool()
+
+
+@pytest.mark.asyncio
+async def test_solana_tools_fetch_falls_back_to_mint_accounts(monkeypatch):
+    tools = SolanaTools("https://rpc.test")
+    calls = []
+
+    async def fake_rpc_post(method, params):
+        calls.append(method)
+        if method == "getAssetBatch":
+            return [{"content": {"metadata": {"name": "Wrapped SOL", "symbol": "SOL"}}}, None]
+        return {
+            "value": [
+                {"data": {"parsed": {"type": "mint", "info": {"supply": "10", "decimals": 6}}}}
+            ]
+        }
+
+    monkeypatch.setattr(tools, "_rpc_post", fake_rpc_post)
+    found = await tools.get_token_metadata_batch([MINT_A, MINT_B])
+
+    assert calls == ["getAssetBatch", "getMultipleAccounts"]
+    assert found[MINT_A]["symbol"] == "SOL"
+    assert found[MINT_B]["supply"] == {"amount": "10", "decimals": 6}
+    assert found[MINT_B]["source"] == "rpc_mint_account"
@@ -0,0 +1,136 @@
+import json
+import time
+
+import pytest
+
+from sam.core.middleware import ToolContext
+from sam.core.tool_router import REQUEST_TOOLS_NAME, ToolRouter
+from sam.core.tools import Tool, ToolRegistry, ToolSpec
+
+
+async def _noop(_args):
+    return {"ok": True}
+
+
+def _registry(groups):
+    registry = ToolRegistry()
+    for prefix, actions in groups.items():
+        for action in actions:
+            name = f"{prefix}_{action}"
+            registry.register(
+                Tool(
+                    spec=ToolSpec(
+                        name=name,
+                        description=f"{action.replace('_', ' ')} on {prefix}",
+                        input_schema={
+                            "type": "object",
+                            "properties": {
+                                "market": {"type": "string", "description": f"{prefix} market id"}
+                            },
+                        },
+                    ),
+                    handler=_noop,
+                )
+            )
+    return registry
+
+
+GROUPS = {
+    "hyperliquid": ["balance", "positions", "open_order", "close_position", "user_fills"],
+    "kalshi": ["list_markets", "market_detail", "opportunity_scan"],
+    "polymarket": ["list_markets", "strategy_brief"],
+    "jupiter": ["swap", "quote"],
+    "pump": ["buy", "sell", "token_info"],
+    "evm": ["balance", "transfer"],
+}
+
+
+def test_router_selects_mentioned_groups_and_keeps_used_tools():
+    registry = _registry(GROUPS)
+    router = ToolRouter(registry, max_tools=4)
+
+    selected = router.select([{"role": "user", "content": "What are my Kalshi markets?"}])
+    assert {"kalshi_list_markets", "kalshi_market_detail", "kalshi_opportunity_scan"} <= selected
+    assert REQUEST_TOOLS_NAME in selected
+    assert not any(name.startswith("pump_") for name in selected)
+
+    messages = [
+        {"role": "user", "content": "buy some pump tokens"},
+        {"role": "tool", "name": "evm_transfer", "content": "{}"},
+    ]
+    selected = router.select(messages)
+    assert "pump_buy" in selected
+    assert "evm_transfer" in selected
+
+    specs = router.list_specs(messages)
+    assert {s["name"] for s in specs} == selected
+
+
+@pytest.mark.asyncio
+async def test_request_tools_escape_hatch_is_per_session():
+    registry = _registry(GROUPS)
+    router = ToolRouter(registry, max_tools=4)
+    messages = [{"role": "user", "content": "swap on jupiter"}]
+    assert "evm_balance" not in router.select(messages, "s1")
+
+    result = await registry.call(
+        REQUEST_TOOLS_NAME, {"namespace": "evm"}, context=ToolContext(session_id="s1")
+    )
+    assert result["enabled_tools"] == ["evm_balance", "evm_transfer"]
+    assert "evm_balance" in router.select(messages, "s1")
+    assert "evm_balance" not in router.select(messages, "s2")
+
+    router.reset("s1")
+    assert "evm_balance" not in router.select(messages, "s1")
+
+    missing = await registry.call(REQUEST_TOOLS_NAME, {"query": "zzz"})
+    assert "error" in missing
+    assert "kalshi" in missing["available_groups"]
+
+
+def test_follow_up_turn_keeps_previous_turns_tool_groups():
+    registry = _registry(GROUPS)
+    router = ToolRouter(registry, max_tools=4)
+    call = {"id": "1", "function": {"name": "hyperliquid_open_order", "arguments": "{}"}}
+    history = [
+        {"role": "user", "content": "long 1 SOL on hyperliquid"},
+        {"role": "assistant", "content": "", "tool_calls": [call]},
+        {"role": "tool", "tool_call_id": "1", "name": "hyperliquid_open_order", "content": "{}"},
+        {"role": "assistant", "content": "Done"},
+    ]
+
+    selected = router.select(history + [{"role": "user", "content": "do it again"}])
+    assert {"hyperliquid_open_order", "hyperliquid_close_position"} <= selected
+
+    # Older turns stop seeding the selection
+    later = history + [
+        {"role": "user", "content": "what kalshi markets are open"},
+        {"role": "assistant", "content": "None"},
+        {"role": "user", "content": "and polymarket"},
+    ]
+    assert "hyperliquid_close_position" not in router.select(later)
+
+
+def test_small_registry_passes_every_tool_through():
+    registry = _registry({"evm": ["balance", "transfer"]})
+    router = ToolRouter(registry, max_tools=16)
+    assert router.select([{"role": "user", "content": "hi"}]) == {"evm_balance", "evm_transfer"}
+
+
+@pytest.mark.performance
+def test_tool_router_performance_spec_bytes_and_latency():
+    groups = {f"venue{i}": [f"action{j}" for j in range(5)] for i in range(10)}
+    registry = _registry(groups)
+    router = ToolRouter(registry, max_tools=10)
+    messages = [{"role": "user", "content": "show venue3 action2 for market abc"}]
+
+    full = len(json.dumps(registry.list_specs()))
+    routed = len(json.dumps(router.list_specs(messages)))
+
+    start = time.perf_counter()
+    for _ in range(200):
+        router.select(messages)
+    per_call_ms = (time.perf_counter() - start) / 200 * 1000
+
+    assert 0 < routed < full / 2
+    assert per_call_ms < 5
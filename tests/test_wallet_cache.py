@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from sam.integrations.solana.solana_tools import SolanaTools, create_solana_tools
+from sam.integrations.solana.wallet_cache import WalletStateCache, ws_url_for
+
+WALLET = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+
+
+def test_ttl_fallback_and_stale_fetch_is_discarded():
+    cache = WalletStateCache(None, ttl=60.0)
+    assert cache.get(WALLET) is None
+
+    version = cache.version(WALLET)
+    cache.invalidate(WALLET)  # e.g. our own send lands while the fetch is running
+    cache.put(WALLET, {"sol_balance": 1.0}, version)
+    assert cache.get(WALLET) is None
+
+    cache.put(WALLET, {"sol_balance": 2.0}, cache.version(WALLET))
+    assert cache.get(WALLET) == {"sol_balance": 2.0}
+    cache.ttl = 0
+    assert cache.get(WALLET) is None
+    assert ws_url_for("https://rpc.test/?key=1") == "wss://rpc.test/?key=1"
+
+
+@pytest.mark.asyncio
+async def test_subscription_keeps_entry_current_until_account_changes():
+    notify = asyncio.Event()
+    requests = []
+
+    async def ws_handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        for _ in range(2):
+            message = json.loads((await ws.receive()).data)
+            requests.append(message["method"])
+            await ws.send_json({"jsonrpc": "2.0", "id": message["id"], "result": len(requests)})
+        await notify.wait()
+        await ws.send_json({"jsonrpc": "2.0", "method": "programNotification", "params": {}})
+        await ws.receive()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", ws_handler)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    session = aiohttp.ClientSession()
+
+    async def session_factory():
+        return session
+
+    cache = WalletStateCache(
+        f"ws://127.0.0.1:{server.port}/", ttl=0, session_factory=session_factory
+    )
+    try:
+        assert cache.get(WALLET) is None
+        for _ in range(100):
+            if cache.subscribed(WALLET):
+                break
+            await asyncio.sleep(0.01)
+        assert requests == ["accountSubscribe", "programSubscribe"]
+
+        # Subscribed: served from memory even with a zero TTL
+        cache.put(WALLET, {"sol_balance": 1.0}, cache.version(WALLET))
+        assert cache.get(WALLET) == {"sol_balance": 1.0}
+
+        notify.set()
+        for _ in range(100):
+            if cache.get_stats()["notifications"]:
+                break
+            await asyncio.sleep(0.01)
+        assert cache.get(WALLET) is None
+    finally:
+        await cache.stop()
+        await session.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_balance_tool_reads_shared_cache_and_own_sends_invalidate_it(monkeypatch):
+    cache = WalletStateCache(None)
+    tools = SolanaTools("https://rpc.test", wallet_cache=cache)
+    tools.wallet_address = WALLET
+    fetches = []
+
+    async def fake_get_balance(address=None):
+        fetches.append(address)
+        return {"address": WALLET, "sol_balance": 1.0}
+
+    monkeypatch.setattr(tools, "get_balance", fake_get_balance)
+    handler = next(t for t in create_solana_tools(tools) if t.spec.name == "get_balance").handler
+
+    await handler({})
+    await handler({})
+    assert fetches == [None]
+
+    tools.invalidate_wallet_balance()
+    await handler({})
+    assert fetches == [None, None]